@@ -20,7 +20,6 @@ logging.getLogger('electionguard').setLevel(logging.WARNING)
 
 from flask import Flask, request, jsonify, g, Response
 from typing import Dict, List, Optional, Tuple, Any
-import gc
 import random
 from datetime import datetime
 import uuid
@@ -94,7 +93,6 @@ from electionguard.manifest import (
     ContactInformation,
     ReportingUnitType
 )
-from electionguard_tools.helpers.election_builder import ElectionBuilder
 from electionguard.tally import (
     tally_ballots,
     CiphertextTally,
@@ -118,21 +116,24 @@ from electionguard.decryption import (
     compute_lagrange_coefficients_for_guardians as compute_lagrange_coeffs
 )
 from services.setup_guardians import setup_guardians_service
+from services.key_ceremony_engine import generate_guardian_key_pairs
 from services.guardian_key_ceremony import (
     init_guardian_ceremony_service,
     submit_guardian_keys_service,
     finalize_guardian_ceremony_service,
     get_ceremony_status_service
 )
-from services.create_encrypted_ballot import create_encrypted_ballot_service
+from services.create_encrypted_ballot import create_encrypted_ballot_service, create_encrypted_ballots_service
+from services.election_manifest import create_encrypted_manifest_ballot_service, register_election_manifest_service
 from services.create_encrypted_tally import create_encrypted_tally_service
 from services.create_partial_decryption import create_partial_decryption_service
 from services.create_compensated_decryption_shares import create_compensated_decryption_service, compute_compensated_ballot_shares
-from services.combine_decryption_shares import combine_decryption_shares_service
+from services.combine_decryption_shares import combine_decryption_shares_service, decrypt_spoiled_ballots_service
 from services.create_partial_decryption_shares import compute_ballot_shares, compute_guardian_decryption_shares
 from services.create_encrypted_ballot import create_election_manifest, create_plaintext_ballot
 from services.create_encrypted_tally import ciphertext_tally_to_raw, raw_to_ciphertext_tally
-from services.benaloh_challenge import benaloh_challenge_service
+from services.benaloh_challenge import benaloh_challenge_service, benaloh_challenge_batch_service
+from services.compact_ballot import expand_compact_ballots_service
 
 # Re-apply WARNING level after all ElectionGuard imports (ElectionGuardLog singleton now
 # defaults to WARNING, but this ensures nothing else reset it during service imports).
@@ -141,15 +142,30 @@ logging.getLogger('electionguard').setLevel(logging.WARNING)
 # Import ballot sanitization modules
 from ballot_sanitizer import prepare_ballot_for_publication, process_ballot_response
 from ballot_publisher import BallotPublisher
-
-# Import post-quantum cryptography (Kyber1024)
-try:
-    import pqcrypto.kem.ml_kem_1024 as kyber1024
-    from pqcrypto.kem.ml_kem_1024 import generate_keypair, encrypt, decrypt
-    PQ_AVAILABLE = True
-except ImportError:
-    print("Warning: pqcrypto not available. Install with: pip install pqcrypto")
-    PQ_AVAILABLE = False
+from memory_governor import get_memory_governor
+from request_profiler import PROFILE_HEADER, PROFILE_MODE_HEADER, get_request_profiler
+from idempotency import IDEMPOTENCY_AUTO, get_idempotency_cache, request_digest
+from http_compression import COMPRESSION_MIN_BYTES, compress_body, compress_stream, decode_body, negotiate
+from credential_pool import MAX_BULK_GUARDIANS, get_kem_pool, map_concurrently
+from msgpack_stream import STREAM_RESPONSE_MIN_ITEMS, count_streamed_items, iter_packed_chunks
+
+# Post-quantum cryptography (Kyber1024) is only used by the credential endpoints,
+# so it is imported on first use rather than at worker boot.
+_pq_kem = None
+_pq_kem_loaded = False
+
+
+def get_pq_kem():
+    """Get the ML-KEM-1024 module, importing it on first use. Returns None if unavailable."""
+    global _pq_kem, _pq_kem_loaded
+    if not _pq_kem_loaded:
+        try:
+            import pqcrypto.kem.ml_kem_1024 as kyber1024
+            _pq_kem = kyber1024
+        except ImportError:
+            print("Warning: pqcrypto not available. Install with: pip install pqcrypto")
+        _pq_kem_loaded = True
+    return _pq_kem
 
 
 #!/usr/bin/env python
@@ -220,6 +236,69 @@ logger = logging.getLogger(__name__)
 request_tracking = {}
 tracking_lock = threading.Lock()
 
+# Memory governor: per-request RSS deltas, deferred GC and RSS-based worker retirement
+memory_governor = get_memory_governor()
+
+@app.before_request
+def begin_memory_accounting():
+    memory_governor.begin_request()
+
+@app.after_request
+def end_memory_accounting(response):
+    endpoint = request.url_rule.rule if request.url_rule else '<unmatched>'
+    usage = memory_governor.end_request(endpoint)
+    response.headers['X-Worker-RSS-MB'] = f"{usage['rss_mb']:.1f}"
+    response.headers['X-Worker-RSS-Delta-MB'] = f"{usage['rss_delta_mb']:.1f}"
+    # Only a managing server (gunicorn) can replace a retired worker
+    can_retire = request.environ.get('SERVER_SOFTWARE', '').startswith('gunicorn')
+    response.call_on_close(lambda: memory_governor.after_response(usage['collect'], can_retire))
+    return response
+
+# Request profiler: on-demand (token header) and 1-in-N sampled profiles of live requests
+request_profiler = get_request_profiler()
+PROFILER_SKIPPED_ENDPOINTS = {'/health', '/api/health', '/profiles', '/profiles/settings', '/profiles/<profile_id>'}
+
+@app.before_request
+def begin_request_profile():
+    endpoint = request.url_rule.rule if request.url_rule else '<unmatched>'
+    if endpoint not in PROFILER_SKIPPED_ENDPOINTS:
+        request_profiler.begin_request(
+            endpoint, request.headers.get(PROFILE_HEADER), request.headers.get(PROFILE_MODE_HEADER)
+        )
+
+@app.after_request
+def end_request_profile(response):
+    profile_id = request_profiler.end_request(response.status_code)
+    if profile_id:
+        response.headers['X-EG-Profile-Id'] = profile_id
+    return response
+
+@app.after_request
+def compress_response(response):
+    """Compress msgpack and JSON bodies with the best coding the client accepts."""
+    coding = negotiate(request.headers.get('Accept-Encoding'))
+    if (coding is None or response.status_code < 200 or response.status_code in (204, 304)
+            or 'Content-Encoding' in response.headers
+            or response.mimetype not in ('application/msgpack', 'application/json')):
+        return response
+    response.vary.add('Accept-Encoding')
+    if response.is_streamed:
+        # Chunked responses are compressed as their items are packed
+        response.response = compress_stream(response.response, coding)
+        response.headers.pop('Content-Length', None)
+    else:
+        body = response.get_data()
+        if len(body) < COMPRESSION_MIN_BYTES:
+            return response
+        response.set_data(compress_body(body, coding))
+    response.headers['Content-Encoding'] = coding
+    return response
+
+@app.teardown_request
+def abandon_request_profile(_error):
+    # Releases the profiler if an unhandled exception skipped after_request
+    request_profiler.end_request()
+
 def track_request(endpoint):
     """Decorator to track request execution and detect hangs"""
     def decorator(f):
@@ -273,6 +352,39 @@ def track_request(endpoint):
         return wrapper
     return decorator
 
+IDEMPOTENCY_HEADER = 'Idempotency-Key'
+
+def idempotent(endpoint):
+    """Decorator answering repeated requests with the same idempotency key from one computation."""
+    def decorator(f):
+        @wraps(f)
+        def wrapper(*args, **kwargs):
+            try:
+                data = get_request_data()
+                key = request.headers.get(IDEMPOTENCY_HEADER) or (
+                    data.get('idempotency_key') if isinstance(data, dict) else None
+                )
+                if not key and not IDEMPOTENCY_AUTO:
+                    return f(*args, **kwargs)
+                if isinstance(data, dict):
+                    data = {k: v for k, v in data.items() if k != 'idempotency_key'}
+                digest = request_digest(data)
+
+                def compute():
+                    response = f(*args, **kwargs)
+                    return response.status_code, response.get_data()
+
+                status, body, replayed = get_idempotency_cache().run(endpoint, str(key or digest), digest, compute)
+            except ValueError as e:
+                return make_binary_response({'status': 'error', 'message': str(e)}, status=400)
+            response = Response(body, status=status, mimetype='application/msgpack')
+            if replayed:
+                logger.info(f"Replayed stored {endpoint} response")
+                response.headers['X-EG-Idempotent-Replay'] = 'true'
+            return response
+        return wrapper
+    return decorator
+
 # def ## print_json(data, str_):
 #     """Disabled file I/O to prevent blocking - use logger instead"""
 #     try:
@@ -380,15 +492,27 @@ def get_request_data():
     byte strings as msgpack *raw* type, which cannot be decoded as UTF-8 when
     ``raw=False`` is used, causing a UnicodeDecodeError / UnpackValueError.  We
     silently fall back to raw=True and convert all byte values to strings.
+    The body is parsed once per request; later calls return the same object.
+    Compressed bodies (Content-Encoding) are decompressed first; an unsupported or
+    corrupt encoding raises ValueError.
     """
+    if '_request_data' in g:
+        return g._request_data
     ct = request.content_type or ''
+    content_encoding = request.headers.get('Content-Encoding')
+    body = decode_body(request.get_data(), content_encoding) if content_encoding else request.data
     if 'msgpack' in ct:
         try:
-            return msgpack.unpackb(request.data, raw=False)
+            data = msgpack.unpackb(body, raw=False)
         except (UnicodeDecodeError, ValueError):
-            raw_data = msgpack.unpackb(request.data, raw=True)
-            return _bytes_to_str_deep(raw_data)
-    return request.json
+            raw_data = msgpack.unpackb(body, raw=True)
+            data = _bytes_to_str_deep(raw_data)
+    elif content_encoding:
+        data = json.loads(body)
+    else:
+        data = request.json
+    g._request_data = data
+    return data
 
 
 def _sanitize_for_msgpack(obj):
@@ -431,6 +555,20 @@ def make_binary_response(data, status=200):
     return Response(packed, status=status, mimetype='application/msgpack')
 
 
+def make_streaming_response(data, status=200):
+    """Return a msgpack response whose StreamedArray values are packed item by item.
+
+    The body is byte-identical to make_binary_response(data). Large responses are sent
+    with chunked transfer encoding as the items are produced; small ones are joined and
+    sent in one piece. Errors raised by the item producers after the first chunk has
+    been sent abort the connection, so services validate their inputs before returning.
+    """
+    chunks = iter_packed_chunks(data, _sanitize_for_msgpack)
+    if count_streamed_items(data) < STREAM_RESPONSE_MIN_ITEMS:
+        return Response(b''.join(chunks), status=status, mimetype='application/msgpack')
+    return Response(chunks, status=status, mimetype='application/msgpack', direct_passthrough=True)
+
+
 def safe_int_conversion(value):
     """Safely convert values to int, handling JSON string->int issues"""
     if isinstance(value, str):
@@ -610,6 +748,67 @@ def verify_hmac(key: bytes, data: bytes, expected_hmac: bytes) -> bool:
 HKDF_INFO_HYBRID = b'ml-kem-1024-hybrid-enc-v1'
 HKDF_INFO_HMAC = b'hmac-key-derivation-v1'
 
+def seal_private_key(pq_kem, private_key: str, password: Optional[str] = None) -> dict:
+    """
+    Encrypt a private key under a password-derived and an ML-KEM-1024 shared key.
+
+    Returns the encrypted key (Storage 1) and the HMAC-protected credentials needed to
+    decrypt it (Storage 2). A random password is generated when none is given.
+    """
+    if password is None:
+        password = generate_strong_password()
+    salt = os.urandom(SCRYPT_SALT_LENGTH)
+
+    # Post-quantum material is pre-generated, so only the KDF remains on the request path
+    _pq_public_key, pq_private_key, pq_ciphertext, pq_shared_secret = get_kem_pool(pq_kem).take()
+
+    password_key = derive_key_from_password(password, salt)
+    combined_key = HKDF(
+        algorithm=hashes.SHA256(),
+        length=AES_KEY_LENGTH,
+        salt=salt,
+        info=HKDF_INFO_HYBRID,
+        backend=default_backend()
+    ).derive(password_key + pq_shared_secret)
+
+    # Fast encryption of private key
+    nonce = os.urandom(12)
+    cipher = Cipher(algorithms.AES(combined_key), modes.GCM(nonce), backend=default_backend())
+    encryptor = cipher.encryptor()
+    encrypted_data = encryptor.update(private_key.encode('utf-8')) + encryptor.finalize()
+
+    # Fast password encryption
+    encrypted_password = fast_encrypt_with_master_key(password.encode('utf-8'))
+
+    # Create credentials structure (without HMAC tag first)
+    credentials_data = {
+        'version': '1.0',
+        'algorithm': PQ_ALGORITHM,
+        'salt': base64.b64encode(salt).decode(),
+        'pq_private_key': base64.b64encode(pq_private_key).decode(),
+        'pq_ciphertext': base64.b64encode(pq_ciphertext).decode(),
+        'nonce': base64.b64encode(nonce).decode(),
+        'tag': base64.b64encode(encryptor.tag).decode(),
+        'encrypted_password': base64.b64encode(encrypted_password).decode()
+    }
+
+    # Generate HMAC for credentials integrity
+    credentials_json = json.dumps(credentials_data, separators=(',', ':')).encode('utf-8')
+    hmac_key = HKDF(
+        algorithm=hashes.SHA256(),
+        length=32,
+        salt=salt,
+        info=HKDF_INFO_HMAC,
+        backend=default_backend()
+    ).derive(combined_key)
+    credentials_data['hmac_tag'] = base64.b64encode(generate_hmac(hmac_key, credentials_json)).decode()
+    final_credentials = json.dumps(credentials_data, separators=(',', ':')).encode('utf-8')
+
+    return {
+        'encrypted_data': base64.b64encode(encrypted_data).decode(),
+        'credentials': base64.b64encode(final_credentials).decode()
+    }
+
 @app.route('/setup_guardians', methods=['POST'])
 def api_setup_guardians():
     """API endpoint to setup guardians and create joint key."""
@@ -660,7 +859,8 @@ def api_setup_guardians():
             'public_keys': result['public_keys'],
             'polynomials': result['polynomials'],
             'number_of_guardians': result['number_of_guardians'],
-            'quorum': result['quorum']
+            'quorum': result['quorum'],
+            'ceremony_timings': result['ceremony_timings']
         }
         serialization_elapsed = time.time() - serialization_start
         print(f"✅ SERIALIZATION COMPLETE: {serialization_elapsed*1000:.2f}ms")
@@ -682,6 +882,64 @@ def api_setup_guardians():
     except Exception as e:
         return make_binary_response({'status': 'error', 'message': str(e)}, status=500)
 
+def _publish_encrypted_ballot(ballot_id: str, result: dict, ballot_status: str) -> dict:
+    """Sanitize and publish one encrypted ballot; returns its response entry."""
+    # Keep binary transport as the with-nonce version for casting/tallying.
+    # (base64-encoded msgpack of the full CiphertextBallot, including nonces)
+    encrypted_ballot_with_nonce = result['encrypted_ballot']
+
+    # Decode binary transport -> dict -> JSON string so the ballot_publisher
+    # sanitizer can parse it.  json.dumps on a base64 string would fail.
+    ballot_dict_for_sanitization = from_binary_transport_to_dict(encrypted_ballot_with_nonce)
+    ballot_json_for_sanitization = json.dumps(ballot_dict_for_sanitization)
+
+    # Create the complete ballot response for sanitization
+    complete_ballot_response = {
+        'status': 'success',
+        'encrypted_ballot': ballot_json_for_sanitization,
+        'ballot_hash': result['ballot_hash']
+    }
+    
+    # Apply secure ballot publication based on ballot status
+    try:
+        publication_result = ballot_publisher.publish_ballot(
+            ballot_id=ballot_id,
+            encrypted_ballot_response=json.dumps(complete_ballot_response),
+            ballot_status=ballot_status
+        )
+        
+        # Create the final response based on ballot status
+        response = {
+            'status': 'success',
+            'ballot_id': ballot_id,
+            'ballot_status': ballot_status,
+            'ballot_hash': publication_result['ballot_hash'],
+            'encrypted_ballot': publication_result['encrypted_ballot'],
+            'encrypted_ballot_with_nonce': encrypted_ballot_with_nonce,
+            'publication_status': publication_result['publication_status']
+        }
+        
+        # Add nonces only for audited ballots
+        if ballot_status == 'AUDITED' and 'ballot_nonces' in publication_result:
+            response['ballot_nonces'] = publication_result['ballot_nonces']
+            response['nonces_available'] = True
+        else:
+            response['nonces_available'] = False
+            
+    except Exception as sanitization_error:
+        print(f"Sanitization error: {sanitization_error}")
+        # Fallback to unsanitized response if sanitization fails
+        response = {
+            'status': 'success',
+            'encrypted_ballot': result['encrypted_ballot'],
+            'ballot_hash': result['ballot_hash'],
+            'encrypted_ballot_with_nonce': result['encrypted_ballot'],
+            'warning': 'Ballot published without sanitization due to error',
+            'sanitization_error': str(sanitization_error)
+        }
+    return response
+
+
 @app.route('/create_encrypted_ballot', methods=['POST'])
 @track_request('/create_encrypted_ballot')
 def api_create_encrypted_ballot():
@@ -709,6 +967,8 @@ def api_create_encrypted_ballot():
         number_of_guardians = safe_int_conversion(data.get('number_of_guardians', 1))
         quorum = safe_int_conversion(data.get('quorum', 1))
         max_choices = safe_int_conversion(data.get('max_choices', 1))
+        compact = bool(data.get('compact', False))
+        device = data.get('device')
         
         # Call service function to create the encrypted ballot
         service_start = time.time()
@@ -724,7 +984,10 @@ def api_create_encrypted_ballot():
             create_plaintext_ballot,
             create_election_manifest,
             generate_ballot_hash_electionguard,
-            max_choices=max_choices
+            max_choices=max_choices,
+            compact=compact,
+            device=device,
+            contest_proofs=data.get('contest_proofs')
         )
         service_elapsed = time.time() - service_start
         
@@ -732,61 +995,12 @@ def api_create_encrypted_ballot():
         # If you need to store ballots, do it in the backend database
         # election_data is only for temporary session data if needed
         
-        # Create the complete ballot response for sanitization
         serialization_start = time.time()
-
-        # Keep binary transport as the with-nonce version for casting/tallying.
-        # (base64-encoded msgpack of the full CiphertextBallot, including nonces)
-        encrypted_ballot_with_nonce = result['encrypted_ballot']
-
-        # Decode binary transport -> dict -> JSON string so the ballot_publisher
-        # sanitizer can parse it.  json.dumps on a base64 string would fail.
-        ballot_dict_for_sanitization = from_binary_transport_to_dict(encrypted_ballot_with_nonce)
-        ballot_json_for_sanitization = json.dumps(ballot_dict_for_sanitization)
-
-        complete_ballot_response = {
-            'status': 'success',
-            'encrypted_ballot': ballot_json_for_sanitization,
-            'ballot_hash': result['ballot_hash']
-        }
+        response = _publish_encrypted_ballot(ballot_id, result, ballot_status)
         
-        # Apply secure ballot publication based on ballot status
-        try:
-            publication_result = ballot_publisher.publish_ballot(
-                ballot_id=ballot_id,
-                encrypted_ballot_response=json.dumps(complete_ballot_response),
-                ballot_status=ballot_status
-            )
-            
-            # Create the final response based on ballot status
-            response = {
-                'status': 'success',
-                'ballot_id': ballot_id,
-                'ballot_status': ballot_status,
-                'ballot_hash': publication_result['ballot_hash'],
-                'encrypted_ballot': publication_result['encrypted_ballot'],
-                'encrypted_ballot_with_nonce': encrypted_ballot_with_nonce,
-                'publication_status': publication_result['publication_status']
-            }
-            
-            # Add nonces only for audited ballots
-            if ballot_status == 'AUDITED' and 'ballot_nonces' in publication_result:
-                response['ballot_nonces'] = publication_result['ballot_nonces']
-                response['nonces_available'] = True
-            else:
-                response['nonces_available'] = False
-                
-        except Exception as sanitization_error:
-            print(f"Sanitization error: {sanitization_error}")
-            # Fallback to unsanitized response if sanitization fails
-            response = {
-                'status': 'success',
-                'encrypted_ballot': result['encrypted_ballot'],
-                'ballot_hash': result['ballot_hash'],
-                'encrypted_ballot_with_nonce': result['encrypted_ballot'],
-                'warning': 'Ballot published without sanitization due to error',
-                'sanitization_error': str(sanitization_error)
-            }
+        # Sealed compact form for storage; create_encrypted_tally expands it server-side
+        if compact:
+            response['compact_ballot'] = result['compact_ballot']
         
         # Save the response to file for debugging
         # with open("create_encrypted_ballot_response.json", "w", encoding="utf-8") as f:
@@ -799,15 +1013,8 @@ def api_create_encrypted_ballot():
         serialization_elapsed = time.time() - serialization_start
         endpoint_elapsed = time.time() - endpoint_start
         
-        # AGGRESSIVE memory cleanup to prevent accumulation across chunks
-        import sys
-        
-        # Clear Python's internal type cache
-        if hasattr(sys, '_clear_type_cache'):
-            sys._clear_type_cache()
-        
-        # Force full garbage collection (generation 2 includes all objects)
-        gc.collect(generation=2)
+        # Full garbage collection runs after the response is sent, off the request path
+        memory_governor.defer_collection()
         
         # Note: We keep timing output minimal for ballot encryption since it's called frequently
         # Detailed timing is shown only for batch operations (tally, partial decryption, etc.)
@@ -820,6 +1027,110 @@ def api_create_encrypted_ballot():
         return make_binary_response({'status': 'error', 'message': str(e)}, status=500)
 
 
+@app.route('/create_encrypted_ballots', methods=['POST'])
+@track_request('/create_encrypted_ballots')
+def api_create_encrypted_ballots():
+    """API endpoint to encrypt a batch of ballots from one device, chained in request order."""
+    try:
+        endpoint_start = time.time()
+        data = get_request_data()
+        ballots = data['ballots']
+        if not isinstance(ballots, list):
+            raise ValueError('ballots must be a list')
+        logger.info(f'Creating {len(ballots)} encrypted ballots')
+        
+        ballot_status = data.get('ballot_status', 'CAST').upper()
+        if ballot_status not in ['CAST', 'AUDITED']:
+            ballot_status = 'CAST'  # Default to most secure option
+        
+        compact = bool(data.get('compact', False))
+        result = create_encrypted_ballots_service(
+            data['party_names'],
+            data['candidate_names'],
+            ballots,
+            data['joint_public_key'],
+            data['commitment_hash'],
+            safe_int_conversion(data.get('number_of_guardians', 1)),
+            safe_int_conversion(data.get('quorum', 1)),
+            create_plaintext_ballot,
+            create_election_manifest,
+            generate_ballot_hash_electionguard,
+            max_choices=safe_int_conversion(data.get('max_choices', 1)),
+            compact=compact,
+            device=data.get('device'),
+            contest_proofs=data.get('contest_proofs')
+        )
+        
+        responses = []
+        for entry in result['ballots']:
+            response = _publish_encrypted_ballot(entry['ballot_id'], entry, ballot_status)
+            if compact:
+                response['compact_ballot'] = entry['compact_ballot']
+            responses.append(response)
+        
+        memory_governor.defer_collection()
+        logger.info(f'Finished encrypting {len(responses)} ballots in {(time.time() - endpoint_start)*1000:.2f}ms')
+        return make_binary_response({'status': 'success', 'ballots': responses})
+    
+    except ValueError as e:
+        return make_binary_response({'status': 'error', 'message': str(e)}, status=400)
+    except Exception as e:
+        return make_binary_response({'status': 'error', 'message': str(e)}, status=500)
+
+
+@app.route('/election_manifest', methods=['POST'])
+@track_request('/election_manifest')
+def api_register_election_manifest():
+    """API endpoint to register a full election manifest (many contests, ballot styles and units)."""
+    try:
+        data = get_request_data()
+        if 'manifest' not in data:
+            raise ValueError('manifest is required')
+        result = register_election_manifest_service(data['manifest'])
+        logger.info(f"Registered manifest {result['manifest_id']} ({result['contests']} contests, {result['ballot_styles']} styles)")
+        return make_binary_response({'status': 'success', **result})
+    
+    except ValueError as e:
+        return make_binary_response({'status': 'error', 'message': str(e)}, status=400)
+    except Exception as e:
+        return make_binary_response({'status': 'error', 'message': str(e)}, status=500)
+
+
+@app.route('/create_encrypted_manifest_ballot', methods=['POST'])
+@track_request('/create_encrypted_manifest_ballot')
+def api_create_encrypted_manifest_ballot():
+    """API endpoint to encrypt a ballot of a registered manifest with secure publication."""
+    try:
+        data = get_request_data()
+        ballot_id = data['ballot_id']
+        ballot_status = data.get('ballot_status', 'CAST').upper()
+        if ballot_status not in ['CAST', 'AUDITED']:
+            ballot_status = 'CAST'  # Default to most secure option
+        
+        result = create_encrypted_manifest_ballot_service(
+            data['manifest_id'],
+            ballot_id,
+            data['ballot_style_id'],
+            data.get('votes', {}),
+            data['joint_public_key'],
+            data['commitment_hash'],
+            safe_int_conversion(data.get('number_of_guardians', 1)),
+            safe_int_conversion(data.get('quorum', 1)),
+            generate_ballot_hash_electionguard,
+            device=data.get('device'),
+            contest_proofs=data.get('contest_proofs')
+        )
+        response = _publish_encrypted_ballot(ballot_id, result, ballot_status)
+        
+        memory_governor.defer_collection()
+        return make_binary_response(response)
+    
+    except ValueError as e:
+        return make_binary_response({'status': 'error', 'message': str(e)}, status=400)
+    except Exception as e:
+        return make_binary_response({'status': 'error', 'message': str(e)}, status=500)
+
+
 @app.route('/combine_guardian_public_keys', methods=['POST'])
 def api_combine_guardian_public_keys():
     """Combine guardian public keys generated on client machines into a joint election key."""
@@ -855,6 +1166,30 @@ def api_combine_guardian_public_keys():
         return make_binary_response({'status': 'error', 'message': str(e)}, status=500)
 
 
+def _guardian_credential_bundle(key_pair) -> dict:
+    """Credential bundle of one guardian's election key pair, in ElectionGuard-compatible formats."""
+    return {
+        'private_key': {
+            'guardian_id': key_pair.owner_id,
+            'private_key': str(int(key_pair.key_pair.secret_key)),
+        },
+        'public_key': {
+            'guardian_id': key_pair.owner_id,
+            'public_key': str(int(key_pair.key_pair.public_key)),
+        },
+        'polynomial': {
+            'guardian_id': key_pair.owner_id,
+            'polynomial': to_binary_transport(key_pair.polynomial),
+        },
+        'guardian_data': {
+            'id': key_pair.owner_id,
+            'sequence_order': key_pair.sequence_order,
+            'election_public_key': to_binary_transport(key_pair.share()),
+            'backups': {}
+        }
+    }
+
+
 @app.route('/generate_guardian_credentials', methods=['POST'])
 def api_generate_guardian_credentials():
     """Generate one guardian credential bundle in ElectionGuard-compatible formats."""
@@ -873,27 +1208,7 @@ def api_generate_guardian_credentials():
             quorum,
         )
 
-        response = {
-            'status': 'success',
-            'private_key': {
-                'guardian_id': guardian.id,
-                'private_key': str(int(guardian._election_keys.key_pair.secret_key)),
-            },
-            'public_key': {
-                'guardian_id': guardian.id,
-                'public_key': str(int(guardian._election_keys.key_pair.public_key)),
-            },
-            'polynomial': {
-                'guardian_id': guardian.id,
-                'polynomial': to_binary_transport(guardian._election_keys.polynomial),
-            },
-            'guardian_data': {
-                'id': guardian.id,
-                'sequence_order': guardian.sequence_order,
-                'election_public_key': to_binary_transport(guardian.share_key()),
-                'backups': {}
-            }
-        }
+        response = {'status': 'success', **_guardian_credential_bundle(guardian._election_keys)}
 
         return make_binary_response(response)
 
@@ -903,6 +1218,66 @@ def api_generate_guardian_credentials():
         return make_binary_response({'status': 'error', 'message': str(e)}, status=500)
 
 
+@app.route('/generate_guardian_credentials_bulk', methods=['POST'])
+@track_request('/generate_guardian_credentials_bulk')
+def api_generate_guardian_credentials_bulk():
+    """
+    Generate the credential bundles of every guardian of an election in one request.
+
+    Key pairs are generated on the ceremony process pool for large panels. With
+    seal_private_keys, each guardian's private key entry (as compact JSON) is also sealed
+    like /api/encrypt, with the scrypt derivations running concurrently; passwords, when
+    given, are listed in guardian order.
+    """
+    try:
+        data = get_request_data()
+
+        number_of_guardians = safe_int_conversion(data['number_of_guardians'])
+        quorum = safe_int_conversion(data['quorum'])
+        if number_of_guardians < 1 or not 1 <= quorum <= number_of_guardians:
+            raise ValueError('quorum must be between 1 and number_of_guardians')
+        if number_of_guardians > MAX_BULK_GUARDIANS:
+            raise ValueError(f'number_of_guardians must be at most {MAX_BULK_GUARDIANS} (EG_MAX_BULK_GUARDIANS)')
+        guardian_ids = [str(guardian_id) for guardian_id in data.get('guardian_ids') or range(1, number_of_guardians + 1)]
+        if len(guardian_ids) != number_of_guardians:
+            raise ValueError(f'Expected {number_of_guardians} guardian_ids, got {len(guardian_ids)}')
+        if len(set(guardian_ids)) != len(guardian_ids):
+            raise ValueError('guardian_ids must be unique')
+
+        seal = bool(data.get('seal_private_keys', False))
+        passwords = data.get('passwords') or [None] * number_of_guardians
+        if len(passwords) != number_of_guardians:
+            raise ValueError(f'Expected {number_of_guardians} passwords, got {len(passwords)}')
+        if any(password is not None and (not isinstance(password, str) or len(password) < 32) for password in passwords):
+            raise ValueError('Invalid password format. Minimum length is 32 characters.')
+        pq_kem = get_pq_kem() if seal else None
+        if seal and pq_kem is None:
+            return make_binary_response({'status': 'error', 'message': 'Post-quantum cryptography not available'}, status=501)
+
+        key_pairs = generate_guardian_key_pairs(guardian_ids, quorum)
+        guardians = [_guardian_credential_bundle(key_pair) for key_pair in key_pairs]
+        if seal:
+            # Each seal is dominated by its scrypt derivation, which releases the GIL
+            sealed = map_concurrently(
+                lambda item: seal_private_key(pq_kem, json.dumps(item[0]['private_key'], separators=(',', ':')), item[1]),
+                zip(guardians, passwords),
+            )
+            for bundle, sealed_key in zip(guardians, sealed):
+                bundle.update(sealed_key)
+
+        return make_binary_response({
+            'status': 'success',
+            'number_of_guardians': number_of_guardians,
+            'quorum': quorum,
+            'guardians': guardians,
+        })
+
+    except ValueError as e:
+        return make_binary_response({'status': 'error', 'message': str(e)}, status=400)
+    except Exception as e:
+        return make_binary_response({'status': 'error', 'message': str(e)}, status=500)
+
+
 @app.route('/generate_guardian_backup_shares', methods=['POST', 'OPTIONS'])
 def api_generate_guardian_backup_shares():
     """
@@ -1088,6 +1463,63 @@ def api_benaloh_challenge():
     except Exception as e:
         return make_binary_response({'status': 'error', 'message': str(e)}, status=500)
 
+@app.route('/benaloh_challenge_batch', methods=['POST'])
+@track_request('/benaloh_challenge_batch')
+def api_benaloh_challenge_batch():
+    """API endpoint to verify many Benaloh challenges for one election in a single call."""
+    try:
+        endpoint_start = time.time()
+        print('Benaloh challenge batch call at the microservice')
+        data = get_request_data()
+
+        validation_error = validate_input(data, ['challenges', 'joint_public_key'])
+        if validation_error:
+            return make_binary_response({'status': 'error', 'message': validation_error}, status=400)
+
+        challenges = data['challenges']
+        if not isinstance(challenges, list) or not challenges:
+            return make_binary_response({'status': 'error', 'message': 'challenges must be a non-empty list'}, status=400)
+        max_workers = data.get('max_workers')
+        if max_workers is not None:
+            max_workers = safe_int_conversion(max_workers)
+
+        result = benaloh_challenge_batch_service(
+            challenges=challenges,
+            joint_public_key=data['joint_public_key'],
+            max_workers=max_workers
+        )
+
+        endpoint_elapsed = time.time() - endpoint_start
+        print(f"🎯 BENALOH_CHALLENGE_BATCH: {result['total']} ballots "
+              f"({result['matched']} matched, {result['mismatched']} mismatched, {result['failed']} failed) "
+              f"in {endpoint_elapsed*1000:.2f}ms on {result['workers']} worker(s)")
+
+        return make_binary_response({
+            'status': 'success',
+            'total': result['total'],
+            'matched': result['matched'],
+            'mismatched': result['mismatched'],
+            'failed': result['failed'],
+            'workers': result['workers'],
+            'results': [
+                {
+                    'status': 'success',
+                    'match': item['match'],
+                    'message': item['message'],
+                    'ballot_id': item['ballot_id'],
+                    'verified_candidates': item['verified_candidates'],
+                    'verified_candidate': item['verified_candidate'],
+                    'expected_candidate': item.get('expected_candidate')
+                } if item['success'] else {'status': 'error', 'message': item['error']}
+                for item in result['results']
+            ]
+        })
+
+    except ValueError as e:
+        return make_binary_response({'status': 'error', 'message': str(e)}, status=400)
+    except Exception as e:
+        return make_binary_response({'status': 'error', 'message': str(e)}, status=500)
+
 @app.route('/health', methods=['GET'])
 def api_health_check():
     """API endpoint for health check."""
@@ -1113,9 +1545,52 @@ def api_health_check():
         'ballot_publication_stats': stats,
         'active_requests': len([r for r in request_tracking.values() if r['status'] == 'started']),
         'stuck_requests': stuck_requests,
-        'thread_count': threading.active_count()
+        'thread_count': threading.active_count(),
+        'memory': memory_governor.get_stats()
+    }), 200
+
+@app.route('/profiles', methods=['GET'])
+def api_list_profiles():
+    """API endpoint listing stored request profiles (requires the profiling token)."""
+    if not request_profiler.authorized(request.headers.get(PROFILE_HEADER)):
+        return jsonify({"error": "Profiling token required"}), 403
+    return jsonify({
+        "profiles": request_profiler.list_profiles(),
+        "statistics": request_profiler.get_stats()
     }), 200
 
+@app.route('/profiles/settings', methods=['POST'])
+def api_profile_settings():
+    """API endpoint to change the sampling rate of every worker (requires the profiling token)."""
+    if not request_profiler.authorized(request.headers.get(PROFILE_HEADER)):
+        return jsonify({"error": "Profiling token required"}), 403
+    try:
+        data = get_request_data() or {}
+        request_profiler.set_sample_every(safe_int_conversion(data.get('sample_every', 0)))
+        return jsonify({"sample_every": request_profiler.sample_every}), 200
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+@app.route('/profiles/<profile_id>', methods=['GET'])
+def api_get_profile(profile_id):
+    """API endpoint returning one profile: the raw file, or a text report with ?format=text."""
+    if not request_profiler.authorized(request.headers.get(PROFILE_HEADER)):
+        return jsonify({"error": "Profiling token required"}), 403
+    try:
+        info = request_profiler.get_profile(profile_id)
+        if info is None:
+            return jsonify({"error": "Profile not found"}), 404
+        if request.args.get('format') == 'text':
+            return Response(request_profiler.summarize(profile_id), status=200, mimetype='text/plain')
+        with open(info['path'], 'rb') as profile_file:
+            body = profile_file.read()
+        return Response(body, status=200, mimetype='application/octet-stream',
+                        headers={'Content-Disposition': f"attachment; filename={info['file']}"})
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
 @app.route('/ballots/<ballot_id>', methods=['GET'])
 def api_get_published_ballot(ballot_id):
     """API endpoint to retrieve a published ballot (sanitized based on status)."""
@@ -1214,13 +1689,16 @@ def api_create_encrypted_tally():
         
         logger.info('Creating encrypted tally')
         data = get_request_data()
-        party_names = data['party_names']
-        candidate_names = data['candidate_names']
+        # A registered manifest replaces the party and candidate names
+        manifest_id = data.get('manifest_id')
+        party_names = data['party_names'] if manifest_id is None else data.get('party_names', [])
+        candidate_names = data['candidate_names'] if manifest_id is None else data.get('candidate_names', [])
         joint_public_key = data['joint_public_key']  # Expecting string
         commitment_hash = data['commitment_hash']    # Expecting string
-        encrypted_ballots = data['encrypted_ballots'] # List of encrypted ballot strings
+        encrypted_ballots = data.get('encrypted_ballots', []) # List of encrypted ballot strings
+        compact_ballots = data.get('compact_ballots', []) # Sealed compact ballots from create_encrypted_ballot
         
-        print(f"\n📊 RECEIVED: {len(encrypted_ballots)} encrypted ballots")
+        print(f"\n📊 RECEIVED: {len(encrypted_ballots)} encrypted ballots, {len(compact_ballots)} compact ballots")
         
         ## print_json(data, "create_encrypted_tally")
         # Dump the request to a file named "create_encrypted_tally_request.json"
@@ -1244,7 +1722,14 @@ def api_create_encrypted_tally():
             quorum,
             create_election_manifest,
             ciphertext_tally_to_raw,
-            max_choices=max_choices
+            max_choices=max_choices,
+            stream=True,
+            compact_ballots=compact_ballots,
+            manifest_id=manifest_id,
+            checkpoint_id=data.get('checkpoint_id'),
+            tally_id=data.get('tally_id'),
+            reset_ballot_index=bool(data.get('reset_ballot_index', False)),
+            contest_proofs=data.get('contest_proofs')
         )
         service_elapsed = time.time() - service_start
         print(f"✅ COMPUTATION COMPLETE: {service_elapsed*1000:.2f}ms")
@@ -1259,8 +1744,11 @@ def api_create_encrypted_tally():
         response = {
             'status': 'success',
             'ciphertext_tally': result['ciphertext_tally'],
-            'submitted_ballots': result['submitted_ballots']
+            'submitted_ballots': result['submitted_ballots'],
+            'rejected_ballot_ids': result['rejected_ballot_ids']
         }
+        if result['rejected_ballot_ids']:
+            print(f"⚠️  REJECTED: {len(result['rejected_ballot_ids'])} ballots already tallied for this tally")
         serialization_elapsed = time.time() - serialization_start
         print(f"✅ SERIALIZATION COMPLETE: {serialization_elapsed*1000:.2f}ms")
         
@@ -1268,8 +1756,8 @@ def api_create_encrypted_tally():
         # ## print_json(response, "create_encrypted_tally_response")  # Disabled
         logger.info('Finished creating encrypted tally')
         
-        # Force garbage collection to free memory
-        gc.collect()
+        # Free memory with a full collection once the response has been sent
+        memory_governor.defer_collection()
         
         endpoint_elapsed = time.time() - endpoint_start
         print(f"\n{'='*80}")
@@ -1278,7 +1766,44 @@ def api_create_encrypted_tally():
         print(f"   └─ Serialization: {serialization_elapsed*1000:.2f}ms ({serialization_elapsed/endpoint_elapsed*100:.1f}%)")
         print('='*80 + '\n')
         
-        return make_binary_response(response)
+        return make_streaming_response(response)
+    
+    except ValueError as e:
+        return make_binary_response({'status': 'error', 'message': str(e)}, status=400)
+    except Exception as e:
+        return make_binary_response({'status': 'error', 'message': str(e)}, status=500)
+
+
+@app.route('/expand_compact_ballots', methods=['POST'])
+@track_request('/expand_compact_ballots')
+def api_expand_compact_ballots():
+    """API endpoint to expand sealed compact ballots into full submitted ballots for an audit."""
+    try:
+        data = get_request_data()
+        compact_ballots = data.get('compact_ballots', [])
+        print(f"\n📦 EXPAND: {len(compact_ballots)} compact ballots")
+        
+        expand_start = time.time()
+        result = expand_compact_ballots_service(
+            data['party_names'],
+            data['candidate_names'],
+            data['joint_public_key'],
+            data['commitment_hash'],
+            compact_ballots,
+            safe_int_conversion(data.get('number_of_guardians', 1)),
+            safe_int_conversion(data.get('quorum', 1)),
+            create_election_manifest,
+            max_choices=safe_int_conversion(data.get('max_choices', 1)),
+            stream=True,
+            contest_proofs=data.get('contest_proofs')
+        )
+        print(f"✅ EXPANDED: {(time.time() - expand_start)*1000:.2f}ms")
+        
+        memory_governor.defer_collection()
+        return make_streaming_response({
+            'status': 'success',
+            'submitted_ballots': result['submitted_ballots']
+        })
     
     except ValueError as e:
         return make_binary_response({'status': 'error', 'message': str(e)}, status=400)
@@ -1287,8 +1812,14 @@ def api_create_encrypted_tally():
 
 @app.route('/create_partial_decryption', methods=['POST'])
 @track_request('/create_partial_decryption')
+@idempotent('/create_partial_decryption')
 def api_create_partial_decryption():
-    """API endpoint to compute decryption shares for a single guardian."""
+    """
+    API endpoint to compute decryption shares for a single guardian.
+
+    ballot_id_from and ballot_id_to restrict the ballot shares to ballot ids in [from, to), so
+    the shares of one guardian can be computed on several machines and merged.
+    """
     try:
         endpoint_start = time.time()
         print('\n' + '='*80)
@@ -1351,6 +1882,8 @@ def api_create_partial_decryption():
         number_of_guardians = safe_int_conversion(data.get('number_of_guardians', 1))
         quorum = safe_int_conversion(data.get('quorum', 1))
         max_choices = safe_int_conversion(data.get('max_choices', 1))
+        ballot_id_from = data.get('ballot_id_from')
+        ballot_id_to = data.get('ballot_id_to')
         
         # Call service function with single guardian data
         service_start = time.time()
@@ -1372,7 +1905,10 @@ def api_create_partial_decryption():
             create_election_manifest,
             raw_to_ciphertext_tally,
             compute_ballot_shares,
-            max_choices=max_choices
+            max_choices=max_choices,
+            checkpoint_id=data.get('checkpoint_id'),
+            ballot_id_from=str(ballot_id_from) if ballot_id_from is not None else None,
+            ballot_id_to=str(ballot_id_to) if ballot_id_to is not None else None
         )
         service_elapsed = time.time() - service_start
         print(f"✅ COMPUTATION COMPLETE: {service_elapsed*1000:.2f}ms")
@@ -1392,8 +1928,8 @@ def api_create_partial_decryption():
         # ## print_json(response, "create_partial_decryption_response")  # Disabled
         logger.info('Finished creating partial decryption')
         
-        # Force garbage collection to free memory
-        gc.collect()
+        # Free memory with a full collection once the response has been sent
+        memory_governor.defer_collection()
         
         endpoint_elapsed = time.time() - endpoint_start
         print(f"\n{'='*80}")
@@ -1412,8 +1948,14 @@ def api_create_partial_decryption():
 
 @app.route('/create_compensated_decryption', methods=['POST'])
 @track_request('/create_compensated_decryption')
+@idempotent('/create_compensated_decryption')
 def api_create_compensated_decryption():
-    """API endpoint to compute compensated decryption shares for missing guardians."""
+    """
+    API endpoint to compute compensated decryption shares for missing guardians.
+
+    ballot_id_from and ballot_id_to restrict the ballot shares to ballot ids in [from, to), so
+    the shares of one guardian can be computed on several machines and merged.
+    """
     try:
         endpoint_start = time.time()
         
@@ -1474,6 +2016,8 @@ def api_create_compensated_decryption():
         number_of_guardians = safe_int_conversion(data.get('number_of_guardians', 1))
         quorum = safe_int_conversion(data.get('quorum', 1))
         max_choices = safe_int_conversion(data.get('max_choices', 1))
+        ballot_id_from = data.get('ballot_id_from')
+        ballot_id_to = data.get('ballot_id_to')
         
         deserialize_elapsed = time.time() - deserialize_start
         
@@ -1498,7 +2042,10 @@ def api_create_compensated_decryption():
             create_election_manifest,
             raw_to_ciphertext_tally,
             compute_compensated_ballot_shares,
-            max_choices=max_choices
+            max_choices=max_choices,
+            checkpoint_id=data.get('checkpoint_id'),
+            ballot_id_from=str(ballot_id_from) if ballot_id_from is not None else None,
+            ballot_id_to=str(ballot_id_to) if ballot_id_to is not None else None
         )
         service_elapsed = time.time() - service_start
 
@@ -1514,8 +2061,8 @@ def api_create_compensated_decryption():
         # ## print_data(response, "./io/create_compensated_decryption_response.json")  # Disabled
         logger.info('Finished creating compensated decryption')
         
-        # Force garbage collection to free memory
-        gc.collect()
+        # Free memory with a full collection once the response has been sent
+        memory_governor.defer_collection()
         
         endpoint_elapsed = time.time() - endpoint_start
         # Note: Timing output kept minimal for compensated decryption (called frequently in loops)
@@ -1529,6 +2076,50 @@ def api_create_compensated_decryption():
         
 
 
+def _guardian_shares_from_request(data):
+    """
+    Rebuild the available guardians' shares and the compensated shares of missing guardians
+    from the parallel arrays of a combine request. Tally share arrays may be omitted.
+    """
+    available_guardian_shares = {}
+    available_guardian_ids_list = data.get('available_guardian_ids', [])
+    available_guardian_public_keys = data.get('available_guardian_public_keys', [])
+    available_tally_shares = data.get('available_tally_shares', [])
+    available_ballot_shares = data.get('available_ballot_shares', [])
+    
+    for i, guardian_id in enumerate(available_guardian_ids_list):
+        try:
+            available_guardian_shares[guardian_id] = {
+                'guardian_public_key': available_guardian_public_keys[i],
+                'tally_share': available_tally_shares[i] if i < len(available_tally_shares) else None,
+                'ballot_shares': deserialize_string_to_dict(available_ballot_shares[i], label=f"ballot_shares_{guardian_id}") if isinstance(available_ballot_shares[i], str) else available_ballot_shares[i]
+            }
+        except Exception as e:
+            raise ValueError(f"Error reconstructing available_guardian_shares for {guardian_id}: {e}")
+    
+    all_compensated_shares = {}
+    missing_guardian_ids_list = data.get('missing_guardian_ids', [])
+    compensating_guardian_ids_list = data.get('compensating_guardian_ids', [])
+    compensated_tally_shares = data.get('compensated_tally_shares', [])
+    compensated_ballot_shares = data.get('compensated_ballot_shares', [])
+    
+    for i in range(len(missing_guardian_ids_list)):
+        try:
+            missing_guardian_id = missing_guardian_ids_list[i]
+            compensating_guardian_id = compensating_guardian_ids_list[i]
+            
+            if missing_guardian_id not in all_compensated_shares:
+                all_compensated_shares[missing_guardian_id] = {}
+            
+            all_compensated_shares[missing_guardian_id][compensating_guardian_id] = {
+                'compensated_tally_share': compensated_tally_shares[i] if i < len(compensated_tally_shares) else None,
+                'compensated_ballot_shares': deserialize_string_to_dict(compensated_ballot_shares[i]) if isinstance(compensated_ballot_shares[i], str) else compensated_ballot_shares[i]
+            }
+        except Exception as e:
+            raise ValueError(f"Error reconstructing compensated_shares: {e}")
+    
+    return available_guardian_shares, all_compensated_shares
+
 @app.route('/combine_decryption_shares', methods=['POST'])
 @track_request('/combine_decryption_shares')
 def api_combine_decryption_shares():
@@ -1569,50 +2160,21 @@ def api_combine_decryption_shares():
         except Exception as e:
             raise ValueError(f"Error deserializing guardian_data: {e}")
 
-        # Reconstruct available_guardian_shares from separate arrays
-        available_guardian_shares = {}
-        available_guardian_ids_list = data.get('available_guardian_ids', [])
-        available_guardian_public_keys = data.get('available_guardian_public_keys', [])
-        available_tally_shares = data.get('available_tally_shares', [])
-        available_ballot_shares = data.get('available_ballot_shares', [])
-        
-        for i, guardian_id in enumerate(available_guardian_ids_list):
-            try:
-                available_guardian_shares[guardian_id] = {
-                    'guardian_public_key': available_guardian_public_keys[i],
-                    'tally_share': available_tally_shares[i],
-                    'ballot_shares': deserialize_string_to_dict(available_ballot_shares[i], label=f"ballot_shares_{guardian_id}") if isinstance(available_ballot_shares[i], str) else available_ballot_shares[i]
-                }
-            except Exception as e:
-                raise ValueError(f"Error reconstructing available_guardian_shares for {guardian_id}: {e}")
-        
-        # Reconstruct compensated_shares from separate arrays
-        all_compensated_shares = {}
-        missing_guardian_ids_list = data.get('missing_guardian_ids', [])
-        compensating_guardian_ids_list = data.get('compensating_guardian_ids', [])
-        compensated_tally_shares = data.get('compensated_tally_shares', [])
-        compensated_ballot_shares = data.get('compensated_ballot_shares', [])
-        
-        for i in range(len(missing_guardian_ids_list)):
-            try:
-                missing_guardian_id = missing_guardian_ids_list[i]
-                compensating_guardian_id = compensating_guardian_ids_list[i]
-                
-                if missing_guardian_id not in all_compensated_shares:
-                    all_compensated_shares[missing_guardian_id] = {}
-                
-                all_compensated_shares[missing_guardian_id][compensating_guardian_id] = {
-                    'compensated_tally_share': compensated_tally_shares[i],
-                    'compensated_ballot_shares': deserialize_string_to_dict(compensated_ballot_shares[i]) if isinstance(compensated_ballot_shares[i], str) else compensated_ballot_shares[i]
-                }
-            except Exception as e:
-                raise ValueError(f"Error reconstructing compensated_shares: {e}")
+        # Reconstruct available_guardian_shares and compensated_shares from separate arrays
+        available_guardian_shares, all_compensated_shares = _guardian_shares_from_request(data)
         
         # Get the required quorum with safe int conversion
         quorum = safe_int_conversion(data.get('quorum', len(guardian_data)))
         number_of_guardians = safe_int_conversion(data.get('number_of_guardians', len(guardian_data)))
         max_choices = safe_int_conversion(data.get('max_choices', 1))
         
+        # Optional paging of the per-ballot verification list, which dominates large responses
+        include_ballot_verification = data.get('include_ballot_verification', True) not in (False, 'false', 'False', 0)
+        verification_offset = safe_int_conversion(data.get('verification_offset', 0))
+        verification_limit = data.get('verification_limit')
+        if verification_limit is not None:
+            verification_limit = safe_int_conversion(verification_limit)
+        
         deserialize_elapsed = time.time() - deserialize_start
         print(f"✅ DESERIALIZATION COMPLETE: {deserialize_elapsed*1000:.2f}ms")
         
@@ -1665,7 +2227,11 @@ def api_combine_decryption_shares():
             raw_to_ciphertext_tally,
             generate_ballot_hash,
             generate_ballot_hash_electionguard,
-            max_choices=max_choices
+            max_choices=max_choices,
+            include_ballot_verification=include_ballot_verification,
+            verification_offset=verification_offset,
+            verification_limit=verification_limit,
+            stream=True
         )
         service_elapsed = time.time() - service_start
         print(f"✅ COMPUTATION COMPLETE: {service_elapsed*1000:.2f}ms")
@@ -1684,8 +2250,8 @@ def api_combine_decryption_shares():
         # ## print_data(response, "./io/combine_decryption_shares_response.json")  # Disabled
         logger.info('Finished combining decryption shares')
         
-        # Force garbage collection to free memory
-        gc.collect()
+        # Free memory with a full collection once the response has been sent
+        memory_governor.defer_collection()
         
         endpoint_elapsed = time.time() - endpoint_start
         print(f"\n{'='*80}")
@@ -1695,13 +2261,65 @@ def api_combine_decryption_shares():
         print(f"   └─ Serialization: {serialization_elapsed*1000:.2f}ms ({serialization_elapsed/endpoint_elapsed*100:.1f}%)")
         print('='*80 + '\n')
         
-        return make_binary_response(response)
+        return make_streaming_response(response)
     
     except ValueError as e:
         return make_binary_response({'status': 'error', 'message': str(e)}, status=400)
     except Exception as e:
         return make_binary_response({'status': 'error', 'message': str(e)}, status=500)
 
+@app.route('/decrypt_spoiled_ballots', methods=['POST'])
+@track_request('/decrypt_spoiled_ballots')
+def api_decrypt_spoiled_ballots():
+    """
+    API endpoint to decrypt spoiled (audited) ballots from guardian ballot shares.
+
+    Takes the inputs of /combine_decryption_shares without the tally. The spoiled ballots
+    are decrypted in parallel chunks and streamed in submitted order as they complete.
+    ballot_id_from and ballot_id_to restrict the run to ballot ids in [from, to).
+    """
+    try:
+        data = get_request_data()
+        try:
+            submitted_ballots_json = deserialize_list_of_strings_to_list_of_dicts(data['submitted_ballots'], label="submitted_ballots")
+        except Exception as e:
+            raise ValueError(f"Error deserializing submitted_ballots: {e}")
+        try:
+            guardian_data = deserialize_list_of_strings_to_list_of_dicts(data['guardian_data'], label="guardian_data")
+        except Exception as e:
+            raise ValueError(f"Error deserializing guardian_data: {e}")
+        available_guardian_shares, compensated_shares = _guardian_shares_from_request(data)
+        ballot_id_from = data.get('ballot_id_from')
+        ballot_id_to = data.get('ballot_id_to')
+
+        results = decrypt_spoiled_ballots_service(
+            data['party_names'],
+            data['candidate_names'],
+            data['joint_public_key'],
+            data['commitment_hash'],
+            submitted_ballots_json,
+            guardian_data,
+            available_guardian_shares,
+            compensated_shares,
+            safe_int_conversion(data.get('quorum', len(guardian_data))),
+            create_election_manifest,
+            generate_ballot_hash,
+            generate_ballot_hash_electionguard,
+            max_choices=safe_int_conversion(data.get('max_choices', 1)),
+            ballot_id_from=str(ballot_id_from) if ballot_id_from is not None else None,
+            ballot_id_to=str(ballot_id_to) if ballot_id_to is not None else None
+        )
+
+        # Free memory with a full collection once the response has been sent
+        memory_governor.defer_collection()
+
+        return make_streaming_response({'status': 'success', **results})
+
+    except ValueError as e:
+        return make_binary_response({'status': 'error', 'message': str(e)}, status=400)
+    except Exception as e:
+        return make_binary_response({'status': 'error', 'message': str(e)}, status=500)
+
 @app.route('/api/encrypt', methods=['POST'])
 # @rate_limit(max_requests=10, window_minutes=1)
 def encrypt_it():
@@ -1712,7 +2330,8 @@ def encrypt_it():
     - encrypted_data: The encrypted private key (Storage 1)
     - credentials: Contains all metadata + HMAC tag (Storage 2)
     """
-    if not PQ_AVAILABLE:
+    pq_kem = get_pq_kem()
+    if pq_kem is None:
         logger.error("Post-quantum cryptography not available")
         return make_binary_response({'error': 'Post-quantum cryptography not available'}, 501)
 
@@ -1729,79 +2348,18 @@ def encrypt_it():
             return make_binary_response({'error': 'Invalid private key format or size'}, 400)
 
         # Use guardian-provided password when supplied, otherwise generate random password
-        provided_password = data.get('password')
-        if provided_password is not None:
-            if not isinstance(provided_password, str) or len(provided_password) < 32:
-                return make_binary_response({'error': 'Invalid password format. Minimum length is 32 characters.'}, 400)
-            password = provided_password
-        else:
-            password = generate_strong_password()
-        salt = os.urandom(SCRYPT_SALT_LENGTH)
-        
-        # Post-quantum operations (these are the fastest part)
-        pq_public_key, pq_private_key = generate_keypair()
-        pq_ciphertext, pq_shared_secret = encrypt(pq_public_key)
-        
-        # Optimized key derivation
-        password_key = derive_key_from_password(password, salt)
-        combined_key = HKDF(
-            algorithm=hashes.SHA256(),
-            length=AES_KEY_LENGTH,
-            salt=salt,
-            info=HKDF_INFO_HYBRID,
-            backend=default_backend()
-        ).derive(password_key + pq_shared_secret)
-
-        # Fast encryption of private key
-        nonce = os.urandom(12)
-        cipher = Cipher(algorithms.AES(combined_key), modes.GCM(nonce), backend=default_backend())
-        encryptor = cipher.encryptor()
-        
-        private_key_bytes = private_key.encode('utf-8')
-        encrypted_data = encryptor.update(private_key_bytes) + encryptor.finalize()
-
-        # Fast password encryption
-        encrypted_password = fast_encrypt_with_master_key(password.encode('utf-8'))
-
-        # Create credentials structure (without HMAC tag first)
-        credentials_data = {
-            'version': '1.0',
-            'algorithm': PQ_ALGORITHM,
-            'salt': base64.b64encode(salt).decode(),
-            'pq_private_key': base64.b64encode(pq_private_key).decode(),
-            'pq_ciphertext': base64.b64encode(pq_ciphertext).decode(),
-            'nonce': base64.b64encode(nonce).decode(),
-            'tag': base64.b64encode(encryptor.tag).decode(),
-            'encrypted_password': base64.b64encode(encrypted_password).decode()
-        }
-        
-        # Serialize credentials for HMAC calculation
-        credentials_json = json.dumps(credentials_data, separators=(',', ':')).encode('utf-8')
-        
-        # Generate HMAC for credentials integrity
-        hmac_key = HKDF(
-            algorithm=hashes.SHA256(),
-            length=32,
-            salt=salt,
-            info=HKDF_INFO_HMAC,
-            backend=default_backend()
-        ).derive(combined_key)
-        
-        hmac_tag = generate_hmac(hmac_key, credentials_json)
-        
-        # Add HMAC tag to credentials
-        credentials_data['hmac_tag'] = base64.b64encode(hmac_tag).decode()
-        
-        # Final credentials with HMAC tag
-        final_credentials = json.dumps(credentials_data, separators=(',', ':')).encode('utf-8')
+        password = data.get('password')
+        if password is not None and (not isinstance(password, str) or len(password) < 32):
+            return make_binary_response({'error': 'Invalid password format. Minimum length is 32 characters.'}, 400)
+        sealed = seal_private_key(pq_kem, private_key, password)
 
         logger.info(f"Successful encryption for IP: {request.remote_addr}")
         
         # Return only 2 storage items instead of 3
         return make_binary_response({
             'status': 'success',
-            'encrypted_data': base64.b64encode(encrypted_data).decode(),  # Storage 1
-            'credentials': base64.b64encode(final_credentials).decode()    # Storage 2 (includes HMAC)
+            'encrypted_data': sealed['encrypted_data'],  # Storage 1
+            'credentials': sealed['credentials']         # Storage 2 (includes HMAC)
         })
 
     except Exception as e:
@@ -1820,7 +2378,8 @@ def decrypt_it():
     """
     is_msgpack_client = 'msgpack' in (request.content_type or '')
 
-    if not PQ_AVAILABLE:
+    pq_kem = get_pq_kem()
+    if pq_kem is None:
         logger.error("Post-quantum cryptography not available")
         if is_msgpack_client:
             return make_binary_response({'error': 'Post-quantum cryptography not available'}, 501)
@@ -1885,7 +2444,7 @@ def decrypt_it():
         pq_ciphertext = base64.b64decode(credentials['pq_ciphertext'])
         
         # Post-quantum decryption
-        pq_shared_secret = decrypt(pq_private_key, pq_ciphertext)
+        pq_shared_secret = pq_kem.decrypt(pq_private_key, pq_ciphertext)
         
         # Fast password decryption
         encrypted_password = base64.b64decode(credentials['encrypted_password'])
@@ -1956,10 +2515,11 @@ def decrypt_it():
 @app.route('/api/health', methods=['GET'])
 def health_check():
     """Health check endpoint"""
+    pq_available = get_pq_kem() is not None
     return jsonify({
         'status': 'healthy',
-        'pq_available': PQ_AVAILABLE,
-        'algorithm': PQ_ALGORITHM if PQ_AVAILABLE else None,
+        'pq_available': pq_available,
+        'algorithm': PQ_ALGORITHM if pq_available else None,
         'storage_design': '2-storage (encrypted_data + credentials_with_hmac)'
     }), 200
 
@@ -1975,8 +2535,12 @@ def rate_limit_exceeded(error):
         return make_binary_response({'error': 'Rate limit exceeded'}, 429)
     return jsonify({'error': 'Rate limit exceeded'}), 429
 
+# Everything imported so far is shared, long-lived state (with gunicorn --preload it is
+# inherited from the master), so keep it out of every future collection.
+memory_governor.freeze_preloaded_heap()
+
 if __name__ == '__main__':
-    if not PQ_AVAILABLE:
+    if get_pq_kem() is None:
         print("Warning: Running without post-quantum cryptography support")
     
     # Security headers
@@ -0,0 +1,340 @@
+"""
+ASGI front end for the ElectionGuard API.
+
+Serves every route of api.py from a single event loop, so health checks and ballot
+lookups stay fast while long crypto calls are running:
+
+- lookups (/health, /api/health, /ballots..., /profiles...) and /publish_ballot are
+  answered in this process, on threads beside the event loop: they need its in-memory
+  state, and file reads or profile reports of any size never hold up other requests,
+- every other route is CPU-bound crypto and is handed, unchanged, to a bounded process
+  pool whose workers run the Flask app. Request parsing, msgpack/JSON negotiation, status
+  codes and response bodies are therefore exactly those of api.py,
+- a worker sends the response back through a pipe chunk by chunk as the Flask app
+  produces it, so streamed msgpack responses (tallies, decryptions) stay streamed and
+  are never held whole in either process,
+- crypto runs in two lanes with their own workers: short calls (credentials, key
+  combination, single Benaloh challenges) never wait behind ballots, tallies and
+  decryptions,
+- a lane accepts at most its worker count plus EG_ASGI_QUEUE_DEPTH requests; beyond that
+  requests are refused at once with 429 and Retry-After instead of queueing without bound.
+
+Ballots published by a worker (/create_encrypted_ballot) are handed back once the response
+is sent and recorded in this process, so /ballots/<id> finds them.
+
+Each lane worker is a process with its own copy of api's state and runs the service pools
+with one process. Device session chains, registered manifests and in-flight idempotent
+requests are shared between workers only through EG_ENCRYPTION_SESSION_DIR,
+EG_MANIFEST_DIR and EG_IDEMPOTENCY_DIR; with a directory set to empty they are per worker.
+
+Run with one event loop process; the pools use the cores:
+    uvicorn asgi:app --host 0.0.0.0 --port 5000 --workers 1
+"""
+
+import asyncio
+import json
+import multiprocessing
+import os
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import asynccontextmanager
+from multiprocessing.connection import Connection
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+import msgpack
+from fastapi import FastAPI, Request, Response
+from fastapi.responses import StreamingResponse
+from werkzeug.test import EnvironBuilder, run_wsgi_app
+
+import api
+from process_pools import run_services_inline
+
+# Worker processes for long crypto (ballots, tallies, decryption); 0 uses every core.
+ASGI_HEAVY_WORKERS = int(os.environ.get('EG_ASGI_HEAVY_WORKERS', '0')) or os.cpu_count() or 1
+# Worker processes for short crypto calls.
+ASGI_LIGHT_WORKERS = int(os.environ.get('EG_ASGI_LIGHT_WORKERS', '1'))
+# Requests allowed to wait in each lane once all of its workers are busy.
+ASGI_QUEUE_DEPTH = int(os.environ.get('EG_ASGI_QUEUE_DEPTH', '8'))
+# Replace a pool worker after this many requests; 0 keeps workers for the pool's lifetime.
+ASGI_MAX_TASKS_PER_CHILD = int(os.environ.get('EG_ASGI_MAX_TASKS_PER_CHILD', '0')) or None
+
+# Routes answered in this process, on a thread beside the event loop
+EVENT_LOOP_ROUTES = {'/health', '/api/health', '/ballots', '/publish_ballot', '/profiles'}
+EVENT_LOOP_PREFIXES = ('/ballots/', '/profiles/')
+# Crypto routes that finish in well under a second
+LIGHT_CRYPTO_ROUTES = {
+    '/generate_guardian_credentials',
+    '/combine_guardian_public_keys',
+    '/benaloh_challenge',
+    '/api/encrypt',
+    '/api/decrypt',
+}
+
+# Set by the response and recomputed by the ASGI server
+_HOP_HEADERS = {'content-length', 'transfer-encoding', 'connection'}
+# Seconds between checks that a worker still owes a response while its pipe is quiet
+_PIPE_POLL_INTERVAL = 0.5
+
+_WsgiResult = Tuple[int, List[Tuple[str, str]], bytes]
+
+
+def _call_flask(method: str, path: str, query_string: bytes, headers: List[Tuple[str, str]], body: bytes) -> _WsgiResult:
+    """Run one request through the Flask app and return its status, headers and full body."""
+    environ = EnvironBuilder(
+        path=path, method=method, query_string=query_string, headers=headers, data=body,
+    ).get_environ()
+    app_iter, status, response_headers = run_wsgi_app(api.app, environ, buffered=True)
+    return int(status.split(' ', 1)[0]), list(response_headers.items()), b''.join(app_iter)
+
+
+def _drain_publications() -> Dict[str, Dict[str, Any]]:
+    """Hand over the ballots this worker published so the front end can serve them."""
+    publisher = api.ballot_publisher
+    drained = {
+        'cast_ballots': publisher.cast_ballots,
+        'audited_ballots': publisher.audited_ballots,
+        'ballot_nonces': publisher.ballot_nonces,
+    }
+    publisher.cast_ballots, publisher.audited_ballots, publisher.ballot_nonces = {}, {}, {}
+    return drained
+
+
+def _run_in_worker(
+    method: str, path: str, query_string: bytes, headers: List[Tuple[str, str]], body: bytes, sink: Connection
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Pool task: serve one crypto request with the worker's own copy of the Flask app.
+
+    The status and headers, then every body chunk, are sent through ``sink`` as the app
+    produces them; closing it ends the body. Returns the ballots published meanwhile.
+    """
+    environ = EnvironBuilder(
+        path=path, method=method, query_string=query_string, headers=headers, data=body,
+    ).get_environ()
+    try:
+        app_iter, status, response_headers = run_wsgi_app(api.app, environ)
+        try:
+            sink.send((int(status.split(' ', 1)[0]), list(response_headers.items())))
+            for chunk in app_iter:
+                if chunk:
+                    sink.send_bytes(chunk)
+        finally:
+            if hasattr(app_iter, 'close'):
+                app_iter.close()
+    except BrokenPipeError:  # the client went away; the rest of the body is not needed
+        pass
+    finally:
+        sink.close()
+    return _drain_publications()
+
+
+def _receive(source: Connection, task: Future, as_bytes: bool) -> Any:
+    """
+    Next message from a worker's pipe, waiting as long as the worker still runs.
+
+    :raises EOFError: once the worker closed the pipe or finished without another message
+    """
+    while not source.poll(_PIPE_POLL_INTERVAL):
+        if task.done():
+            raise EOFError
+    return source.recv_bytes() if as_bytes else source.recv()
+
+
+def _record_publications(publications: Dict[str, Dict[str, Any]]) -> None:
+    publisher = api.ballot_publisher
+    for attribute, published in publications.items():
+        if published:
+            getattr(publisher, attribute).update(published)
+
+
+def _record_finished_publications(task: 'asyncio.Future[Dict[str, Dict[str, Any]]]') -> None:
+    if not task.cancelled() and task.exception() is None:
+        _record_publications(task.result())
+
+
+class LaneFull(Exception):
+    """Raised when a lane already holds as many requests as it accepts."""
+
+
+class CryptoLane:
+    """
+    A process pool with admission control; only used from the event loop thread.
+
+    Responses are read from the workers' pipes on a thread pool of one thread per request
+    the lane admits, so waiting on a worker never takes a thread from other routes.
+    """
+
+    def __init__(self, name: str, workers: int, queue_depth: int = ASGI_QUEUE_DEPTH):
+        self.name = name
+        self.workers = max(1, workers)
+        self.limit = self.workers + max(0, queue_depth)
+        self.pending = 0
+        self.rejected = 0
+        self.completed = 0
+        self.failed = 0
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._readers = ThreadPoolExecutor(max_workers=self.limit, thread_name_prefix=f'asgi-{name}')
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context('spawn'),
+                max_tasks_per_child=ASGI_MAX_TASKS_PER_CHILD,
+                # Lane workers already use the cores; their own service pools would multiply them
+                initializer=run_services_inline,
+            )
+        return self._executor
+
+    async def run(self, *args) -> Tuple[int, List[Tuple[str, str]], AsyncIterator[bytes]]:
+        """
+        Start ``_run_in_worker(*args)`` in the pool and wait for the response head.
+
+        Returns the status, the headers and the body chunks as the worker produces them;
+        the request holds its place in the lane until the body is consumed or closed.
+
+        :raises LaneFull: at once, if the lane holds as many requests as it accepts
+        """
+        if self.pending >= self.limit:
+            self.rejected += 1
+            raise LaneFull(self.name)
+        self.pending += 1
+        source, sink = multiprocessing.Pipe(duplex=False)
+        task: Optional[Future] = None
+        try:
+            task = self._get_executor().submit(_run_in_worker, *args, sink)
+            try:
+                status, headers = await self._read(source, task, as_bytes=False)
+            except EOFError:
+                # The worker ended without answering: raise what stopped it
+                await asyncio.wrap_future(task)
+                raise BrokenProcessPool('Worker finished without a response')
+            # The worker holds its own end by now; closing ours lets its close end the body
+            sink.close()
+        except BaseException as e:
+            if task is not None:
+                task.cancel()
+            source.close()
+            sink.close()
+            self._finish(False, e)
+            raise
+        return status, headers, self._body(source, task)
+
+    def _read(self, source: Connection, task: Future, as_bytes: bool) -> 'asyncio.Future[Any]':
+        return asyncio.get_running_loop().run_in_executor(self._readers, _receive, source, task, as_bytes)
+
+    async def _body(self, source: Connection, task: Future) -> AsyncIterator[bytes]:
+        succeeded = False
+        error: Optional[BaseException] = None
+        try:
+            while True:
+                try:
+                    chunk = await self._read(source, task, as_bytes=True)
+                except EOFError:
+                    break
+                yield chunk
+            _record_publications(await asyncio.wrap_future(task))
+            succeeded = True
+        except GeneratorExit:
+            # The client went away: the worker stops at its next chunk, and what it
+            # published still counts
+            asyncio.wrap_future(task).add_done_callback(_record_finished_publications)
+            raise
+        except BaseException as e:
+            error = e
+            raise
+        finally:
+            source.close()
+            self._finish(succeeded, error)
+
+    def _finish(self, succeeded: bool, error: Optional[BaseException] = None) -> None:
+        self.pending -= 1
+        if succeeded:
+            self.completed += 1
+            return
+        self.failed += 1
+        if isinstance(error, BrokenProcessPool):
+            # A worker died mid-request; start a fresh pool for the next one
+            self.shutdown(wait=False)
+
+    def shutdown(self, wait: bool = True) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait, cancel_futures=not wait)
+            self._executor = None
+
+    def get_stats(self) -> Dict[str, int]:
+        return {
+            'workers': self.workers,
+            'limit': self.limit,
+            'pending': self.pending,
+            'completed': self.completed,
+            'failed': self.failed,
+            'rejected': self.rejected,
+        }
+
+
+heavy_lane = CryptoLane('heavy', ASGI_HEAVY_WORKERS)
+light_lane = CryptoLane('light', ASGI_LIGHT_WORKERS)
+
+
+def lane_for(path: str) -> Optional[CryptoLane]:
+    """The lane serving ``path``, or None for routes answered in this process."""
+    if path in EVENT_LOOP_ROUTES or path.startswith(EVENT_LOOP_PREFIXES):
+        return None
+    if path in LIGHT_CRYPTO_ROUTES:
+        return light_lane
+    return heavy_lane
+
+
+def _error_response(request: Request, status: int, message: str, headers: Optional[Dict[str, str]] = None) -> Response:
+    """Error body in the request's format, like api.py's error handlers."""
+    if 'msgpack' in request.headers.get('content-type', ''):
+        return Response(msgpack.packb({'error': message}, use_bin_type=True), status, headers, 'application/msgpack')
+    return Response(json.dumps({'error': message}), status, headers, 'application/json')
+
+
+@asynccontextmanager
+async def lifespan(_app: FastAPI):
+    yield
+    heavy_lane.shutdown()
+    light_lane.shutdown()
+
+
+app = FastAPI(title='ElectionGuard API', lifespan=lifespan, docs_url=None, redoc_url=None, openapi_url=None)
+
+
+@app.get('/asgi/health')
+async def asgi_health() -> Dict[str, Any]:
+    """Front end and lane statistics, answered without touching the pools."""
+    return {'status': 'healthy', 'lanes': {lane.name: lane.get_stats() for lane in (heavy_lane, light_lane)}}
+
+
+@app.api_route('/{path:path}', methods=['GET', 'POST', 'OPTIONS'])
+async def dispatch(request: Request) -> Response:
+    """Serve an api.py route in this process or in its crypto lane."""
+    path = request.url.path
+    args = (
+        request.method,
+        path,
+        request.url.query.encode('latin-1'),
+        list(request.headers.items()),
+        await request.body(),
+    )
+
+    lane = lane_for(path)
+    if lane is None:
+        status, headers, body = await asyncio.to_thread(_call_flask, *args)
+        response = Response(body, status)
+    else:
+        try:
+            status, headers, chunks = await lane.run(*args)
+        except LaneFull:
+            return _error_response(request, 429, 'Rate limit exceeded', {'Retry-After': '1'})
+        except BrokenProcessPool:
+            return _error_response(request, 500, 'Worker process exited while handling the request')
+        response = StreamingResponse(chunks, status)
+
+    for name, value in headers:
+        if name.lower() not in _HOP_HEADERS:
+            response.headers.append(name, value)
+    return response
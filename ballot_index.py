@@ -0,0 +1,207 @@
+"""
+Tally-scoped ballot id index for chunked tally ingestion.
+
+Large elections are tallied in chunks, often by different gunicorn workers, and every
+request builds a fresh ballot store, so a ballot sent twice (in one chunk, in two chunks,
+or by a retried request) used to be counted twice. Requests that name a tally (a
+`tally_id`) share an index that records the id of every ballot admitted to that tally and
+rejects any id it has seen before; without a tally id only repeats within one request are
+rejected:
+
+- ids are kept as 16-byte blake2b digests in an in-memory set, so each check is O(1),
+- admissions are appended to one log file per election and tally as fixed-size records,
+  and every worker replays the records appended by the others before deciding (under an
+  exclusive file lock), so duplicates are caught across chunks, threads and workers,
+- ids admitted by a request that then fails are released again so a retry is accepted,
+- an index can be reset, and one left untouched for EG_BALLOT_INDEX_TTL seconds starts
+  over empty; its log is removed.
+"""
+
+import hashlib
+import os
+import tempfile
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Set
+
+try:
+    import fcntl
+except ImportError:  # Windows: the index is still exact within a single process
+    fcntl = None
+
+# Directory of the per-tally logs; empty keeps the index in memory only.
+BALLOT_INDEX_DIR = os.environ.get(
+    'EG_BALLOT_INDEX_DIR', os.path.join(tempfile.gettempdir(), 'electionguard_ballot_index')
+)
+# Seconds an index is kept after it was last updated; 0 keeps it until it is reset.
+BALLOT_INDEX_TTL = int(os.environ.get('EG_BALLOT_INDEX_TTL', str(24 * 3600)))
+
+_DIGEST_SIZE = 16
+_ADMIT = b'+'
+_RELEASE = b'-'
+_RESET = b'!'
+_RECORD_SIZE = 1 + _DIGEST_SIZE
+_SWEEP_INTERVAL = 3600
+
+
+def _digest(ballot_id: str) -> bytes:
+    return hashlib.blake2b(ballot_id.encode('utf-8'), digest_size=_DIGEST_SIZE).digest()
+
+
+class BallotIdIndex:
+    """Thread-safe set of the ballot ids admitted to one tally."""
+
+    def __init__(self, index_id: str, directory: Optional[str] = BALLOT_INDEX_DIR, ttl: int = BALLOT_INDEX_TTL):
+        self.index_id = index_id
+        self.path = os.path.join(directory, f"{index_id}.idx") if directory else None
+        self.ttl = ttl
+        self._digests: Set[bytes] = set()
+        self._offset = 0
+        self._inode: Optional[int] = None
+        self._updated = time.time()
+        self._lock = threading.Lock()
+        if self.path:
+            os.makedirs(directory, exist_ok=True)
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._sync()
+            return len(self._digests)
+
+    def __contains__(self, ballot_id: str) -> bool:
+        with self._lock:
+            self._sync()
+            return _digest(ballot_id) in self._digests
+
+    def _expired(self, updated: float) -> bool:
+        return self.ttl > 0 and time.time() - updated > self.ttl
+
+    def _sync(self) -> None:
+        if self.path:
+            with open(self.path, 'ab+') as log:
+                self._replay(log)
+        elif self._expired(self._updated):
+            self._digests.clear()
+
+    def _replay(self, log) -> None:
+        """Apply the records other workers appended since this process last read the log."""
+        inode = os.fstat(log.fileno()).st_ino
+        if inode != self._inode:
+            # First read, or the log expired and was removed since: start from its beginning
+            self._inode = inode
+            self._offset = 0
+            self._digests.clear()
+        log.seek(self._offset)
+        data = log.read()
+        usable = len(data) - len(data) % _RECORD_SIZE
+        for start in range(0, usable, _RECORD_SIZE):
+            marker = data[start:start + 1]
+            digest = data[start + 1:start + _RECORD_SIZE]
+            if marker == _ADMIT:
+                self._digests.add(digest)
+            elif marker == _RELEASE:
+                self._digests.discard(digest)
+            else:
+                self._digests.clear()
+        self._offset += usable
+
+    def _update(self, marker: bytes, digests: List[bytes]) -> None:
+        """Append records for ``digests`` under the file lock, applying the log first."""
+        with open(self.path, 'ab+') as log:
+            if fcntl is not None:
+                fcntl.flock(log.fileno(), fcntl.LOCK_EX)
+            try:
+                self._replay(log)
+                records = []
+                if self._digests and self._expired(os.fstat(log.fileno()).st_mtime):
+                    records.append(_RESET + bytes(_DIGEST_SIZE))
+                    self._digests.clear()
+                if marker == _ADMIT:
+                    digests[:] = [digest for digest in digests if digest not in self._digests]
+                records += [marker + digest for digest in digests]
+                if records:
+                    log.seek(0, os.SEEK_END)
+                    log.write(b''.join(records))
+                    log.flush()
+                    self._replay(log)
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(log.fileno(), fcntl.LOCK_UN)
+
+    def admit(self, ballot_ids: Iterable[str]) -> List[bool]:
+        """
+        Record the given ballot ids as tallied.
+
+        Returns one flag per id: False if the id was admitted before, by this or any other
+        request for the tally, or appears earlier in ``ballot_ids``.
+        """
+        ballot_ids = list(ballot_ids)
+        digests = [_digest(ballot_id) for ballot_id in ballot_ids]
+        with self._lock:
+            candidates = list(dict.fromkeys(digests))
+            if self.path:
+                self._update(_ADMIT, candidates)
+            else:
+                self._sync()
+                candidates = [digest for digest in candidates if digest not in self._digests]
+                self._digests.update(candidates)
+            self._updated = time.time()
+            fresh = set(candidates)
+
+        admitted = []
+        for digest in digests:
+            admitted.append(digest in fresh)
+            fresh.discard(digest)
+        return admitted
+
+    def release(self, ballot_ids: Iterable[str]) -> None:
+        """Forget ballot ids admitted by a request that did not produce a tally."""
+        digests = list(dict.fromkeys(_digest(ballot_id) for ballot_id in ballot_ids))
+        if not digests:
+            return
+        with self._lock:
+            if self.path:
+                self._update(_RELEASE, digests)
+            else:
+                self._digests.difference_update(digests)
+
+    def reset(self) -> None:
+        """Forget every admitted id, in this and every other worker, to tally again."""
+        with self._lock:
+            if self.path:
+                self._update(_RESET, [bytes(_DIGEST_SIZE)])
+            else:
+                self._digests.clear()
+            self._updated = time.time()
+
+
+_indexes: Dict[str, BallotIdIndex] = {}
+_indexes_lock = threading.Lock()
+_last_sweep = 0.0
+
+
+def _sweep(directory: Optional[str], ttl: int) -> None:
+    """Remove the logs of expired indexes, at most once an hour."""
+    global _last_sweep
+    now = time.time()
+    if not directory or ttl <= 0 or now - _last_sweep < _SWEEP_INTERVAL or not os.path.isdir(directory):
+        return
+    _last_sweep = now
+    for name in os.listdir(directory):
+        path = os.path.join(directory, name)
+        try:
+            if now - os.path.getmtime(path) > ttl:
+                os.remove(path)
+        except OSError:  # removed by another worker
+            pass
+
+
+def get_ballot_index(election_id: str, tally_id: str) -> BallotIdIndex:
+    """Get the ballot id index of one tally of an election, creating it on first use."""
+    index_id = f"{election_id[:32]}-{hashlib.blake2b(tally_id.encode('utf-8'), digest_size=8).hexdigest()}"
+    with _indexes_lock:
+        _sweep(BALLOT_INDEX_DIR, BALLOT_INDEX_TTL)
+        index = _indexes.get(index_id)
+        if index is None:
+            index = _indexes[index_id] = BallotIdIndex(index_id)
+        return index
@@ -0,0 +1,125 @@
+"""
+Checkpoints of long tally and decryption runs.
+
+A large `/create_encrypted_tally` or decryption request is one long computation: when the
+worker times out, is recycled or the machine is preempted, everything it accumulated is
+lost and the retry starts from scratch. A request that names a `checkpoint_id` instead
+saves its progress every EG_CHECKPOINT_INTERVAL ballots:
+
+- a tally saves the running ciphertext of every selection with the ids of the ballots
+  already accumulated (and the ids it admitted to the election's ballot id index),
+- a guardian's decryption saves its tally share and the ballot shares computed so far,
+- a retry with the same `checkpoint_id` (and the same inputs) loads the last checkpoint
+  and only does the work that is left, so a preempted run costs at most one interval.
+
+Checkpoints are JSON files in EG_CHECKPOINT_DIR, written to a temporary file and renamed
+so a crash never leaves a partial checkpoint. Finished runs are kept so a retry after a
+lost response is answered without recomputing, and removed after EG_CHECKPOINT_TTL seconds.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from typing import Any, Dict, Optional
+
+# Directory of the checkpoint files; empty keeps checkpoints in this worker only.
+CHECKPOINT_DIR = os.environ.get(
+    'EG_CHECKPOINT_DIR', os.path.join(tempfile.gettempdir(), 'electionguard_checkpoints')
+)
+# Ballots processed between two checkpoints of a run.
+CHECKPOINT_INTERVAL = max(1, int(os.environ.get('EG_CHECKPOINT_INTERVAL', '500')))
+# Seconds a checkpoint is kept after it was last written.
+CHECKPOINT_TTL = int(os.environ.get('EG_CHECKPOINT_TTL', str(7 * 24 * 3600)))
+
+_SWEEP_INTERVAL = 3600
+
+
+def checkpoint_key(*parts: str) -> str:
+    """Stable file name of a run, from the parts that identify it."""
+    return hashlib.blake2b('|'.join(parts).encode('utf-8'), digest_size=16).hexdigest()
+
+
+class CheckpointStore:
+    """Thread-safe store of the last checkpoint of each run."""
+
+    def __init__(self, directory: Optional[str] = CHECKPOINT_DIR, ttl: int = CHECKPOINT_TTL):
+        self.directory = directory
+        self.ttl = ttl
+        self._memory: Dict[str, str] = {}
+        self._lock = threading.Lock()
+        self._last_sweep = 0.0
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+
+    def load(self, key: str) -> Optional[Dict[str, Any]]:
+        """The last checkpoint of a run, or None if it has none."""
+        with self._lock:
+            if not self.directory:
+                data = self._memory.get(key)
+            else:
+                try:
+                    with open(self._path(key), 'r', encoding='utf-8') as checkpoint_file:
+                        data = checkpoint_file.read()
+                except FileNotFoundError:
+                    data = None
+        return json.loads(data) if data is not None else None
+
+    def save(self, key: str, state: Dict[str, Any]) -> None:
+        """Replace the checkpoint of a run."""
+        data = json.dumps(state, separators=(',', ':'))
+        with self._lock:
+            if not self.directory:
+                self._memory[key] = data
+                return
+            handle, temporary = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+            try:
+                with os.fdopen(handle, 'w', encoding='utf-8') as checkpoint_file:
+                    checkpoint_file.write(data)
+                    checkpoint_file.flush()
+                    os.fsync(checkpoint_file.fileno())
+                os.replace(temporary, self._path(key))
+            except BaseException:
+                if os.path.exists(temporary):
+                    os.remove(temporary)
+                raise
+            self._sweep()
+
+    def discard(self, key: str) -> None:
+        """Remove the checkpoint of a run."""
+        with self._lock:
+            self._memory.pop(key, None)
+            if self.directory and os.path.exists(self._path(key)):
+                os.remove(self._path(key))
+
+    def _sweep(self) -> None:
+        """Remove expired checkpoints, at most once an hour."""
+        now = time.time()
+        if now - self._last_sweep < _SWEEP_INTERVAL:
+            return
+        self._last_sweep = now
+        for name in os.listdir(self.directory):
+            path = os.path.join(self.directory, name)
+            try:
+                if now - os.path.getmtime(path) > self.ttl:
+                    os.remove(path)
+            except OSError:  # removed by another worker
+                pass
+
+
+_store: Optional[CheckpointStore] = None
+_store_lock = threading.Lock()
+
+
+def get_checkpoint_store() -> CheckpointStore:
+    """Get the global checkpoint store."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = CheckpointStore()
+        return _store
@@ -0,0 +1,109 @@
+"""
+Pre-generated ML-KEM material and concurrent key derivation for guardian credentials.
+
+Sealing a guardian's private key costs one scrypt derivation (N=2^16) and one ML-KEM-1024
+key generation and encapsulation, and election setup seals one key per guardian:
+
+- keypairs are generated together with an encapsulation ahead of use and kept in a small
+  pool of EG_KEM_POOL_SIZE entries, refilled by a background thread once half are used;
+  every entry is handed out once, and an empty pool generates inline,
+- bulk sealing runs on a pool of EG_KDF_WORKERS threads; scrypt runs inside OpenSSL with
+  the GIL released, so derivations overlap on multiple cores.
+"""
+
+import os
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Deque, Iterable, List, Optional, Tuple
+
+# Pre-generated ML-KEM keypairs with their encapsulation; 0 generates every one inline.
+KEM_POOL_SIZE = int(os.environ.get('EG_KEM_POOL_SIZE', '16'))
+# Concurrent scrypt derivations; each one holds 64 MB (128 * r * N bytes) while it runs.
+KDF_WORKERS = int(os.environ.get('EG_KDF_WORKERS', '0')) or min(8, os.cpu_count() or 1)
+# Largest panel one bulk credentials request may create; key pairs and seals grow with it.
+MAX_BULK_GUARDIANS = int(os.environ.get('EG_MAX_BULK_GUARDIANS', '256'))
+
+# public key, private key, ciphertext, shared secret
+KemMaterial = Tuple[bytes, bytes, bytes, bytes]
+
+
+class KemPool:
+    """Thread-safe pool of single-use ML-KEM keypairs with their encapsulation."""
+
+    def __init__(self, kem: Any, size: int = KEM_POOL_SIZE):
+        self.kem = kem
+        self.size = size
+        self._entries: Deque[KemMaterial] = deque()
+        self._lock = threading.Lock()
+        self._refilling = False
+        self.hits = 0
+        self.misses = 0
+
+    def take(self) -> KemMaterial:
+        """Hand out a pooled entry, or generate one now if the pool is empty."""
+        with self._lock:
+            entry = self._entries.popleft() if self._entries else None
+            if entry is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            refill = self.size > 0 and not self._refilling and len(self._entries) <= self.size // 2
+            if refill:
+                self._refilling = True
+        if refill:
+            threading.Thread(target=self._refill, name='kem-pool-refill', daemon=True).start()
+        return entry if entry is not None else self._generate()
+
+    def fill(self) -> None:
+        """Generate entries until the pool is full."""
+        while True:
+            with self._lock:
+                if len(self._entries) >= self.size:
+                    return
+            entry = self._generate()
+            with self._lock:
+                self._entries.append(entry)
+
+    def available(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def _generate(self) -> KemMaterial:
+        public_key, private_key = self.kem.generate_keypair()
+        ciphertext, shared_secret = self.kem.encrypt(public_key)
+        return public_key, private_key, ciphertext, shared_secret
+
+    def _refill(self) -> None:
+        try:
+            self.fill()
+        finally:
+            with self._lock:
+                self._refilling = False
+
+
+_kem_pool: Optional[KemPool] = None
+_kdf_executor: Optional[ThreadPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def get_kem_pool(kem: Any) -> KemPool:
+    """Get the global ML-KEM pool of a KEM module."""
+    global _kem_pool
+    with _pool_lock:
+        if _kem_pool is None or _kem_pool.kem is not kem:
+            _kem_pool = KemPool(kem)
+        return _kem_pool
+
+
+def map_concurrently(function: Callable[[Any], Any], items: Iterable[Any]) -> List[Any]:
+    """Apply a GIL-releasing function to items on the key derivation threads, in order."""
+    global _kdf_executor
+    items = list(items)
+    if len(items) < 2 or KDF_WORKERS <= 1:
+        return [function(item) for item in items]
+    with _pool_lock:
+        if _kdf_executor is None:
+            _kdf_executor = ThreadPoolExecutor(max_workers=KDF_WORKERS, thread_name_prefix='kdf')
+        executor = _kdf_executor
+    return list(executor.map(function, items))
@@ -6,6 +6,7 @@ from electionguard import ballot_box
 from electionguard import ballot_code
 from electionguard import ballot_compact
 from electionguard import ballot_validator
+from electionguard import batch_verification
 from electionguard import big_integer
 from electionguard import byte_padding
 from electionguard import chaum_pedersen
@@ -85,6 +86,10 @@ from electionguard.ballot_validator import (
     contest_is_valid_for_style,
     selection_is_valid_for_style,
 )
+from electionguard.batch_verification import (
+    BATCH_SECURITY_BITS,
+    BatchVerifier,
+)
 from electionguard.big_integer import (
     BigInteger,
     bytes_to_hex,
@@ -100,11 +105,13 @@ from electionguard.chaum_pedersen import (
     ChaumPedersenProof,
     ConstantChaumPedersenProof,
     DisjunctiveChaumPedersenProof,
+    RangeChaumPedersenProof,
     make_chaum_pedersen,
     make_constant_chaum_pedersen,
     make_disjunctive_chaum_pedersen,
     make_disjunctive_chaum_pedersen_one,
     make_disjunctive_chaum_pedersen_zero,
+    make_range_chaum_pedersen,
 )
 from electionguard.constants import (
     EXTRA_SMALL_TEST_CONSTANTS,
@@ -140,6 +147,7 @@ from electionguard.decrypt_with_shares import (
     decrypt_tally,
 )
 from electionguard.decryption import (
+    GuardianDecryptionKey,
     RecoveryPublicKey,
     compute_compensated_decryption_share,
     compute_compensated_decryption_share_for_ballot,
@@ -204,6 +212,7 @@ from electionguard.election_polynomial import (
     compute_polynomial_coordinate,
     generate_polynomial,
     verify_polynomial_coordinate,
+    verify_polynomial_coordinates,
 )
 from electionguard.elgamal import (
     ElGamalCiphertext,
@@ -217,13 +226,17 @@ from electionguard.elgamal import (
     elgamal_keypair_from_secret,
     elgamal_keypair_random,
     hashed_elgamal_encrypt,
+    hashed_elgamal_encrypt_batch,
 )
 from electionguard.encrypt import (
     ContestData,
     EncryptionDevice,
     EncryptionMediator,
+    SELECTIONS_PER_TASK,
+    chain_ballot_code,
     contest_from,
     encrypt_ballot,
+    encrypt_ballot_bodies,
     encrypt_ballot_contests,
     encrypt_contest,
     encrypt_selection,
@@ -238,6 +251,7 @@ from electionguard.group import (
     ElementModPorInt,
     ElementModQ,
     ElementModQorInt,
+    FixedBasePowP,
     a_minus_b_q,
     a_plus_bc_q,
     add_q,
@@ -251,6 +265,7 @@ from electionguard.group import (
     mult_inv_p,
     mult_p,
     mult_q,
+    multi_pow_p,
     negate_q,
     pow_p,
     pow_q,
@@ -273,10 +288,12 @@ from electionguard.hash import (
 )
 from electionguard.hmac import (
     get_hmac,
+    get_hmac_blocks,
 )
 from electionguard.key_ceremony import (
     CeremonyDetails,
     CoordinateData,
+    ElectionDecryptionKey,
     ElectionJointKey,
     ElectionKeyPair,
     ElectionPartialKeyBackup,
@@ -286,6 +303,7 @@ from electionguard.key_ceremony import (
     combine_election_public_keys,
     generate_election_key_pair,
     generate_election_partial_key_backup,
+    generate_election_partial_key_backups,
     generate_election_partial_key_challenge,
     get_backup_seed,
     verify_election_partial_key_backup,
@@ -408,6 +426,7 @@ from electionguard.utils import (
 
 __all__ = [
     "AnnotatedString",
+    "BATCH_SECURITY_BITS",
     "BYTE_ENCODING",
     "BYTE_ORDER",
     "BackupVerificationState",
@@ -416,6 +435,7 @@ __all__ = [
     "BallotId",
     "BallotStyle",
     "BaseElement",
+    "BatchVerifier",
     "BigInteger",
     "Candidate",
     "CandidateContestDescription",
@@ -467,6 +487,7 @@ __all__ = [
     "ElGamalPublicKey",
     "ElGamalSecretKey",
     "ElectionConstants",
+    "ElectionDecryptionKey",
     "ElectionGuardLog",
     "ElectionJointKey",
     "ElectionKeyPair",
@@ -486,8 +507,10 @@ __all__ = [
     "EncryptionDevice",
     "EncryptionMediator",
     "FORMAT",
+    "FixedBasePowP",
     "GeopoliticalUnit",
     "Guardian",
+    "GuardianDecryptionKey",
     "GuardianId",
     "GuardianPair",
     "GuardianRecord",
@@ -521,10 +544,12 @@ __all__ = [
     "ProofUsage",
     "PublicCommitment",
     "PublishedCiphertextTally",
+    "RangeChaumPedersenProof",
     "ReadOnlyDataStore",
     "RecoveryPublicKey",
     "ReferendumContestDescription",
     "ReportingUnitType",
+    "SELECTIONS_PER_TASK",
     "SMALL_TEST_CONSTANTS",
     "STANDARD_CONSTANTS",
     "SUPPORTED_VOTE_VARIATIONS",
@@ -552,10 +577,12 @@ __all__ = [
     "ballot_is_valid_for_election",
     "ballot_is_valid_for_style",
     "ballot_validator",
+    "batch_verification",
     "big_integer",
     "byte_padding",
     "bytes_to_hex",
     "cast_ballot",
+    "chain_ballot_code",
     "chaum_pedersen",
     "combine_election_public_keys",
     "compress_plaintext_ballot",
@@ -616,6 +643,7 @@ __all__ = [
     "elgamal_keypair_random",
     "encrypt",
     "encrypt_ballot",
+    "encrypt_ballot_bodies",
     "encrypt_ballot_contests",
     "encrypt_contest",
     "encrypt_selection",
@@ -632,6 +660,7 @@ __all__ = [
     "generate_device_uuid",
     "generate_election_key_pair",
     "generate_election_partial_key_backup",
+    "generate_election_partial_key_backups",
     "generate_election_partial_key_challenge",
     "generate_placeholder_selection_from",
     "generate_placeholder_selections_from",
@@ -645,6 +674,7 @@ __all__ = [
     "get_generator",
     "get_hash_for_device",
     "get_hmac",
+    "get_hmac_blocks",
     "get_i8n_value",
     "get_large_prime",
     "get_optional",
@@ -660,6 +690,7 @@ __all__ = [
     "hash",
     "hash_elems",
     "hashed_elgamal_encrypt",
+    "hashed_elgamal_encrypt_batch",
     "hex_to_p",
     "hex_to_q",
     "hmac",
@@ -687,12 +718,14 @@ __all__ = [
     "make_disjunctive_chaum_pedersen",
     "make_disjunctive_chaum_pedersen_one",
     "make_disjunctive_chaum_pedersen_zero",
+    "make_range_chaum_pedersen",
     "make_schnorr_proof",
     "manifest",
     "match_optional",
     "mult_inv_p",
     "mult_p",
     "mult_q",
+    "multi_pow_p",
     "negate_q",
     "nonces",
     "padded_decode",
@@ -734,6 +767,7 @@ __all__ = [
     "verify_election_partial_key_backup",
     "verify_election_partial_key_challenge",
     "verify_polynomial_coordinate",
+    "verify_polynomial_coordinates",
 ]
 
 # </AUTOGEN_INIT>
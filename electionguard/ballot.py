@@ -9,6 +9,7 @@ from typing import (
     Iterable,
     Optional,
     Protocol,
+    Union,
     runtime_checkable,
 )
 
@@ -17,8 +18,10 @@ from .ballot_code import get_ballot_code
 from .chaum_pedersen import (
     ConstantChaumPedersenProof,
     DisjunctiveChaumPedersenProof,
+    RangeChaumPedersenProof,
     make_constant_chaum_pedersen,
     make_disjunctive_chaum_pedersen,
+    make_range_chaum_pedersen,
 )
 from .election_object_base import (
     ElectionObjectBase,
@@ -490,10 +493,12 @@ class CiphertextBallotContest(OrderedObjectBase, CryptoHashCheckable):
     nonce: Optional[ElementModQ] = None
     """The nonce used to generate the encryption. Sensitive & should be treated as a secret"""
 
-    proof: Optional[ConstantChaumPedersenProof] = None
+    proof: Optional[Union[ConstantChaumPedersenProof, RangeChaumPedersenProof]] = None
     """
     The proof demonstrates the sum of the selections does not exceed the maximum
-    available selections for the contest, and that the proof was generated with the nonce
+    available selections for the contest, and that the proof was generated with the nonce.
+    A `ConstantChaumPedersenProof` when the contest includes placeholder selections,
+    a `RangeChaumPedersenProof` when the election uses range proofs and has none.
     """
 
     extended_data: Optional[HashedElGamalCiphertext] = field(default=None)
@@ -650,15 +655,19 @@ def make_ciphertext_ballot_contest(
     proof_seed: ElementModQ,
     number_elected: int,
     crypto_hash: Optional[ElementModQ] = None,
-    proof: Optional[ConstantChaumPedersenProof] = None,
+    proof: Optional[Union[ConstantChaumPedersenProof, RangeChaumPedersenProof]] = None,
     nonce: Optional[ElementModQ] = None,
     extended_data: Optional[HashedElGamalCiphertext] = None,
+    selection_total: Optional[int] = None,
 ) -> CiphertextBallotContest:
     """
     Constructs a `CipherTextBallotContest` object. Most of the parameters here match up to fields
     in the class, but this helper function will optionally compute a Chaum-Pedersen proof if the
     ballot selections include their encryption nonces. Likewise, if a crypto_hash is not provided,
     it will be derived from the other fields.
+
+    Without `selection_total` the proof shows the selections (with placeholders) add up to
+    `number_elected`; with it, a range proof shows that total lies in [0, `number_elected`].
     """
     if crypto_hash is None:
         crypto_hash = _ciphertext_ballot_context_crypto_hash(
@@ -667,7 +676,20 @@ def make_ciphertext_ballot_contest(
 
     aggregate = _ciphertext_ballot_contest_aggregate_nonce(object_id, ballot_selections)
     elgamal_accumulation = _ciphertext_ballot_elgamal_accumulate(ballot_selections)
-    if proof is None:
+    if proof is None and selection_total is not None:
+        proof = flatmap_optional(
+            aggregate,
+            lambda ag: make_range_chaum_pedersen(
+                elgamal_accumulation,
+                selection_total,
+                number_elected,
+                ag,
+                elgamal_public_key,
+                proof_seed,
+                crypto_extended_base_hash,
+            ),
+        )
+    elif proof is None:
         proof = flatmap_optional(
             aggregate,
             lambda ag: make_constant_chaum_pedersen(
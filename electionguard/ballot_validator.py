@@ -1,4 +1,7 @@
+from typing import Dict
+
 from .ballot import CiphertextBallot, CiphertextBallotContest, CiphertextBallotSelection
+from .chaum_pedersen import RangeChaumPedersenProof
 from .election import CiphertextElectionContext
 from .logs import log_warning
 from .manifest import (
@@ -21,6 +24,15 @@ def ballot_is_valid_for_election(
     if not ballot_is_valid_for_style(ballot, internal_manifest):
         return False
 
+    # every contest is proven the way the election is configured to
+    range_proofs = context.configuration.range_proofs
+    for contest in ballot.contests:
+        if isinstance(contest.proof, RangeChaumPedersenProof) != range_proofs:
+            log_warning(
+                f"ballot_is_valid_for_election: unexpected proof type for contest {contest.object_id}"
+            )
+            return False
+
     if should_validate:
         if not ballot.is_valid_encryption(
             internal_manifest.manifest_hash,
@@ -75,10 +87,17 @@ def contest_is_valid_for_style(
         )
         return False
 
-    # verify the placeholder count
-    if len(contest.ballot_selections) != len(description.ballot_selections) + len(
-        description.placeholder_selections
-    ):
+    # verify the placeholder count; a range proof replaces the placeholders
+    expected_selections = len(description.ballot_selections)
+    if isinstance(contest.proof, RangeChaumPedersenProof):
+        if contest.proof.limit != description.number_elected:
+            log_warning(
+                f"ballot is not valid for style: mismatched selection limit for contest {description.object_id}"
+            )
+            return False
+    else:
+        expected_selections += len(description.placeholder_selections)
+    if len(contest.ballot_selections) != expected_selections:
         log_warning(
             f"ballot is not valid for style: mismatched selection count for contest {description.object_id}"
         )
@@ -97,13 +116,12 @@ def ballot_is_valid_for_style(
     :return: Is valid
     """
     descriptions = internal_manifest.get_contests_for(ballot.style_id)
+    ballot_contests: Dict[str, CiphertextBallotContest] = {}
+    for contest in ballot.contests:
+        ballot_contests.setdefault(contest.object_id, contest)
 
     for description in descriptions:
-        use_contest = None
-        for contest in ballot.contests:
-            if description.object_id == contest.object_id:
-                use_contest = contest
-                break
+        use_contest = ballot_contests.get(description.object_id)
 
         # verify the contest exists on the ballot
         if use_contest is None:
@@ -116,12 +134,11 @@ def ballot_is_valid_for_style(
             return False
 
         # verify the selection metadata
+        contest_selections: Dict[str, CiphertextBallotSelection] = {}
+        for selection in use_contest.ballot_selections:
+            contest_selections.setdefault(selection.object_id, selection)
         for selection_description in description.ballot_selections:
-            use_selection = None
-            for selection in use_contest.ballot_selections:
-                if selection_description.object_id == selection.object_id:
-                    use_selection = selection
-                    break
+            use_selection = contest_selections.get(selection_description.object_id)
 
             if use_selection is None:
                 log_warning(
@@ -1,12 +1,16 @@
 # pylint: disable=too-many-instance-attributes
 from dataclasses import dataclass
+from typing import List, Tuple
 
+from .constants import get_generator
 from .elgamal import ElGamalCiphertext
 from .group import (
     ElementModQ,
     ElementModP,
     g_pow_p,
     mult_p,
+    mult_q,
+    multi_pow_p,
     pow_p,
     a_minus_b_q,
     a_plus_bc_q,
@@ -367,6 +371,113 @@ class ConstantChaumPedersenProof(Proof):
         return success
 
 
+@dataclass
+class RangeChaumPedersenProof(Proof):
+    """
+    Representation of a range Chaum Pederson proof: the ciphertext encrypts one of 0, 1, ..., `limit`.
+
+    One branch per value; only the challenges and responses are kept, the commitments
+    are recomputed from them when verifying (ElectionGuard 2.0 style).
+    """
+
+    challenges: List[ElementModQ]
+    """c_j in the spec, one per value j in [0, limit]"""
+    responses: List[ElementModQ]
+    """v_j in the spec, one per value j in [0, limit]"""
+    limit: int
+    """largest value the ciphertext may encrypt (L in the spec)"""
+    usage: ProofUsage = ProofUsage.SelectionLimit
+    """a description of how to use this proof"""
+
+    def __post_init__(self) -> None:
+        super().__init__()
+
+    def commitments(
+        self, message: ElGamalCiphertext, k: ElementModP
+    ) -> List[Tuple[ElementModP, ElementModP]]:
+        """
+        Recompute the commitments (a_j, b_j) of every branch:
+        𝑎𝑗 = 𝑔^𝑣𝑗 𝐴^−𝑐𝑗 and 𝑏𝑗 = 𝑔^(𝑗𝑐𝑗) 𝐾^𝑣𝑗 𝐵^−𝑐𝑗 mod 𝑝.
+        The message must be in the order-q subgroup for these to be meaningful.
+        """
+        g = ElementModP(get_generator(), False)
+        return [
+            _range_commitment(message, k, g, value, c, v)
+            for value, (c, v) in enumerate(zip(self.challenges, self.responses))
+        ]
+
+    def is_valid(
+        self, message: ElGamalCiphertext, k: ElementModP, q: ElementModQ
+    ) -> bool:
+        """
+        Validates a range Chaum-Pedersen proof.
+        e.g. that the challenges add up to the hash of the recomputed commitments.
+
+        :param message: The ciphertext message
+        :param k: The public key of the election
+        :param q: The extended base hash of the election
+        :return: True if everything is consistent. False otherwise.
+        """
+        alpha = message.pad
+        beta = message.data
+        in_bounds_alpha = alpha.is_valid_residue()
+        in_bounds_beta = beta.is_valid_residue()
+        # this is an arbitrary limit check to keep the proof size and decryption sane
+        sane_limit = 0 <= self.limit < 1_000
+        consistent_size = (
+            len(self.challenges) == len(self.responses) == self.limit + 1
+        )
+        in_bounds_scalars = all(
+            x.is_in_bounds() for x in self.challenges + self.responses
+        )
+
+        consistent_c = False
+        if in_bounds_alpha and in_bounds_beta and sane_limit and consistent_size:
+            consistent_c = add_q(*self.challenges) == hash_elems(
+                q, alpha, beta, self.commitments(message, k)
+            )
+
+        success = (
+            in_bounds_alpha
+            and in_bounds_beta
+            and sane_limit
+            and consistent_size
+            and in_bounds_scalars
+            and consistent_c
+        )
+        if not success:
+            log_warning(
+                "found an invalid Range Chaum-Pedersen proof: "
+                + str(
+                    {
+                        "in_bounds_alpha": in_bounds_alpha,
+                        "in_bounds_beta": in_bounds_beta,
+                        "sane_limit": sane_limit,
+                        "consistent_size": consistent_size,
+                        "in_bounds_scalars": in_bounds_scalars,
+                        "consistent_c": consistent_c,
+                        "k": k,
+                        "proof": self,
+                    }
+                ),
+            )
+        return success
+
+
+def _range_commitment(
+    message: ElGamalCiphertext,
+    k: ElementModP,
+    g: ElementModP,
+    value: int,
+    c: ElementModQ,
+    v: ElementModQ,
+) -> Tuple[ElementModP, ElementModP]:
+    minus_c = negate_q(c)
+    a = multi_pow_p([g, message.pad], [v, minus_c])
+    b = multi_pow_p([g, k, message.data], [mult_q(value, c), v, minus_c])
+    return a, b
+
+
 def make_disjunctive_chaum_pedersen(
     message: ElGamalCiphertext,
     r: ElementModQ,
@@ -531,3 +642,55 @@ def make_constant_chaum_pedersen(
     v = a_plus_bc_q(u, c, r)
 
     return ConstantChaumPedersenProof(a, b, c, v, constant)
+
+
+def make_range_chaum_pedersen(
+    message: ElGamalCiphertext,
+    plaintext: int,
+    limit: int,
+    r: ElementModQ,
+    k: ElementModP,
+    seed: ElementModQ,
+    hash_header: ElementModQ,
+) -> RangeChaumPedersenProof:
+    """
+    Produces a proof that a given encryption is of a value between 0 and `limit`,
+    without revealing which.
+
+    :param message: An ElGamal ciphertext
+    :param plaintext: The value encrypted in the ciphertext, in [0, limit]
+    :param limit: The largest value the proof allows (L in the spec)
+    :param r: The (aggregate) nonce used creating the ElGamal ciphertext
+    :param k: The ElGamal public key for the election
+    :param seed: Used to generate other random values here
+    :param hash_header: A value used when generating the challenge,
+                        usually the election extended base hash (𝑄')
+    """
+    if not 0 <= plaintext <= limit:
+        raise ValueError(f"plaintext {plaintext} is not in [0, {limit}]")
+    alpha = message.pad
+    beta = message.data
+    g = ElementModP(get_generator(), False)
+
+    # Pick the real branch's commitment nonce and a simulated challenge and response per other branch.
+    nonces = Nonces(seed, "range-chaum-pedersen-proof")
+    u = nonces[0]
+    challenges = [nonces[2 * value + 1] for value in range(limit + 1)]
+    responses = [nonces[2 * value + 2] for value in range(limit + 1)]
+
+    commitments = []
+    for value in range(limit + 1):
+        if value == plaintext:
+            commitments.append((g_pow_p(u), pow_p(k, u)))
+        else:
+            commitments.append(
+                _range_commitment(message, k, g, value, challenges[value], responses[value])
+            )
+
+    # The real branch takes whatever challenge makes them add up to the hash
+    c = hash_elems(hash_header, alpha, beta, commitments)
+    simulated = [challenges[value] for value in range(limit + 1) if value != plaintext]
+    challenges[plaintext] = a_minus_b_q(c, add_q(*simulated)) if simulated else c
+    responses[plaintext] = a_plus_bc_q(u, challenges[plaintext], r)
+
+    return RangeChaumPedersenProof(challenges, responses, limit)
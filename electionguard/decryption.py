@@ -1,4 +1,4 @@
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Optional, Tuple, Union
 from electionguard.chaum_pedersen import ChaumPedersenProof, make_chaum_pedersen
 
 from electionguard.elgamal import ElGamalCiphertext
@@ -31,6 +31,7 @@ from .group import (
 )
 from .key_ceremony import (
     CoordinateData,
+    ElectionDecryptionKey,
     ElectionKeyPair,
     ElectionPartialKeyBackup,
     ElectionPublicKey,
@@ -44,9 +45,12 @@ from .type import ContestId, GuardianId, SelectionId
 
 RecoveryPublicKey = ElementModP
 
+# Partial decryption only uses the owner, sequence order and key pair of a guardian
+GuardianDecryptionKey = Union[ElectionKeyPair, ElectionDecryptionKey]
+
 
 def compute_decryption_share(
-    key_pair: ElectionKeyPair,
+    key_pair: GuardianDecryptionKey,
     tally: CiphertextTally,
     context: CiphertextElectionContext,
     scheduler: Optional[Scheduler] = None,
@@ -138,7 +142,7 @@ def compute_compensated_decryption_share(
 
 
 def compute_decryption_share_for_ballot(
-    key_pair: ElectionKeyPair,
+    key_pair: GuardianDecryptionKey,
     ballot: SubmittedBallot,
     context: CiphertextElectionContext,
     scheduler: Optional[Scheduler] = None,
@@ -173,7 +177,7 @@ def compute_decryption_share_for_ballot(
     return DecryptionShare(
         ballot.object_id,
         key_pair.owner_id,
-        key_pair.share().key,
+        key_pair.key_pair.public_key,
         contests,
     )
 
@@ -228,7 +232,7 @@ def compute_compensated_decryption_share_for_ballot(
 
 
 def compute_decryption_share_for_contest(
-    key_pair: ElectionKeyPair,
+    key_pair: GuardianDecryptionKey,
     contest: CiphertextContest,
     context: CiphertextElectionContext,
     scheduler: Optional[Scheduler] = None,
@@ -321,7 +325,7 @@ def compute_compensated_decryption_share_for_contest(
 
 
 def compute_decryption_share_for_selection(
-    key_pair: ElectionKeyPair,
+    key_pair: GuardianDecryptionKey,
     selection: CiphertextSelection,
     context: CiphertextElectionContext,
 ) -> Optional[CiphertextDecryptionSelection]:
@@ -400,7 +404,7 @@ def compute_compensated_decryption_share_for_selection(
 
 
 def partially_decrypt(
-    key_pair: ElectionKeyPair,
+    key_pair: GuardianDecryptionKey,
     elgamal: ElGamalCiphertext,
     extended_base_hash: ElementModQ,
     nonce_seed: ElementModQ = None,
@@ -27,6 +27,13 @@ class Configuration:
     This can also be seen as the maximum ballots where a selection on a ballot can only have one vote.
     """
 
+    range_proofs: bool = field(default=False)
+    """
+    Prove each contest's selection total lies in [0, number_elected] with a range proof
+    instead of adding placeholder selections and proving a constant total.
+    Verifiers expect `RangeChaumPedersenProof` contest proofs and no placeholders when set.
+    """
+
 
 # pylint: disable=too-many-instance-attributes
 @dataclass(eq=True, unsafe_hash=True)
@@ -91,6 +98,7 @@ def make_ciphertext_election_context(
     commitment_hash: ElementModQ,
     manifest_hash: ElementModQ,
     extended_data: Optional[Dict[str, str]] = None,
+    configuration: Optional[Configuration] = None,
 ) -> CiphertextElectionContext:
     """
     Makes a CiphertextElectionContext object.
@@ -100,6 +108,7 @@ def make_ciphertext_election_context(
     :param elgamal_public_key: the public key of the election
     :param commitment_hash: the hash of the commitments the guardians make to each other
     :param manifest_hash: the hash of the election metadata
+    :param configuration: the election's edge-case configuration (default `Configuration()`)
     """
 
     # What's a crypto_base_hash?
@@ -136,4 +145,5 @@ def make_ciphertext_election_context(
         crypto_base_hash,
         crypto_extended_base_hash,
         extended_data,
+        configuration if configuration is not None else Configuration(),
     )
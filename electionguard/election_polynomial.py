@@ -1,8 +1,10 @@
 from dataclasses import dataclass
+from secrets import randbits
 from typing import Dict, List
 
 from .elgamal import ElGamalKeyPair
 from .group import (
+    a_plus_bc_q,
     add_q,
     ElementModP,
     ElementModQ,
@@ -10,6 +12,7 @@ from .group import (
     div_q,
     mult_p,
     mult_q,
+    multi_pow_p,
     ONE_MOD_P,
     pow_p,
     pow_q,
@@ -155,3 +158,48 @@ def verify_polynomial_coordinate(
 
     value_output = g_pow_p(coordinate)
     return value_output == commitment_output
+
+
+_BATCH_WEIGHT_BITS = 64
+
+
+def verify_polynomial_coordinates(
+    coordinates: List[ElementModQ],
+    exponent_modifier: int,
+    commitments: List[List[PublicCommitment]],
+) -> bool:
+    """
+    Batch verify coordinate values from several polynomials evaluated at the same point
+
+    Each individual check g^P_i(ℓ) = ∏_j K_ij^(ℓ^j) is combined using random weights r_i
+    into g^(Σ r_i·P_i(ℓ)) = ∏_i (∏_j K_ij^(ℓ^j))^r_i so a receiving guardian pays for a
+    single full exponentiation of the generator and one multi-exponentiation instead of
+    one of each per sending guardian. A false result means at least one coordinate is
+    invalid; use `verify_polynomial_coordinate` to identify which.
+
+    :param coordinates: Values to be checked, one per polynomial
+    :param exponent_modifier: Unique modifier (usually sequence order) for exponent
+    :param commitments: Public commitments for coefficients of each polynomial
+    :return: True if every coordinate is on its polynomial
+    """
+    if len(coordinates) != len(commitments):
+        return False
+    if not coordinates:
+        return True
+
+    weights = [randbits(_BATCH_WEIGHT_BITS) | 1 for _ in coordinates]
+
+    # Evaluate ∏_j K_ij^(ℓ^j) per polynomial with Horner's rule so every
+    # exponentiation uses the small exponent ℓ.
+    evaluations: List[ElementModP] = []
+    for polynomial_commitments in commitments:
+        evaluation = ONE_MOD_P
+        for commitment in reversed(polynomial_commitments):
+            evaluation = mult_p(pow_p(evaluation, exponent_modifier), commitment)
+        evaluations.append(evaluation)
+
+    weighted_coordinate = ZERO_MOD_Q
+    for coordinate, weight in zip(coordinates, weights):
+        weighted_coordinate = a_plus_bc_q(weighted_coordinate, coordinate, weight)
+
+    return g_pow_p(weighted_coordinate) == multi_pow_p(evaluations, weights)
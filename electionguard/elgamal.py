@@ -1,5 +1,5 @@
 from dataclasses import dataclass
-from typing import Any, Iterable, Optional, Union
+from typing import Any, Iterable, List, Optional, Sequence, Union
 
 
 from .big_integer import bytes_to_hex
@@ -17,7 +17,7 @@ from .group import (
     rand_range_q,
 )
 from .hash import hash_elems
-from .hmac import get_hmac
+from .hmac import get_hmac, get_hmac_blocks
 from .logs import log_info, log_error
 from .utils import get_optional
 
@@ -84,6 +84,24 @@ class ElGamalCiphertext:
         """
         return self.decrypt_known_product(pow_p(public_key, nonce))
 
+    def decrypt_known_product_among(
+        self, product: ElementModP, plaintexts: Sequence[int] = (0, 1)
+    ) -> Optional[int]:
+        """
+        Decrypts an ElGamal ciphertext with a known product when the plaintext can only be one of a few values.
+
+        Checks data == product * g^m for each candidate m directly instead of inverting
+        the product and searching the discrete log.
+
+        :param product: The known product (blinding factor).
+        :param plaintexts: The possible plaintext values, e.g. 0 and 1 for a selection.
+        :return: The matching plaintext, or None if the ciphertext encrypts none of them.
+        """
+        for plaintext in plaintexts:
+            if mult_p(product, g_pow_p(plaintext)) == self.data:
+                return plaintext
+        return None
+
     def partial_decrypt(self, secret_key: ElGamalSecretKey) -> ElementModP:
         """
         Partially Decrypts an ElGamal ciphertext with a known ElGamal secret key.
@@ -133,12 +151,8 @@ class HashedElGamalCiphertext:
         session_key = hash_elems(self.pad, pow_p(self.pad, secret_key))
         data_bytes = to_padded_bytes(self.data)
 
-        (ciphertext_chunks, bit_length) = _get_chunks(data_bytes)
-        mac_key = get_hmac(
-            session_key.to_hex_bytes(),
-            encryption_seed.to_hex_bytes(),
-            bit_length,
-        )
+        (ciphertext, bit_length) = _pad_to_blocks(data_bytes)
+        (mac_key, keystream) = _get_keystream(session_key, encryption_seed, bit_length)
         to_mac = self.pad.to_hex_bytes() + data_bytes
         mac = bytes_to_hex(get_hmac(mac_key, to_mac))
 
@@ -146,16 +160,7 @@ class HashedElGamalCiphertext:
             log_error("MAC verification failed in decryption.")
             return None
 
-        data = b""
-        for i, block in enumerate(ciphertext_chunks):
-            data_key = get_hmac(
-                session_key.to_hex_bytes(),
-                encryption_seed.to_hex_bytes(),
-                bit_length,
-                (i + 1),
-            )
-            data += bytes([a ^ b for (a, b) in zip(block, data_key)])
-        return data
+        return _xor_bytes(ciphertext, keystream)
 
 
 def elgamal_keypair_from_secret(a: ElementModQ) -> Optional[ElGamalKeyPair]:
@@ -232,49 +237,103 @@ def hashed_elgamal_encrypt(
     :param encryption_seed: Encryption seed (Q) for election.
     """
 
+    ciphertext = _hashed_elgamal_encrypt(message, nonce, public_key, encryption_seed)
+
+    log_info(f": publicKey: {public_key.to_hex()}")
+    log_info(f": pad: {ciphertext.pad.to_hex()}")
+    log_info(f": data: {ciphertext.data}")
+    log_info(f": mac: {ciphertext.mac}")
+
+    return ciphertext
+
+
+def hashed_elgamal_encrypt_batch(
+    messages: Sequence[bytes],
+    nonces: Sequence[ElementModQ],
+    public_keys: Sequence[ElGamalPublicKey],
+    encryption_seeds: Sequence[ElementModQ],
+) -> List[HashedElGamalCiphertext]:
+    """
+    Encrypts many variable length byte messages, each with its own nonce, public key and seed.
+
+    Produces the same ciphertexts as calling `hashed_elgamal_encrypt` for each message,
+    without the per-message logging of 4096-bit values.
+
+    :param messages: messages (m) to encrypt; must be in bytes.
+    :param nonces: Randomly chosen nonces in [1, Q), one per message.
+    :param public_keys: ElGamal public keys, one per message.
+    :param encryption_seeds: Encryption seeds (Q), one per message.
+    """
+    assert (
+        len(messages) == len(nonces) == len(public_keys) == len(encryption_seeds)
+    ), "Each message requires a nonce, public key and encryption seed"
+
+    ciphertexts = [
+        _hashed_elgamal_encrypt(message, nonce, public_key, encryption_seed)
+        for (message, nonce, public_key, encryption_seed) in zip(
+            messages, nonces, public_keys, encryption_seeds
+        )
+    ]
+    log_info(f": hashed elgamal batch encrypted {len(ciphertexts)} messages")
+    return ciphertexts
+
+
+def _hashed_elgamal_encrypt(
+    message: bytes,
+    nonce: ElementModQ,
+    public_key: ElGamalPublicKey,
+    encryption_seed: ElementModQ,
+) -> HashedElGamalCiphertext:
     pad = g_pow_p(nonce)
     pubkey_pow_n = pow_p(public_key, nonce)
 
     session_key = hash_elems(pad, pubkey_pow_n)
 
-    (message_chunks, bit_length) = _get_chunks(message)
-    data = b""
-    for i, block in enumerate(message_chunks):
-        data_key = get_hmac(
-            session_key.to_hex_bytes(),
-            encryption_seed.to_hex_bytes(),
-            bit_length,
-            (i + 1),
-        )
-        data += bytes([a ^ b for (a, b) in zip(block, data_key)])
+    (plaintext, bit_length) = _pad_to_blocks(message)
+    (mac_key, keystream) = _get_keystream(session_key, encryption_seed, bit_length)
+    data = _xor_bytes(plaintext, keystream)
 
-    mac_key = get_hmac(
-        session_key.to_hex_bytes(), encryption_seed.to_hex_bytes(), bit_length
-    )
     to_mac = pad.to_hex_bytes() + data
     mac = get_hmac(mac_key, to_mac)
 
-    log_info(f": publicKey: {public_key.to_hex()}")
-    log_info(f": pad: {pad.to_hex()}")
-    log_info(f": data: {data!r}")
-    log_info(f": mac: {bytes_to_hex(mac)}")
-    log_info(f"to_mac {to_mac!r}")
-
     return HashedElGamalCiphertext(pad, bytes_to_hex(data), bytes_to_hex(mac))
 
 
-def _get_chunks(message: bytes) -> tuple[list[bytes], int]:
+def _pad_to_blocks(message: bytes) -> tuple[bytes, int]:
+    """Zero pad a message to a whole number of blocks, returning it with its bit length."""
     remainder = len(message) % _BLOCK_SIZE
     if remainder:
-        message += bytes([0 for _n in range(_BLOCK_SIZE - remainder)])
-    number_of_blocks = int(len(message) / _BLOCK_SIZE)
-    return (
-        [
-            message[_BLOCK_SIZE * i : _BLOCK_SIZE * (i + 1)]
-            for i in range(number_of_blocks)
-        ],
-        len(message) * 8,
+        message += bytes(_BLOCK_SIZE - remainder)
+    return (message, len(message) * 8)
+
+
+def _get_keystream(
+    session_key: ElementModQ, encryption_seed: ElementModQ, bit_length: int
+) -> tuple[bytes, bytes]:
+    """
+    Derive the mac key (block 0) and the data keystream (blocks 1 to n) for a message.
+
+    The hex byte encodings are computed once and the keyed hmac state is shared by all blocks.
+    """
+    session_key_bytes = session_key.to_hex_bytes()
+    encryption_seed_bytes = encryption_seed.to_hex_bytes()
+    if not bit_length:
+        return (get_hmac(session_key_bytes, encryption_seed_bytes), b"")
+
+    blocks = get_hmac_blocks(
+        session_key_bytes,
+        encryption_seed_bytes,
+        bit_length,
+        bit_length // (_BLOCK_SIZE * 8) + 1,
     )
+    return (blocks[:_BLOCK_SIZE], blocks[_BLOCK_SIZE:])
+
+
+def _xor_bytes(data: bytes, keystream: bytes) -> bytes:
+    """XOR two equal length byte strings as whole integers rather than byte by byte."""
+    return (
+        int.from_bytes(data, "big") ^ int.from_bytes(keystream, "big")
+    ).to_bytes(len(data), "big")
 
 
 def elgamal_add(*ciphertexts: ElGamalCiphertext) -> ElGamalCiphertext:
@@ -1,6 +1,8 @@
+from concurrent.futures import Executor, Future
 from datetime import datetime
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional, Type, TypeVar
+from threading import Lock
+from typing import Dict, List, Optional, Tuple, Type, TypeVar, Union
 from uuid import getnode
 
 from .ballot import (
@@ -42,6 +44,9 @@ from .utils import (
 
 _T = TypeVar("_T", bound="ContestData")
 
+# Contests with more selections and placeholders than this are split across executor tasks
+SELECTIONS_PER_TASK = 8
+
 
 @dataclass
 class ContestData:
@@ -98,7 +103,9 @@ class EncryptionMediator:
     """
     An object for caching election and encryption state.
 
-    It composes Elections and Ballots.
+    It composes Elections and Ballots. Each ballot's code chains to the code of the ballot
+    encrypted before it; only that last hash is sequential, so `encrypt_ballots` encrypts
+    ballot bodies in parallel and links their codes afterwards.
     """
 
     _internal_manifest: InternalManifest
@@ -114,19 +121,103 @@ class EncryptionMediator:
         self._internal_manifest = internal_manifest
         self._context = context
         self._encryption_seed = encryption_device.get_hash()
+        self._link_lock = Lock()
 
-    def encrypt(self, ballot: PlaintextBallot) -> Optional[CiphertextBallot]:
+    def encrypt(
+        self, ballot: PlaintextBallot, executor: Optional[Executor] = None
+    ) -> Optional[CiphertextBallot]:
         """
         Encrypt the specified ballot using the cached election context.
         """
 
         log_info(f" encrypt: objectId: {ballot.object_id}")
         encrypted_ballot = encrypt_ballot(
-            ballot, self._internal_manifest, self._context, self._encryption_seed
+            ballot,
+            self._internal_manifest,
+            self._context,
+            self._internal_manifest.manifest_hash,
+            executor=executor,
         )
-        if encrypted_ballot is not None and encrypted_ballot.code is not None:
-            self._encryption_seed = encrypted_ballot.code
-        return encrypted_ballot
+        if encrypted_ballot is None:
+            return None
+        return self.link([encrypted_ballot])[0]
+
+    def encrypt_ballots(
+        self, ballots: List[PlaintextBallot], executor: Optional[Executor] = None
+    ) -> List[Optional[CiphertextBallot]]:
+        """
+        Encrypt ballots in order, each chained to the previous one.
+
+        With an executor the ballot bodies are encrypted in parallel, one task per ballot;
+        the codes are then linked in a single sequential pass. Ballots that fail to
+        encrypt are `None` and left out of the chain.
+        """
+        bodies = encrypt_ballot_bodies(
+            ballots, self._internal_manifest, self._context, executor
+        )
+        linked = iter(self.link([body for body in bodies if body is not None]))
+        return [None if body is None else next(linked) for body in bodies]
+
+    def link(self, ballots: List[CiphertextBallot]) -> List[CiphertextBallot]:
+        """Chain encrypted ballots, in order, to the code of the last ballot of this mediator."""
+        linked = []
+        with self._link_lock:
+            for ballot in ballots:
+                chained = chain_ballot_code(ballot, self._encryption_seed)
+                if chained.code is not None:
+                    self._encryption_seed = chained.code
+                linked.append(chained)
+        return linked
+
+
+def chain_ballot_code(
+    ballot: CiphertextBallot, code_seed: ElementModQ
+) -> CiphertextBallot:
+    """
+    Rebuild an encrypted ballot with `code_seed` as the previous code in its ballot code.
+
+    Only the code seed and the code change: the contests, nonce and timestamp are kept,
+    so this costs one hash of the contest hashes and one for the code.
+    """
+    return make_ciphertext_ballot(
+        ballot.object_id,
+        ballot.style_id,
+        ballot.manifest_hash,
+        code_seed,
+        ballot.contests,
+        ballot.nonce,
+        ballot.timestamp,
+    )
+
+
+def encrypt_ballot_bodies(
+    ballots: List[PlaintextBallot],
+    internal_manifest: InternalManifest,
+    context: CiphertextElectionContext,
+    executor: Optional[Executor] = None,
+    should_verify_proofs: bool = False,
+) -> List[Optional[CiphertextBallot]]:
+    """
+    Encrypt ballots without chaining them, in order, one executor task per ballot.
+
+    The ballots use the manifest hash as code seed; pass them to `chain_ballot_code`
+    (or `EncryptionMediator.link`) to put them on a device's chain.
+    """
+    arguments = [
+        (
+            ballot,
+            internal_manifest,
+            context,
+            internal_manifest.manifest_hash,
+            None,
+            should_verify_proofs,
+        )
+        for ballot in ballots
+    ]
+    if executor is None:
+        return [encrypt_ballot(*args) for args in arguments]
+    futures = [executor.submit(encrypt_ballot, *args) for args in arguments]
+    return [future.result() for future in futures]
 
 
 def generate_device_uuid() -> int:
@@ -266,6 +357,7 @@ def encrypt_contest(
     crypto_extended_base_hash: ElementModQ,
     nonce_seed: ElementModQ,
     should_verify_proofs: bool = False,
+    range_proofs: bool = False,
 ) -> Optional[CiphertextBallotContest]:
     """
     Encrypt a specific `BallotContest` in the context of a specific `Ballot`.
@@ -283,6 +375,57 @@ def encrypt_contest(
     :param nonce_seed: an `ElementModQ` used as a header to seed the `Nonce` generated for this contest.
                  this value can be (or derived from) the Ballot nonce, but no relationship is required
     :param should_verify_proofs: specify if the proofs should be verified prior to returning (default False)
+    :param range_proofs: prove the selection total with a range proof instead of adding placeholders
+    """
+    plan = _plan_contest(contest, contest_description, nonce_seed, range_proofs)
+    if plan is None:
+        return None
+
+    encrypted_selections = _encrypt_planned_selections(
+        plan.selections,
+        elgamal_public_key,
+        crypto_extended_base_hash,
+        plan.contest_nonce,
+        should_verify_proofs,
+    )
+    if encrypted_selections is None:
+        return None  # log will have happened earlier
+
+    return _finish_contest(
+        contest,
+        contest_description,
+        plan,
+        encrypted_selections,
+        elgamal_public_key,
+        crypto_extended_base_hash,
+        should_verify_proofs,
+    )
+
+
+@dataclass
+class _ContestPlan:
+    """The plaintext selections of a contest, in order, with the nonces to encrypt them."""
+
+    error: Optional[ContestErrorType]
+    error_data: Optional[List[SelectionId]]
+    contest_description_hash: ElementModQ
+    contest_nonce: ElementModQ
+    chaum_pedersen_nonce: ElementModQ
+    selections: List[Tuple[PlaintextBallotSelection, SelectionDescription, bool]]
+    selection_total: Optional[int] = None
+    """Votes to prove with a range proof; `None` when placeholders make up the total"""
+
+
+def _plan_contest(
+    contest: PlaintextBallotContest,
+    contest_description: ContestDescriptionWithPlaceholders,
+    nonce_seed: ElementModQ,
+    range_proofs: bool = False,
+) -> Optional[_ContestPlan]:
+    """
+    Validate a contest and list the selections to encrypt: one per selection
+    description (explicit `False` where no vote was given) followed by the placeholders,
+    which are left out when the total is proven with a range proof.
     """
     error: Optional[ContestErrorType] = None
     error_data: Optional[List[SelectionId]] = None
@@ -305,58 +448,45 @@ def encrypt_contest(
     contest_nonce = nonce_sequence[contest_description.sequence_order]
     chaum_pedersen_nonce = next(iter(nonce_sequence))
 
-    encrypted_selections: List[CiphertextBallotSelection] = []
+    selections: List[Tuple[PlaintextBallotSelection, SelectionDescription, bool]] = []
 
     selection_count = 0
 
-    # TODO: ISSUE #54 this code could be inefficient if we had a contest
-    # with a lot of choices, although the O(n^2) iteration here is small
-    # compared to the huge cost of doing the cryptography.
+    # Index the voter's selections once instead of scanning them per description;
+    # on an overvote no votes are counted and placeholders are used instead
+    voted_selections: Dict[str, PlaintextBallotSelection] = {}
+    if error is not ContestErrorType.OverVote:
+        for selection in contest.ballot_selections:
+            voted_selections.setdefault(selection.object_id, selection)
 
-    # Generate the encrypted selections
+    # Plan the encrypted selections
     for description in contest_description.ballot_selections:
-        has_selection = False
-        encrypted_selection = None
-
-        # iterate over the actual selections for each contest description
-        # and apply the selected value if it exists.  If it does not, an explicit
+        # apply the selected value if it exists.  If it does not, an explicit
         # false is entered instead and the selection_count is not incremented
         # this allows consumers to only pass in the relevant selections made by a voter
-        for selection in contest.ballot_selections:
-            # If overvote, no votes should be counted and instead placeholders should be used.
-            if (
-                selection.object_id == description.object_id
-                and error is not ContestErrorType.OverVote
-            ):
-                # track the selection count so we can append the
-                # appropriate number of true placeholder votes
-                has_selection = True
-                selection_count += selection.vote
-                encrypted_selection = encrypt_selection(
-                    selection,
-                    description,
-                    elgamal_public_key,
-                    crypto_extended_base_hash,
-                    contest_nonce,
-                    should_verify_proofs=should_verify_proofs,
-                )
-                break
+        use_selection = voted_selections.get(description.object_id)
+        if use_selection is not None:
+            # track the selection count so we can append the
+            # appropriate number of true placeholder votes
+            selection_count += use_selection.vote
 
-        if not has_selection:
+        if use_selection is None:
             # No selection was made for this possible value
             # so we explicitly set it to false
-            encrypted_selection = encrypt_selection(
-                selection_from(description),
-                description,
-                elgamal_public_key,
-                crypto_extended_base_hash,
-                contest_nonce,
-                should_verify_proofs=should_verify_proofs,
-            )
-
-        if encrypted_selection is None:
-            return None  # log will have happened earlier
-        encrypted_selections.append(get_optional(encrypted_selection))
+            use_selection = selection_from(description)
+
+        selections.append((use_selection, description, False))
+
+    if range_proofs:
+        return _ContestPlan(
+            error,
+            error_data,
+            contest_description_hash,
+            contest_nonce,
+            chaum_pedersen_nonce,
+            selections,
+            selection_total=selection_count,
+        )
 
     # Handle Placeholder selections
     # After we loop through all of the real selections on the ballot,
@@ -372,26 +502,66 @@ def encrypt_contest(
             select_placeholder = True
             selection_count += 1
 
+        selections.append(
+            (
+                selection_from(
+                    description=placeholder,
+                    is_placeholder=True,
+                    is_affirmative=select_placeholder,
+                ),
+                placeholder,
+                True,
+            )
+        )
+
+    return _ContestPlan(
+        error,
+        error_data,
+        contest_description_hash,
+        contest_nonce,
+        chaum_pedersen_nonce,
+        selections,
+    )
+
+
+def _encrypt_planned_selections(
+    selections: List[Tuple[PlaintextBallotSelection, SelectionDescription, bool]],
+    elgamal_public_key: ElGamalPublicKey,
+    crypto_extended_base_hash: ElementModQ,
+    contest_nonce: ElementModQ,
+    should_verify_proofs: bool = False,
+) -> Optional[List[CiphertextBallotSelection]]:
+    """Encrypt planned selections in order; `None` if any of them fails."""
+    encrypted_selections: List[CiphertextBallotSelection] = []
+    for selection, description, is_placeholder in selections:
         encrypted_selection = encrypt_selection(
-            selection=selection_from(
-                description=placeholder,
-                is_placeholder=True,
-                is_affirmative=select_placeholder,
-            ),
-            selection_description=placeholder,
-            elgamal_public_key=elgamal_public_key,
-            crypto_extended_base_hash=crypto_extended_base_hash,
-            nonce_seed=contest_nonce,
-            is_placeholder=True,
+            selection,
+            description,
+            elgamal_public_key,
+            crypto_extended_base_hash,
+            contest_nonce,
+            is_placeholder=is_placeholder,
             should_verify_proofs=should_verify_proofs,
         )
         if encrypted_selection is None:
             return None  # log will have happened earlier
         encrypted_selections.append(get_optional(encrypted_selection))
+    return encrypted_selections
 
+
+def _finish_contest(
+    contest: PlaintextBallotContest,
+    contest_description: ContestDescriptionWithPlaceholders,
+    plan: _ContestPlan,
+    encrypted_selections: List[CiphertextBallotSelection],
+    elgamal_public_key: ElGamalPublicKey,
+    crypto_extended_base_hash: ElementModQ,
+    should_verify_proofs: bool = False,
+) -> Optional[CiphertextBallotContest]:
+    """Encrypt the contest data and prove the selection total of encrypted selections."""
     encrypted_contest_data = hashed_elgamal_encrypt(
-        ContestData(error, error_data, contest.write_ins).to_bytes(),
-        Nonces(contest_nonce, "constant-extended-data")[0],
+        ContestData(plan.error, plan.error_data, contest.write_ins).to_bytes(),
+        Nonces(plan.contest_nonce, "constant-extended-data")[0],
         elgamal_public_key,
         crypto_extended_base_hash,
     )
@@ -400,19 +570,20 @@ def encrypt_contest(
     encrypted_contest = make_ciphertext_ballot_contest(
         contest.object_id,
         contest_description.sequence_order,
-        contest_description_hash,
+        plan.contest_description_hash,
         encrypted_selections,
         elgamal_public_key,
         crypto_extended_base_hash,
-        chaum_pedersen_nonce,
+        plan.chaum_pedersen_nonce,
         contest_description.number_elected,
-        nonce=contest_nonce,
+        nonce=plan.contest_nonce,
         extended_data=encrypted_contest_data,
+        selection_total=plan.selection_total,
     )
 
     if should_verify_proofs or not encrypted_contest.proof:
         if encrypted_contest.is_valid_encryption(
-            contest_description_hash, elgamal_public_key, crypto_extended_base_hash
+            plan.contest_description_hash, elgamal_public_key, crypto_extended_base_hash
         ):
             return encrypted_contest
         log_warning(
@@ -435,6 +606,7 @@ def encrypt_ballot(
     encryption_seed: ElementModQ,
     nonce: Optional[ElementModQ] = None,
     should_verify_proofs: bool = False,
+    executor: Optional[Executor] = None,
 ) -> Optional[CiphertextBallot]:
     """
     Encrypt a specific `Ballot` in the context of a specific `CiphertextElectionContext`.
@@ -453,6 +625,8 @@ def encrypt_ballot(
     :param nonce: an optional `int` used to seed the `Nonce` generated for this contest
                  if this value is not provided, the secret generating mechanism of the OS provides its own
     :param should_verify_proofs: specify if the proofs should be verified prior to returning (default False)
+    :param executor: an optional executor (e.g. a process pool) to encrypt contests and the
+        selections of large contests in parallel; the result is identical to a sequential run
     """
 
     # Determine the relevant range of contests for this ballot style
@@ -483,6 +657,7 @@ def encrypt_ballot(
         context,
         nonce_seed,
         should_verify_proofs=should_verify_proofs,
+        executor=executor,
     )
     if encrypted_contests is None:
         return None
@@ -519,31 +694,121 @@ def encrypt_ballot_contests(
     context: CiphertextElectionContext,
     nonce_seed: ElementModQ,
     should_verify_proofs: bool = False,
+    executor: Optional[Executor] = None,
+    selections_per_task: int = SELECTIONS_PER_TASK,
 ) -> Optional[List[CiphertextBallotContest]]:
-    """Encrypt contests from a plaintext ballot with a specific style"""
+    """
+    Encrypt contests from a plaintext ballot with a specific style
+
+    With an executor, each contest is a task; contests with more than `selections_per_task`
+    selections and placeholders are split into tasks of that many selections and their
+    contest proof is made once all of them are done. Every nonce is derived from
+    `nonce_seed`, so the contests come back in order and identical to a sequential run.
+    """
     encrypted_contests: List[CiphertextBallotContest] = []
+    pending: List[
+        Tuple[
+            PlaintextBallotContest,
+            ContestDescriptionWithPlaceholders,
+            Optional[_ContestPlan],
+            Union[Future, List[Future]],
+        ]
+    ] = []
+
+    range_proofs = context.configuration.range_proofs
+    ballot_contests: Dict[str, PlaintextBallotContest] = {}
+    for contest in ballot.contests:
+        ballot_contests.setdefault(contest.object_id, contest)
 
     # Only iterate on contests for this specific ballot style
     for ballot_style_contest in description.get_contests_for(ballot.style_id):
-        use_contest = None
-        for contest in ballot.contests:
-            if contest.object_id == ballot_style_contest.object_id:
-                use_contest = contest
-                break
+        use_contest = ballot_contests.get(ballot_style_contest.object_id)
 
         # no selections provided for the contest, so create a placeholder contest
         if not use_contest:
             use_contest = contest_from(ballot_style_contest)
 
-        encrypted_contest = encrypt_contest(
-            use_contest,
-            ballot_style_contest,
-            context.elgamal_public_key,
-            context.crypto_extended_base_hash,
-            nonce_seed,
-            should_verify_proofs=should_verify_proofs,
+        if executor is None:
+            encrypted_contest = encrypt_contest(
+                use_contest,
+                ballot_style_contest,
+                context.elgamal_public_key,
+                context.crypto_extended_base_hash,
+                nonce_seed,
+                should_verify_proofs=should_verify_proofs,
+                range_proofs=range_proofs,
+            )
+
+            if encrypted_contest is None:
+                return None
+            encrypted_contests.append(get_optional(encrypted_contest))
+            continue
+
+        selection_total = len(ballot_style_contest.ballot_selections)
+        if not range_proofs:
+            selection_total += len(ballot_style_contest.placeholder_selections)
+        if selection_total <= selections_per_task:
+            pending.append(
+                (
+                    use_contest,
+                    ballot_style_contest,
+                    None,
+                    executor.submit(
+                        encrypt_contest,
+                        use_contest,
+                        ballot_style_contest,
+                        context.elgamal_public_key,
+                        context.crypto_extended_base_hash,
+                        nonce_seed,
+                        should_verify_proofs,
+                        range_proofs,
+                    ),
+                )
+            )
+            continue
+
+        plan = _plan_contest(use_contest, ballot_style_contest, nonce_seed, range_proofs)
+        if plan is None:
+            return None
+        pending.append(
+            (
+                use_contest,
+                ballot_style_contest,
+                plan,
+                [
+                    executor.submit(
+                        _encrypt_planned_selections,
+                        plan.selections[start : start + selections_per_task],
+                        context.elgamal_public_key,
+                        context.crypto_extended_base_hash,
+                        plan.contest_nonce,
+                        should_verify_proofs,
+                    )
+                    for start in range(0, len(plan.selections), selections_per_task)
+                ],
+            )
         )
 
+    for use_contest, ballot_style_contest, plan, work in pending:
+        if plan is None:
+            encrypted_contest = work.result()  # type: ignore
+        else:
+            encrypted_selections: List[CiphertextBallotSelection] = []
+            for chunk in work:  # type: ignore
+                encrypted_chunk = chunk.result()
+                if encrypted_chunk is None:
+                    return None
+                encrypted_selections.extend(encrypted_chunk)
+            encrypted_contest = _finish_contest(
+                use_contest,
+                ballot_style_contest,
+                plan,
+                encrypted_selections,
+                context.elgamal_public_key,
+                context.crypto_extended_base_hash,
+                should_verify_proofs,
+            )
+
         if encrypted_contest is None:
             return None
         encrypted_contests.append(get_optional(encrypted_contest))
@@ -6,7 +6,7 @@ made about timing or other side-channels.
 """
 
 from abc import ABC
-from typing import Final, Optional, Union
+from typing import Final, List, Optional, Sequence, Union
 from secrets import randbelow
 from sys import maxsize
 
@@ -265,6 +265,92 @@ def g_pow_p(e: ElementModPOrQorInt) -> ElementModP:
     return ElementModP(powmod(_GENERATOR, e, _LARGE_PRIME))
 
 
+_MULTI_POW_WINDOW = 4
+
+
+def multi_pow_p(
+    bases: Sequence[ElementModPOrQorInt], exponents: Sequence[ElementModPOrQorInt]
+) -> ElementModP:
+    """
+    Compute the product of b_i^e_i mod p over all pairs using simultaneous exponentiation.
+
+    Uses a fixed-window Straus method so the squarings are shared between all bases,
+    which is considerably cheaper than multiplying individual `pow_p` results together
+    when there are many bases with short exponents.
+
+    :param bases: Elements in [0,P).
+    :param exponents: Non-negative exponents, one per base.
+    """
+    assert len(bases) == len(exponents), "Each base requires an exponent"
+    mask = (1 << _MULTI_POW_WINDOW) - 1
+
+    tables: List[List[mpz]] = []
+    exponent_values: List[mpz] = []
+    max_bits = 0
+    for base, exponent in zip(bases, exponents):
+        b = _get_mpz(base) % _LARGE_PRIME
+        table = [mpz(1), b]
+        for _ in range(mask - 1):
+            table.append((table[-1] * b) % _LARGE_PRIME)
+        tables.append(table)
+        e = _get_mpz(exponent)
+        exponent_values.append(e)
+        max_bits = max(max_bits, e.bit_length())
+
+    result = mpz(1)
+    for window in range((max_bits + _MULTI_POW_WINDOW - 1) // _MULTI_POW_WINDOW - 1, -1, -1):
+        for _ in range(_MULTI_POW_WINDOW):
+            result = (result * result) % _LARGE_PRIME
+        shift = window * _MULTI_POW_WINDOW
+        for table, e in zip(tables, exponent_values):
+            digit = (e >> shift) & mask
+            if digit:
+                result = (result * table[digit]) % _LARGE_PRIME
+    return ElementModP(result)
+
+
+_FIXED_BASE_WINDOW = 6
+
+
+class FixedBasePowP:
+    """
+    Repeated exponentiation of a single base mod p using precomputed powers.
+
+    Stores b^(d * 2^(w*i)) for every w-bit digit d of every window i of a Q-sized
+    exponent, so each `pow` needs only one multiplication per non-zero digit and no
+    squarings. Building the table costs about as much as ten `pow_p` calls, so it pays
+    off when the same base (e.g. the joint public key) is raised to many exponents.
+    """
+
+    def __init__(self, base: ElementModPOrQorInt, window: int = _FIXED_BASE_WINDOW):
+        self.base = _get_mpz(base) % _LARGE_PRIME
+        self.window = window
+        self._mask = (1 << window) - 1
+        self._tables: List[List[mpz]] = []
+        power = self.base
+        for _ in range((int(_SMALL_PRIME).bit_length() + window - 1) // window):
+            table = [mpz(1), power]
+            for _ in range(self._mask - 1):
+                table.append((table[-1] * power) % _LARGE_PRIME)
+            self._tables.append(table)
+            power = (table[-1] * power) % _LARGE_PRIME
+
+    def pow(self, exponent: ElementModPOrQorInt) -> ElementModP:
+        """Compute base^exponent mod p."""
+        e = _get_mpz(exponent)
+        if e < 0 or e.bit_length() > len(self._tables) * self.window:
+            return pow_p(self.base, e)
+        result = mpz(1)
+        for table in self._tables:
+            if not e:
+                break
+            digit = e & self._mask
+            if digit:
+                result = (result * table[digit]) % _LARGE_PRIME
+            e >>= self.window
+        return ElementModP(result)
+
+
 def rand_q() -> ElementModQ:
     """
     Generate random number between 0 and Q.
@@ -26,12 +26,11 @@ from .key_ceremony import (
     ElectionPartialKeyVerification,
     ElectionPublicKey,
     generate_election_key_pair,
-    generate_election_partial_key_backup,
+    generate_election_partial_key_backups,
     generate_election_partial_key_challenge,
     verify_election_partial_key_backup,
     verify_election_partial_key_challenge,
 )
-from .logs import log_warning
 from .schnorr import SchnorrProof
 from .tally import CiphertextTally
 from .type import BallotId, GuardianId
@@ -312,16 +311,13 @@ class Guardian:
         """
         Generate all election partial key backups based on existing public keys.
         """
-        for guardian_key in self._guardian_election_public_keys.values():
-            backup = generate_election_partial_key_backup(
-                self.id, self._election_keys.polynomial, guardian_key
-            )
-            if backup is None:
-                log_warning(
-                    f"guardian; {self.id} could not generate election partial key backups: failed to encrypt"
-                )
-                return False
-            self._backups_to_share[guardian_key.owner_id] = backup
+        backups = generate_election_partial_key_backups(
+            self.id,
+            self._election_keys.polynomial,
+            list(self._guardian_election_public_keys.values()),
+        )
+        for backup in backups:
+            self._backups_to_share[backup.designated_id] = backup
 
         return True
 
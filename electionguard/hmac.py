@@ -1,6 +1,7 @@
 """Implementation of Hashing for Message Authentication Codes (HMAC)"""
 
-from hmac import digest
+from hashlib import sha256
+from hmac import digest, new
 from typing import Optional
 
 _BYTE_LENGTH = 4
@@ -27,6 +28,31 @@ def get_hmac(
     return digest(key, message, "SHA256")
 
 
+def get_hmac_blocks(key: bytes, message: bytes, length: int, count: int) -> bytes:
+    """
+    Get the concatenated hmac digests of a message for block positions 0 to count - 1.
+
+    Equivalent to joining `get_hmac(key, message, length, start)` for each start, but
+    the keyed hmac state is computed once and copied for every block.
+
+    :param key: key (k) in bytes
+    :param message: message in bytes
+    :param length: length (L) of total message
+    :param count: number of blocks to derive
+    :return: count digests in bytes, ordered by starting byte position
+    """
+
+    keyed = new(key, digestmod=sha256)
+    end_byte = length.to_bytes(_BYTE_LENGTH, _BYTE_ORDER)
+    blocks = bytearray(keyed.digest_size * count)
+    view = memoryview(blocks)
+    for start in range(count):
+        block = keyed.copy()
+        block.update(start.to_bytes(_BYTE_LENGTH, _BYTE_ORDER) + message + end_byte)
+        view[start * keyed.digest_size : (start + 1) * keyed.digest_size] = block.digest()
+    return bytes(blocks)
+
+
 def _fix_message_length(msg: bytes, length: int, start: int = 0) -> bytes:
     """
     Fix the message length to a set byte length with starting and end bytes.
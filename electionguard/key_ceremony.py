@@ -1,5 +1,5 @@
 from dataclasses import dataclass
-from typing import List, Type, TypeVar
+from typing import List, Sequence, Type, TypeVar
 
 from .serialize import padded_decode, padded_encode
 from .election_polynomial import (
@@ -15,6 +15,7 @@ from .elgamal import (
     HashedElGamalCiphertext,
     elgamal_combine_public_keys,
     hashed_elgamal_encrypt,
+    hashed_elgamal_encrypt_batch,
 )
 from .group import ElementModQ, rand_q
 from .hash import hash_elems
@@ -91,6 +92,35 @@ class ElectionKeyPair:
             self.polynomial.get_proofs(),
         )
 
+    def decryption_key(self) -> "ElectionDecryptionKey":
+        """The part of the key pair needed to partially decrypt"""
+        return ElectionDecryptionKey(self.owner_id, self.sequence_order, self.key_pair)
+
+
+@dataclass
+class ElectionDecryptionKey:
+    """
+    A guardian's election key pair without its secret polynomial
+
+    Holds everything a partial decryption needs, so it can be built from a stored
+    secret key without parsing or regenerating the polynomial.
+    """
+
+    owner_id: GuardianId
+    """
+    The id of the owner guardian
+    """
+
+    sequence_order: int
+    """
+    The sequence order of the owner guardian
+    """
+
+    key_pair: ElGamalKeyPair
+    """
+    The pair of public and private election keys for the guardian
+    """
+
 
 @dataclass
 class ElectionJointKey:
@@ -233,6 +263,48 @@ def generate_election_partial_key_backup(
     )
 
 
+def generate_election_partial_key_backups(
+    sender_guardian_id: GuardianId,
+    sender_guardian_polynomial: ElectionPolynomial,
+    receiver_guardian_public_keys: Sequence[ElectionPublicKey],
+) -> List[ElectionPartialKeyBackup]:
+    """
+    Generate election partial key backups for many receiving guardians at once
+    :param sender_guardian_id: Owner of election key
+    :param sender_guardian_polynomial: The owner's Election polynomial
+    :param receiver_guardian_public_keys: The receiving guardians' public keys
+    :return: Election partial key backups, in the order of the receiving keys
+    """
+    coordinates = [
+        CoordinateData(
+            compute_polynomial_coordinate(
+                public_key.sequence_order, sender_guardian_polynomial
+            )
+        ).to_bytes()
+        for public_key in receiver_guardian_public_keys
+    ]
+    encrypted_coordinates = hashed_elgamal_encrypt_batch(
+        coordinates,
+        [rand_q() for _ in receiver_guardian_public_keys],
+        [public_key.key for public_key in receiver_guardian_public_keys],
+        [
+            get_backup_seed(public_key.owner_id, public_key.sequence_order)
+            for public_key in receiver_guardian_public_keys
+        ],
+    )
+    return [
+        ElectionPartialKeyBackup(
+            sender_guardian_id,
+            public_key.owner_id,
+            public_key.sequence_order,
+            encrypted_coordinate,
+        )
+        for (public_key, encrypted_coordinate) in zip(
+            receiver_guardian_public_keys, encrypted_coordinates
+        )
+    ]
+
+
 def get_backup_seed(receiver_guardian_id: str, sequence_order: int) -> ElementModQ:
     return hash_elems(receiver_guardian_id, sequence_order)
 
@@ -550,20 +550,15 @@ class ContestDescriptionWithPlaceholders(ContestDescription):
         :param selection_id: Id of Selection
         :return: description
         """
-        matching_selections = list(
-            filter(lambda i: i.object_id == selection_id, self.ballot_selections)
-        )
-
-        if any(matching_selections):
-            return matching_selections[0]
-
-        matching_placeholders = list(
-            filter(lambda i: i.object_id == selection_id, self.placeholder_selections)
-        )
-
-        if any(matching_placeholders):
-            return matching_placeholders[0]
-        return None
+        # The index is built on first use and kept out of the dataclass fields,
+        # so it is neither serialized nor compared
+        index = self.__dict__.get("_selection_index")
+        if index is None:
+            index = {}
+            for selection in self.ballot_selections + self.placeholder_selections:
+                index.setdefault(selection.object_id, selection)
+            self.__dict__["_selection_index"] = index
+        return index.get(selection_id)
 
 
 class SpecVersion(Enum):
@@ -884,6 +879,39 @@ class InternalManifest:
         object.__setattr__(
             self, "contests", self._generate_contests_with_placeholders(manifest)
         )
+        self._build_indexes()
+
+    def _build_indexes(self) -> None:
+        """
+        Index contests and ballot styles by id, and the contests of each ballot style,
+        so lookups per ballot do not scan the manifest.
+        The indexes are plain attributes: they are not serialized or compared.
+        """
+        contests_by_id: Dict[str, ContestDescriptionWithPlaceholders] = {}
+        positions_by_district: Dict[str, List[int]] = {}
+        for position, contest in enumerate(self.contests):
+            contests_by_id.setdefault(contest.object_id, contest)
+            positions_by_district.setdefault(contest.electoral_district_id, []).append(
+                position
+            )
+
+        styles_by_id: Dict[str, BallotStyle] = {}
+        contests_by_style: Dict[str, List[ContestDescriptionWithPlaceholders]] = {}
+        for style in self.ballot_styles:
+            if style.object_id in styles_by_id:
+                continue
+            styles_by_id[style.object_id] = style
+            positions: Set[int] = set()
+            for gp_unit_id in style.geopolitical_unit_ids or []:
+                positions.update(positions_by_district.get(gp_unit_id, []))
+            # keep the manifest order of the contests
+            contests_by_style[style.object_id] = [
+                self.contests[position] for position in sorted(positions)
+            ]
+
+        object.__setattr__(self, "_contests_by_id", contests_by_id)
+        object.__setattr__(self, "_styles_by_id", styles_by_id)
+        object.__setattr__(self, "_contests_by_style", contests_by_style)
 
     def contest_for(
         self, contest_id: str
@@ -893,21 +921,15 @@ class InternalManifest:
         :param contest_id: Contest id
         :return: Contest description or none
         """
-        matching_contests = list(
-            filter(lambda i: i.object_id == contest_id, self.contests)
-        )
-
-        if any(matching_contests):
-            return matching_contests[0]
-        return None
+        return self._contests_by_id.get(contest_id)
 
     def get_ballot_style(self, ballot_style_id: str) -> BallotStyle:
         """
         Get a ballot style for a specified ballot_style_id
         """
-        style = list(
-            filter(lambda i: i.object_id == ballot_style_id, self.ballot_styles)
-        )[0]
+        style = self._styles_by_id.get(ballot_style_id)
+        if style is None:
+            raise IndexError(f"unknown ballot style {ballot_style_id}")
         return style
 
     def get_contests_for(
@@ -918,15 +940,9 @@ class InternalManifest:
         :param ballot_style_id: ballot style id
         :return: contest descriptions
         """
-        style = self.get_ballot_style(ballot_style_id)
-        if style.geopolitical_unit_ids is None:
-            return []
-        # pylint: disable=unnecessary-comprehension
-        gp_unit_ids = [gp_unit_id for gp_unit_id in style.geopolitical_unit_ids]
-        contests = list(
-            filter(lambda i: i.electoral_district_id in gp_unit_ids, self.contests)
-        )
-        return contests
+        if ballot_style_id not in self._contests_by_style:
+            self.get_ballot_style(ballot_style_id)
+        return list(self._contests_by_style[ballot_style_id])
 
     @staticmethod
     def _generate_contests_with_placeholders(
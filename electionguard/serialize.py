@@ -27,7 +27,6 @@ _file_extension = "json"
 
 _config = Config(
     cast=[
-        datetime,
         BigInteger,
         ContestErrorType,
         ElementModP,
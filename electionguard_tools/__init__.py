@@ -1,108 +1,173 @@
 import importlib.metadata
 
 # <AUTOGEN_INIT>
-from electionguard_tools import factories
-from electionguard_tools import helpers
-from electionguard_tools import scripts
-from electionguard_tools import strategies
+def lazy_import(module_name, submodules, submod_attrs):
+    """
+    Build a module level ``__getattr__`` that imports submodules on first access.
 
-from electionguard_tools.factories import (
-    AllPrivateElectionData,
-    AllPublicElectionData,
-    BallotFactory,
-    ElectionFactory,
-    NUMBER_OF_GUARDIANS,
-    QUORUM,
-    ballot_factory,
-    election_factory,
-    get_contest_description_well_formed,
-    get_selection_description_well_formed,
-    get_selection_poorly_formed,
-    get_selection_well_formed,
-)
-from electionguard_tools.helpers import (
-    CIPHERTEXT_BALLOT_PREFIX,
-    COEFFICIENTS_FILE_NAME,
-    CONSTANTS_FILE_NAME,
-    CONTEXT_FILE_NAME,
-    DEVICES_DIR,
-    DEVICE_PREFIX,
-    ELECTION_RECORD_DIR,
-    ENCRYPTED_TALLY_FILE_NAME,
-    ElectionBuilder,
-    GUARDIANS_DIR,
-    GUARDIAN_PREFIX,
-    KeyCeremonyOrchestrator,
-    MANIFEST_FILE_NAME,
-    PLAINTEXT_BALLOT_PREFIX,
-    PRIVATE_DATA_DIR,
-    PRIVATE_GUARDIAN_PREFIX,
-    SPOILED_BALLOTS_DIR,
-    SPOILED_BALLOT_PREFIX,
-    SUBMITTED_BALLOTS_DIR,
-    SUBMITTED_BALLOT_PREFIX,
-    TALLY_FILE_NAME,
-    TallyCeremonyOrchestrator,
-    accumulate_plaintext_ballots,
-    election_builder,
-    export,
-    export_private_data,
-    export_record,
-    key_ceremony_orchestrator,
-    tally_accumulate,
-    tally_ceremony_orchestrator,
-)
-from electionguard_tools.scripts import (
-    DEFAULT_NUMBER_OF_BALLOTS,
-    DEFAULT_SAMPLE_MANIFEST,
-    DEFAULT_SPEC_VERSION,
-    DEFAULT_SPOIL_RATE,
-    DEFAULT_USE_ALL_GUARDIANS,
-    DEFAULT_USE_PRIVATE_DATA,
-    ElectionSampleDataGenerator,
-    sample_generator,
-)
-from electionguard_tools.strategies import (
-    CiphertextElectionsTupleType,
-    ElectionsAndBallotsTupleType,
-    annotated_emails,
-    annotated_strings,
-    ballot_styles,
-    candidate_contest_descriptions,
-    candidates,
-    ciphertext_elections,
-    contact_infos,
-    contest_descriptions,
-    contest_descriptions_room_for_overvoting,
-    election,
-    election_descriptions,
-    election_types,
-    elections_and_ballots,
-    elements_mod_p,
-    elements_mod_p_no_zero,
-    elements_mod_q,
-    elements_mod_q_no_zero,
-    elgamal,
-    elgamal_keypairs,
-    geopolitical_units,
-    group,
-    human_names,
-    internationalized_human_names,
-    internationalized_texts,
-    language_human_names,
-    languages,
-    party_lists,
-    plaintext_voted_ballot,
-    plaintext_voted_ballots,
-    referendum_contest_descriptions,
-    reporting_unit_types,
-    two_letter_codes,
+    The factories and strategies depend on hypothesis, which is slow to import and
+    only needed by tests, so nothing is imported until an attribute is requested.
+    """
+    import importlib
+
+    name_to_submod = {
+        func: mod for mod, funcs in submod_attrs.items() for func in funcs
+    }
+
+    def __getattr__(name):
+        if name in submodules:
+            attr = importlib.import_module(f"{module_name}.{name}")
+        elif name in name_to_submod:
+            module = importlib.import_module(f"{module_name}.{name_to_submod[name]}")
+            attr = getattr(module, name)
+        else:
+            raise AttributeError(f"module {module_name!r} has no attribute {name!r}")
+        globals()[name] = attr
+        return attr
+
+    return __getattr__
+
+
+__getattr__ = lazy_import(
+    __name__,
+    submodules={
+        "factories",
+        "helpers",
+        "scripts",
+        "strategies",
+    },
+    submod_attrs={
+        "factories": [
+            "AllPrivateElectionData",
+            "AllPublicElectionData",
+            "BallotFactory",
+            "ElectionFactory",
+            "NUMBER_OF_GUARDIANS",
+            "QUORUM",
+            "ballot_factory",
+            "election_factory",
+            "get_contest_description_well_formed",
+            "get_selection_description_well_formed",
+            "get_selection_poorly_formed",
+            "get_selection_well_formed",
+        ],
+        "helpers": [
+            "ARCHIVE_COMPRESSION",
+            "ARCHIVE_MAGIC",
+            "ARCHIVE_SECTIONS",
+            "ARCHIVE_SEGMENT_BYTES",
+            "ARCHIVE_VERSION",
+            "CHECKPOINT_VERSION",
+            "CIPHERTEXT_BALLOT_PREFIX",
+            "COEFFICIENTS_FILE_NAME",
+            "CONSTANTS_FILE_NAME",
+            "CONTEXT_FILE_NAME",
+            "DEVICES_DIR",
+            "DEVICE_PREFIX",
+            "ELECTION_RECORD_ARCHIVE",
+            "ELECTION_RECORD_DIR",
+            "ENCRYPTED_TALLY_FILE_NAME",
+            "ElectionBuilder",
+            "GUARDIANS_DIR",
+            "GUARDIAN_PREFIX",
+            "KeyCeremonyOrchestrator",
+            "MANIFEST_FILE_NAME",
+            "PLAINTEXT_BALLOT_PREFIX",
+            "PRIVATE_DATA_DIR",
+            "PRIVATE_GUARDIAN_PREFIX",
+            "ProgressCallback",
+            "RecordArchive",
+            "RecordArchiveWriter",
+            "SPOILED_BALLOTS_DIR",
+            "SPOILED_BALLOT_PREFIX",
+            "SUBMITTED_BALLOTS_DIR",
+            "SUBMITTED_BALLOT_PREFIX",
+            "TALLY_FILE_NAME",
+            "TallyCeremonyOrchestrator",
+            "VERIFY_CHUNK_SIZE",
+            "VerificationFailure",
+            "VerificationReport",
+            "accumulate_plaintext_ballots",
+            "election_builder",
+            "export",
+            "export_private_data",
+            "export_record",
+            "export_record_archive",
+            "key_ceremony_orchestrator",
+            "pack_record_directory",
+            "record_archive",
+            "record_verifier",
+            "tally_accumulate",
+            "tally_ceremony_orchestrator",
+            "unpack_record_archive",
+            "verify_election_record",
+        ],
+        "scripts": [
+            "DEFAULT_NUMBER_OF_BALLOTS",
+            "DEFAULT_SAMPLE_MANIFEST",
+            "DEFAULT_SPEC_VERSION",
+            "DEFAULT_SPOIL_RATE",
+            "DEFAULT_USE_ALL_GUARDIANS",
+            "DEFAULT_USE_PRIVATE_DATA",
+            "ElectionSampleDataGenerator",
+            "convert_record",
+            "sample_generator",
+            "verify_and_print",
+            "verify_record",
+        ],
+        "strategies": [
+            "CiphertextElectionsTupleType",
+            "ElectionsAndBallotsTupleType",
+            "annotated_emails",
+            "annotated_strings",
+            "ballot_styles",
+            "candidate_contest_descriptions",
+            "candidates",
+            "ciphertext_elections",
+            "contact_infos",
+            "contest_descriptions",
+            "contest_descriptions_room_for_overvoting",
+            "election",
+            "election_descriptions",
+            "election_types",
+            "elections_and_ballots",
+            "elements_mod_p",
+            "elements_mod_p_no_zero",
+            "elements_mod_q",
+            "elements_mod_q_no_zero",
+            "elgamal",
+            "elgamal_keypairs",
+            "geopolitical_units",
+            "group",
+            "human_names",
+            "internationalized_human_names",
+            "internationalized_texts",
+            "language_human_names",
+            "languages",
+            "party_lists",
+            "plaintext_voted_ballot",
+            "plaintext_voted_ballots",
+            "referendum_contest_descriptions",
+            "reporting_unit_types",
+            "two_letter_codes",
+        ],
+    },
 )
 
+
+def __dir__():
+    return __all__
+
 __all__ = [
+    "ARCHIVE_COMPRESSION",
+    "ARCHIVE_MAGIC",
+    "ARCHIVE_SECTIONS",
+    "ARCHIVE_SEGMENT_BYTES",
+    "ARCHIVE_VERSION",
     "AllPrivateElectionData",
     "AllPublicElectionData",
     "BallotFactory",
+    "CHECKPOINT_VERSION",
     "CIPHERTEXT_BALLOT_PREFIX",
     "COEFFICIENTS_FILE_NAME",
     "CONSTANTS_FILE_NAME",
@@ -116,6 +181,7 @@ __all__ = [
     "DEFAULT_USE_PRIVATE_DATA",
     "DEVICES_DIR",
     "DEVICE_PREFIX",
+    "ELECTION_RECORD_ARCHIVE",
     "ELECTION_RECORD_DIR",
     "ENCRYPTED_TALLY_FILE_NAME",
     "ElectionBuilder",
@@ -130,13 +196,19 @@ __all__ = [
     "PLAINTEXT_BALLOT_PREFIX",
     "PRIVATE_DATA_DIR",
     "PRIVATE_GUARDIAN_PREFIX",
+    "ProgressCallback",
     "QUORUM",
+    "RecordArchive",
+    "RecordArchiveWriter",
     "SPOILED_BALLOTS_DIR",
     "SPOILED_BALLOT_PREFIX",
     "SUBMITTED_BALLOTS_DIR",
     "SUBMITTED_BALLOT_PREFIX",
     "TALLY_FILE_NAME",
     "TallyCeremonyOrchestrator",
+    "VERIFY_CHUNK_SIZE",
+    "VerificationFailure",
+    "VerificationReport",
     "accumulate_plaintext_ballots",
     "annotated_emails",
     "annotated_strings",
@@ -148,6 +220,7 @@ __all__ = [
     "contact_infos",
     "contest_descriptions",
     "contest_descriptions_room_for_overvoting",
+    "convert_record",
     "election",
     "election_builder",
     "election_descriptions",
@@ -163,6 +236,7 @@ __all__ = [
     "export",
     "export_private_data",
     "export_record",
+    "export_record_archive",
     "factories",
     "geopolitical_units",
     "get_contest_description_well_formed",
@@ -177,9 +251,12 @@ __all__ = [
     "key_ceremony_orchestrator",
     "language_human_names",
     "languages",
+    "pack_record_directory",
     "party_lists",
     "plaintext_voted_ballot",
     "plaintext_voted_ballots",
+    "record_archive",
+    "record_verifier",
     "referendum_contest_descriptions",
     "reporting_unit_types",
     "sample_generator",
@@ -188,6 +265,10 @@ __all__ = [
     "tally_accumulate",
     "tally_ceremony_orchestrator",
     "two_letter_codes",
+    "unpack_record_archive",
+    "verify_and_print",
+    "verify_election_record",
+    "verify_record",
 ]
 
 # </AUTOGEN_INIT>
@@ -117,11 +117,18 @@ class ElectionFactory:
         self, sample_manifest: str
     ) -> Tuple[AllPublicElectionData, AllPrivateElectionData]:
         """Get hamilton manifest and context"""
+        manifest = self.get_manifest_from_filename(f"manifest-{sample_manifest}.json")
+        return self.get_manifest_with_encryption_context(manifest)
+
+    @staticmethod
+    def get_manifest_with_encryption_context(
+        manifest: Manifest,
+    ) -> Tuple[AllPublicElectionData, AllPrivateElectionData]:
+        """Run a key ceremony for a manifest and build its context"""
         guardians: List[Guardian] = []
         guardian_records: List[GuardianRecord] = []
 
         # Configure the election builder
-        manifest = self.get_manifest_from_filename(f"manifest-{sample_manifest}.json")
         builder = ElectionBuilder(NUMBER_OF_GUARDIANS, QUORUM, manifest)
 
         # Run the Key Ceremony
@@ -1,6 +1,8 @@
 from electionguard_tools.helpers import election_builder
 from electionguard_tools.helpers import export
 from electionguard_tools.helpers import key_ceremony_orchestrator
+from electionguard_tools.helpers import record_archive
+from electionguard_tools.helpers import record_verifier
 from electionguard_tools.helpers import tally_accumulate
 from electionguard_tools.helpers import tally_ceremony_orchestrator
 
@@ -33,6 +35,27 @@ from electionguard_tools.helpers.export import (
 from electionguard_tools.helpers.key_ceremony_orchestrator import (
     KeyCeremonyOrchestrator,
 )
+from electionguard_tools.helpers.record_archive import (
+    ARCHIVE_COMPRESSION,
+    ARCHIVE_MAGIC,
+    ARCHIVE_SECTIONS,
+    ARCHIVE_SEGMENT_BYTES,
+    ARCHIVE_VERSION,
+    ELECTION_RECORD_ARCHIVE,
+    RecordArchive,
+    RecordArchiveWriter,
+    export_record_archive,
+    pack_record_directory,
+    unpack_record_archive,
+)
+from electionguard_tools.helpers.record_verifier import (
+    CHECKPOINT_VERSION,
+    ProgressCallback,
+    VERIFY_CHUNK_SIZE,
+    VerificationFailure,
+    VerificationReport,
+    verify_election_record,
+)
 from electionguard_tools.helpers.tally_accumulate import (
     accumulate_plaintext_ballots,
 )
@@ -41,12 +64,19 @@ from electionguard_tools.helpers.tally_ceremony_orchestrator import (
 )
 
 __all__ = [
+    "ARCHIVE_COMPRESSION",
+    "ARCHIVE_MAGIC",
+    "ARCHIVE_SECTIONS",
+    "ARCHIVE_SEGMENT_BYTES",
+    "ARCHIVE_VERSION",
+    "CHECKPOINT_VERSION",
     "CIPHERTEXT_BALLOT_PREFIX",
     "COEFFICIENTS_FILE_NAME",
     "CONSTANTS_FILE_NAME",
     "CONTEXT_FILE_NAME",
     "DEVICES_DIR",
     "DEVICE_PREFIX",
+    "ELECTION_RECORD_ARCHIVE",
     "ELECTION_RECORD_DIR",
     "ENCRYPTED_TALLY_FILE_NAME",
     "ElectionBuilder",
@@ -57,18 +87,30 @@ __all__ = [
     "PLAINTEXT_BALLOT_PREFIX",
     "PRIVATE_DATA_DIR",
     "PRIVATE_GUARDIAN_PREFIX",
+    "ProgressCallback",
+    "RecordArchive",
+    "RecordArchiveWriter",
     "SPOILED_BALLOTS_DIR",
     "SPOILED_BALLOT_PREFIX",
     "SUBMITTED_BALLOTS_DIR",
     "SUBMITTED_BALLOT_PREFIX",
     "TALLY_FILE_NAME",
     "TallyCeremonyOrchestrator",
+    "VERIFY_CHUNK_SIZE",
+    "VerificationFailure",
+    "VerificationReport",
     "accumulate_plaintext_ballots",
     "election_builder",
     "export",
     "export_private_data",
     "export_record",
+    "export_record_archive",
     "key_ceremony_orchestrator",
+    "pack_record_directory",
+    "record_archive",
+    "record_verifier",
     "tally_accumulate",
     "tally_ceremony_orchestrator",
+    "unpack_record_archive",
+    "verify_election_record",
 ]
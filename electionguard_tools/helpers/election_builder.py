@@ -7,6 +7,7 @@ from electionguard.elgamal import ElGamalPublicKey
 
 from electionguard.election import (
     CiphertextElectionContext,
+    Configuration,
     make_ciphertext_election_context,
 )
 from electionguard.group import ElementModQ
@@ -40,6 +41,8 @@ class ElectionBuilder:
 
     extended_data: Optional[Dict[str, str]] = field(default=None)
 
+    configuration: Configuration = field(default_factory=Configuration)
+
     def __post_init__(self) -> None:
         self.internal_manifest = InternalManifest(self.manifest)
 
@@ -96,5 +99,6 @@ class ElectionBuilder:
                 get_optional(self.commitment_hash),
                 self.manifest.crypto_hash(),
                 extended_data=self.extended_data,
+                configuration=self.configuration,
             ),
         )
@@ -0,0 +1,375 @@
+"""
+Packed, indexed archive for a publishable election record.
+
+`export_record` writes one JSON file per device, guardian and ballot. For large
+elections that is hundreds of thousands of small files, and publishing, copying and
+reading the record is dominated by filesystem overhead. An archive holds the same JSON
+documents in a single file:
+
+    header   b"EGRA" + version (u16) + reserved (u16)
+    segment  length prefixed records (u32 big endian + JSON), optionally zlib compressed
+    ...
+    index    msgpack: compression, segment table and per section (object_id, segment,
+             offset, length) entries
+    footer   index offset (u64) + index length (u64) + b"EGRA"
+
+Records are appended in a streaming fashion and a segment is written out whenever it
+reaches `segment_bytes`, so exporting needs memory for one segment only. Readers map the
+file into memory and look records up by section and object id in O(1); records in
+uncompressed archives are sliced straight out of the mapping.
+
+Every record is exactly the JSON that `to_file` writes, so an archive converts to and
+from the directory layout of `export_record` without changing a byte.
+"""
+
+from collections import OrderedDict
+import mmap
+import os
+import struct
+import zlib
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple, Type, TypeVar
+
+import msgpack
+
+from electionguard.ballot import SubmittedBallot
+from electionguard.constants import ElectionConstants
+from electionguard.election import CiphertextElectionContext
+from electionguard.election_polynomial import LagrangeCoefficientsRecord
+from electionguard.encrypt import EncryptionDevice
+from electionguard.guardian import GuardianRecord
+from electionguard.manifest import Manifest
+from electionguard.serialize import from_raw, to_raw
+from electionguard.tally import PlaintextTally, PublishedCiphertextTally
+
+from electionguard_tools.helpers.export import (
+    COEFFICIENTS_FILE_NAME,
+    CONSTANTS_FILE_NAME,
+    CONTEXT_FILE_NAME,
+    DEVICES_DIR,
+    DEVICE_PREFIX,
+    ENCRYPTED_TALLY_FILE_NAME,
+    GUARDIANS_DIR,
+    GUARDIAN_PREFIX,
+    MANIFEST_FILE_NAME,
+    SPOILED_BALLOTS_DIR,
+    SPOILED_BALLOT_PREFIX,
+    SUBMITTED_BALLOTS_DIR,
+    SUBMITTED_BALLOT_PREFIX,
+    TALLY_FILE_NAME,
+)
+
+_T = TypeVar("_T")
+
+ELECTION_RECORD_ARCHIVE = "election_record.egra"
+ARCHIVE_MAGIC = b"EGRA"
+ARCHIVE_VERSION = 1
+ARCHIVE_SEGMENT_BYTES = int(os.environ.get("EG_ARCHIVE_SEGMENT_BYTES", str(1 << 20)))
+ARCHIVE_COMPRESSION = "zlib"
+
+# Section name -> directory (None for the record root) and file name prefix. Singleton
+# sections are stored under the object id "" and use the section name as file name.
+ARCHIVE_SECTIONS: Dict[str, Tuple[Optional[str], str]] = {
+    MANIFEST_FILE_NAME: (None, MANIFEST_FILE_NAME),
+    CONTEXT_FILE_NAME: (None, CONTEXT_FILE_NAME),
+    CONSTANTS_FILE_NAME: (None, CONSTANTS_FILE_NAME),
+    COEFFICIENTS_FILE_NAME: (None, COEFFICIENTS_FILE_NAME),
+    ENCRYPTED_TALLY_FILE_NAME: (None, ENCRYPTED_TALLY_FILE_NAME),
+    TALLY_FILE_NAME: (None, TALLY_FILE_NAME),
+    DEVICES_DIR: (DEVICES_DIR, DEVICE_PREFIX),
+    GUARDIANS_DIR: (GUARDIANS_DIR, GUARDIAN_PREFIX),
+    SUBMITTED_BALLOTS_DIR: (SUBMITTED_BALLOTS_DIR, SUBMITTED_BALLOT_PREFIX),
+    SPOILED_BALLOTS_DIR: (SPOILED_BALLOTS_DIR, SPOILED_BALLOT_PREFIX),
+}
+
+_HEADER = struct.Struct(">4sHH")
+_FOOTER = struct.Struct(">QQ4s")
+_RECORD_LENGTH = struct.Struct(">I")
+_DECOMPRESSED_SEGMENT_CACHE = 8
+
+# (segment, offset of the JSON within the segment, length)
+_Location = Tuple[int, int, int]
+
+
+class RecordArchiveWriter:
+    """Streams records into a new archive; use as a context manager or call `close`."""
+
+    def __init__(
+        self,
+        path: str,
+        compression: Optional[str] = None,
+        segment_bytes: int = ARCHIVE_SEGMENT_BYTES,
+    ):
+        if compression not in (None, ARCHIVE_COMPRESSION):
+            raise ValueError(f"Unsupported archive compression: {compression}")
+        self.path = path
+        self.compression = compression
+        self.segment_bytes = segment_bytes
+        directory = os.path.dirname(os.path.abspath(path))
+        if not os.path.exists(directory):
+            os.makedirs(directory)
+        # Written next to the target and renamed on close, so readers never map a partial archive
+        self._file = open(path + ".tmp", "wb")
+        self._file.write(_HEADER.pack(ARCHIVE_MAGIC, ARCHIVE_VERSION, 0))
+        self._segment = bytearray()
+        # file offset, stored length, raw length
+        self._segments: List[Tuple[int, int, int]] = []
+        self._sections: Dict[str, List[Tuple[str, int, int, int]]] = {}
+        self._keys: Dict[str, Set[str]] = {}
+
+    def add_raw(self, section: str, object_id: str, data: bytes) -> None:
+        """Append the serialized JSON of one object."""
+        if section not in ARCHIVE_SECTIONS:
+            raise ValueError(f"Unknown election record section: {section}")
+        keys = self._keys.setdefault(section, set())
+        if object_id in keys:
+            raise ValueError(f"Duplicate {section} record: {object_id}")
+        keys.add(object_id)
+
+        self._segment += _RECORD_LENGTH.pack(len(data))
+        self._sections.setdefault(section, []).append(
+            (object_id, len(self._segments), len(self._segment), len(data))
+        )
+        self._segment += data
+        if len(self._segment) >= self.segment_bytes:
+            self._flush_segment()
+
+    def add(self, section: str, object_id: str, data: Any) -> None:
+        """Serialize an election object exactly as `to_file` would and append it."""
+        self.add_raw(section, object_id, to_raw(data).encode("utf-8"))
+
+    def _flush_segment(self) -> None:
+        if not self._segment:
+            return
+        stored = bytes(self._segment)
+        if self.compression == ARCHIVE_COMPRESSION:
+            stored = zlib.compress(stored)
+        self._segments.append((self._file.tell(), len(stored), len(self._segment)))
+        self._file.write(stored)
+        self._segment = bytearray()
+
+    def close(self) -> None:
+        """Write the last segment, the index and the footer."""
+        if self._file.closed:
+            return
+        self._flush_segment()
+        index = msgpack.packb(
+            {
+                "version": ARCHIVE_VERSION,
+                "compression": self.compression,
+                "segments": self._segments,
+                "sections": self._sections,
+            },
+            use_bin_type=True,
+        )
+        index_offset = self._file.tell()
+        self._file.write(index)
+        self._file.write(_FOOTER.pack(index_offset, len(index), ARCHIVE_MAGIC))
+        self._file.close()
+        os.replace(self._file.name, self.path)
+
+    def discard(self) -> None:
+        """Abandon the archive without replacing an existing one."""
+        if not self._file.closed:
+            self._file.close()
+            os.remove(self._file.name)
+
+    def __enter__(self) -> "RecordArchiveWriter":
+        return self
+
+    def __exit__(self, exc_type: Any, *args: Any) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.discard()
+
+
+class RecordArchive:
+    """Read only, memory mapped view of an archive with O(1) lookup by object id."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, "rb")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, _reserved = _HEADER.unpack_from(self._map, 0)
+        index_offset, index_length, end_magic = _FOOTER.unpack_from(
+            self._map, len(self._map) - _FOOTER.size
+        )
+        if magic != ARCHIVE_MAGIC or end_magic != ARCHIVE_MAGIC:
+            raise ValueError(f"{path} is not an election record archive")
+        if version > ARCHIVE_VERSION:
+            raise ValueError(f"Unsupported election record archive version {version}")
+        index = msgpack.unpackb(
+            self._map[index_offset : index_offset + index_length], raw=False
+        )
+        self.compression: Optional[str] = index["compression"]
+        self._segments: List[List[int]] = index["segments"]
+        self._entries: Dict[str, List[List[Any]]] = index["sections"]
+        self._lookup: Dict[str, Dict[str, _Location]] = {}
+        self._decompressed: "OrderedDict[int, bytes]" = OrderedDict()
+
+    def sections(self) -> List[str]:
+        """Sections present in the archive."""
+        return list(self._entries)
+
+    def object_ids(self, section: str) -> List[str]:
+        """Object ids of a section in the order they were written."""
+        return [entry[0] for entry in self._entries.get(section, [])]
+
+    def __len__(self) -> int:
+        return sum(len(entries) for entries in self._entries.values())
+
+    def _locations(self, section: str) -> Dict[str, _Location]:
+        if section not in self._lookup:
+            self._lookup[section] = {
+                object_id: (segment, offset, length)
+                for object_id, segment, offset, length in self._entries.get(section, [])
+            }
+        return self._lookup[section]
+
+    def contains(self, section: str, object_id: str = "") -> bool:
+        """True if the archive holds the object."""
+        return object_id in self._locations(section)
+
+    def get_raw(self, section: str, object_id: str = "") -> bytes:
+        """The JSON of one object, exactly as `to_file` wrote it."""
+        location = self._locations(section).get(object_id)
+        if location is None:
+            raise KeyError(f"{section} record {object_id!r} is not in {self.path}")
+        segment, offset, length = location
+        if self.compression is None:
+            start = self._segments[segment][0] + offset
+            return self._map[start : start + length]
+        data = self._segment_data(segment)
+        return data[offset : offset + length]
+
+    def get(self, type_: Type[_T], section: str, object_id: str = "") -> _T:
+        """Deserialize one object."""
+        return from_raw(type_, self.get_raw(section, object_id))
+
+    def iter_raw(self, section: str) -> Iterator[Tuple[str, bytes]]:
+        """Object ids and JSON of a section in the order they were written."""
+        for object_id in self.object_ids(section):
+            yield object_id, self.get_raw(section, object_id)
+
+    def _segment_data(self, segment: int) -> bytes:
+        data = self._decompressed.get(segment)
+        if data is None:
+            offset, stored_length, _raw_length = self._segments[segment]
+            data = zlib.decompress(self._map[offset : offset + stored_length])
+            self._decompressed[segment] = data
+            if len(self._decompressed) > _DECOMPRESSED_SEGMENT_CACHE:
+                self._decompressed.popitem(last=False)
+        else:
+            self._decompressed.move_to_end(segment)
+        return data
+
+    def close(self) -> None:
+        """Release the memory map."""
+        self._map.close()
+        self._file.close()
+
+    def __enter__(self) -> "RecordArchive":
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+
+# TODO #148 Revert PlaintextTally to PublishedPlaintextTally after moving spoiled info
+def export_record_archive(
+    manifest: Manifest,
+    context: CiphertextElectionContext,
+    constants: ElectionConstants,
+    devices: Iterable[EncryptionDevice],
+    submitted_ballots: Iterable[SubmittedBallot],
+    spoiled_ballots: Iterable[PlaintextTally],
+    ciphertext_tally: PublishedCiphertextTally,
+    plaintext_tally: PlaintextTally,
+    guardian_records: Iterable[GuardianRecord],
+    lagrange_coefficients: LagrangeCoefficientsRecord,
+    archive_path: str = ELECTION_RECORD_ARCHIVE,
+    compression: Optional[str] = None,
+) -> None:
+    """Export a publishable election record as a single archive, streaming the ballots"""
+    with RecordArchiveWriter(archive_path, compression) as writer:
+        writer.add(MANIFEST_FILE_NAME, "", manifest)
+        writer.add(CONTEXT_FILE_NAME, "", context)
+        writer.add(CONSTANTS_FILE_NAME, "", constants)
+        writer.add(COEFFICIENTS_FILE_NAME, "", lagrange_coefficients)
+
+        for device in devices:
+            writer.add(DEVICES_DIR, str(device.device_id), device)
+
+        if guardian_records is not None:
+            for guardian_record in guardian_records:
+                writer.add(GUARDIANS_DIR, guardian_record.guardian_id, guardian_record)
+
+        for ballot in submitted_ballots:
+            writer.add(SUBMITTED_BALLOTS_DIR, ballot.object_id, ballot)
+
+        for spoiled_ballot in spoiled_ballots:
+            writer.add(SPOILED_BALLOTS_DIR, spoiled_ballot.object_id, spoiled_ballot)
+
+        writer.add(ENCRYPTED_TALLY_FILE_NAME, "", ciphertext_tally)
+        writer.add(TALLY_FILE_NAME, "", plaintext_tally)
+
+
+def pack_record_directory(
+    record_directory: str,
+    archive_path: str = ELECTION_RECORD_ARCHIVE,
+    compression: Optional[str] = None,
+) -> int:
+    """
+    Convert a directory written by `export_record` into an archive.
+
+    :return: the number of records packed
+    """
+    count = 0
+    with RecordArchiveWriter(archive_path, compression) as writer:
+        for section, (directory, prefix) in ARCHIVE_SECTIONS.items():
+            if directory is None:
+                names = [prefix + ".json"]
+                source = record_directory
+            else:
+                source = os.path.join(record_directory, directory)
+                if not os.path.isdir(source):
+                    continue
+                names = sorted(
+                    name
+                    for name in os.listdir(source)
+                    if name.startswith(prefix) and name.endswith(".json")
+                )
+            for name in names:
+                path = os.path.join(source, name)
+                if not os.path.exists(path):
+                    continue
+                object_id = "" if directory is None else name[len(prefix) : -len(".json")]
+                with open(path, "rb") as record_file:
+                    writer.add_raw(section, object_id, record_file.read())
+                count += 1
+    return count
+
+
+def unpack_record_archive(archive_path: str, record_directory: str) -> int:
+    """
+    Convert an archive back into the directory layout of `export_record`.
+
+    :return: the number of files written
+    """
+    count = 0
+    with RecordArchive(archive_path) as archive:
+        for section in archive.sections():
+            directory, prefix = ARCHIVE_SECTIONS[section]
+            target = (
+                record_directory
+                if directory is None
+                else os.path.join(record_directory, directory)
+            )
+            if not os.path.exists(target):
+                os.makedirs(target)
+            for object_id, data in archive.iter_raw(section):
+                name = prefix if directory is None else prefix + object_id
+                with open(os.path.join(target, name + ".json"), "wb") as record_file:
+                    record_file.write(data)
+                count += 1
+    return count
@@ -0,0 +1,644 @@
+"""
+Offline verification of an exported election record.
+
+Reads the directory layout written by `export_record`, or an archive written by
+`export_record_archive`, and checks, independently of the code that produced it:
+
+- the guardian records (Schnorr proofs of every commitment) and that the joint key,
+  commitment hash and the base hashes of the context follow from them,
+- every submitted ballot (style, hashes, ballot code, selection limit accumulation and
+  all proofs),
+- that the encrypted tally is the product of the cast ballots,
+- every decryption share of the tally and the spoiled ballots, the compensated shares
+  and their Lagrange reconstruction, and that the plaintexts follow from the shares.
+
+Ballots and spoiled ballots are verified in chunks on a process pool, and the proofs of
+each chunk are checked together with a `BatchVerifier`; only a chunk that fails is
+re-checked proof by proof to find the bad ballots. Completed chunks can be recorded in
+a checkpoint file so an interrupted run resumes where it stopped.
+"""
+
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+import json
+import os
+from tempfile import NamedTemporaryFile
+from time import perf_counter
+from typing import Any, Callable, Dict, List, Optional, Tuple, Type, TypeVar, Union
+
+from electionguard.ballot import BallotBoxState, SubmittedBallot
+from electionguard.ballot_code import get_ballot_code
+from electionguard.ballot_validator import ballot_is_valid_for_style
+from electionguard.batch_verification import BatchVerifier
+from electionguard.chaum_pedersen import RangeChaumPedersenProof
+from electionguard.election import (
+    CiphertextElectionContext,
+    make_ciphertext_election_context,
+)
+from electionguard.election_polynomial import (
+    LagrangeCoefficientsRecord,
+    compute_lagrange_coefficient,
+)
+from electionguard.elgamal import ElGamalCiphertext, elgamal_combine_public_keys
+from electionguard.group import (
+    ElementModP,
+    g_pow_p,
+    mult_p,
+    multi_pow_p,
+    pow_p,
+    pow_q,
+)
+from electionguard.guardian import GuardianRecord
+from electionguard.hash import hash_elems
+from electionguard.manifest import InternalManifest, Manifest
+from electionguard.scheduler import Scheduler
+from electionguard.serialize import from_file
+from electionguard.tally import PlaintextTally, PublishedCiphertextTally
+
+from electionguard_tools.helpers.export import (
+    COEFFICIENTS_FILE_NAME,
+    CONTEXT_FILE_NAME,
+    ENCRYPTED_TALLY_FILE_NAME,
+    GUARDIANS_DIR,
+    MANIFEST_FILE_NAME,
+    SPOILED_BALLOTS_DIR,
+    SUBMITTED_BALLOTS_DIR,
+    TALLY_FILE_NAME,
+)
+from electionguard_tools.helpers.record_archive import ARCHIVE_SECTIONS, RecordArchive
+
+_T = TypeVar("_T")
+
+VERIFY_CHUNK_SIZE = int(os.environ.get("EG_VERIFY_CHUNK_SIZE", "128"))
+CHECKPOINT_VERSION = 1
+
+# "contest_id/selection_id" -> (pad, data) as hex, for the product of cast ballots
+_Aggregate = Dict[str, Tuple[str, str]]
+ProgressCallback = Callable[[str, int, int], None]
+
+
+@dataclass
+class VerificationFailure:
+    """A single check of the election record that did not hold."""
+
+    check: str
+    object_id: str
+    message: str
+
+
+@dataclass
+class VerificationReport:
+    """Outcome of verifying an election record."""
+
+    record: str
+    ballots: int = 0
+    cast: int = 0
+    spoiled: int = 0
+    decrypted_spoiled: int = 0
+    resumed_chunks: int = 0
+    workers: int = 1
+    seconds: float = 0.0
+    failures: List[VerificationFailure] = field(default_factory=list)
+
+    @property
+    def is_valid(self) -> bool:
+        """True if every check passed."""
+        return not self.failures
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Plain dictionary for json output."""
+        return {
+            "record": self.record,
+            "valid": self.is_valid,
+            "ballots": self.ballots,
+            "cast": self.cast,
+            "spoiled": self.spoiled,
+            "decrypted_spoiled": self.decrypted_spoiled,
+            "resumed_chunks": self.resumed_chunks,
+            "workers": self.workers,
+            "seconds": round(self.seconds, 3),
+            "failures": [vars(failure) for failure in self.failures],
+        }
+
+
+@dataclass
+class _RecordState:
+    """Everything but the ballots, loaded once per process."""
+
+    source: "_RecordSource"
+    manifest: Manifest
+    internal_manifest: InternalManifest
+    context: CiphertextElectionContext
+    guardians: Dict[str, GuardianRecord]
+    coefficients: LagrangeCoefficientsRecord
+
+
+class _DirectorySource:
+    """Objects of a record in the directory layout of `export_record`."""
+
+    def __init__(self, record_directory: str):
+        self.record_directory = record_directory
+
+    def _path(self, section: str, object_id: str) -> str:
+        directory, prefix = ARCHIVE_SECTIONS[section]
+        if directory is None:
+            return os.path.join(self.record_directory, prefix + ".json")
+        return os.path.join(self.record_directory, directory, prefix + object_id + ".json")
+
+    def object_ids(self, section: str) -> List[str]:
+        directory, prefix = ARCHIVE_SECTIONS[section]
+        path = os.path.join(self.record_directory, directory or "")
+        if not os.path.isdir(path):
+            return []
+        return sorted(
+            name[len(prefix) : -len(".json")]
+            for name in os.listdir(path)
+            if name.startswith(prefix) and name.endswith(".json")
+        )
+
+    def load(self, type_: Type[_T], section: str, object_id: str = "") -> _T:
+        return from_file(type_, self._path(section, object_id))
+
+
+class _ArchiveSource:
+    """Objects of a record packed with `export_record_archive`."""
+
+    def __init__(self, archive_path: str):
+        self.archive = RecordArchive(archive_path)
+
+    def object_ids(self, section: str) -> List[str]:
+        return sorted(self.archive.object_ids(section))
+
+    def load(self, type_: Type[_T], section: str, object_id: str = "") -> _T:
+        return self.archive.get(type_, section, object_id)
+
+
+_RecordSource = Union[_DirectorySource, _ArchiveSource]
+
+_state: Optional[_RecordState] = None
+_state_key: Optional[Tuple[str, int]] = None
+
+
+def _load_state(record_path: str) -> _RecordState:
+    """Open a record directory or archive and load its non-ballot parts once per process."""
+    global _state, _state_key
+    # A replaced archive is a new file, so the modification time tells a stale mapping apart
+    key = (record_path, os.stat(record_path).st_mtime_ns)
+    if _state is None or _state_key != key:
+        source: _RecordSource = (
+            _ArchiveSource(record_path)
+            if os.path.isfile(record_path)
+            else _DirectorySource(record_path)
+        )
+        manifest = source.load(Manifest, MANIFEST_FILE_NAME)
+        guardians = [
+            source.load(GuardianRecord, GUARDIANS_DIR, guardian_id)
+            for guardian_id in source.object_ids(GUARDIANS_DIR)
+        ]
+        _state = _RecordState(
+            source=source,
+            manifest=manifest,
+            internal_manifest=InternalManifest(manifest),
+            context=source.load(CiphertextElectionContext, CONTEXT_FILE_NAME),
+            guardians={
+                guardian.guardian_id: guardian
+                for guardian in sorted(guardians, key=lambda g: g.sequence_order)
+            },
+            coefficients=source.load(LagrangeCoefficientsRecord, COEFFICIENTS_FILE_NAME),
+        )
+        _state_key = key
+    return _state
+
+
+def _failure(check: str, object_id: str, message: str) -> Tuple[str, str, str]:
+    return (check, object_id, message)
+
+
+def _verify_ballot_chunk(record_path: str, ballot_ids: List[str]) -> Dict[str, Any]:
+    """
+    Verify a chunk of submitted ballots.
+
+    :return: the failures, the number of cast and spoiled ballots, and the product of the
+        cast ballots' selection ciphertexts keyed by contest and selection
+    """
+    state = _load_state(record_path)
+    context = state.context
+    public_key = context.elgamal_public_key
+    extended_hash = context.crypto_extended_base_hash
+
+    failures: List[Tuple[str, str, str]] = []
+    ballots: List[SubmittedBallot] = []
+    batch = BatchVerifier()
+    for expected_id in ballot_ids:
+        try:
+            ballot = state.source.load(SubmittedBallot, SUBMITTED_BALLOTS_DIR, expected_id)
+        except Exception as e:  # pylint: disable=broad-except
+            failures.append(_failure("ballot.parse", expected_id, str(e)))
+            continue
+        ballot_failures = _check_ballot_structure(ballot, expected_id, state)
+        if not ballot_failures:
+            for contest in ballot.contests:
+                for selection in contest.ballot_selections:
+                    batch.add_disjunctive_proof(
+                        selection.proof, selection.ciphertext, public_key, extended_hash
+                    )
+                if isinstance(contest.proof, RangeChaumPedersenProof):
+                    batch.add_range_proof(
+                        contest.proof, contest.ciphertext_accumulation, public_key, extended_hash
+                    )
+                else:
+                    batch.add_constant_proof(
+                        contest.proof, contest.ciphertext_accumulation, public_key, extended_hash
+                    )
+        failures.extend(ballot_failures)
+        ballots.append(ballot)
+
+    if not batch.verify():
+        # The batch only says that something is wrong, so find the ballots one by one
+        failed_ids = {failure[1] for failure in failures}
+        for ballot in ballots:
+            if ballot.object_id not in failed_ids and not ballot.is_valid_encryption(
+                ballot.manifest_hash, public_key, extended_hash
+            ):
+                failures.append(
+                    _failure("ballot.proofs", ballot.object_id, "invalid encryption proof")
+                )
+        if not failures:
+            failures.append(_failure("ballot.batch", ballot_ids[0], "batch verification failed"))
+
+    aggregate: Dict[str, List[Any]] = {}
+    cast = spoiled = 0
+    for ballot in ballots:
+        if ballot.state == BallotBoxState.SPOILED:
+            spoiled += 1
+            continue
+        if ballot.state != BallotBoxState.CAST:
+            failures.append(
+                _failure("ballot.state", ballot.object_id, f"state {ballot.state.name}")
+            )
+            continue
+        cast += 1
+        for contest in ballot.contests:
+            for selection in contest.ballot_selections:
+                if selection.is_placeholder_selection:
+                    continue
+                key = f"{contest.object_id}/{selection.object_id}"
+                product = aggregate.setdefault(key, [1, 1])
+                product[0] = mult_p(product[0], selection.ciphertext.pad)
+                product[1] = mult_p(product[1], selection.ciphertext.data)
+
+    return {
+        "failures": failures,
+        "cast": cast,
+        "spoiled": spoiled,
+        "aggregate": {
+            key: (pad.to_hex(), data.to_hex()) for key, (pad, data) in aggregate.items()
+        },
+    }
+
+
+def _check_ballot_structure(
+    ballot: SubmittedBallot, expected_id: str, state: _RecordState
+) -> List[Tuple[str, str, str]]:
+    """Every check of a ballot except its proofs."""
+    object_id = ballot.object_id
+    if object_id != expected_id:
+        return [_failure("ballot.id", expected_id, f"file contains ballot {object_id}")]
+    if ballot.manifest_hash != state.context.manifest_hash:
+        return [_failure("ballot.manifest_hash", object_id, "wrong manifest hash")]
+    if not ballot_is_valid_for_style(ballot, state.internal_manifest):
+        return [_failure("ballot.style", object_id, f"not valid for {ballot.style_id}")]
+
+    for contest in ballot.contests:
+        for selection in contest.ballot_selections:
+            if selection.proof is None or selection.crypto_hash != selection.crypto_hash_with(
+                selection.description_hash
+            ):
+                return [_failure("ballot.selection_hash", object_id, selection.object_id)]
+        if isinstance(contest.proof, RangeChaumPedersenProof) != state.context.configuration.range_proofs:
+            return [_failure("ballot.contest_proof", object_id, contest.object_id)]
+        if contest.proof is None or contest.crypto_hash != contest.crypto_hash_with(
+            contest.description_hash
+        ):
+            return [_failure("ballot.contest_hash", object_id, contest.object_id)]
+        if contest.ciphertext_accumulation != contest.elgamal_accumulate():
+            return [_failure("ballot.accumulation", object_id, contest.object_id)]
+
+    if ballot.crypto_hash != ballot.crypto_hash_with(ballot.manifest_hash):
+        return [_failure("ballot.crypto_hash", object_id, "wrong ballot hash")]
+    if ballot.code != get_ballot_code(ballot.code_seed, ballot.timestamp, ballot.crypto_hash):
+        return [_failure("ballot.code", object_id, "wrong ballot code")]
+    return []
+
+
+def _verify_spoiled_chunk(record_path: str, ballot_ids: List[str]) -> Dict[str, Any]:
+    """Verify the decryptions of a chunk of spoiled ballots."""
+    state = _load_state(record_path)
+    failures: List[Tuple[str, str, str]] = []
+    for ballot_id in ballot_ids:
+        try:
+            plaintext = state.source.load(PlaintextTally, SPOILED_BALLOTS_DIR, ballot_id)
+            submitted = state.source.load(SubmittedBallot, SUBMITTED_BALLOTS_DIR, ballot_id)
+        except Exception as e:  # pylint: disable=broad-except
+            failures.append(_failure("spoiled.parse", ballot_id, str(e)))
+            continue
+        if submitted.state != BallotBoxState.SPOILED:
+            failures.append(_failure("spoiled.state", ballot_id, "ballot was not spoiled"))
+            continue
+        messages = {
+            f"{contest.object_id}/{selection.object_id}": selection.ciphertext
+            for contest in submitted.contests
+            for selection in contest.ballot_selections
+        }
+        failures.extend(_check_decryption(plaintext, messages, state, "spoiled"))
+    return {"failures": failures, "decrypted": len(ballot_ids)}
+
+
+def _check_decryption(
+    plaintext: PlaintextTally,
+    messages: Dict[str, ElGamalCiphertext],
+    state: _RecordState,
+    kind: str,
+) -> List[Tuple[str, str, str]]:
+    """
+    Check that every selection of a decrypted tally or ballot follows from its shares.
+
+    :param messages: the ciphertext each selection must have been decrypted from
+    """
+    extended_hash = state.context.crypto_extended_base_hash
+    coefficients = state.coefficients.coefficients
+    available = [state.guardians[guardian_id] for guardian_id in coefficients]
+    recovery_keys: Dict[Tuple[str, str], ElementModP] = {}
+    failures: List[Tuple[str, str, str]] = []
+    batch = BatchVerifier()
+    checked = []
+
+    for contest in plaintext.contests.values():
+        for selection in contest.selections.values():
+            where = f"{plaintext.object_id}:{contest.object_id}/{selection.object_id}"
+            message = selection.message
+            expected = messages.get(f"{contest.object_id}/{selection.object_id}")
+            if expected is None or message != expected:
+                failures.append(_failure(f"{kind}.message", where, "ciphertext differs"))
+                continue
+            if {share.guardian_id for share in selection.shares} != set(state.guardians):
+                failures.append(_failure(f"{kind}.shares", where, "not one share per guardian"))
+                continue
+
+            for share in selection.shares:
+                if share.proof is not None and share.recovered_parts is None:
+                    key = state.guardians[share.guardian_id].election_public_key
+                    if not batch.add_chaum_pedersen_proof(
+                        share.proof, message, key, share.share, extended_hash
+                    ):
+                        failures.append(_failure(f"{kind}.share_proof", where, share.guardian_id))
+                    continue
+                if share.proof is not None or set(share.recovered_parts or {}) != set(coefficients):
+                    failures.append(
+                        _failure(f"{kind}.recovered_parts", where, share.guardian_id)
+                    )
+                    continue
+                missing = state.guardians[share.guardian_id]
+                parts = [share.recovered_parts[guardian.guardian_id] for guardian in available]
+                for guardian, part in zip(available, parts):
+                    pair = (missing.guardian_id, guardian.guardian_id)
+                    if pair not in recovery_keys:
+                        recovery_keys[pair] = _recovery_public_key(missing, guardian)
+                    if part.recovery_key != recovery_keys[pair] or not batch.add_chaum_pedersen_proof(
+                        part.proof, message, part.recovery_key, part.share, extended_hash
+                    ):
+                        failures.append(
+                            _failure(f"{kind}.compensated_proof", where, "/".join(pair))
+                        )
+                if multi_pow_p(
+                    [part.share for part in parts],
+                    [coefficients[guardian.guardian_id] for guardian in available],
+                ) != share.share:
+                    failures.append(_failure(f"{kind}.reconstruction", where, share.guardian_id))
+
+            if mult_p(selection.value, *[share.share for share in selection.shares]) != message.data:
+                failures.append(_failure(f"{kind}.combination", where, "shares do not combine"))
+            elif g_pow_p(selection.tally) != selection.value:
+                failures.append(_failure(f"{kind}.plaintext", where, f"value is not g^{selection.tally}"))
+            checked.append((where, selection))
+
+    if not batch.verify():
+        # Find the selections with a bad proof individually
+        for where, selection in checked:
+            for share in selection.shares:
+                key = state.guardians[share.guardian_id].election_public_key
+                if not share.is_valid(selection.message, key, extended_hash):
+                    failures.append(_failure(f"{kind}.share_proof", where, share.guardian_id))
+    return failures
+
+
+def _recovery_public_key(missing: GuardianRecord, available: GuardianRecord) -> ElementModP:
+    """The public key of the missing guardian's secret share held by an available guardian."""
+    key = mult_p(
+        *[
+            pow_p(commitment, pow_q(available.sequence_order, index))
+            for index, commitment in enumerate(missing.election_commitments)
+        ]
+    )
+    return key
+
+
+def _verify_guardians_and_context(state: _RecordState) -> List[Tuple[str, str, str]]:
+    """Check the key ceremony results, the context and the Lagrange coefficients."""
+    failures: List[Tuple[str, str, str]] = []
+    context = state.context
+    guardians = list(state.guardians.values())
+
+    for guardian in guardians:
+        if len(guardian.election_commitments) != context.quorum:
+            failures.append(_failure("guardian.commitments", guardian.guardian_id, "wrong count"))
+        if guardian.election_public_key != guardian.election_commitments[0]:
+            failures.append(_failure("guardian.public_key", guardian.guardian_id, "not the first commitment"))
+        for commitment, proof in zip(guardian.election_commitments, guardian.election_proofs):
+            if proof.public_key != commitment or not proof.is_valid():
+                failures.append(_failure("guardian.proof", guardian.guardian_id, "invalid Schnorr proof"))
+                break
+
+    commitments = [c for guardian in guardians for c in guardian.election_commitments]
+    expected = make_ciphertext_election_context(
+        len(guardians),
+        context.quorum,
+        elgamal_combine_public_keys(g.election_public_key for g in guardians),
+        hash_elems(commitments),
+        state.manifest.crypto_hash(),
+    )
+    for name in (
+        "number_of_guardians",
+        "elgamal_public_key",
+        "commitment_hash",
+        "manifest_hash",
+        "crypto_base_hash",
+        "crypto_extended_base_hash",
+    ):
+        if getattr(context, name) != getattr(expected, name):
+            failures.append(_failure("context", name, "does not match the guardian records"))
+
+    coefficients = state.coefficients.coefficients
+    if len(coefficients) < context.quorum or not set(coefficients) <= set(state.guardians):
+        failures.append(_failure("lagrange", "available_guardians", "not a quorum of guardians"))
+        return failures
+    orders = {g: state.guardians[g].sequence_order for g in coefficients}
+    for guardian_id, coefficient in coefficients.items():
+        others = [order for g, order in orders.items() if g != guardian_id]
+        if compute_lagrange_coefficient(orders[guardian_id], *others) != coefficient:
+            failures.append(_failure("lagrange", guardian_id, "wrong coefficient"))
+    return failures
+
+
+class _Checkpoint:
+    """Completed chunks of an interrupted run, written atomically after every chunk."""
+
+    def __init__(self, path: Optional[str], record_path: str, chunk_size: int, ballots: int):
+        self.path = path
+        self.header = {
+            "version": CHECKPOINT_VERSION,
+            "record": os.path.abspath(record_path),
+            "chunk_size": chunk_size,
+            "ballots": ballots,
+        }
+        self.completed: Dict[str, Dict[str, Any]] = {}
+        self.aggregate: _Aggregate = {}
+        if path and os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as checkpoint_file:
+                saved = json.load(checkpoint_file)
+            if any(saved.get(key) != value for key, value in self.header.items()):
+                raise ValueError(
+                    f"Checkpoint {path} was written for a different record or chunk size"
+                )
+            self.completed = saved["completed"]
+            self.aggregate = {k: tuple(v) for k, v in saved["aggregate"].items()}
+
+    def record(self, task: str, result: Dict[str, Any]) -> None:
+        aggregate = result.pop("aggregate", None)
+        if aggregate:
+            self.aggregate = _merge_aggregates(self.aggregate, aggregate)
+        self.completed[task] = result
+        if self.path:
+            directory = os.path.dirname(os.path.abspath(self.path))
+            with NamedTemporaryFile(
+                "w", dir=directory, delete=False, encoding="utf-8", suffix=".tmp"
+            ) as temporary:
+                json.dump(
+                    dict(self.header, completed=self.completed, aggregate=self.aggregate),
+                    temporary,
+                )
+            os.replace(temporary.name, self.path)
+
+
+def _merge_aggregates(left: _Aggregate, right: _Aggregate) -> _Aggregate:
+    merged = dict(left)
+    for key, (pad, data) in right.items():
+        if key in merged:
+            pad = mult_p(ElementModP(merged[key][0]), ElementModP(pad)).to_hex()
+            data = mult_p(ElementModP(merged[key][1]), ElementModP(data)).to_hex()
+        merged[key] = (pad, data)
+    return merged
+
+
+def _verify_tally(state: _RecordState, aggregate: _Aggregate) -> List[Tuple[str, str, str]]:
+    """Compare the encrypted tally with the cast ballots and check its decryption."""
+    encrypted = state.source.load(PublishedCiphertextTally, ENCRYPTED_TALLY_FILE_NAME)
+    failures: List[Tuple[str, str, str]] = []
+    messages: Dict[str, ElGamalCiphertext] = {}
+    for contest in encrypted.contests.values():
+        for selection in contest.selections.values():
+            key = f"{contest.object_id}/{selection.object_id}"
+            pad, data = aggregate.pop(key, ("01", "01"))
+            if selection.ciphertext != ElGamalCiphertext(ElementModP(pad), ElementModP(data)):
+                failures.append(_failure("tally.aggregation", key, "not the product of the cast ballots"))
+            messages[key] = selection.ciphertext
+    for key in aggregate:
+        failures.append(_failure("tally.aggregation", key, "cast votes for a selection missing from the tally"))
+
+    plaintext = state.source.load(PlaintextTally, TALLY_FILE_NAME)
+    failures.extend(_check_decryption(plaintext, messages, state, "tally"))
+    return failures
+
+
+def verify_election_record(
+    record_path: str,
+    max_workers: Optional[int] = None,
+    chunk_size: int = VERIFY_CHUNK_SIZE,
+    checkpoint_path: Optional[str] = None,
+    progress: Optional[ProgressCallback] = None,
+) -> VerificationReport:
+    """
+    Verify an exported election record.
+
+    :param record_path: directory written by `export_record` or archive written by
+        `export_record_archive`
+    :param max_workers: processes for ballot verification, defaults to the cpu count
+    :param chunk_size: ballots per batch verified task
+    :param checkpoint_path: file recording completed chunks; an existing one is resumed
+    :param progress: called with (stage, done, total) as the verification proceeds
+    :return: the report, listing every failed check
+    """
+    started = perf_counter()
+    record_path = os.path.abspath(record_path)
+    state = _load_state(record_path)
+    ballot_ids = state.source.object_ids(SUBMITTED_BALLOTS_DIR)
+    spoiled_ids = state.source.object_ids(SPOILED_BALLOTS_DIR)
+    workers = max(1, max_workers or Scheduler.cpu_count())
+    report = VerificationReport(record_path, ballots=len(ballot_ids), workers=workers)
+    failures = _verify_guardians_and_context(state)
+
+    checkpoint = _Checkpoint(checkpoint_path, record_path, chunk_size, len(ballot_ids))
+    tasks: Dict[str, Tuple[Callable[..., Dict[str, Any]], List[str]]] = {}
+    for start in range(0, len(ballot_ids), chunk_size):
+        tasks[f"ballots:{start // chunk_size}"] = (
+            _verify_ballot_chunk,
+            ballot_ids[start : start + chunk_size],
+        )
+    for start in range(0, len(spoiled_ids), chunk_size):
+        tasks[f"spoiled:{start // chunk_size}"] = (
+            _verify_spoiled_chunk,
+            spoiled_ids[start : start + chunk_size],
+        )
+    pending = {task: job for task, job in tasks.items() if task not in checkpoint.completed}
+    report.resumed_chunks = len(tasks) - len(pending)
+
+    done = report.resumed_chunks
+    if progress:
+        progress("chunks", done, len(tasks))
+    if workers == 1 or len(pending) <= 1:
+        for task, (function, ids) in pending.items():
+            checkpoint.record(task, function(record_path, ids))
+            done += 1
+            if progress:
+                progress("chunks", done, len(tasks))
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(pending))) as executor:
+            futures = {
+                executor.submit(function, record_path, ids): task
+                for task, (function, ids) in pending.items()
+            }
+            for future in as_completed(futures):
+                checkpoint.record(futures[future], future.result())
+                done += 1
+                if progress:
+                    progress("chunks", done, len(tasks))
+
+    for result in checkpoint.completed.values():
+        failures.extend(tuple(f) for f in result["failures"])
+        report.cast += result.get("cast", 0)
+        report.spoiled += result.get("spoiled", 0)
+        report.decrypted_spoiled += result.get("decrypted", 0)
+    if report.decrypted_spoiled != report.spoiled:
+        failures.append(
+            _failure("spoiled.count", "spoiled_ballots", "not every spoiled ballot is decrypted")
+        )
+
+    if progress:
+        progress("tally", 0, 1)
+    failures.extend(_verify_tally(state, dict(checkpoint.aggregate)))
+    if progress:
+        progress("tally", 1, 1)
+
+    report.failures = [VerificationFailure(*failure) for failure in failures]
+    report.seconds = perf_counter() - started
+    return report
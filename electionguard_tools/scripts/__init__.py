@@ -1,4 +1,6 @@
+from electionguard_tools.scripts import convert_record
 from electionguard_tools.scripts import sample_generator
+from electionguard_tools.scripts import verify_record
 
 from electionguard_tools.scripts.sample_generator import (
     DEFAULT_NUMBER_OF_BALLOTS,
@@ -9,6 +11,9 @@ from electionguard_tools.scripts.sample_generator import (
     DEFAULT_USE_PRIVATE_DATA,
     ElectionSampleDataGenerator,
 )
+from electionguard_tools.scripts.verify_record import (
+    verify_and_print,
+)
 
 __all__ = [
     "DEFAULT_NUMBER_OF_BALLOTS",
@@ -18,5 +23,8 @@ __all__ = [
     "DEFAULT_USE_ALL_GUARDIANS",
     "DEFAULT_USE_PRIVATE_DATA",
     "ElectionSampleDataGenerator",
+    "convert_record",
     "sample_generator",
+    "verify_and_print",
+    "verify_record",
 ]
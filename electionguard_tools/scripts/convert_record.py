@@ -0,0 +1,51 @@
+#!/usr/bin/env python
+import os
+
+from electionguard_tools.helpers.export import ELECTION_RECORD_DIR
+from electionguard_tools.helpers.record_archive import (
+    ARCHIVE_COMPRESSION,
+    ELECTION_RECORD_ARCHIVE,
+    pack_record_directory,
+    unpack_record_archive,
+)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Convert an election record between the directory layout and a packed archive",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+    )
+    parser.add_argument(
+        "source",
+        metavar="<source>",
+        help="A record directory to pack, or an archive to unpack.",
+    )
+    parser.add_argument(
+        "target",
+        metavar="<target>",
+        nargs="?",
+        default=None,
+        help=f"The archive or directory to write, defaults to {ELECTION_RECORD_ARCHIVE} "
+        f"or {ELECTION_RECORD_DIR}.",
+    )
+    parser.add_argument(
+        "-z",
+        "--compress",
+        default=False,
+        action="store_true",
+        help="Compress the archive segments when packing.",
+    )
+    args = parser.parse_args()
+
+    if os.path.isdir(args.source):
+        target = args.target or ELECTION_RECORD_ARCHIVE
+        count = pack_record_directory(
+            args.source, target, ARCHIVE_COMPRESSION if args.compress else None
+        )
+        print(f"Packed {count} records into {target} ({os.path.getsize(target)} bytes)")
+    else:
+        target = args.target or ELECTION_RECORD_DIR
+        count = unpack_record_archive(args.source, target)
+        print(f"Unpacked {count} records into {target}")
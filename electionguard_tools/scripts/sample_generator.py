@@ -1,7 +1,7 @@
 #!/usr/bin/env python
 from random import randint
 from shutil import rmtree
-from typing import List
+from typing import List, Optional
 
 from electionguard.ballot import (
     BallotBoxState,
@@ -17,6 +17,7 @@ from electionguard.encrypt import (
     EncryptionMediator,
 )
 from electionguard.guardian import PrivateGuardianRecord
+from electionguard.manifest import Manifest
 from electionguard.tally import tally_ballots
 from electionguard.type import BallotId
 from electionguard.utils import get_optional
@@ -66,23 +67,33 @@ class ElectionSampleDataGenerator:
         use_all_guardians: bool = DEFAULT_USE_ALL_GUARDIANS,
         use_private_data: bool = DEFAULT_USE_PRIVATE_DATA,
         sample_manifest: str = DEFAULT_SAMPLE_MANIFEST,
+        manifest: Optional[Manifest] = None,
+        election_record_directory: str = ELECTION_RECORD_DIR,
     ) -> None:
         """
         Generate the sample data set
+
+        A `manifest` takes precedence over `sample_manifest` when both are given.
         """
 
         # Clear the results directory
-        rmtree(ELECTION_RECORD_DIR, ignore_errors=True)
+        rmtree(election_record_directory, ignore_errors=True)
         rmtree(PRIVATE_DATA_DIR, ignore_errors=True)
 
         # Configure the election
         # TODO: pass the spec version and the manifest name in
-        (
-            public_data,
-            private_data,
-        ) = self.election_factory.get_sample_manifest_with_encryption_context(
-            sample_manifest
-        )
+        if manifest is None:
+            (
+                public_data,
+                private_data,
+            ) = self.election_factory.get_sample_manifest_with_encryption_context(
+                sample_manifest
+            )
+        else:
+            (
+                public_data,
+                private_data,
+            ) = self.election_factory.get_manifest_with_encryption_context(manifest)
         plaintext_ballots = (
             self.ballot_factory.generate_fake_plaintext_ballots_for_election(
                 public_data.internal_manifest, number_of_ballots
@@ -174,6 +185,7 @@ class ElectionSampleDataGenerator:
                 plaintext_tally,
                 public_data.guardians,
                 LagrangeCoefficientsRecord(mediator.get_lagrange_coefficients()),
+                election_record_directory,
             )
 
             if use_private_data:
@@ -0,0 +1,101 @@
+#!/usr/bin/env python
+import json
+import sys
+from time import perf_counter
+from typing import Optional
+
+from electionguard_tools.helpers.export import ELECTION_RECORD_DIR
+from electionguard_tools.helpers.record_verifier import (
+    VERIFY_CHUNK_SIZE,
+    VerificationReport,
+    verify_election_record,
+)
+
+
+def _print_progress(stage: str, done: int, total: int) -> None:
+    print(f"{stage}: {done}/{total}", file=sys.stderr, flush=True)
+
+
+def verify_and_print(
+    record_path: str = ELECTION_RECORD_DIR,
+    workers: Optional[int] = None,
+    chunk_size: int = VERIFY_CHUNK_SIZE,
+    checkpoint: Optional[str] = None,
+    as_json: bool = False,
+) -> VerificationReport:
+    """
+    Verify an election record and print the result
+    """
+    started = perf_counter()
+    report = verify_election_record(
+        record_path,
+        max_workers=workers,
+        chunk_size=chunk_size,
+        checkpoint_path=checkpoint,
+        progress=_print_progress,
+    )
+    if as_json:
+        print(json.dumps(report.to_dict(), indent=2))
+        return report
+
+    for failure in report.failures:
+        print(f"FAILED {failure.check} {failure.object_id}: {failure.message}")
+    print(
+        f"{'VALID' if report.is_valid else 'INVALID'}: {report.ballots} ballots "
+        f"({report.cast} cast, {report.spoiled} spoiled), {len(report.failures)} failures, "
+        f"{report.resumed_chunks} chunks resumed, {report.workers} workers, "
+        f"{perf_counter() - started:.1f}s"
+    )
+    return report
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Verify an exported election record",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+    )
+    parser.add_argument(
+        "record",
+        metavar="<record>",
+        nargs="?",
+        default=ELECTION_RECORD_DIR,
+        help="The election record directory, or an archive written by export_record_archive.",
+    )
+    parser.add_argument(
+        "-w",
+        "--workers",
+        metavar="<count>",
+        default=None,
+        type=int,
+        help="Processes used to verify ballots, defaults to the cpu count.",
+    )
+    parser.add_argument(
+        "-c",
+        "--chunk-size",
+        metavar="<count>",
+        default=VERIFY_CHUNK_SIZE,
+        type=int,
+        help="Ballots verified together in one batch.",
+    )
+    parser.add_argument(
+        "-r",
+        "--checkpoint",
+        metavar="<file>",
+        default=None,
+        type=str,
+        help="Record completed chunks in this file and resume from it if it exists.",
+    )
+    parser.add_argument(
+        "--json",
+        default=False,
+        action="store_true",
+        help="Print the report as json.",
+    )
+    args = parser.parse_args()
+
+    verification = verify_and_print(
+        args.record, args.workers, args.chunk_size, args.checkpoint, args.json
+    )
+    sys.exit(0 if verification.is_valid else 1)
@@ -0,0 +1,123 @@
+"""
+Per-device encryption sessions for ballot code chaining.
+
+Every ballot code is hash(previous code, timestamp, ballot hash), so the ballots of one
+encryption device form a chain. Requests are served by many workers and threads, so the
+head of each device's chain is kept outside any single mediator:
+
+- a session is identified by the election (manifest hash and extended base hash) and the
+  device (device id, session id, launch code, location); its chain starts at the device hash,
+- the current head is a 32-byte file per session, read and replaced under an exclusive
+  file lock, so ballots encrypted by different workers still extend one chain,
+- only linking takes the lock; the ballot bodies are encrypted before, in parallel
+  (`electionguard.encrypt.chain_ballot_code` rebuilds a ballot on the head).
+"""
+
+import hashlib
+import os
+import tempfile
+import threading
+from typing import Dict, List, Optional
+
+from electionguard.ballot import CiphertextBallot
+from electionguard.election import CiphertextElectionContext
+from electionguard.encrypt import EncryptionDevice, chain_ballot_code
+from electionguard.group import ElementModQ
+
+try:
+    import fcntl
+except ImportError:  # Windows: chains are still exact within a single process
+    fcntl = None
+
+# Directory of the per-session chain heads; empty keeps sessions in memory only.
+ENCRYPTION_SESSION_DIR = os.environ.get(
+    'EG_ENCRYPTION_SESSION_DIR', os.path.join(tempfile.gettempdir(), 'electionguard_encryption_sessions')
+)
+
+_CODE_SIZE = 32
+
+
+def _code_bytes(code: ElementModQ) -> bytes:
+    return int(code).to_bytes(_CODE_SIZE, 'big')
+
+
+class DeviceSession:
+    """Thread-safe head of one device's ballot code chain in one election."""
+
+    def __init__(self, session_id: str, starting_code: ElementModQ, directory: Optional[str] = ENCRYPTION_SESSION_DIR):
+        self.session_id = session_id
+        self.path = os.path.join(directory, f"{session_id}.code") if directory else None
+        self._head = starting_code
+        self._lock = threading.Lock()
+        self.linked = 0
+        if self.path:
+            os.makedirs(directory, exist_ok=True)
+
+    @property
+    def head(self) -> ElementModQ:
+        """Code of the last ballot on the chain (the device hash before the first ballot)."""
+        with self._lock:
+            if self.path and os.path.exists(self.path):
+                with open(self.path, 'rb') as head_file:
+                    data = head_file.read()
+                if len(data) == _CODE_SIZE:
+                    return ElementModQ(int.from_bytes(data, 'big'))
+            return self._head
+
+    def link(self, ballots: List[CiphertextBallot]) -> List[CiphertextBallot]:
+        """Append encrypted ballots, in order, to the chain and return them with their codes."""
+        with self._lock:
+            if not self.path:
+                return self._link(ballots)
+            with open(self.path, 'ab+') as head_file:
+                if fcntl is not None:
+                    fcntl.flock(head_file.fileno(), fcntl.LOCK_EX)
+                try:
+                    head_file.seek(0)
+                    data = head_file.read()
+                    if len(data) == _CODE_SIZE:
+                        self._head = ElementModQ(int.from_bytes(data, 'big'))
+                    linked = self._link(ballots)
+                    head_file.truncate(0)
+                    head_file.write(_code_bytes(self._head))
+                    head_file.flush()
+                    return linked
+                finally:
+                    if fcntl is not None:
+                        fcntl.flock(head_file.fileno(), fcntl.LOCK_UN)
+
+    def _link(self, ballots: List[CiphertextBallot]) -> List[CiphertextBallot]:
+        linked = []
+        for ballot in ballots:
+            chained = chain_ballot_code(ballot, self._head)
+            self._head = chained.code
+            linked.append(chained)
+        self.linked += len(linked)
+        return linked
+
+
+def session_id_for(device: EncryptionDevice, context: CiphertextElectionContext) -> str:
+    """Stable name of a device's session in an election."""
+    key = '|'.join([
+        context.manifest_hash.to_hex(),
+        context.crypto_extended_base_hash.to_hex(),
+        str(device.device_id),
+        str(device.session_id),
+        str(device.launch_code),
+        device.location,
+    ])
+    return hashlib.blake2b(key.encode('utf-8'), digest_size=16).hexdigest()
+
+
+_sessions: Dict[str, DeviceSession] = {}
+_sessions_lock = threading.Lock()
+
+
+def get_device_session(device: EncryptionDevice, context: CiphertextElectionContext) -> DeviceSession:
+    """Get the session of a device in an election, creating it on first use."""
+    session_id = session_id_for(device, context)
+    with _sessions_lock:
+        session = _sessions.get(session_id)
+        if session is None:
+            session = _sessions[session_id] = DeviceSession(session_id, device.get_hash())
+        return session
@@ -0,0 +1,261 @@
+"""
+Content-Encoding negotiation for request and response bodies.
+
+Ballots, tallies and decryption shares are mostly hex strings of big integers, which
+carry four bits per byte and compress to about 60% even at the fastest settings (more
+with the repeated keys of msgpack maps), and a tally or decryption moves hundreds of
+megabytes per election between the backend and this service:
+
+- request bodies sent with `Content-Encoding` are decompressed before they are parsed,
+  refusing bodies that inflate beyond EG_MAX_DECOMPRESSED_MB,
+- responses are compressed with the best coding the client lists in `Accept-Encoding`,
+  unless they are smaller than EG_COMPRESSION_MIN_BYTES; streamed responses are
+  compressed chunk by chunk as they are produced,
+- gzip and deflate come from the standard library; zstd (`zstandard`) and lz4 (`lz4`) are
+  used when installed, and `register_codec` adds others.
+"""
+
+import os
+import zlib
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
+
+# Bodies smaller than this are sent uncompressed.
+COMPRESSION_MIN_BYTES = int(os.environ.get('EG_COMPRESSION_MIN_BYTES', '1024'))
+# Codec level; higher levels gain little on hex digits for much more CPU.
+COMPRESSION_LEVEL = int(os.environ.get('EG_COMPRESSION_LEVEL', '1'))
+# Largest decompressed request body; 0 disables the limit.
+MAX_DECOMPRESSED_BYTES = int(float(os.environ.get('EG_MAX_DECOMPRESSED_MB', '2048')) * 1024 * 1024)
+
+
+class Compressor(ABC):
+    """Incremental compressor: `compress` returns what is ready, `flush` the rest."""
+
+    @abstractmethod
+    def compress(self, data: bytes) -> bytes:
+        """Compress more data, returning the compressed bytes that are ready."""
+
+    @abstractmethod
+    def flush(self) -> bytes:
+        """Finish the stream, returning the remaining compressed bytes."""
+
+
+class Decompressor(ABC):
+    """Incremental decompressor returning at most `max_length` bytes per call (0: no limit)."""
+
+    @abstractmethod
+    def decompress(self, data: bytes, max_length: int = 0) -> bytes:
+        """Decompress more data, returning at most max_length bytes."""
+
+    @property
+    def eof(self) -> bool:
+        """Whether the end of the compressed data was reached; codecs that cannot tell say True."""
+        return True
+
+
+@dataclass
+class Codec:
+    """A content coding: its token and factories of its stream (de)compressors."""
+
+    name: str
+    compressor: Callable[[int], Compressor]
+    decompressor: Callable[[], Decompressor]
+
+
+class _ZlibCompressor(Compressor):
+    def __init__(self, level: int, wbits: int):
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, wbits)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.flush()
+
+
+class _ZlibDecompressor(Decompressor):
+    def __init__(self, wbits: int, members: bool):
+        self._wbits = wbits
+        self._members = members
+        self._decompressor = zlib.decompressobj(wbits)
+
+    def decompress(self, data: bytes, max_length: int = 0) -> bytes:
+        output = self._decompressor.decompress(data, max_length)
+        # A gzip body may hold several members, each decoded in turn; deflate is one stream
+        while self._decompressor.eof and self._decompressor.unused_data:
+            if not self._members:
+                raise ValueError('data after the end of the compressed stream')
+            remaining = max_length - len(output) if max_length else 0
+            if max_length and remaining <= 0:
+                break
+            data = self._decompressor.unused_data
+            self._decompressor = zlib.decompressobj(self._wbits)
+            output += self._decompressor.decompress(data, remaining)
+        return output
+
+    @property
+    def eof(self) -> bool:
+        return self._decompressor.eof
+
+
+_codecs: Dict[str, Codec] = {}
+# Server preference among the codings a client accepts
+_preference: List[str] = []
+
+
+def register_codec(codec: Codec, preferred: bool = False) -> None:
+    """Make a content coding available, ahead of the others if preferred."""
+    _codecs[codec.name] = codec
+    if codec.name in _preference:
+        _preference.remove(codec.name)
+    if preferred:
+        _preference.insert(0, codec.name)
+    else:
+        _preference.append(codec.name)
+
+
+register_codec(Codec(
+    'gzip', lambda level: _ZlibCompressor(level, 16 + zlib.MAX_WBITS),
+    lambda: _ZlibDecompressor(16 + zlib.MAX_WBITS, members=True)
+))
+register_codec(Codec(
+    'deflate', lambda level: _ZlibCompressor(level, zlib.MAX_WBITS),
+    lambda: _ZlibDecompressor(zlib.MAX_WBITS, members=False)
+))
+
+try:
+    import zstandard
+except ImportError:  # optional: gzip and deflate remain available
+    zstandard = None
+
+if zstandard is not None:
+    class _ZstdCompressor(Compressor):
+        def __init__(self, level: int):
+            self._compressor = zstandard.ZstdCompressor(level=level).compressobj()
+
+        def compress(self, data: bytes) -> bytes:
+            return self._compressor.compress(data)
+
+        def flush(self) -> bytes:
+            return self._compressor.flush()
+
+    class _ZstdDecompressor(Decompressor):
+        # decompressobj() has no output limit, so each body is read through a stream reader;
+        # it does not report where the data ended, so eof keeps the default
+        def __init__(self):
+            self._decompressor = zstandard.ZstdDecompressor()
+
+        def decompress(self, data: bytes, max_length: int = 0) -> bytes:
+            with self._decompressor.stream_reader(data, read_across_frames=True) as reader:
+                return reader.read(max_length or -1)
+
+    register_codec(Codec('zstd', _ZstdCompressor, _ZstdDecompressor), preferred=True)
+
+try:
+    import lz4.frame as lz4_frame
+except ImportError:  # optional
+    lz4_frame = None
+
+if lz4_frame is not None:
+    class _Lz4Compressor(Compressor):
+        def __init__(self, level: int):
+            self._compressor = lz4_frame.LZ4FrameCompressor(compression_level=max(0, level))
+            self._started = False
+
+        def compress(self, data: bytes) -> bytes:
+            header = b'' if self._started else self._compressor.begin()
+            self._started = True
+            return header + self._compressor.compress(data)
+
+        def flush(self) -> bytes:
+            header = b'' if self._started else self._compressor.begin()
+            self._started = True
+            return header + self._compressor.flush()
+
+    class _Lz4Decompressor(Decompressor):
+        def __init__(self):
+            self._decompressor = lz4_frame.LZ4FrameDecompressor()
+
+        def decompress(self, data: bytes, max_length: int = 0) -> bytes:
+            output = self._decompressor.decompress(data, max_length or -1)
+            if self._decompressor.eof and self._decompressor.unused_data:
+                raise ValueError('data after the end of the compressed frame')
+            return output
+
+        @property
+        def eof(self) -> bool:
+            return self._decompressor.eof
+
+    register_codec(Codec('lz4', _Lz4Compressor, _Lz4Decompressor))
+
+
+def available_codings() -> List[str]:
+    """Content codings this server reads and writes, most preferred first."""
+    return list(_preference)
+
+
+def negotiate(accept_encoding: Optional[str]) -> Optional[str]:
+    """The preferred coding among those an `Accept-Encoding` header allows, or None."""
+    if not accept_encoding:
+        return None
+    weights: Dict[str, float] = {}
+    for item in accept_encoding.split(','):
+        token, _, parameters = item.strip().partition(';')
+        weight = 1.0
+        for parameter in parameters.split(';'):
+            name, _, value = parameter.strip().partition('=')
+            if name.strip().lower() == 'q':
+                try:
+                    weight = float(value)
+                except ValueError:
+                    weight = 0.0
+        weights[token.strip().lower()] = weight
+    wildcard = weights.get('*', 0.0)
+    candidates = [(weights.get(name, wildcard), -rank, name) for rank, name in enumerate(_preference)]
+    weight, _, name = max(candidates, default=(0.0, 0, None))
+    return name if weight > 0 else None
+
+
+def decode_body(body: bytes, content_encoding: Optional[str], max_size: int = MAX_DECOMPRESSED_BYTES) -> bytes:
+    """
+    Undo the content codings of a request body (applied in the order listed).
+
+    :raises ValueError: for an unsupported coding, a corrupt or truncated body (trailing data
+        included) or one larger than max_size
+    """
+    codings = [c.strip().lower() for c in (content_encoding or '').split(',') if c.strip()]
+    for coding in reversed(codings):
+        if coding == 'identity':
+            continue
+        codec = _codecs.get(coding)
+        if codec is None:
+            raise ValueError(f"Unsupported Content-Encoding '{coding}'; supported: {', '.join(available_codings())}")
+        try:
+            decompressor = codec.decompressor()
+            limit = max_size + 1 if max_size else 0
+            body = decompressor.decompress(body, limit)
+        except Exception as e:  # zlib.error, or the optional codecs' own error types
+            raise ValueError(f"Request body is not valid {coding} data: {e}")
+        if max_size and len(body) > max_size:
+            raise ValueError(f"Decompressed request body exceeds {max_size} bytes")
+        if not decompressor.eof:
+            raise ValueError(f"Request body is truncated {coding} data")
+    return body
+
+
+def compress_body(body: bytes, coding: str, level: int = COMPRESSION_LEVEL) -> bytes:
+    """Compress a whole body with a content coding."""
+    compressor = _codecs[coding].compressor(level)
+    return compressor.compress(body) + compressor.flush()
+
+
+def compress_stream(chunks: Iterable[bytes], coding: str, level: int = COMPRESSION_LEVEL) -> Iterator[bytes]:
+    """Compress a body produced in chunks, yielding compressed data as it becomes available."""
+    compressor = _codecs[coding].compressor(level)
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
@@ -0,0 +1,250 @@
+"""
+Idempotent results of expensive requests.
+
+The backend retries `/create_partial_decryption` and `/create_compensated_decryption` when
+they time out, and every retry used to recompute all shares, even when an identical request
+had just finished on another worker. Requests that opt in are answered once:
+
+- a request is named by its endpoint and the client's idempotency key (the
+  `Idempotency-Key` header or an `idempotency_key` field), or, with EG_IDEMPOTENCY_AUTO, by
+  a digest of the canonicalized request (msgpack with sorted keys),
+- successful responses are stored in EG_IDEMPOTENCY_DIR with the request digest, bounded
+  to EG_IDEMPOTENCY_MAX_MB (oldest evicted first) and expired after EG_IDEMPOTENCY_TTL seconds,
+- the computation of a name holds an exclusive lock, so an identical request arriving
+  meanwhile, in this worker or another, waits for the first one and gets its result; the
+  lock (a file, and a thread lock in each worker) exists only while it is held or awaited,
+- a key reused with a different request is refused instead of answered with a stale result.
+"""
+
+import hashlib
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import msgpack
+
+try:
+    import fcntl
+except ImportError:  # Windows: duplicates are only awaited within a single process
+    fcntl = None
+
+# Directory of the stored results; empty keeps them in this worker only.
+IDEMPOTENCY_DIR = os.environ.get(
+    'EG_IDEMPOTENCY_DIR', os.path.join(tempfile.gettempdir(), 'electionguard_idempotency')
+)
+IDEMPOTENCY_MAX_BYTES = int(float(os.environ.get('EG_IDEMPOTENCY_MAX_MB', '1024')) * 1024 * 1024)
+IDEMPOTENCY_TTL = int(os.environ.get('EG_IDEMPOTENCY_TTL', str(24 * 3600)))
+# Also deduplicate requests that carry no idempotency key, by their digest.
+IDEMPOTENCY_AUTO = os.environ.get('EG_IDEMPOTENCY_AUTO', '').lower() in ('1', 'true', 'yes')
+
+
+def _canonical(value: Any) -> Any:
+    if isinstance(value, dict):
+        return [[_canonical(k), _canonical(v)] for k, v in sorted(value.items(), key=lambda item: str(item[0]))]
+    if isinstance(value, (list, tuple)):
+        return [_canonical(v) for v in value]
+    return value
+
+
+def request_digest(data: Any) -> str:
+    """Digest of a parsed request that does not depend on the order of its keys."""
+    packed = msgpack.packb(_canonical(data), use_bin_type=True, default=str)
+    return hashlib.blake2b(packed, digest_size=32).hexdigest()
+
+
+class IdempotencyCache:
+    """Thread-safe store of the results of named requests."""
+
+    def __init__(self, directory: Optional[str] = IDEMPOTENCY_DIR,
+                 max_bytes: int = IDEMPOTENCY_MAX_BYTES, ttl: int = IDEMPOTENCY_TTL):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._memory: 'OrderedDict[str, Tuple[float, str, bytes]]' = OrderedDict()
+        self._memory_bytes = 0
+        self._memory_lock = threading.Lock()
+        # Thread lock of each name in use, with the number of requests holding or awaiting it
+        self._locks: Dict[str, Tuple[threading.Lock, int]] = {}
+        self._locks_lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def run(self, endpoint: str, key: str, digest: str,
+            compute: Callable[[], Tuple[int, bytes]]) -> Tuple[int, bytes, bool]:
+        """
+        The response of a named request: stored, awaited from an identical request in
+        flight, or computed now. Only successful (200) responses are stored.
+
+        :return: status, body and whether the body was replayed
+        :raises ValueError: if the key was used for a different request
+        """
+        name = hashlib.blake2b(f"{endpoint}|{key}".encode('utf-8'), digest_size=16).hexdigest()
+        with self._locks_lock:
+            lock, users = self._locks.get(name) or (threading.Lock(), 0)
+            self._locks[name] = (lock, users + 1)
+        try:
+            with lock, self._exclusive(name):
+                stored = self._load(name)
+                if stored is not None:
+                    stored_digest, body = stored
+                    if stored_digest != digest:
+                        raise ValueError(f"Idempotency key '{key}' was already used for a different request")
+                    self.hits += 1
+                    return 200, body, True
+                self.misses += 1
+                status, body = compute()
+                if status == 200:
+                    self._store(name, digest, body)
+                return status, body, False
+        finally:
+            with self._locks_lock:
+                lock, users = self._locks[name]
+                if users == 1:
+                    del self._locks[name]
+                else:
+                    self._locks[name] = (lock, users - 1)
+
+    def _exclusive(self, name: str):
+        return _FileLock(os.path.join(self.directory, f"{name}.lock") if self.directory and fcntl else None)
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.directory, f"{name}.result")
+
+    def _load(self, name: str) -> Optional[Tuple[str, bytes]]:
+        now = time.time()
+        if not self.directory:
+            with self._memory_lock:
+                entry = self._memory.get(name)
+                if entry is None or now - entry[0] > self.ttl:
+                    self._forget(name)
+                    return None
+                self._memory.move_to_end(name)
+                return entry[1], entry[2]
+        path = self._path(name)
+        try:
+            if now - os.path.getmtime(path) > self.ttl:
+                os.remove(path)
+                return None
+            with open(path, 'rb') as result_file:
+                entry = msgpack.unpackb(result_file.read(), raw=False)
+        except (OSError, ValueError):  # missing, evicted meanwhile or truncated
+            return None
+        return entry['digest'], entry['body']
+
+    def _store(self, name: str, digest: str, body: bytes) -> None:
+        if len(body) > self.max_bytes:
+            return
+        if not self.directory:
+            with self._memory_lock:
+                self._forget(name)
+                self._memory[name] = (time.time(), digest, body)
+                self._memory_bytes += len(body)
+                while self._memory_bytes > self.max_bytes:
+                    self._forget(next(iter(self._memory)))
+            return
+        handle, temporary = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        with os.fdopen(handle, 'wb') as result_file:
+            result_file.write(msgpack.packb({'digest': digest, 'body': body}, use_bin_type=True))
+        os.replace(temporary, self._path(name))
+        self._evict()
+
+    def _forget(self, name: str) -> None:
+        entry = self._memory.pop(name, None)
+        if entry is not None:
+            self._memory_bytes -= len(entry[2])
+
+    def _evict(self) -> None:
+        """
+        Remove expired results, then the oldest ones until the store fits its bound, and
+        the lock files a worker that exited mid-request left behind.
+        """
+        now = time.time()
+        results = []
+        for entry in os.scandir(self.directory):
+            try:
+                stat = entry.stat()
+            except OSError:
+                continue
+            if entry.name.endswith('.result'):
+                results.append((stat.st_mtime, stat.st_size, entry.path))
+            elif entry.name.endswith('.lock') and now - stat.st_mtime > self.ttl:
+                _FileLock.remove_abandoned(entry.path)
+        results.sort()
+        total = sum(size for _, size, _ in results)
+        for mtime, size, path in results:
+            if total <= self.max_bytes and now - mtime <= self.ttl:
+                break
+            try:
+                os.remove(path)
+            except OSError:  # removed by another worker
+                pass
+            total -= size
+
+
+class _FileLock:
+    """
+    Exclusive lock on a file shared by all workers (no-op without a path).
+
+    The holder removes the file before releasing it, so files do not pile up; a waiter that
+    then gets the lock of the removed file sees that the path is gone or names another file,
+    and waits on that one instead.
+    """
+
+    def __init__(self, path: Optional[str]):
+        self.path = path
+        self._file = None
+
+    def __enter__(self):
+        while self.path:
+            self._file = open(self.path, 'ab')
+            fcntl.flock(self._file.fileno(), fcntl.LOCK_EX)
+            if _same_file(self._file, self.path):
+                break
+            self._file.close()
+        return self
+
+    def __exit__(self, *exc_info):
+        if self._file is not None:
+            try:
+                os.remove(self.path)
+            except OSError:
+                pass
+            fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+            self._file.close()
+            self._file = None
+
+    @staticmethod
+    def remove_abandoned(path: str) -> None:
+        """Remove a lock file nobody holds or awaits."""
+        try:
+            with open(path, 'ab') as lock_file:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+                if _same_file(lock_file, path):
+                    os.remove(path)
+        except OSError:  # held, or removed meanwhile
+            pass
+
+
+def _same_file(opened, path: str) -> bool:
+    try:
+        return os.fstat(opened.fileno()).st_ino == os.stat(path).st_ino
+    except OSError:
+        return False
+
+
+_cache: Optional[IdempotencyCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_idempotency_cache() -> IdempotencyCache:
+    """Get the global idempotency cache."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = IdempotencyCache()
+        return _cache
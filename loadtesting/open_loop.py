@@ -0,0 +1,597 @@
+#!/usr/bin/env python
+
+"""
+Open-Loop Load Generator
+========================
+Drives the full election lifecycle (setup -> encrypt bursts -> tally -> partial /
+compensated decryption -> combine) against the API at a target arrival rate, without
+PostgreSQL or a running server.
+
+Unlike the thread-per-user benchmarks, requests are issued on a fixed schedule whether
+or not earlier requests have finished (open loop), so queueing delay shows up in the
+numbers instead of silently throttling the load. Every request is measured twice:
+
+- service time:  from when the request was actually sent until the response arrived
+- response time: from when the schedule said it should be sent until the response
+                 arrived (corrected for coordinated omission)
+
+Latencies go into HDR-style log-linear histograms, so percentiles stay accurate to
+better than 1% at any scale.
+
+Usage:
+    # In-process (Flask test client), SQLite in memory
+    python loadtesting/open_loop.py --ballots 200 --rate 20
+
+    # Against a running server, Poisson arrivals in 4 bursts, keep the database
+    python loadtesting/open_loop.py --url http://127.0.0.1:5000 --ballots 1000 --rate 50 \\
+        --bursts 4 --arrival poisson --db loadtest.sqlite3 --json results.json
+"""
+
+import sys, os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import asyncio
+import contextlib
+import json
+import logging
+import random
+import sqlite3
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+import msgpack
+
+PERCENTILES = [50.0, 90.0, 99.0, 99.9]
+
+# ============================================================================
+# LATENCY HISTOGRAM
+# ============================================================================
+
+
+class LatencyHistogram:
+    """
+    HDR-style histogram of latencies in microseconds.
+
+    Each power-of-two range is split into 2^(significant_bits - 1) linear buckets, so
+    a recorded value is off by at most 2^-(significant_bits - 1) of itself (0.8% with
+    the default 8 bits) while memory stays logarithmic in the largest value.
+    """
+
+    def __init__(self, significant_bits: int = 8):
+        self.significant_bits = significant_bits
+        self.sub_bucket_count = 1 << significant_bits
+        self.counts: Dict[int, int] = defaultdict(int)
+        self.total = 0
+        self.sum = 0
+        self.min = None
+        self.max = 0
+
+    def _index(self, value: int) -> int:
+        if value < self.sub_bucket_count:
+            return value
+        shift = value.bit_length() - self.significant_bits
+        half = self.sub_bucket_count >> 1
+        return self.sub_bucket_count + (shift - 1) * half + ((value >> shift) - half)
+
+    def _highest_equivalent_value(self, index: int) -> int:
+        if index < self.sub_bucket_count:
+            return index
+        half = self.sub_bucket_count >> 1
+        shift = (index - self.sub_bucket_count) // half + 1
+        mantissa = (index - self.sub_bucket_count) % half + half
+        return ((mantissa + 1) << shift) - 1
+
+    def record(self, value_us: float, count: int = 1) -> None:
+        value = max(0, int(value_us))
+        self.counts[self._index(value)] += count
+        self.total += count
+        self.sum += value * count
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = max(self.max, value)
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        assert other.significant_bits == self.significant_bits, "Histograms must share precision"
+        for index, count in other.counts.items():
+            self.counts[index] += count
+        self.total += other.total
+        self.sum += other.sum
+        if other.min is not None:
+            self.min = other.min if self.min is None else min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    def percentile(self, percentile: float) -> int:
+        """Highest value (within histogram precision) at or below which `percentile`% of samples fall."""
+        if not self.total:
+            return 0
+        target = max(1, int(-(-percentile * self.total // 100)))
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= target:
+                return min(self._highest_equivalent_value(index), self.max)
+        return self.max
+
+    def mean(self) -> float:
+        return self.sum / self.total if self.total else 0.0
+
+    def summary_ms(self) -> Dict[str, float]:
+        summary = {f"p{p:g}": self.percentile(p) / 1000 for p in PERCENTILES}
+        summary['mean'] = self.mean() / 1000
+        summary['max'] = self.max / 1000
+        return summary
+
+
+# ============================================================================
+# SQLITE STAND-IN FOR THE ELECTION DATABASE
+# ============================================================================
+
+
+class ElectionStore:
+    """
+    SQLite stand-in for the amarvote tables used by the backend (elections,
+    election_choices, ballots, allowed_voters) plus the guardian credentials the
+    decryption steps need. Opaque API payloads are stored as msgpack blobs.
+    """
+
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS elections (
+        election_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        election_title TEXT, number_of_guardians INTEGER, election_quorum INTEGER,
+        joint_public_key TEXT, base_hash TEXT, max_choices INTEGER
+    );
+    CREATE TABLE IF NOT EXISTS election_choices (
+        choice_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        election_id INTEGER, option_title TEXT, party_name TEXT
+    );
+    CREATE TABLE IF NOT EXISTS guardians (
+        election_id INTEGER, guardian_id TEXT, sequence_order INTEGER,
+        guardian_data BLOB, private_key BLOB, public_key BLOB, polynomial BLOB
+    );
+    CREATE TABLE IF NOT EXISTS ballots (
+        ballot_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        election_id INTEGER, cipher_text BLOB, hash_code TEXT, tracking_code TEXT, status TEXT
+    );
+    CREATE TABLE IF NOT EXISTS allowed_voters (
+        election_id INTEGER, user_email TEXT, has_voted BOOLEAN
+    );
+    """
+
+    def __init__(self, path: str = ":memory:"):
+        self.connection = sqlite3.connect(path)
+        self.connection.row_factory = sqlite3.Row
+        self.connection.executescript(self.SCHEMA)
+
+    def create_election(self, title: str, party_names: List[str], candidate_names: List[str],
+                        setup: Dict[str, Any], max_choices: int) -> int:
+        with self.connection:
+            cursor = self.connection.execute(
+                "INSERT INTO elections (election_title, number_of_guardians, election_quorum, "
+                "joint_public_key, base_hash, max_choices) VALUES (?, ?, ?, ?, ?, ?)",
+                (title, setup['number_of_guardians'], setup['quorum'],
+                 str(setup['joint_public_key']), str(setup['commitment_hash']), max_choices),
+            )
+            election_id = cursor.lastrowid
+            self.connection.executemany(
+                "INSERT INTO election_choices (election_id, option_title, party_name) VALUES (?, ?, ?)",
+                [(election_id, candidate, party) for candidate, party in zip(candidate_names, party_names)],
+            )
+            self.connection.executemany(
+                "INSERT INTO guardians VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (election_id, _guardian_id(guardian_data), index + 1, _pack(guardian_data),
+                     _pack(setup['private_keys'][index]), _pack(setup['public_keys'][index]),
+                     _pack(setup['polynomials'][index]))
+                    for index, guardian_data in enumerate(setup['guardian_data'])
+                ],
+            )
+        return election_id
+
+    def get_election_by_id(self, election_id: int) -> Optional[Dict[str, Any]]:
+        row = self.connection.execute("SELECT * FROM elections WHERE election_id = ?", (election_id,)).fetchone()
+        return dict(row) if row else None
+
+    def get_election_choices(self, election_id: int) -> List[Dict[str, Any]]:
+        rows = self.connection.execute(
+            "SELECT * FROM election_choices WHERE election_id = ? ORDER BY choice_id", (election_id,)
+        ).fetchall()
+        return [dict(row) for row in rows]
+
+    def get_guardians(self, election_id: int) -> List[Dict[str, Any]]:
+        rows = self.connection.execute(
+            "SELECT * FROM guardians WHERE election_id = ? ORDER BY sequence_order", (election_id,)
+        ).fetchall()
+        return [
+            {key: _unpack(row[key]) if isinstance(row[key], bytes) else row[key] for key in row.keys()}
+            for row in rows
+        ]
+
+    def add_ballot_to_db(self, election_id: int, tracking_code: str, ballot_hash: str,
+                         cipher_text: Any, user_email: str) -> None:
+        with self.connection:
+            self.connection.execute(
+                "INSERT INTO ballots (election_id, cipher_text, hash_code, tracking_code, status) "
+                "VALUES (?, ?, ?, ?, 'cast')",
+                (election_id, _pack(cipher_text), ballot_hash, tracking_code),
+            )
+            self.connection.execute(
+                "INSERT INTO allowed_voters (election_id, user_email, has_voted) VALUES (?, ?, 1)",
+                (election_id, user_email),
+            )
+
+    def get_ballot_ciphertexts(self, election_id: int) -> List[Any]:
+        rows = self.connection.execute(
+            "SELECT cipher_text FROM ballots WHERE election_id = ? ORDER BY ballot_id", (election_id,)
+        ).fetchall()
+        return [_unpack(row['cipher_text']) for row in rows]
+
+
+def _pack(value: Any) -> bytes:
+    return msgpack.packb(value, use_bin_type=True)
+
+
+def _unpack(value: bytes) -> Any:
+    return msgpack.unpackb(value, raw=False)
+
+
+def _guardian_id(guardian_data: Any) -> str:
+    return json.loads(guardian_data)['id'] if isinstance(guardian_data, str) else guardian_data['id']
+
+
+# ============================================================================
+# TRANSPORTS
+# ============================================================================
+
+
+class InProcessTransport:
+    """Calls the Flask app through its test client, one client per worker thread."""
+
+    def __init__(self):
+        import api
+        self._app = api.app
+        self._local = threading.local()
+
+    def post(self, path: str, payload: Dict[str, Any]) -> Tuple[int, Any]:
+        if not hasattr(self._local, 'client'):
+            self._local.client = self._app.test_client()
+        response = self._local.client.post(path, data=_pack(payload), content_type='application/msgpack')
+        return response.status_code, _unpack(response.data)
+
+
+class HttpTransport:
+    """Calls a running server over HTTP with one keep-alive session per worker thread."""
+
+    def __init__(self, base_url: str, timeout: float = 600):
+        import requests
+        self._requests = requests
+        self._base_url = base_url.rstrip('/')
+        self._timeout = timeout
+        self._local = threading.local()
+
+    def post(self, path: str, payload: Dict[str, Any]) -> Tuple[int, Any]:
+        if not hasattr(self._local, 'session'):
+            self._local.session = self._requests.Session()
+        response = self._local.session.post(
+            f"{self._base_url}{path}", data=_pack(payload),
+            headers={'Content-Type': 'application/msgpack'}, timeout=self._timeout,
+        )
+        return response.status_code, _unpack(response.content)
+
+
+# ============================================================================
+# LOAD GENERATOR
+# ============================================================================
+
+
+@dataclass
+class EndpointStats:
+    """Latency histograms and counters for one endpoint."""
+
+    service: LatencyHistogram = field(default_factory=LatencyHistogram)
+    response: LatencyHistogram = field(default_factory=LatencyHistogram)
+    requests: int = 0
+    errors: int = 0
+    first_intended: Optional[float] = None
+    last_finished: float = 0.0
+
+    def report(self) -> Dict[str, Any]:
+        elapsed = self.last_finished - (self.first_intended or self.last_finished)
+        return {
+            'requests': self.requests,
+            'errors': self.errors,
+            'throughput_rps': round(self.requests / elapsed, 2) if elapsed > 0 else None,
+            'service_time_ms': self.service.summary_ms(),
+            'response_time_ms': self.response.summary_ms(),
+        }
+
+
+class OpenLoopLoadGenerator:
+    """Schedules API calls on an asyncio clock and runs them on a bounded thread pool."""
+
+    def __init__(self, transport, store: ElectionStore, concurrency: int = 8, seed: Optional[int] = None):
+        self.transport = transport
+        self.store = store
+        self.executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="loadgen")
+        self.random = random.Random(seed)
+        self.stats: Dict[str, EndpointStats] = defaultdict(EndpointStats)
+        self.errors: List[str] = []
+
+    def _timed_post(self, path: str, payload: Dict[str, Any]) -> Tuple[int, Any, float, float]:
+        started = time.perf_counter()
+        try:
+            status, body = self.transport.post(path, payload)
+        except Exception as e:
+            status, body = 0, {'status': 'error', 'message': str(e)}
+        return status, body, started, time.perf_counter()
+
+    async def request(self, path: str, payload: Dict[str, Any], intended: Optional[float] = None) -> Optional[Any]:
+        """Issue one request; latency is measured from `intended` (default: now)."""
+        intended = time.perf_counter() if intended is None else intended
+        loop = asyncio.get_running_loop()
+        status, body, started, finished = await loop.run_in_executor(self.executor, self._timed_post, path, payload)
+
+        stats = self.stats[path]
+        stats.requests += 1
+        stats.service.record((finished - started) * 1e6)
+        stats.response.record((finished - intended) * 1e6)
+        stats.first_intended = intended if stats.first_intended is None else min(stats.first_intended, intended)
+        stats.last_finished = max(stats.last_finished, finished)
+        if status != 200:
+            stats.errors += 1
+            message = body.get('message') if isinstance(body, dict) else body
+            self.errors.append(f"{path} -> {status}: {str(message)[:200]}")
+            return None
+        return body
+
+    def arrival_offsets(self, count: int, rate: float, arrival: str) -> List[float]:
+        """Send offsets in seconds for `count` arrivals at `rate` per second."""
+        if arrival == 'poisson':
+            offsets, now = [], 0.0
+            for _ in range(count):
+                offsets.append(now)
+                now += self.random.expovariate(rate)
+            return offsets
+        return [i / rate for i in range(count)]
+
+    async def open_loop(self, path: str, payloads: List[Dict[str, Any]], rate: float, arrival: str) -> List[Optional[Any]]:
+        """Send payloads on schedule regardless of how many requests are still outstanding."""
+        start = time.perf_counter()
+        tasks = []
+        for offset, payload in zip(self.arrival_offsets(len(payloads), rate, arrival), payloads):
+            intended = start + offset
+            delay = intended - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            tasks.append(asyncio.create_task(self.request(path, payload, intended)))
+        return await asyncio.gather(*tasks)
+
+    # ---------------------------------------------------------------- lifecycle
+
+    async def setup_election(self, number_of_guardians: int, quorum: int, party_names: List[str],
+                             candidate_names: List[str], max_choices: int) -> int:
+        setup = await self.request('/setup_guardians', {
+            'number_of_guardians': number_of_guardians, 'quorum': quorum,
+            'party_names': party_names, 'candidate_names': candidate_names,
+        })
+        if setup is None:
+            raise RuntimeError(f"Guardian setup failed: {self.errors[-1]}")
+        return self.store.create_election("Load test election", party_names, candidate_names, setup, max_choices)
+
+    def _election_payload(self, election_id: int) -> Dict[str, Any]:
+        election = self.store.get_election_by_id(election_id)
+        choices = self.store.get_election_choices(election_id)
+        return {
+            'party_names': [choice['party_name'] for choice in choices],
+            'candidate_names': [choice['option_title'] for choice in choices],
+            'joint_public_key': election['joint_public_key'],
+            'commitment_hash': election['base_hash'],
+            'number_of_guardians': election['number_of_guardians'],
+            'quorum': election['election_quorum'],
+            'max_choices': election['max_choices'],
+        }
+
+    async def encrypt_ballots(self, election_id: int, ballots: int, rate: float, bursts: int,
+                              burst_pause: float, arrival: str) -> int:
+        base = self._election_payload(election_id)
+        candidates = base['candidate_names']
+        payloads = []
+        for number in range(1, ballots + 1):
+            size = self.random.randint(1, base['max_choices'])
+            payloads.append(dict(
+                base, ballot_id=f"ballot-{number}",
+                candidate_names_to_vote=self.random.sample(candidates, min(size, len(candidates))),
+            ))
+
+        stored = 0
+        burst_size = -(-ballots // max(1, bursts))
+        for burst, first in enumerate(range(0, ballots, burst_size)):
+            if burst and burst_pause:
+                await asyncio.sleep(burst_pause)
+            batch = payloads[first:first + burst_size]
+            for payload, result in zip(batch, await self.open_loop('/create_encrypted_ballot', batch, rate, arrival)):
+                if result is None:
+                    continue
+                self.store.add_ballot_to_db(
+                    election_id, payload['ballot_id'], result['ballot_hash'],
+                    result['encrypted_ballot'],
+                    f"{payload['ballot_id']}@example.com",
+                )
+                stored += 1
+        return stored
+
+    async def decrypt_chunk(self, election_id: int, ballots: List[Any], missing: int) -> Optional[Dict[str, Any]]:
+        """Tally one chunk of ballots, decrypt it with the available guardians and combine."""
+        base = self._election_payload(election_id)
+        tally = await self.request('/create_encrypted_tally', dict(base, encrypted_ballots=ballots))
+        if tally is None:
+            return None
+
+        guardians = self.store.get_guardians(election_id)
+        available = guardians[:len(guardians) - missing]
+        absent = guardians[len(guardians) - missing:]
+        common = dict(base, ciphertext_tally=tally['ciphertext_tally'], submitted_ballots=tally['submitted_ballots'])
+
+        partials = await asyncio.gather(*[
+            self.request('/create_partial_decryption', dict(
+                common, guardian_id=guardian['guardian_id'], guardian_data=guardian['guardian_data'],
+                private_key=guardian['private_key'], public_key=guardian['public_key'],
+                polynomial=guardian['polynomial'],
+            ))
+            for guardian in available
+        ])
+        pairs = [(missing_guardian, guardian) for missing_guardian in absent for guardian in available]
+        compensated = await asyncio.gather(*[
+            self.request('/create_compensated_decryption', dict(
+                common, available_guardian_id=guardian['guardian_id'],
+                missing_guardian_id=missing_guardian['guardian_id'],
+                available_guardian_data=guardian['guardian_data'],
+                missing_guardian_data=missing_guardian['guardian_data'],
+                available_private_key=guardian['private_key'], available_public_key=guardian['public_key'],
+                available_polynomial=guardian['polynomial'],
+            ))
+            for missing_guardian, guardian in pairs
+        ])
+        if any(result is None for result in partials + compensated):
+            return None
+
+        return await self.request('/combine_decryption_shares', dict(
+            common,
+            guardian_data=[guardian['guardian_data'] for guardian in guardians],
+            available_guardian_ids=[guardian['guardian_id'] for guardian in available],
+            available_guardian_public_keys=[partial['guardian_public_key'] for partial in partials],
+            available_tally_shares=[partial['tally_share'] for partial in partials],
+            available_ballot_shares=[partial['ballot_shares'] for partial in partials],
+            missing_guardian_ids=[missing_guardian['guardian_id'] for missing_guardian, _ in pairs],
+            compensating_guardian_ids=[guardian['guardian_id'] for _, guardian in pairs],
+            compensated_tally_shares=[result['compensated_tally_share'] for result in compensated],
+            compensated_ballot_shares=[result['compensated_ballot_shares'] for result in compensated],
+            include_ballot_verification=False,
+        ))
+
+    async def tally_and_decrypt(self, election_id: int, chunk_size: int, missing: int) -> Dict[str, int]:
+        """Run every chunk's tally/decryption pipeline concurrently and add up the votes."""
+        ballots = self.store.get_ballot_ciphertexts(election_id)
+        chunks = [ballots[i:i + chunk_size] for i in range(0, len(ballots), chunk_size)]
+        results = await asyncio.gather(*[self.decrypt_chunk(election_id, chunk, missing) for chunk in chunks])
+
+        votes: Dict[str, int] = defaultdict(int)
+        for result in results:
+            if result is None:
+                continue
+            for candidate, info in result['results']['results']['candidates'].items():
+                votes[candidate] += int(info['votes'])
+        return dict(votes)
+
+    async def run(self, args) -> Dict[str, Any]:
+        party_names = [f"Party {i + 1}" for i in range(args.candidates)]
+        candidate_names = [f"Candidate {i + 1}" for i in range(args.candidates)]
+
+        phases = {}
+        start = time.perf_counter()
+        election_id = await self.setup_election(args.guardians, args.quorum, party_names, candidate_names, args.max_choices)
+        phases['setup'] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        stored = await self.encrypt_ballots(election_id, args.ballots, args.rate, args.bursts, args.burst_pause, args.arrival)
+        phases['encrypt'] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        votes = await self.tally_and_decrypt(election_id, args.chunk_size, args.missing)
+        phases['tally_and_decrypt'] = time.perf_counter() - start
+
+        return {
+            'target_rate_rps': args.rate,
+            'ballots_requested': args.ballots,
+            'ballots_stored': stored,
+            'votes_counted': sum(votes.values()),
+            'votes': votes,
+            'phase_seconds': {phase: round(seconds, 3) for phase, seconds in phases.items()},
+            'endpoints': {path: stats.report() for path, stats in self.stats.items()},
+            'errors': self.errors[:20],
+        }
+
+
+# ============================================================================
+# REPORTING
+# ============================================================================
+
+
+def print_report(report: Dict[str, Any]) -> None:
+    print("\n" + "=" * 100)
+    print("📊 OPEN-LOOP LOAD TEST RESULTS")
+    print("=" * 100)
+    print(f"Target rate: {report['target_rate_rps']} ballots/s | "
+          f"Ballots stored: {report['ballots_stored']}/{report['ballots_requested']} | "
+          f"Votes counted: {report['votes_counted']}")
+    print("Phases: " + ", ".join(f"{phase} {seconds:.2f}s" for phase, seconds in report['phase_seconds'].items()))
+
+    columns = [f"p{p:g}" for p in PERCENTILES] + ['max']
+    print(f"\n{'Endpoint':<34}{'Req':>6}{'Err':>5}{'RPS':>8}  {'Latency (ms)':<10}" + "".join(f"{c:>10}" for c in columns))
+    print("-" * 100)
+    for path, endpoint in report['endpoints'].items():
+        rps = endpoint['throughput_rps']
+        for label, key in (('service', 'service_time_ms'), ('response*', 'response_time_ms')):
+            prefix = (f"{path:<34}{endpoint['requests']:>6}{endpoint['errors']:>5}{(rps or 0):>8.2f}"
+                      if label == 'service' else " " * 53)
+            print(f"{prefix}  {label:<10}" + "".join(f"{endpoint[key][c]:>10.1f}" for c in columns))
+    print("-" * 100)
+    print("* response time is measured from the scheduled send time (coordinated-omission corrected)")
+
+    if report['errors']:
+        print("\n❌ First errors:")
+        for error in report['errors']:
+            print(f"   {error}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Open-loop load generator for the ElectionGuard API")
+    parser.add_argument("--url", default=None, help="Base URL of a running server (default: in-process)")
+    parser.add_argument("--db", default=":memory:", help="SQLite database path (default: in memory)")
+    parser.add_argument("--guardians", type=int, default=3)
+    parser.add_argument("--quorum", type=int, default=2)
+    parser.add_argument("--missing", type=int, default=0, help="Guardians to treat as missing (compensated path)")
+    parser.add_argument("--candidates", type=int, default=4)
+    parser.add_argument("--max-choices", type=int, default=1)
+    parser.add_argument("--ballots", type=int, default=100)
+    parser.add_argument("--rate", type=float, default=10.0, help="Target ballot arrivals per second")
+    parser.add_argument("--arrival", choices=['uniform', 'poisson'], default='uniform')
+    parser.add_argument("--bursts", type=int, default=1, help="Split ballots into this many bursts")
+    parser.add_argument("--burst-pause", type=float, default=0.0, help="Idle seconds between bursts")
+    parser.add_argument("--chunk-size", type=int, default=100, help="Ballots per tally chunk")
+    parser.add_argument("--concurrency", type=int, default=8, help="Maximum requests in flight")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--json", default=None, help="Write the report to this JSON file")
+    parser.add_argument("--verbose", action="store_true", help="Keep the server's own output (in-process)")
+    args = parser.parse_args()
+
+    if args.missing >= args.guardians or args.guardians - args.missing < args.quorum:
+        parser.error("--missing must leave at least --quorum guardians available")
+
+    transport = HttpTransport(args.url) if args.url else InProcessTransport()
+    store = ElectionStore(args.db)
+    generator = OpenLoopLoadGenerator(transport, store, args.concurrency, args.seed)
+
+    report_stream = sys.stdout
+    quiet = not args.verbose and not args.url
+    if quiet:
+        logging.getLogger().setLevel(logging.WARNING)
+    with open(os.devnull, 'w', encoding='utf-8', errors='replace') as devnull, (contextlib.redirect_stdout(devnull) if quiet else contextlib.nullcontext()):
+        report = asyncio.run(generator.run(args))
+    generator.executor.shutdown(wait=True)
+
+    with contextlib.redirect_stdout(report_stream):
+        print_report(report)
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"\n💾 Report written to {args.json}")
+
+    return 0 if report['ballots_stored'] == args.ballots and report['votes_counted'] >= args.ballots else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,24 +2,57 @@
 Manifest and context caching to avoid expensive recreation.
 The manifest creation is expensive (~100-200ms) and gets called for EVERY operation.
 This cache reduces 56+ manifest creations to just 1 for a typical election.
+
+Full manifests (many contests, ballot styles and geopolitical units) are registered once
+under their manifest hash and stored in EG_MANIFEST_DIR, so every worker can build their
+context from the id alone.
+
+Each context proves contest selection limits either with 'placeholder' selections or with
+a 'range' proof, which drops them. The mode is chosen per election (the contest_proofs
+argument) and is part of the context cache key; EG_CONTEST_PROOFS is only the default.
 """
 
 from typing import Dict, Tuple, Optional
 from electionguard.manifest import Manifest, InternalManifest
-from electionguard.election import CiphertextElectionContext
+from electionguard.election import CiphertextElectionContext, Configuration
+from electionguard.serialize import from_raw, to_raw
 from electionguard_tools.helpers.election_builder import ElectionBuilder
 from electionguard.group import int_to_p, int_to_q
 from electionguard.utils import get_optional
 import hashlib
 import json
+import os
+import tempfile
+
+# Directory of registered manifests shared by all workers; empty keeps them in this worker only.
+MANIFEST_DIR = os.environ.get('EG_MANIFEST_DIR', os.path.join(tempfile.gettempdir(), 'electionguard_manifests'))
+
+# Default proof of contest selection limits for elections that don't choose one: 'placeholder' or 'range'.
+CONTEST_PROOFS = os.environ.get('EG_CONTEST_PROOFS', 'placeholder').lower()
+if CONTEST_PROOFS not in ('placeholder', 'range'):
+    raise ValueError(f"EG_CONTEST_PROOFS must be 'placeholder' or 'range', not '{CONTEST_PROOFS}'")
+
+_HEX_DIGITS = set('0123456789abcdefABCDEF')
+
+
+def resolve_contest_proofs(contest_proofs: Optional[str] = None) -> str:
+    """Return the contest proof mode of an election, defaulting to EG_CONTEST_PROOFS."""
+    if contest_proofs is None:
+        return CONTEST_PROOFS
+    mode = str(contest_proofs).lower()
+    if mode not in ('placeholder', 'range'):
+        raise ValueError(f"contest_proofs must be 'placeholder' or 'range', not '{contest_proofs}'")
+    return mode
 
 
 class ManifestCache:
     """Thread-safe manifest and context cache."""
     
-    def __init__(self):
+    def __init__(self, manifest_dir: Optional[str] = MANIFEST_DIR):
         self._manifest_cache: Dict[str, Manifest] = {}
         self._context_cache: Dict[str, Tuple[InternalManifest, CiphertextElectionContext]] = {}
+        self._registered: Dict[str, Manifest] = {}
+        self.manifest_dir = manifest_dir
     
     def _get_manifest_key(self, party_names: list, candidate_names: list, max_choices: int = 1) -> str:
         """Generate cache key from party and candidate names including max_choices."""
@@ -31,9 +64,9 @@ class ManifestCache:
         return hashlib.sha256(key_data.encode()).hexdigest()
     
     def _get_context_key(self, manifest_key: str, joint_public_key: int, commitment_hash: int, 
-                         number_of_guardians: int, quorum: int) -> str:
+                         number_of_guardians: int, quorum: int, contest_proofs: str) -> str:
         """Generate cache key for context."""
-        key_data = f"{manifest_key}:{joint_public_key}:{commitment_hash}:{number_of_guardians}:{quorum}"
+        key_data = f"{manifest_key}:{joint_public_key}:{commitment_hash}:{number_of_guardians}:{quorum}:{contest_proofs}"
         return hashlib.sha256(key_data.encode()).hexdigest()
     
     def get_or_create_manifest(self, party_names: list, candidate_names: list, 
@@ -56,11 +89,13 @@ class ManifestCache:
                              joint_public_key_int: int, commitment_hash_int: int,
                              number_of_guardians: int, quorum: int,
                              create_manifest_func,
-                             max_choices: int = 1) -> Tuple[InternalManifest, CiphertextElectionContext]:
-        """Get cached context or create new one."""
+                             max_choices: int = 1,
+                             contest_proofs: Optional[str] = None) -> Tuple[InternalManifest, CiphertextElectionContext]:
+        """Get cached context or create new one (contest_proofs defaults to EG_CONTEST_PROOFS)."""
+        contest_proofs = resolve_contest_proofs(contest_proofs)
         manifest_key = self._get_manifest_key(party_names, candidate_names, max_choices)
         context_key = self._get_context_key(manifest_key, joint_public_key_int, 
-                                           commitment_hash_int, number_of_guardians, quorum)
+                                           commitment_hash_int, number_of_guardians, quorum, contest_proofs)
         
         if context_key not in self._context_cache:
             # Get or create manifest first
@@ -73,7 +108,8 @@ class ManifestCache:
             election_builder = ElectionBuilder(
                 number_of_guardians=number_of_guardians,
                 quorum=quorum,
-                manifest=manifest
+                manifest=manifest,
+                configuration=Configuration(range_proofs=contest_proofs == 'range')
             )
             election_builder.set_public_key(joint_public_key)
             election_builder.set_commitment_hash(commitment_hash)
@@ -87,10 +123,68 @@ class ManifestCache:
         
         return internal_manifest, context
     
+    def register_manifest(self, manifest: Manifest) -> str:
+        """Store a full manifest and return its id (the manifest hash)."""
+        manifest_id = manifest.crypto_hash().to_hex()
+        self._registered[manifest_id] = manifest
+        if self.manifest_dir:
+            os.makedirs(self.manifest_dir, exist_ok=True)
+            path = os.path.join(self.manifest_dir, f"{manifest_id}.json")
+            if not os.path.exists(path):
+                temporary = f"{path}.{os.getpid()}.tmp"
+                with open(temporary, 'w', encoding='utf-8') as manifest_file:
+                    manifest_file.write(to_raw(manifest))
+                os.replace(temporary, path)
+        print(f"  📝 MANIFEST REGISTERED - id: {manifest_id[:8]}... ({len(manifest.contests)} contests, {len(manifest.ballot_styles)} styles)")
+        return manifest_id
+    
+    def get_registered_manifest(self, manifest_id: str) -> Optional[Manifest]:
+        """Get a registered manifest, loading it from the manifest directory if another worker registered it."""
+        manifest = self._registered.get(manifest_id)
+        if manifest is None and self.manifest_dir and manifest_id and set(manifest_id) <= _HEX_DIGITS:
+            path = os.path.join(self.manifest_dir, f"{manifest_id}.json")
+            if os.path.exists(path):
+                with open(path, 'r', encoding='utf-8') as manifest_file:
+                    manifest = from_raw(Manifest, manifest_file.read())
+                self._registered[manifest_id] = manifest
+        return manifest
+    
+    def get_or_create_registered_context(self, manifest_id: str,
+                                         joint_public_key_int: int, commitment_hash_int: int,
+                                         number_of_guardians: int, quorum: int,
+                                         contest_proofs: Optional[str] = None) -> Tuple[InternalManifest, CiphertextElectionContext]:
+        """Get cached context of a registered manifest or create new one."""
+        contest_proofs = resolve_contest_proofs(contest_proofs)
+        context_key = self._get_context_key(f"registered:{manifest_id}", joint_public_key_int,
+                                            commitment_hash_int, number_of_guardians, quorum, contest_proofs)
+        
+        if context_key not in self._context_cache:
+            manifest = self.get_registered_manifest(manifest_id)
+            if manifest is None:
+                raise ValueError(f'Unknown manifest_id: {manifest_id}')
+            
+            election_builder = ElectionBuilder(
+                number_of_guardians=number_of_guardians,
+                quorum=quorum,
+                manifest=manifest,
+                configuration=Configuration(range_proofs=contest_proofs == 'range')
+            )
+            election_builder.set_public_key(int_to_p(joint_public_key_int))
+            election_builder.set_commitment_hash(int_to_q(commitment_hash_int))
+            
+            internal_manifest, context = get_optional(election_builder.build())
+            self._context_cache[context_key] = (internal_manifest, context)
+            print(f"  🔨 CONTEXT CREATED (registered manifest {manifest_id[:8]}...) - key: {context_key[:8]}...")
+        else:
+            internal_manifest, context = self._context_cache[context_key]
+        
+        return internal_manifest, context
+    
     def clear(self):
         """Clear all caches."""
         self._manifest_cache.clear()
         self._context_cache.clear()
+        self._registered.clear()
         print("  🗑️  CACHE CLEARED")
 
 
@@ -0,0 +1,156 @@
+"""
+Memory governor for API workers.
+
+Replaces count-based worker recycling (gunicorn --max-requests) with recycling driven
+by actual memory pressure. A single large tally can grow a worker by gigabytes while
+hundreds of small ballot requests barely move it, so the governor:
+
+- measures the RSS delta of every request,
+- runs full garbage collections after the response has been sent instead of on the
+  request path,
+- asks the worker to retire gracefully once RSS crosses a soft threshold, after the
+  current response is finished,
+- freezes the preloaded heap so collections never scan (and copy-on-write dirty) the
+  modules and caches shared with the gunicorn master.
+"""
+
+import gc
+import os
+import signal
+import sys
+import threading
+import time
+from typing import Any, Dict, Optional
+
+import psutil
+
+# Soft RSS limit in MB; 0 disables retirement (e.g. for the development server).
+WORKER_SOFT_RSS_MB = int(os.environ.get('EG_WORKER_SOFT_RSS_MB', '0'))
+# Requests growing RSS by at least this many MB get a deferred full collection even
+# when the endpoint did not ask for one.
+GC_TRIGGER_DELTA_MB = int(os.environ.get('EG_GC_TRIGGER_DELTA_MB', '64'))
+
+_MB = 1024 * 1024
+
+
+class MemoryGovernor:
+    """Thread-safe per-worker memory accounting and retirement."""
+
+    def __init__(self, soft_rss_mb: int = WORKER_SOFT_RSS_MB, gc_trigger_delta_mb: int = GC_TRIGGER_DELTA_MB):
+        self.soft_rss_bytes = soft_rss_mb * _MB
+        self.gc_trigger_delta_bytes = gc_trigger_delta_mb * _MB
+        self._process = psutil.Process(os.getpid())
+        self._pid = os.getpid()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._endpoint_stats: Dict[str, Dict[str, float]] = {}
+        self._requests = 0
+        self._deferred_collections = 0
+        self._collection_ms = 0.0
+        self._frozen_objects = 0
+        self.retiring = False
+
+    def _rss(self) -> int:
+        # psutil.Process caches the pid; refresh it in forked workers
+        if os.getpid() != self._pid:
+            self._process = psutil.Process(os.getpid())
+            self._pid = os.getpid()
+        return self._process.memory_info().rss
+
+    def freeze_preloaded_heap(self) -> None:
+        """Collect once and move every surviving object to the permanent generation."""
+        gc.collect()
+        gc.freeze()
+        self._frozen_objects = gc.get_freeze_count()
+        print(f"🧊 GC FROZEN: {self._frozen_objects} preloaded objects excluded from collection")
+
+    def begin_request(self) -> None:
+        """Record RSS at the start of the current request."""
+        self._local.rss_before = self._rss()
+        self._local.collect = False
+
+    def defer_collection(self) -> None:
+        """Ask for a full collection once the current response has been sent."""
+        self._local.collect = True
+
+    def end_request(self, endpoint: str) -> Dict[str, Any]:
+        """Record the RSS delta of the current request and decide what to do after the response."""
+        rss_before = getattr(self._local, 'rss_before', None)
+        rss_after = self._rss()
+        delta = rss_after - rss_before if rss_before is not None else 0
+        collect = getattr(self._local, 'collect', False) or delta >= self.gc_trigger_delta_bytes
+
+        with self._lock:
+            self._requests += 1
+            stats = self._endpoint_stats.setdefault(
+                endpoint, {'requests': 0, 'total_delta_mb': 0.0, 'max_delta_mb': 0.0}
+            )
+            stats['requests'] += 1
+            stats['total_delta_mb'] += delta / _MB
+            stats['max_delta_mb'] = max(stats['max_delta_mb'], delta / _MB)
+
+        return {
+            'rss_mb': rss_after / _MB,
+            'rss_delta_mb': delta / _MB,
+            'collect': collect,
+        }
+
+    def after_response(self, collect: bool, can_retire: bool) -> None:
+        """Run deferred work once the response is on the wire; retire the worker if over the soft limit."""
+        if collect:
+            start = time.time()
+            gc.collect()
+            if hasattr(sys, '_clear_type_cache'):
+                sys._clear_type_cache()
+            with self._lock:
+                self._deferred_collections += 1
+                self._collection_ms += (time.time() - start) * 1000
+
+        if not self.soft_rss_bytes or self.retiring:
+            return
+        rss = self._rss()
+        if rss < self.soft_rss_bytes:
+            return
+        if not can_retire:
+            print(f"⚠️  RSS {rss / _MB:.0f}MB over soft limit {self.soft_rss_bytes / _MB:.0f}MB (no managing server to retire to)")
+            return
+
+        self.retiring = True
+        print(f"♻️  RSS {rss / _MB:.0f}MB over soft limit {self.soft_rss_bytes / _MB:.0f}MB - retiring worker {os.getpid()}")
+        # gunicorn treats SIGTERM as a graceful shutdown: the worker stops accepting
+        # requests and the master starts a replacement.
+        os.kill(os.getpid(), signal.SIGTERM)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Snapshot of memory accounting for the health endpoint."""
+        with self._lock:
+            return {
+                'pid': os.getpid(),
+                'rss_mb': round(self._rss() / _MB, 1),
+                'soft_rss_limit_mb': self.soft_rss_bytes // _MB,
+                'retiring': self.retiring,
+                'requests': self._requests,
+                'deferred_collections': self._deferred_collections,
+                'collection_ms': round(self._collection_ms, 2),
+                'frozen_objects': self._frozen_objects,
+                'endpoints': {
+                    endpoint: {
+                        'requests': int(stats['requests']),
+                        'avg_delta_mb': round(stats['total_delta_mb'] / stats['requests'], 2),
+                        'max_delta_mb': round(stats['max_delta_mb'], 2),
+                    }
+                    for endpoint, stats in self._endpoint_stats.items()
+                },
+            }
+
+
+# Global governor instance
+_global_governor: Optional[MemoryGovernor] = None
+
+
+def get_memory_governor() -> MemoryGovernor:
+    """Get the global memory governor instance."""
+    global _global_governor
+    if _global_governor is None:
+        _global_governor = MemoryGovernor()
+    return _global_governor
@@ -0,0 +1,112 @@
+"""
+Incremental msgpack encoding for large API responses.
+
+`msgpack.packb(response)` needs the whole response as Python objects and then the
+whole packed body as one `bytes` object before anything is sent. For tallies with
+tens of thousands of submitted ballots that is two full copies in memory and a long
+wait for the first byte.
+
+Services mark their large lists as `StreamedArray` (a length plus an iterator that
+produces the items on demand). `iter_packed_chunks` walks the response dict, writes
+map/array headers with `msgpack.Packer` and packs streamed items one at a time, so
+the bytes on the wire are identical to `msgpack.packb(response)` while at most one
+item and one output chunk are held in memory.
+"""
+
+import os
+from typing import Any, Callable, Iterable, Iterator, Optional
+
+import msgpack
+
+# Responses with at least this many streamed items are sent with chunked transfer
+# encoding; smaller ones are packed in one piece and sent with a Content-Length.
+STREAM_RESPONSE_MIN_ITEMS = int(os.environ.get('EG_STREAM_RESPONSE_MIN_ITEMS', '1000'))
+# Packed bytes buffered before a chunk is handed to the server
+STREAM_CHUNK_BYTES = int(os.environ.get('EG_STREAM_CHUNK_BYTES', '65536'))
+
+
+class StreamedArray:
+    """A list of known length whose items are produced lazily, exactly once."""
+
+    def __init__(self, length: int, items: Iterable[Any]):
+        self.length = length
+        self._items: Optional[Iterable[Any]] = items
+
+    def __len__(self) -> int:
+        return self.length
+
+    def __iter__(self) -> Iterator[Any]:
+        if self._items is None:
+            raise RuntimeError("StreamedArray items can only be consumed once")
+        items, self._items = self._items, None
+        count = 0
+        for item in items:
+            count += 1
+            if count > self.length:
+                break
+            yield item
+        if count != self.length:
+            raise ValueError(f"StreamedArray produced {count} items, expected {self.length}")
+
+
+def count_streamed_items(data: Any) -> int:
+    """Total number of items in all StreamedArrays reachable through nested dicts."""
+    if isinstance(data, StreamedArray):
+        return len(data)
+    if isinstance(data, dict):
+        return sum(count_streamed_items(value) for value in data.values())
+    return 0
+
+
+def _contains_stream(data: Any) -> bool:
+    if isinstance(data, StreamedArray):
+        return True
+    if isinstance(data, dict):
+        return any(_contains_stream(value) for value in data.values())
+    return False
+
+
+def iter_packed_chunks(
+    data: Any,
+    sanitize_func: Callable[[Any], Any],
+    chunk_bytes: int = STREAM_CHUNK_BYTES,
+) -> Iterator[bytes]:
+    """
+    Pack `data` incrementally, yielding chunks of roughly `chunk_bytes`.
+
+    Dicts on the path to a StreamedArray are written as map headers followed by their
+    entries; everything else is packed whole. A value that fails to pack (lone
+    surrogates) is passed through `sanitize_func` and packed again, so one bad string
+    only costs a copy of the item it is in.
+    """
+    packer = msgpack.Packer(use_bin_type=True, default=str)
+    buffer = bytearray()
+
+    def pack(value: Any) -> bytes:
+        try:
+            return packer.pack(value)
+        except Exception:
+            packer.reset()
+            return packer.pack(sanitize_func(value))
+
+    def walk(value: Any) -> Iterator[None]:
+        if isinstance(value, StreamedArray):
+            buffer.extend(packer.pack_array_header(len(value)))
+            for item in value:
+                buffer.extend(pack(item))
+                yield
+        elif isinstance(value, dict) and _contains_stream(value):
+            buffer.extend(packer.pack_map_header(len(value)))
+            for key, item in value.items():
+                buffer.extend(pack(key))
+                yield from walk(item)
+        else:
+            buffer.extend(pack(value))
+            yield
+
+    for _ in walk(data):
+        if len(buffer) >= chunk_bytes:
+            yield bytes(buffer)
+            buffer.clear()
+    if buffer:
+        yield bytes(buffer)
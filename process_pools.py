@@ -0,0 +1,92 @@
+"""
+Shared, fixed-size process pools for the CPU-bound services.
+
+The key ceremony, ballot encryption, compact ballot expansion, Benaloh challenges and
+spoiled ballot decryption each fan work out to a process pool of their own:
+
+- a pool starts on first use with a fixed number of processes (its EG_*_MAX_WORKERS
+  setting, or one per core) and is never resized or replaced while the process runs, so
+  concurrent requests can always submit to it and its processes are started only once,
+- callers bound the parallelism of a request by the number of tasks they submit,
+- every pool is shut down when the process exits,
+- processes that are themselves workers of a pool (the ASGI lanes) run the services
+  inline, so a host runs one process per lane worker rather than one per core for each.
+"""
+
+import atexit
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional
+
+from electionguard.scheduler import Scheduler
+
+# Sizes of the service pools, read when the services are imported.
+POOL_WORKER_SETTINGS = (
+    'EG_CEREMONY_MAX_WORKERS',
+    'EG_ENCRYPT_MAX_WORKERS',
+    'EG_EXPAND_MAX_WORKERS',
+    'EG_BENALOH_MAX_WORKERS',
+    'EG_SPOILED_MAX_WORKERS',
+)
+
+
+class SharedProcessPool:
+    """A process pool of fixed size, started on first use and shared by all requests."""
+
+    def __init__(self, name: str, max_workers: Optional[int] = None):
+        self.name = name
+        self.max_workers = max_workers
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        with _pools_lock:
+            _pools.append(self)
+
+    @property
+    def workers(self) -> int:
+        """Processes in the pool: max_workers, or one per core."""
+        return max(1, self.max_workers or Scheduler.cpu_count())
+
+    def get(self) -> ProcessPoolExecutor:
+        """Get the pool, starting it on first use."""
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            return self._executor
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Shut the pool down if it was started; the next `get` starts a new one."""
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=wait)
+                self._executor = None
+
+
+_pools: List[SharedProcessPool] = []
+_pools_lock = threading.Lock()
+
+
+def shutdown_all_pools() -> None:
+    """Shut down every shared pool that was started."""
+    with _pools_lock:
+        pools = list(_pools)
+    for pool in pools:
+        pool.shutdown()
+
+
+def run_services_inline() -> None:
+    """
+    Process pool initializer: size every service pool of this process to one worker.
+
+    It must run before the services are imported, which holds for pools started with the
+    'spawn' context whose tasks import them; pools created already are resized as well.
+    """
+    for setting in POOL_WORKER_SETTINGS:
+        os.environ[setting] = '1'
+    with _pools_lock:
+        pools = list(_pools)
+    for pool in pools:
+        pool.max_workers = 1
+
+
+atexit.register(shutdown_all_pools)
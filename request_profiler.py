@@ -0,0 +1,304 @@
+"""
+Opt-in request profiling for API workers.
+
+Offline profiling scripts (scripts/profile_*.py) replay synthetic payloads; slow
+production requests depend on real ones. The profiler captures profiles of live
+requests without a redeploy:
+
+- on demand: a request carrying ``X-EG-Profile: <EG_PROFILE_TOKEN>`` runs under
+  cProfile (or the stack sampler with ``X-EG-Profile-Mode: stack``),
+- sampled: one request in EG_PROFILE_SAMPLE_EVERY is profiled automatically with the
+  low-overhead stack sampler; the rate can be changed at runtime through the admin
+  endpoint and applies to every worker sharing the profile directory,
+- profiles are written to EG_PROFILE_DIR (pstats ``.prof`` or collapsed-stack
+  ``.collapsed`` files plus a ``.json`` description); only the newest
+  EG_PROFILE_MAX_FILES are kept.
+
+Only the request thread is profiled. Work fanned out to process pools shows up as time
+spent waiting on their futures. One profile runs at a time per worker; requests arriving
+meanwhile are served unprofiled.
+"""
+
+import cProfile
+import hmac
+import io
+import itertools
+import json
+import os
+import pstats
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from collections import Counter
+from typing import Any, Dict, List, Optional
+
+# Directory shared by all workers; holds profiles, their descriptions and the sampling setting.
+PROFILE_DIR = os.environ.get('EG_PROFILE_DIR') or os.path.join(tempfile.gettempdir(), 'electionguard_profiles')
+# Number of profiles kept; the oldest are deleted first.
+PROFILE_MAX_FILES = int(os.environ.get('EG_PROFILE_MAX_FILES', '50'))
+# Profile one request in this many; 0 disables sampling until enabled through the admin endpoint.
+PROFILE_SAMPLE_EVERY = int(os.environ.get('EG_PROFILE_SAMPLE_EVERY', '0'))
+# Secret for on-demand profiling and the profile endpoints; empty disables both.
+PROFILE_TOKEN = os.environ.get('EG_PROFILE_TOKEN', '')
+# Interval of the stack sampler in milliseconds.
+PROFILE_STACK_INTERVAL_MS = int(os.environ.get('EG_PROFILE_STACK_INTERVAL_MS', '5'))
+
+PROFILE_HEADER = 'X-EG-Profile'
+PROFILE_MODE_HEADER = 'X-EG-Profile-Mode'
+PROFILE_MODES = ('cprofile', 'stack')
+
+_SETTINGS_FILE = 'settings.json'
+_EXTENSIONS = {'cprofile': '.prof', 'stack': '.collapsed'}
+
+
+class StackSampler:
+    """Samples the stack of one thread from a background thread (collapsed-stack output)."""
+
+    def __init__(self, thread_id: int, interval_ms: int = PROFILE_STACK_INTERVAL_MS):
+        self.thread_id = thread_id
+        self.interval = max(1, interval_ms) / 1000.0
+        self.stacks: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='eg-stack-sampler', daemon=True)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            names = []
+            while frame is not None:
+                code = frame.f_code
+                names.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+                frame = frame.f_back
+            if names:
+                self.stacks[';'.join(reversed(names))] += 1
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def write(self, path: str) -> None:
+        with open(path, 'w', encoding='utf-8') as collapsed:
+            for stack, count in self.stacks.most_common():
+                collapsed.write(f"{stack} {count}\n")
+
+
+class RequestProfiler:
+    """Decides which requests are profiled and stores their profiles in a bounded directory."""
+
+    def __init__(
+        self,
+        directory: str = PROFILE_DIR,
+        max_files: int = PROFILE_MAX_FILES,
+        sample_every: int = PROFILE_SAMPLE_EVERY,
+        token: str = PROFILE_TOKEN
+    ):
+        self.directory = directory
+        self.max_files = max(1, max_files)
+        self.token = token
+        self._default_sample_every = max(0, sample_every)
+        self._sample_every = self._default_sample_every
+        self._settings_mtime = None
+        self._counter = itertools.count(1)
+        # cProfile cannot nest and sampling two requests at once would mix their costs
+        self._busy = threading.Lock()
+        self._local = threading.local()
+        self._saved = 0
+        self._skipped_busy = 0
+
+    # ----- access -----
+
+    def authorized(self, header_value: Optional[str]) -> bool:
+        """True if the header carries the profiling token."""
+        return bool(self.token) and bool(header_value) and hmac.compare_digest(header_value, self.token)
+
+    # ----- sampling setting (shared through the profile directory) -----
+
+    @property
+    def sample_every(self) -> int:
+        path = os.path.join(self.directory, _SETTINGS_FILE)
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            return self._default_sample_every
+        if mtime != self._settings_mtime:
+            try:
+                with open(path, 'r', encoding='utf-8') as settings:
+                    self._sample_every = max(0, int(json.load(settings)['sample_every']))
+            except (OSError, ValueError, KeyError, TypeError):
+                self._sample_every = self._default_sample_every
+            self._settings_mtime = mtime
+        return self._sample_every
+
+    def set_sample_every(self, sample_every: int) -> None:
+        """Profile one request in ``sample_every`` in every worker; 0 turns sampling off."""
+        if sample_every < 0:
+            raise ValueError('sample_every must be 0 or a positive integer')
+        os.makedirs(self.directory, exist_ok=True)
+        path = os.path.join(self.directory, _SETTINGS_FILE)
+        temporary = f"{path}.{os.getpid()}.tmp"
+        with open(temporary, 'w', encoding='utf-8') as settings:
+            json.dump({'sample_every': sample_every}, settings)
+        os.replace(temporary, path)
+
+    # ----- per request -----
+
+    def begin_request(self, endpoint: str, header_value: Optional[str] = None, mode: Optional[str] = None) -> None:
+        """Start profiling the current request if it asked for it or is sampled."""
+        self._local.active = None
+        if header_value:
+            if not self.authorized(header_value):
+                return
+            reason = 'requested'
+            mode = mode if mode in PROFILE_MODES else 'cprofile'
+        else:
+            sample_every = self.sample_every
+            if not sample_every or next(self._counter) % sample_every:
+                return
+            reason = 'sampled'
+            mode = 'stack'
+
+        if not self._busy.acquire(blocking=False):
+            self._skipped_busy += 1
+            return
+        if mode == 'cprofile':
+            profiler = cProfile.Profile()
+            profiler.enable()
+        else:
+            profiler = StackSampler(threading.get_ident())
+            profiler.start()
+        self._local.active = {
+            'endpoint': endpoint,
+            'reason': reason,
+            'mode': mode,
+            'profiler': profiler,
+            'started': time.time(),
+            'start_counter': time.perf_counter(),
+        }
+
+    def end_request(self, status_code: Optional[int] = None) -> Optional[str]:
+        """Stop the current request's profile and store it; returns the profile id."""
+        active = getattr(self._local, 'active', None)
+        if active is None:
+            return None
+        self._local.active = None
+        try:
+            profiler = active['profiler']
+            if active['mode'] == 'cprofile':
+                profiler.disable()
+            else:
+                profiler.stop()
+            return self._save(active, status_code)
+        finally:
+            self._busy.release()
+
+    def _save(self, active: Dict[str, Any], status_code: Optional[int]) -> str:
+        os.makedirs(self.directory, exist_ok=True)
+        started = active['started']
+        microseconds = int(started * 1_000_000) % 1_000_000
+        profile_id = f"{time.strftime('%Y%m%dT%H%M%S', time.gmtime(started))}.{microseconds:06d}-{uuid.uuid4().hex[:8]}"
+        file_name = profile_id + _EXTENSIONS[active['mode']]
+        if active['mode'] == 'cprofile':
+            active['profiler'].dump_stats(os.path.join(self.directory, file_name))
+        else:
+            active['profiler'].write(os.path.join(self.directory, file_name))
+
+        info = {
+            'id': profile_id,
+            'endpoint': active['endpoint'],
+            'reason': active['reason'],
+            'mode': active['mode'],
+            'file': file_name,
+            'status_code': status_code,
+            'started': active['started'],
+            'elapsed_ms': round((time.perf_counter() - active['start_counter']) * 1000, 2),
+            'pid': os.getpid(),
+        }
+        # The description is written last: a profile is listed only once it is complete
+        with open(os.path.join(self.directory, profile_id + '.json'), 'w', encoding='utf-8') as description:
+            json.dump(info, description)
+        self._saved += 1
+        self._prune()
+        return profile_id
+
+    # ----- stored profiles -----
+
+    def _descriptions(self) -> List[str]:
+        try:
+            names = os.listdir(self.directory)
+        except OSError:
+            return []
+        # Ids start with a UTC timestamp, so name order is age order
+        return sorted(name for name in names if name.endswith('.json') and name != _SETTINGS_FILE)
+
+    def _prune(self) -> None:
+        descriptions = self._descriptions()
+        for name in descriptions[:max(0, len(descriptions) - self.max_files)]:
+            profile_id = name[:-len('.json')]
+            for extension in ('.json',) + tuple(_EXTENSIONS.values()):
+                try:
+                    os.remove(os.path.join(self.directory, profile_id + extension))
+                except OSError:
+                    pass
+
+    def list_profiles(self) -> List[Dict[str, Any]]:
+        """Descriptions of the stored profiles, newest first."""
+        profiles = []
+        for name in reversed(self._descriptions()):
+            try:
+                with open(os.path.join(self.directory, name), 'r', encoding='utf-8') as description:
+                    profiles.append(json.load(description))
+            except (OSError, ValueError):
+                continue  # pruned by another worker meanwhile
+        return profiles
+
+    def get_profile(self, profile_id: str) -> Optional[Dict[str, Any]]:
+        """Description and file path of one stored profile, or None."""
+        if not profile_id or os.path.basename(profile_id) != profile_id or profile_id.startswith('.'):
+            return None
+        try:
+            with open(os.path.join(self.directory, profile_id + '.json'), 'r', encoding='utf-8') as description:
+                info = json.load(description)
+        except (OSError, ValueError):
+            return None
+        info['path'] = os.path.join(self.directory, info['file'])
+        return info if os.path.exists(info['path']) else None
+
+    def summarize(self, profile_id: str, limit: int = 40) -> Optional[str]:
+        """Text report of a stored profile: top functions by cumulative time, or hottest stacks."""
+        info = self.get_profile(profile_id)
+        if info is None:
+            return None
+        if info['mode'] == 'stack':
+            with open(info['path'], 'r', encoding='utf-8') as collapsed:
+                return ''.join(itertools.islice(collapsed, limit))
+        report = io.StringIO()
+        pstats.Stats(info['path'], stream=report).sort_stats('cumulative').print_stats(limit)
+        return report.getvalue()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'directory': self.directory,
+            'sample_every': self.sample_every,
+            'on_demand': bool(self.token),
+            'saved': self._saved,
+            'skipped_busy': self._skipped_busy,
+            'stored': len(self._descriptions()),
+            'max_files': self.max_files,
+        }
+
+
+# Global profiler instance
+_global_profiler: Optional[RequestProfiler] = None
+
+
+def get_request_profiler() -> RequestProfiler:
+    """Get the global request profiler instance."""
+    global _global_profiler
+    if _global_profiler is None:
+        _global_profiler = RequestProfiler()
+    return _global_profiler
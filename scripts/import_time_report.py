@@ -0,0 +1,114 @@
+"""Report where worker boot time goes, using `python -X importtime`.
+
+Usage:
+    python scripts/import_time_report.py                 # breakdown for `import api`
+    python scripts/import_time_report.py --top 40        # show more modules
+    python scripts/import_time_report.py --budget-ms 500 # exit 1 when over budget
+    python scripts/import_time_report.py --json          # machine readable output
+"""
+import sys, os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import json
+import subprocess
+from collections import defaultdict
+from dataclasses import asdict, dataclass
+from typing import Dict, List
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@dataclass
+class ImportRecord:
+    """One line of `-X importtime` output."""
+
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+def measure_import_times(module: str = "api") -> List[ImportRecord]:
+    """Import a module in a fresh interpreter and return its `-X importtime` records."""
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=REPO_ROOT,
+        capture_output=True,
+        text=True,
+        encoding="utf-8",
+        errors="replace",
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{completed.stderr[-2000:]}")
+
+    records = []
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        records.append(ImportRecord(
+            module=name.strip(),
+            self_us=int(self_us),
+            cumulative_us=int(cumulative_us),
+            depth=(len(name) - len(name.lstrip()) - 1) // 2,
+        ))
+    return records
+
+
+def total_import_ms(records: List[ImportRecord], module: str) -> float:
+    """Cumulative import time of a top-level module in milliseconds."""
+    for record in records:
+        if record.module == module and record.depth == 0:
+            return record.cumulative_us / 1000
+    raise ValueError(f"No import record for {module}")
+
+
+def time_by_package(records: List[ImportRecord]) -> Dict[str, float]:
+    """Self time grouped by top-level package in milliseconds, slowest first."""
+    totals: Dict[str, int] = defaultdict(int)
+    for record in records:
+        totals[record.module.split(".")[0]] += record.self_us
+    return {
+        package: us / 1000
+        for package, us in sorted(totals.items(), key=lambda item: item[1], reverse=True)
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Import time breakdown for worker boot")
+    parser.add_argument("--module", default="api", help="Module to import (default: api)")
+    parser.add_argument("--top", type=int, default=20, help="Number of modules and packages to list")
+    parser.add_argument("--budget-ms", type=float, default=None, help="Fail when total import time exceeds this")
+    parser.add_argument("--json", action="store_true", help="Print a JSON report")
+    args = parser.parse_args()
+
+    records = measure_import_times(args.module)
+    total_ms = total_import_ms(records, args.module)
+    packages = time_by_package(records)
+    slowest = sorted(records, key=lambda record: record.cumulative_us, reverse=True)[:args.top]
+
+    if args.json:
+        print(json.dumps({
+            'module': args.module,
+            'total_ms': total_ms,
+            'packages_ms': dict(list(packages.items())[:args.top]),
+            'modules': [asdict(record) for record in slowest],
+        }, indent=2))
+    else:
+        print(f"⏱️  import {args.module}: {total_ms:.1f}ms")
+        print(f"\n📦 Self time by package (top {args.top}):")
+        for package, ms in list(packages.items())[:args.top]:
+            print(f"   {ms:8.1f}ms  {package}")
+        print(f"\n🐢 Slowest modules by cumulative time (top {args.top}):")
+        for record in slowest:
+            print(f"   {record.cumulative_us / 1000:8.1f}ms  {'  ' * record.depth}{record.module}")
+
+    if args.budget_ms is not None and total_ms > args.budget_ms:
+        print(f"❌ import {args.module} took {total_ms:.1f}ms, budget is {args.budget_ms:.1f}ms", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
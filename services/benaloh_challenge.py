@@ -1,14 +1,33 @@
 #!/usr/bin/env python
 
-from typing import Dict, Any, List, Set
+from typing import Dict, Any, List, Optional, Set, Tuple, Union
 import json
+import os
 from electionguard.serialize import from_raw, to_raw
 from electionguard.ballot import CiphertextBallot, PlaintextBallot
 from electionguard.manifest import Manifest
 from electionguard.election import CiphertextElectionContext, make_ciphertext_election_context
-from electionguard.group import ElementModP, ElementModQ, int_to_q, int_to_p, g_pow_p
-from electionguard.elgamal import ElGamalPublicKey
+from electionguard.group import ElementModP, ElementModQ, FixedBasePowP, int_to_q, int_to_p, g_pow_p
+from electionguard.elgamal import ElGamalCiphertext, ElGamalPublicKey
+from electionguard.scheduler import Scheduler
 from binary_serialize import from_binary_transport_to_dict
+from process_pools import SharedProcessPool
+
+# Below this many challenges the process pool start-up costs more than it saves.
+PARALLEL_BENALOH_MIN_CHALLENGES = int(os.environ.get('EG_PARALLEL_BENALOH_MIN_CHALLENGES', '64'))
+BENALOH_MAX_WORKERS = int(os.environ.get('EG_BENALOH_MAX_WORKERS', '0')) or None
+
+# A challenged selection is encrypted as either 0 or 1
+SELECTION_PLAINTEXTS = (0, 1)
+
+_pool = SharedProcessPool('benaloh', BENALOH_MAX_WORKERS)
+
+
+def shutdown_benaloh_pool() -> None:
+    """Shut down the shared Benaloh process pool if one was started."""
+    _pool.shutdown()
+
+
 def benaloh_challenge_service(
     encrypted_ballot_with_nonce: str,
     party_names: List[str],
@@ -128,3 +147,144 @@ def benaloh_challenge_service(
             "error": f"Benaloh challenge failed: {str(e)}",
             "traceback": traceback.format_exc()
         }
+
+
+def _verify_challenge(
+    encrypted_ballot_with_nonce: Union[str, Dict],
+    candidate_names_to_verify,
+    public_key_powers: FixedBasePowP
+) -> Dict[str, Any]:
+    """Verify one challenged ballot; errors are reported in the result instead of raised."""
+    try:
+        if isinstance(candidate_names_to_verify, str):
+            expected_candidates: Set[str] = {candidate_names_to_verify}
+        else:
+            expected_candidates = set(candidate_names_to_verify)
+
+        if isinstance(encrypted_ballot_with_nonce, dict):
+            ballot_data = encrypted_ballot_with_nonce
+        else:
+            ballot_data = from_binary_transport_to_dict(encrypted_ballot_with_nonce)
+
+        voted_candidates: Set[str] = set()
+        for contest in ballot_data["contests"]:
+            for selection in contest["ballot_selections"]:
+                selection_nonce_str = selection.get("nonce")
+                if not selection_nonce_str or selection.get("is_placeholder_selection", False):
+                    continue
+
+                ciphertext = ElGamalCiphertext(
+                    int_to_p(int(selection["ciphertext"]["pad"], 16)),
+                    int_to_p(int(selection["ciphertext"]["data"], 16)),
+                )
+                # K^r is the blinding factor; the selection must then be g^0 or g^1
+                blinding = public_key_powers.pow(int(selection_nonce_str, 16))
+                vote = ciphertext.decrypt_known_product_among(blinding, SELECTION_PLAINTEXTS)
+                if vote is None:
+                    raise ValueError(
+                        f"Selection {selection['object_id']} does not decrypt to 0 or 1 with its nonce"
+                    )
+                if vote == 1:
+                    voted_candidates.add(selection["object_id"])
+
+        # Same fields as benaloh_challenge_service
+        expected = ', '.join(sorted(expected_candidates))
+        verified = ', '.join(sorted(voted_candidates)) if voted_candidates else None
+        result = {
+            "success": True,
+            "match": voted_candidates == expected_candidates,
+            "ballot_id": ballot_data.get("object_id"),
+            "verified_candidates": sorted(voted_candidates),
+            "verified_candidate": verified,
+        }
+        if result["match"]:
+            result["message"] = f"Ballot choice matches expected selection: {expected}"
+        else:
+            result["message"] = (
+                f"Ballot choice does NOT match expected selection. "
+                f"Expected: {expected}. "
+                f"Actual: {verified or 'none'}"
+            )
+            result["expected_candidate"] = expected
+        return result
+
+    except Exception as e:
+        return {
+            "success": False,
+            "error": f"Benaloh challenge failed: {str(e)}"
+        }
+
+
+def _verify_challenge_chunk(joint_public_key: int, challenges: List[Tuple[Any, Any]]) -> List[Dict[str, Any]]:
+    """Worker task: verify a slice of the batch against one precomputed public key table."""
+    public_key_powers = FixedBasePowP(int_to_p(joint_public_key))
+    return [
+        _verify_challenge(encrypted_ballot_with_nonce, candidate_names_to_verify, public_key_powers)
+        for encrypted_ballot_with_nonce, candidate_names_to_verify in challenges
+    ]
+
+
+def benaloh_challenge_batch_service(
+    challenges: List[Dict[str, Any]],
+    joint_public_key: str,
+    max_workers: Optional[int] = None
+) -> Dict[str, Any]:
+    """
+    Perform Benaloh challenges for many ballots of the same election at once.
+
+    Every selection is checked directly against g^0 and g^1 with its nonce, and the
+    powers of the joint public key are precomputed once per worker, so the cost per
+    selection is a few multiplications instead of a full exponentiation plus a
+    discrete log lookup. Large batches are split across a process pool.
+
+    Args:
+        challenges: List of dicts with 'encrypted_ballot_with_nonce' (binary transport
+            string or ballot dict) and 'candidate_names_to_verify' (str or list)
+        joint_public_key: Joint public key used for encryption
+        max_workers: Worker processes (None picks one per CPU for large batches); never
+            more than the shared Benaloh pool has
+
+    Returns:
+        Dict with one result per challenge (in request order) and summary counts
+
+    Raises:
+        ValueError: If a challenge is missing a required field
+    """
+    jobs = []
+    for index, challenge in enumerate(challenges):
+        missing = [
+            field for field in ('encrypted_ballot_with_nonce', 'candidate_names_to_verify')
+            if field not in challenge
+        ]
+        if missing:
+            raise ValueError(f"Challenge {index} is missing fields: {', '.join(missing)}")
+        jobs.append((challenge['encrypted_ballot_with_nonce'], challenge['candidate_names_to_verify']))
+
+    joint_public_key_int = int(int_to_p(int(joint_public_key)))
+
+    if max_workers is None:
+        max_workers = BENALOH_MAX_WORKERS
+    if max_workers is None:
+        max_workers = Scheduler.cpu_count() if len(jobs) >= PARALLEL_BENALOH_MIN_CHALLENGES else 1
+    # Clients choose at most the pool size: the pool is shared and never grows per request
+    max_workers = max(1, min(max_workers, _pool.workers, len(jobs)))
+
+    if max_workers == 1:
+        results = _verify_challenge_chunk(joint_public_key_int, jobs)
+    else:
+        chunk_size = -(-len(jobs) // max_workers)
+        executor = _pool.get()
+        futures = [
+            executor.submit(_verify_challenge_chunk, joint_public_key_int, jobs[start:start + chunk_size])
+            for start in range(0, len(jobs), chunk_size)
+        ]
+        results = [result for future in futures for result in future.result()]
+
+    return {
+        "results": results,
+        "total": len(results),
+        "matched": sum(1 for result in results if result["success"] and result["match"]),
+        "mismatched": sum(1 for result in results if result["success"] and not result["match"]),
+        "failed": sum(1 for result in results if not result["success"]),
+        "workers": max_workers
+    }
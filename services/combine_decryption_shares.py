@@ -52,7 +52,6 @@ from electionguard.manifest import (
     ContactInformation,
     ReportingUnitType
 )
-from electionguard_tools.helpers.election_builder import ElectionBuilder
 from electionguard.tally import (
     tally_ballots,
     CiphertextTally,
@@ -76,6 +75,15 @@ from electionguard.decryption import (
     compute_lagrange_coefficients_for_guardians as compute_lagrange_coeffs
 )
 from manifest_cache import get_manifest_cache
+from msgpack_stream import StreamedArray
+from services.spoiled_ballots import (
+    SpoiledBallotShares,
+    decrypt_spoiled_ballots,
+    materialize_ballot,
+    select_ballot_range,
+    spoiled_ballots_of,
+    submitted_ballot_views,
+)
 
 
 
@@ -94,7 +102,11 @@ def combine_decryption_shares_service(
     raw_to_ciphertext_tally_func,
     generate_ballot_hash_func,
     generate_ballot_hash_electionguard_func,
-    max_choices: int = 1
+    max_choices: int = 1,
+    include_ballot_verification: bool = True,
+    verification_offset: int = 0,
+    verification_limit: Optional[int] = None,
+    stream: bool = False
 ) -> Dict[str, Any]:
     """
     Service function to combine decryption shares to produce final election results with quorum support.
@@ -114,6 +126,10 @@ def combine_decryption_shares_service(
         raw_to_ciphertext_tally_func: Function to deserialize ciphertext tally
         generate_ballot_hash_func: Function to generate ballot hash
         generate_ballot_hash_electionguard_func: Function to generate ElectionGuard ballot hash
+        include_ballot_verification: Whether to build the per-ballot verification list
+        verification_offset: Index of the first submitted ballot in the verification list
+        verification_limit: Maximum number of ballots in the verification list (None for all)
+        stream: Return the verification list as a StreamedArray built while the response is sent
         
     Returns:
         Dictionary containing election results
@@ -140,36 +156,24 @@ def combine_decryption_shares_service(
     
     # Process ciphertext tally and ballots
     ciphertext_tally = raw_to_ciphertext_tally_func(ciphertext_tally_json, manifest=manifest)
-    submitted_ballots = []
-    for ballot_json in submitted_ballots_json:
-        if isinstance(ballot_json, dict):
-            submitted_ballots.append(from_raw(SubmittedBallot, json.dumps(ballot_json)))
-        else:
-            # Binary deserialization (base64)
-            submitted_ballots.append(from_binary_transport(SubmittedBallot, ballot_json))
+    # Only the spoiled ballots are deserialized in full, when their shares are computed
+    submitted_ballots = submitted_ballot_views(submitted_ballots_json)
     
     # Configure decryption mediator
     decryption_mediator = DecryptionMediator("decryption-mediator", context)
     
-    # First, get all guardian keys from guardian data - binary deserialization
-    all_guardian_keys = []
-    for guardian_info in guardian_data:
-        election_public_key_data = guardian_info['election_public_key']
-        if isinstance(election_public_key_data, dict):
-            election_public_key = from_raw(ElectionPublicKey, json.dumps(election_public_key_data))
-        else:
-            # Binary deserialization (base64)
-            election_public_key = from_binary_transport(ElectionPublicKey, election_public_key_data)
-        all_guardian_keys.append(election_public_key)
+    # First, index all guardian keys from guardian data by guardian id - binary deserialization
+    guardian_data_by_id = {guardian_info['id']: guardian_info for guardian_info in guardian_data}
+    guardian_keys_by_id = {
+        guardian_id: _deserialize_election_public_key(guardian_info['election_public_key'])
+        for guardian_id, guardian_info in guardian_data_by_id.items()
+    }
     
     # Add available guardian shares (normal decryption shares) - binary deserialization
+    available_guardian_keys: Dict[str, ElectionPublicKey] = {}
     for guardian_id, share_data in available_guardian_shares.items():
-        guardian_public_key_data = share_data['guardian_public_key']
-        if isinstance(guardian_public_key_data, dict):
-            guardian_public_key = from_raw(ElectionPublicKey, json.dumps(guardian_public_key_data))
-        else:
-            # Binary deserialization (base64)
-            guardian_public_key = from_binary_transport(ElectionPublicKey, guardian_public_key_data)
+        guardian_public_key = _deserialize_election_public_key(share_data['guardian_public_key'])
+        available_guardian_keys[guardian_id] = guardian_public_key
             
         tally_share_data = share_data['tally_share']
         if tally_share_data:
@@ -181,28 +185,14 @@ def combine_decryption_shares_service(
         else:
             tally_share = None
         
-        ballot_shares = {}
-        for ballot_id, serialized_ballot_share in share_data['ballot_shares'].items():
-            if serialized_ballot_share:
-                if isinstance(serialized_ballot_share, dict):
-                    ballot_shares[ballot_id] = from_raw(DecryptionShare, json.dumps(serialized_ballot_share))
-                else:
-                    # Binary deserialization (base64)
-                    ballot_shares[ballot_id] = from_binary_transport(DecryptionShare, serialized_ballot_share)
-        
-        decryption_mediator.announce(guardian_public_key, tally_share, ballot_shares)
+        # Ballot shares go to the spoiled ballot pipeline rather than the mediator
+        decryption_mediator.announce(guardian_public_key, tally_share)
     
     # Announce missing guardians - binary deserialization
     print(f"Processing compensated shares for {len(compensated_shares)} guardians")
     for missing_guardian_id in compensated_shares.keys():
-        missing_guardian_info = next((gd for gd in guardian_data if gd['id'] == missing_guardian_id), None)
-        if missing_guardian_info:
-            missing_guardian_public_key_data = missing_guardian_info['election_public_key']
-            if isinstance(missing_guardian_public_key_data, dict):
-                missing_guardian_public_key = from_raw(ElectionPublicKey, json.dumps(missing_guardian_public_key_data))
-            else:
-                # Binary deserialization (base64)
-                missing_guardian_public_key = from_binary_transport(ElectionPublicKey, missing_guardian_public_key_data)
+        missing_guardian_public_key = guardian_keys_by_id.get(missing_guardian_id)
+        if missing_guardian_public_key:
             decryption_mediator.announce_missing(missing_guardian_public_key)
             print(f"Announced missing guardian: {missing_guardian_id}")
     
@@ -221,24 +211,13 @@ def combine_decryption_shares_service(
                     compensated_tally_share = from_binary_transport(CompensatedDecryptionShare, compensated_tally_share_data)
                 decryption_mediator.receive_tally_compensation_share(compensated_tally_share)
                 print(f"    ✅ Added compensated tally share")
-            
-            if comp_share_data.get('compensated_ballot_shares'):
-                compensated_ballot_shares = {}
-                for ballot_id, serialized_comp_ballot_share in comp_share_data['compensated_ballot_shares'].items():
-                    if serialized_comp_ballot_share:
-                        if isinstance(serialized_comp_ballot_share, dict):
-                            compensated_ballot_shares[ballot_id] = from_raw(CompensatedDecryptionShare, json.dumps(serialized_comp_ballot_share))
-                        else:
-                            # Binary deserialization (base64)
-                            compensated_ballot_shares[ballot_id] = from_binary_transport(CompensatedDecryptionShare, serialized_comp_ballot_share)
-                
-                decryption_mediator.receive_ballot_compensation_shares(compensated_ballot_shares)
-                print(f"    ✅ Added {len(compensated_ballot_shares)} compensated ballot shares")
+
+    spoiled_shares = collect_spoiled_ballot_shares(submitted_ballots, available_guardian_shares, compensated_shares)
+    print(f"✅ Collected shares of {len(spoiled_shares)} individually decrypted ballots")
     
     # Reconstruct shares for missing guardians
-    print(f"Reconstructing shares for tally and ballots...")
+    print(f"Reconstructing shares for tally...")
     decryption_mediator.reconstruct_shares_for_tally(ciphertext_tally)
-    decryption_mediator.reconstruct_shares_for_ballots(submitted_ballots)
     print(f"✅ Shares reconstructed")
     
     # Ensure announcement is complete
@@ -259,9 +238,19 @@ def combine_decryption_shares_service(
     if plaintext_tally is None:
         raise ValueError("Failed to decrypt tally - plaintext_tally is None")
     
-    plaintext_spoiled_ballots = decryption_mediator.get_plaintext_ballots(submitted_ballots, manifest)
-    if plaintext_spoiled_ballots is None:
-        plaintext_spoiled_ballots = {}
+    # Missing guardians' ballot shares are reconstructed and ballots decrypted in parallel chunks
+    plaintext_spoiled_ballots = {
+        ballot_id: plaintext
+        for ballot_id, plaintext in decrypt_spoiled_ballots(
+            list(spoiled_shares.values()),
+            decryption_mediator.get_missing_guardians(),
+            decryption_mediator.get_lagrange_coefficients(),
+            context.crypto_extended_base_hash,
+            number_of_guardians,
+            manifest,
+        )
+        if plaintext is not None
+    }
     
     # Create sets of cast and spoiled ballot IDs for quick lookup
     cast_ballot_ids = ciphertext_tally.cast_ballot_ids
@@ -322,17 +311,32 @@ def combine_decryption_shares_service(
                 'percentage': str(round(selection.tally / len(cast_ballot_ids) * 100, 2)) if len(cast_ballot_ids) > 0 else "0"
             }
     
+    # Index submitted ballots by id and hash each ballot at most once
+    submitted_ballots_by_id = {ballot.object_id: ballot for ballot in submitted_ballots}
+    initial_hashes: Dict[str, str] = {}
+    decrypted_hashes: Dict[str, str] = {}
+    
+    def initial_hash_for(ballot: SubmittedBallot) -> str:
+        if ballot.object_id not in initial_hashes:
+            initial_hashes[ballot.object_id] = generate_ballot_hash_electionguard_func(ballot)
+        return initial_hashes[ballot.object_id]
+    
+    def decrypted_hash_for(ballot_id: str, ballot: Any) -> str:
+        if ballot_id not in decrypted_hashes:
+            decrypted_hashes[ballot_id] = generate_ballot_hash_func(ballot)
+        return decrypted_hashes[ballot_id]
+    
     # Process spoiled ballots
     for ballot_id, ballot in plaintext_spoiled_ballots.items():
         if isinstance(ballot, PlaintextBallot):
             # Find the original ballot to compute its initial hash
-            original_ballot = next((b for b in submitted_ballots if b.object_id == ballot_id), None)
-            initial_hash = generate_ballot_hash_electionguard_func(original_ballot) if original_ballot else "N/A"
+            original_ballot = submitted_ballots_by_id.get(ballot_id)
+            initial_hash = initial_hash_for(original_ballot) if original_ballot else "N/A"
             
             ballot_info = {
                 'ballot_id': ballot_id,
                 'initial_hash': initial_hash,
-                'decrypted_hash': generate_ballot_hash_func(ballot),
+                'decrypted_hash': decrypted_hash_for(ballot_id, ballot),
                 'status': 'spoiled',
                 'selections': []
             }
@@ -348,9 +352,14 @@ def combine_decryption_shares_service(
             
             results['results']['spoiled_ballots'].append(ballot_info)
     
-    # Add ballot verification information
-    for ballot in submitted_ballots:
-        initial_hash = generate_ballot_hash_electionguard_func(ballot)
+    # Add ballot verification information for the requested page of submitted ballots
+    verification_offset = max(0, verification_offset)
+    verification_end = len(submitted_ballots) if verification_limit is None else verification_offset + max(0, verification_limit)
+    results['verification']['ballots_total'] = len(submitted_ballots)
+    results['verification']['ballots_offset'] = verification_offset
+    
+    def verify_ballot(ballot: SubmittedBallot) -> Dict[str, str]:
+        initial_hash = initial_hash_for(ballot)
         
         ballot_info = {
             'ballot_id': ballot.object_id,
@@ -361,7 +370,7 @@ def combine_decryption_shares_service(
         if ballot.object_id in spoiled_ballot_ids:
             spoiled_ballot = plaintext_spoiled_ballots.get(ballot.object_id)
             if spoiled_ballot:
-                ballot_info['decrypted_hash'] = generate_ballot_hash_func(spoiled_ballot)
+                ballot_info['decrypted_hash'] = decrypted_hash_for(ballot.object_id, spoiled_ballot)
                 ballot_info['verification'] = 'success'
             else:
                 ballot_info['decrypted_hash'] = 'N/A'
@@ -370,16 +379,18 @@ def combine_decryption_shares_service(
             ballot_info['decrypted_hash'] = initial_hash
             ballot_info['verification'] = 'success'
         
-        results['verification']['ballots'].append(ballot_info)
+        return ballot_info
     
-    # Add guardian information - binary deserialization
-    for guardian_id, share_data in available_guardian_shares.items():
-        guardian_public_key_data = share_data['guardian_public_key']
-        if isinstance(guardian_public_key_data, dict):
-            guardian_public_key = from_raw(ElectionPublicKey, json.dumps(guardian_public_key_data))
+    if include_ballot_verification:
+        verification_page = submitted_ballots[verification_offset:verification_end]
+        verified_ballots = (verify_ballot(ballot) for ballot in verification_page)
+        if stream:
+            results['verification']['ballots'] = StreamedArray(len(verification_page), verified_ballots)
         else:
-            # Binary deserialization (base64)
-            guardian_public_key = from_binary_transport(ElectionPublicKey, guardian_public_key_data)
+            results['verification']['ballots'] = list(verified_ballots)
+    
+    # Add guardian information, reusing the keys deserialized above
+    for guardian_public_key in available_guardian_keys.values():
         results['verification']['guardians'].append({
             'id': guardian_public_key.owner_id,
             'sequence_order': str(guardian_public_key.sequence_order),
@@ -387,24 +398,163 @@ def combine_decryption_shares_service(
             'status': 'available'
         })
     
-    # Add missing guardian information - binary deserialization
+    # Add missing guardian information
     for missing_guardian_id in compensated_shares.keys():
-        guardian_info = next((gd for gd in guardian_data if gd['id'] == missing_guardian_id), None)
+        guardian_info = guardian_data_by_id.get(missing_guardian_id)
         if guardian_info:
-            # Get the public key from election_public_key
-            missing_guardian_public_key_data = guardian_info['election_public_key']
-            if isinstance(missing_guardian_public_key_data, dict):
-                missing_guardian_public_key = from_raw(ElectionPublicKey, json.dumps(missing_guardian_public_key_data))
-            else:
-                # Binary deserialization (base64)
-                missing_guardian_public_key = from_binary_transport(ElectionPublicKey, missing_guardian_public_key_data)
             results['verification']['guardians'].append({
                 'id': missing_guardian_id,
                 'sequence_order': str(guardian_info['sequence_order']),
-                'public_key': str(missing_guardian_public_key.key),
+                'public_key': str(guardian_keys_by_id[missing_guardian_id].key),
                 'status': 'missing (compensated)'
             })
     
+    return results
+
+
+def decrypt_spoiled_ballots_service(
+    party_names: List[str],
+    candidate_names: List[str],
+    joint_public_key: str,
+    commitment_hash: str,
+    submitted_ballots_json: List[Dict],
+    guardian_data: List[Dict],
+    available_guardian_shares: Dict[str, Dict],
+    compensated_shares: Dict[str, Dict],
+    quorum: int,
+    create_election_manifest_func,
+    generate_ballot_hash_func,
+    generate_ballot_hash_electionguard_func,
+    max_choices: int = 1,
+    ballot_id_from: Optional[str] = None,
+    ballot_id_to: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Decrypt the spoiled ballots among the submitted ballots, without the tally.
+    
+    Missing guardians' ballot shares are reconstructed and the ballots decrypted in chunks
+    across the spoiled ballot process pool. The results are a StreamedArray produced in
+    ballot order while the response is sent. With ballot_id_from and ballot_id_to only the
+    ballots with ids in [ballot_id_from, ballot_id_to) are decrypted, so that a large audit
+    can be split across several requests or machines.
+    
+    Raises:
+        ValueError: If there are too few guardians or a missing guardian has no compensated shares
+    """
+    number_of_guardians = len(guardian_data)
+    cache = get_manifest_cache()
+    _, context = cache.get_or_create_context(
+        party_names, candidate_names,
+        int(joint_public_key), int(commitment_hash),
+        number_of_guardians, quorum,
+        create_election_manifest_func,
+        max_choices=max_choices
+    )
+    manifest = cache.get_or_create_manifest(party_names, candidate_names, create_election_manifest_func, max_choices=max_choices)
+    
+    # Only the spoiled ballots are deserialized in full, when their shares are computed
+    submitted_ballots = submitted_ballot_views(submitted_ballots_json)
+    ballots = spoiled_ballots_of(select_ballot_range(submitted_ballots, ballot_id_from, ballot_id_to))
     
+    # Validate the guardians before the first result is streamed
+    if len(available_guardian_shares) < quorum:
+        raise ValueError(f"Insufficient guardians available. Need {quorum}, have {len(available_guardian_shares)}")
+    available_guardian_keys = [
+        _deserialize_election_public_key(share_data['guardian_public_key'])
+        for share_data in available_guardian_shares.values()
+    ]
+    missing_guardian_keys = []
+    for guardian_info in guardian_data:
+        if guardian_info['id'] in available_guardian_shares:
+            continue
+        if guardian_info['id'] not in compensated_shares:
+            raise ValueError(f"Missing compensated shares for guardian {guardian_info['id']}")
+        missing_guardian_keys.append(_deserialize_election_public_key(guardian_info['election_public_key']))
     
-    return results
+    spoiled_shares = collect_spoiled_ballot_shares(ballots, available_guardian_shares, compensated_shares)
+    items = [spoiled_shares.get(ballot.object_id) or SpoiledBallotShares(ballot) for ballot in ballots]
+    ballots_by_id = {ballot.object_id: ballot for ballot in ballots}
+    
+    def spoiled_ballot_results():
+        for ballot_id, plaintext in decrypt_spoiled_ballots(
+            items,
+            missing_guardian_keys,
+            compute_lagrange_coeffs(available_guardian_keys),
+            context.crypto_extended_base_hash,
+            number_of_guardians,
+            manifest,
+        ):
+            ballot_info = {
+                'ballot_id': ballot_id,
+                'initial_hash': generate_ballot_hash_electionguard_func(ballots_by_id[ballot_id]),
+                'decrypted_hash': 'N/A',
+                'status': 'spoiled',
+                'verification': 'failed',
+                'selections': []
+            }
+            if plaintext is not None:
+                ballot_info['decrypted_hash'] = generate_ballot_hash_func(plaintext)
+                ballot_info['verification'] = 'success'
+                for contest in plaintext.contests.values():
+                    for selection in contest.selections.values():
+                        if selection.tally == 1:
+                            ballot_info['selections'].append({
+                                'contest_id': contest.object_id,
+                                'selection_id': selection.object_id,
+                                'vote': str(selection.tally)
+                            })
+            yield ballot_info
+    
+    return {
+        'ballots_total': len(ballots),
+        'ballot_id_from': ballot_id_from,
+        'ballot_id_to': ballot_id_to,
+        'spoiled_ballots': StreamedArray(len(ballots), spoiled_ballot_results())
+    }
+
+
+def collect_spoiled_ballot_shares(
+    submitted_ballots: List[SubmittedBallot],
+    available_guardian_shares: Dict[str, Dict],
+    compensated_shares: Dict[str, Dict],
+) -> Dict[str, SpoiledBallotShares]:
+    """
+    Gather the shares of every submitted ballot that guardians decrypted individually (the
+    spoiled ones), in submitted order. Shares of ballots not submitted are ignored.
+    """
+    submitted_ballots_by_id = {ballot.object_id: ballot for ballot in submitted_ballots}
+    spoiled_shares: Dict[str, SpoiledBallotShares] = {}
+    
+    def spoiled_shares_for(ballot_id: str) -> Optional[SpoiledBallotShares]:
+        if ballot_id not in spoiled_shares and ballot_id in submitted_ballots_by_id:
+            spoiled_shares[ballot_id] = SpoiledBallotShares(materialize_ballot(submitted_ballots_by_id[ballot_id]))
+        return spoiled_shares.get(ballot_id)
+    
+    for guardian_id, share_data in available_guardian_shares.items():
+        for ballot_id, serialized_ballot_share in (share_data.get('ballot_shares') or {}).items():
+            if serialized_ballot_share and spoiled_shares_for(ballot_id):
+                spoiled_shares[ballot_id].shares[guardian_id] = _deserialize_share(DecryptionShare, serialized_ballot_share)
+    
+    for compensated_data in compensated_shares.values():
+        for comp_share_data in compensated_data.values():
+            for ballot_id, serialized_comp_ballot_share in (comp_share_data.get('compensated_ballot_shares') or {}).items():
+                if serialized_comp_ballot_share and spoiled_shares_for(ballot_id):
+                    share = _deserialize_share(CompensatedDecryptionShare, serialized_comp_ballot_share)
+                    spoiled_shares[ballot_id].compensated_shares.setdefault(share.missing_guardian_id, {})[share.guardian_id] = share
+    
+    order = {ballot.object_id: index for index, ballot in enumerate(submitted_ballots)}
+    return {ballot_id: spoiled_shares[ballot_id] for ballot_id in sorted(spoiled_shares, key=order.__getitem__)}
+
+
+def _deserialize_share(share_type, share_data: Any):
+    """Deserialize a decryption share sent as a dict or as binary transport (base64)."""
+    if isinstance(share_data, dict):
+        return from_raw(share_type, json.dumps(share_data))
+    return from_binary_transport(share_type, share_data)
+
+
+def _deserialize_election_public_key(election_public_key_data: Any) -> ElectionPublicKey:
+    """Deserialize an election public key sent as a dict or as binary transport (base64)."""
+    if isinstance(election_public_key_data, dict):
+        return from_raw(ElectionPublicKey, json.dumps(election_public_key_data))
+    return from_binary_transport(ElectionPublicKey, election_public_key_data)
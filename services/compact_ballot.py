@@ -0,0 +1,303 @@
+"""
+Service for storing and shipping ballots in compact form.
+
+A ballot encrypted by this API is fully determined by its plaintext selections, its
+master nonce, its code seed and its timestamp: re-running the encryption with them
+reproduces every ciphertext, proof and hash byte for byte
+(`electionguard.ballot_compact.expand_compact_submitted_ballot`). A sealed compact
+ballot keeps only those values, packed with msgpack and encrypted with AES-256-GCM
+under its own key, so it takes a few hundred bytes instead of tens of kilobytes.
+Because it contains the votes and the nonce it must never leave the server unsealed.
+Tallies and audits expand sealed ballots in bulk across a process pool.
+"""
+
+import base64
+import json
+import os
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+import msgpack
+from cryptography.exceptions import InvalidTag
+from cryptography.hazmat.backends import default_backend
+from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
+
+from electionguard.ballot import CiphertextBallot, PlaintextBallot, SubmittedBallot
+from electionguard.ballot_box import BallotBoxState, submit_ballot
+from electionguard.ballot_compact import (
+    CompactPlaintextBallot,
+    CompactSubmittedBallot,
+    compress_submitted_ballot,
+    expand_compact_submitted_ballot,
+)
+from electionguard.group import ElementModQ
+from electionguard.scheduler import Scheduler
+from electionguard.serialize import to_raw
+from manifest_cache import get_manifest_cache
+from msgpack_stream import StreamedArray
+from process_pools import SharedProcessPool
+
+# Below this many ballots the process pool start-up costs more than it saves.
+PARALLEL_EXPAND_MIN_BALLOTS = int(os.environ.get('EG_PARALLEL_EXPAND_MIN_BALLOTS', '16'))
+EXPAND_MAX_WORKERS = int(os.environ.get('EG_EXPAND_MAX_WORKERS', '0')) or None
+
+COMPACT_BALLOT_VERSION = 1
+_NONCE_LENGTH = 12
+_TAG_LENGTH = 16
+
+# Compact ballots are sealed with their own key so a leaked credential key does not expose votes.
+# They are stored at rest, so there is no per-process fallback key: without one they are refused.
+COMPACT_BALLOT_KEY: Optional[bytes] = None
+try:
+    COMPACT_BALLOT_KEY = base64.b64decode(os.environ.get('EG_COMPACT_BALLOT_KEY', ''), validate=True) or None
+except ValueError:
+    pass
+if COMPACT_BALLOT_KEY is None or len(COMPACT_BALLOT_KEY) != 32:
+    print("WARNING: EG_COMPACT_BALLOT_KEY is not set to 32 base64-encoded bytes. Compact ballots are disabled")
+
+_pool = SharedProcessPool('expand', EXPAND_MAX_WORKERS)
+
+
+def shutdown_expand_pool() -> None:
+    """Shut down the shared expansion process pool if one was started."""
+    _pool.shutdown()
+
+
+def compact_ballot_key() -> bytes:
+    """
+    The key compact ballots are sealed with.
+
+    Raises:
+        ValueError: If EG_COMPACT_BALLOT_KEY is not set to 32 base64-encoded bytes
+    """
+    if COMPACT_BALLOT_KEY is None or len(COMPACT_BALLOT_KEY) != 32:
+        raise ValueError(
+            "Compact ballots are disabled: set EG_COMPACT_BALLOT_KEY to 32 base64-encoded bytes, "
+            "the same on every worker and across restarts"
+        )
+    return COMPACT_BALLOT_KEY
+
+
+def _q_bytes(element: ElementModQ) -> bytes:
+    return int(element).to_bytes(32, 'big')
+
+
+def seal_compact_ballot(compact_ballot: CompactSubmittedBallot) -> str:
+    """
+    Pack a compact ballot and encrypt it under the compact ballot key (base64 string).
+
+    Raises:
+        ValueError: If no compact ballot key is configured
+    """
+    key = compact_ballot_key()
+    plaintext = compact_ballot.compact_plaintext_ballot
+    packed = msgpack.packb([
+        plaintext.object_id,
+        plaintext.style_id,
+        [int(selection) for selection in plaintext.selections],
+        plaintext.write_ins,
+        compact_ballot.timestamp,
+        _q_bytes(compact_ballot.ballot_nonce),
+        _q_bytes(compact_ballot.code_seed),
+        _q_bytes(compact_ballot.code),
+        compact_ballot.ballot_box_state.value,
+    ], use_bin_type=True)
+
+    version = bytes([COMPACT_BALLOT_VERSION])
+    nonce = os.urandom(_NONCE_LENGTH)
+    encryptor = Cipher(algorithms.AES(key), modes.GCM(nonce), backend=default_backend()).encryptor()
+    encryptor.authenticate_additional_data(version)
+    ciphertext = encryptor.update(packed) + encryptor.finalize()
+    return base64.b64encode(version + nonce + encryptor.tag + ciphertext).decode('ascii')
+
+
+def open_compact_ballot(sealed_ballot: str) -> CompactSubmittedBallot:
+    """
+    Decrypt and unpack a sealed compact ballot.
+
+    Raises:
+        ValueError: If the ballot is malformed or was not sealed with this key, or no
+            compact ballot key is configured
+    """
+    key = compact_ballot_key()
+    try:
+        sealed = base64.b64decode(sealed_ballot.encode('ascii'), validate=True)
+    except (ValueError, AttributeError) as e:
+        raise ValueError(f"Compact ballot is not valid base64: {e}")
+    header = 1 + _NONCE_LENGTH + _TAG_LENGTH
+    if len(sealed) <= header or sealed[0] != COMPACT_BALLOT_VERSION:
+        raise ValueError("Unsupported compact ballot format")
+
+    nonce = sealed[1:1 + _NONCE_LENGTH]
+    tag = sealed[1 + _NONCE_LENGTH:header]
+    decryptor = Cipher(algorithms.AES(key), modes.GCM(nonce, tag), backend=default_backend()).decryptor()
+    decryptor.authenticate_additional_data(sealed[:1])
+    try:
+        packed = decryptor.update(sealed[header:]) + decryptor.finalize()
+    except InvalidTag:
+        raise ValueError("Compact ballot failed authentication (wrong key or tampered)")
+
+    (object_id, style_id, selections, write_ins, timestamp,
+     ballot_nonce, code_seed, code, state) = msgpack.unpackb(packed, raw=False, strict_map_key=False)
+    return CompactSubmittedBallot(
+        CompactPlaintextBallot(object_id, style_id, [bool(selection) for selection in selections], write_ins),
+        timestamp,
+        ElementModQ(int.from_bytes(ballot_nonce, 'big')),
+        ElementModQ(int.from_bytes(code_seed, 'big')),
+        ElementModQ(int.from_bytes(code, 'big')),
+        BallotBoxState(state),
+    )
+
+
+def make_sealed_compact_ballot(
+    encrypted_ballot: CiphertextBallot,
+    plaintext_ballot: PlaintextBallot,
+    state: BallotBoxState = BallotBoxState.CAST
+) -> str:
+    """Seal the compact form of a ballot just encrypted from ``plaintext_ballot``."""
+    submitted = submit_ballot(encrypted_ballot, state)
+    return seal_compact_ballot(
+        compress_submitted_ballot(submitted, plaintext_ballot, encrypted_ballot.nonce)
+    )
+
+
+def _expand_compact_chunk(
+    election: Tuple[Any, ...],
+    create_election_manifest_func: Callable,
+    compact_ballots: List[CompactSubmittedBallot]
+) -> List[SubmittedBallot]:
+    """Worker task: re-encrypt a slice of compact ballots (context is cached per worker)."""
+    (party_names, candidate_names, joint_public_key, commitment_hash,
+     number_of_guardians, quorum, max_choices, contest_proofs) = election
+    internal_manifest, context = get_manifest_cache().get_or_create_context(
+        party_names, candidate_names,
+        joint_public_key, commitment_hash,
+        number_of_guardians, quorum,
+        create_election_manifest_func,
+        max_choices=max_choices,
+        contest_proofs=contest_proofs
+    )
+    return [
+        expand_compact_submitted_ballot(compact_ballot, internal_manifest, context)
+        for compact_ballot in compact_ballots
+    ]
+
+
+def open_compact_ballots(sealed_ballots: List[str]) -> List[CompactSubmittedBallot]:
+    """
+    Open every sealed compact ballot of a request.
+
+    Raises:
+        ValueError: Naming the first ballot that cannot be opened, or if no compact ballot
+            key is configured
+    """
+    if sealed_ballots:
+        compact_ballot_key()
+    compact_ballots = []
+    for index, sealed_ballot in enumerate(sealed_ballots):
+        try:
+            compact_ballots.append(open_compact_ballot(sealed_ballot))
+        except ValueError as e:
+            raise ValueError(f"Compact ballot {index}: {e}")
+    return compact_ballots
+
+
+def expand_compact_ballots(
+    compact_ballots: List[CompactSubmittedBallot],
+    party_names: List[str],
+    candidate_names: List[str],
+    joint_public_key: int,
+    commitment_hash: int,
+    number_of_guardians: int,
+    quorum: int,
+    create_election_manifest_func,
+    max_choices: int = 1,
+    max_workers: Optional[int] = None,
+    contest_proofs: Optional[str] = None
+) -> List[SubmittedBallot]:
+    """
+    Re-encrypt opened compact ballots into the full submitted ballots, in order.
+
+    Large batches are split across a process pool; each worker builds the election
+    context once and reuses it for its whole slice.
+    """
+    if not compact_ballots:
+        return []
+    election = (party_names, candidate_names, joint_public_key, commitment_hash,
+                number_of_guardians, quorum, max_choices, contest_proofs)
+
+    if max_workers is None:
+        max_workers = EXPAND_MAX_WORKERS
+    if max_workers is None:
+        max_workers = Scheduler.cpu_count() if len(compact_ballots) >= PARALLEL_EXPAND_MIN_BALLOTS else 1
+    max_workers = max(1, min(max_workers, len(compact_ballots)))
+
+    if max_workers == 1:
+        return _expand_compact_chunk(election, create_election_manifest_func, compact_ballots)
+
+    chunk_size = -(-len(compact_ballots) // max_workers)
+    executor = _pool.get()
+    futures = [
+        executor.submit(_expand_compact_chunk, election, create_election_manifest_func, compact_ballots[start:start + chunk_size])
+        for start in range(0, len(compact_ballots), chunk_size)
+    ]
+    return [ballot for future in futures for ballot in future.result()]
+
+
+def expand_compact_ballots_service(
+    party_names: List[str],
+    candidate_names: List[str],
+    joint_public_key: str,
+    commitment_hash: str,
+    compact_ballots: List[str],
+    number_of_guardians: int,
+    quorum: int,
+    create_election_manifest_func,
+    max_choices: int = 1,
+    stream: bool = False,
+    contest_proofs: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Service function to expand sealed compact ballots for an audit or publication.
+
+    Args:
+        party_names: List of party names
+        candidate_names: List of candidate names
+        joint_public_key: Joint public key as string
+        commitment_hash: Commitment hash as string
+        compact_ballots: Sealed compact ballots returned by create_encrypted_ballot
+        number_of_guardians: Number of guardians
+        quorum: Quorum for the election
+        create_election_manifest_func: Function to create election manifest
+        max_choices: Maximum number of candidates voter can select (default 1)
+        stream: Return submitted ballots as a StreamedArray serialized on demand
+        contest_proofs: Contest proofs the ballots were encrypted with, 'placeholder'
+            or 'range' (default: EG_CONTEST_PROOFS)
+
+    Returns:
+        Dictionary with the expanded submitted ballots (without nonces)
+
+    Raises:
+        ValueError: If no ballots are provided or one cannot be opened
+    """
+    if not compact_ballots:
+        raise ValueError('No compact ballots to expand.')
+
+    submitted_ballots = expand_compact_ballots(
+        open_compact_ballots(compact_ballots),
+        party_names,
+        candidate_names,
+        int(joint_public_key),
+        int(commitment_hash),
+        number_of_guardians,
+        quorum,
+        create_election_manifest_func,
+        max_choices=max_choices,
+        contest_proofs=contest_proofs
+    )
+    serialized_ballots = (json.loads(to_raw(ballot)) for ballot in submitted_ballots)
+    submitted_ballots_json: Union[List[Dict], StreamedArray]
+    if stream:
+        submitted_ballots_json = StreamedArray(len(submitted_ballots), serialized_ballots)
+    else:
+        submitted_ballots_json = list(serialized_ballots)
+    return {'submitted_ballots': submitted_ballots_json}
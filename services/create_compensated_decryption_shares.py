@@ -52,7 +52,6 @@ from electionguard.manifest import (
     ContactInformation,
     ReportingUnitType
 )
-from electionguard_tools.helpers.election_builder import ElectionBuilder
 from electionguard.tally import (
     tally_ballots,
     CiphertextTally,
@@ -76,6 +75,27 @@ from electionguard.decryption import (
     compute_lagrange_coefficients_for_guardians as compute_lagrange_coeffs
 )
 from manifest_cache import get_manifest_cache
+from services.create_partial_decryption import ballot_range_parts, compute_shares_with_checkpoint, tally_digest
+from services.spoiled_ballots import map_ballot_chunks, select_ballot_range, spoiled_ballots_of, submitted_ballot_views
+
+
+def _compensated_ballot_shares_chunk(
+    missing_guardian_coordinate: ElementModQ,
+    present_guardian_key: ElectionPublicKey,
+    missing_guardian_key: ElectionPublicKey,
+    context: CiphertextElectionContext,
+    ballots: List[SubmittedBallot]
+) -> Dict[BallotId, Optional[CompensatedDecryptionShare]]:
+    return {
+        ballot.object_id: compute_compensated_decryption_share_for_ballot(
+            missing_guardian_coordinate,
+            missing_guardian_key,
+            present_guardian_key,
+            ballot,
+            context,
+        )
+        for ballot in ballots
+    }
 
 
 def compute_compensated_ballot_shares(
@@ -83,26 +103,23 @@ def compute_compensated_ballot_shares(
     present_guardian_key: ElectionPublicKey,
     missing_guardian_key: ElectionPublicKey,
     ballots: List[SubmittedBallot],
-    context: CiphertextElectionContext
+    context: CiphertextElectionContext,
+    max_workers: Optional[int] = None
 ) -> Dict[BallotId, Optional[CompensatedDecryptionShare]]:
     """Compute compensated decryption shares for ballots.
     
     Only computes shares for SPOILED ballots — CAST ballot shares are never
     used in tally decryption (only spoiled ballots are individually decrypted).
+    Many spoiled ballots are split into chunks across the spoiled ballot process pool.
     """
-    from electionguard.ballot import BallotBoxState
     shares = {}
-    for ballot in ballots:
-        if ballot.state == BallotBoxState.SPOILED:
-            share = compute_compensated_decryption_share_for_ballot(
-                missing_guardian_coordinate,
-                missing_guardian_key,
-                present_guardian_key,
-                ballot,
-                context,
-            )
-            shares[ballot.object_id] = share
-        # CAST ballots: skip — their individual decryption is never needed
+    for chunk_shares in map_ballot_chunks(
+        _compensated_ballot_shares_chunk,
+        (missing_guardian_coordinate, present_guardian_key, missing_guardian_key, context),
+        spoiled_ballots_of(ballots),
+        max_workers,
+    ):
+        shares.update(chunk_shares)
     return shares
 
 
@@ -125,7 +142,10 @@ def create_compensated_decryption_service(
     create_election_manifest_func,
     raw_to_ciphertext_tally_func,
     compute_compensated_ballot_shares_func,
-    max_choices: int = 1
+    max_choices: int = 1,
+    checkpoint_id: Optional[str] = None,
+    ballot_id_from: Optional[str] = None,
+    ballot_id_to: Optional[str] = None
 ) -> Dict[str, Any]:
     """
     Service function to compute compensated decryption shares for missing guardians.
@@ -149,6 +169,10 @@ def create_compensated_decryption_service(
         create_election_manifest_func: Function to create election manifest
         raw_to_ciphertext_tally_func: Function to deserialize ciphertext tally
         compute_compensated_ballot_shares_func: Function to compute compensated ballot shares
+        checkpoint_id: Name of this decryption run; its progress is checkpointed and a
+            retry with the same id resumes from the last checkpoint
+        ballot_id_from: Only compute ballot shares for ballot ids >= this one
+        ballot_id_to: Only compute ballot shares for ballot ids < this one
         
     Returns:
         Dictionary containing compensated shares
@@ -260,37 +284,37 @@ def create_compensated_decryption_service(
     manifest = cache.get_or_create_manifest(party_names, candidate_names, create_election_manifest_func, max_choices=max_choices)
     
     ciphertext_tally = raw_to_ciphertext_tally_func(ciphertext_tally_json, manifest=manifest)
-    submitted_ballots = []
-    for ballot_json in submitted_ballots_json:
-        if isinstance(ballot_json, dict):
-            submitted_ballots.append(from_raw(SubmittedBallot, json.dumps(ballot_json)))
-        else:
-            # Binary deserialization (base64)
-            submitted_ballots.append(from_binary_transport(SubmittedBallot, ballot_json))
+    # Only the spoiled ballots are deserialized in full, when their shares are computed;
+    # a ballot id range lets the shares of one guardian be split across machines
+    submitted_ballots = select_ballot_range(submitted_ballot_views(submitted_ballots_json), ballot_id_from, ballot_id_to)
 
-    # Compute compensated shares
-    compensated_tally_share = compute_compensated_decryption_share(
-        missing_guardian_coordinate,
-        available_guardian_public_key,
-        missing_guardian_public_key,
-        ciphertext_tally,
-        context
+    # Compute compensated shares, serialized using binary serialization (FAST)
+    run_parts = []
+    if checkpoint_id is not None:
+        run_parts = [
+            context.crypto_extended_base_hash.to_hex(), tally_digest(ciphertext_tally),
+            available_guardian_id, missing_guardian_id
+        ] + ballot_range_parts(ballot_id_from, ballot_id_to)
+    serialized_tally_share, serialized_ballot_shares = compute_shares_with_checkpoint(
+        checkpoint_id,
+        run_parts,
+        lambda: compute_compensated_decryption_share(
+            missing_guardian_coordinate,
+            available_guardian_public_key,
+            missing_guardian_public_key,
+            ciphertext_tally,
+            context
+        ),
+        lambda ballots: compute_compensated_ballot_shares_func(
+            missing_guardian_coordinate,
+            available_guardian_public_key,
+            missing_guardian_public_key,
+            ballots,
+            context
+        ),
+        submitted_ballots
     )
     
-    compensated_ballot_shares = compute_compensated_ballot_shares_func(
-        missing_guardian_coordinate,
-        available_guardian_public_key,
-        missing_guardian_public_key,
-        submitted_ballots,
-        context
-    )
-    
-    # Serialize each component using binary serialization (FAST)
-    serialized_tally_share = to_binary_transport(compensated_tally_share) if compensated_tally_share else None
-    serialized_ballot_shares = {}
-    for ballot_id, ballot_share in compensated_ballot_shares.items():
-        serialized_ballot_shares[ballot_id] = to_binary_transport(ballot_share) if ballot_share else None
-    
     return {
         'compensated_tally_share': serialized_tally_share,
         'compensated_ballot_shares': serialized_ballot_shares
@@ -6,6 +6,7 @@ Service for creating encrypted ballots.
 
 from flask import Flask, request, jsonify
 from typing import Dict, List, Optional, Tuple, Any
+import os
 import random
 from datetime import datetime
 import uuid
@@ -30,7 +31,8 @@ from electionguard.election_polynomial import (
     LagrangeCoefficientsRecord,
     ElectionPolynomial
 )
-from electionguard.encrypt import EncryptionDevice, EncryptionMediator
+from electionguard.encrypt import EncryptionDevice, EncryptionMediator, encrypt_ballot_bodies
+from electionguard.encrypt import encrypt_ballot as encrypt_ballot_body
 from electionguard.guardian import Guardian
 from electionguard.key_ceremony_mediator import KeyCeremonyMediator
 from electionguard.key_ceremony import ElectionKeyPair, ElectionPublicKey
@@ -52,7 +54,6 @@ from electionguard.manifest import (
     ContactInformation,
     ReportingUnitType
 )
-from electionguard_tools.helpers.election_builder import ElectionBuilder
 from electionguard.tally import (
     tally_ballots,
     CiphertextTally,
@@ -75,7 +76,28 @@ from electionguard.decryption import (
     decrypt_backup,
     compute_lagrange_coefficients_for_guardians as compute_lagrange_coeffs
 )
+from electionguard.scheduler import Scheduler
+from encryption_sessions import get_device_session
 from manifest_cache import get_manifest_cache
+from process_pools import SharedProcessPool
+from services.compact_ballot import compact_ballot_key, make_sealed_compact_ballot
+
+# Ballots with fewer selections and placeholders than this are encrypted in-process;
+# below it the pool round trips cost more than the parallel encryption saves.
+PARALLEL_ENCRYPT_MIN_SELECTIONS = int(os.environ.get('EG_PARALLEL_ENCRYPT_MIN_SELECTIONS', '24'))
+ENCRYPT_MAX_WORKERS = int(os.environ.get('EG_ENCRYPT_MAX_WORKERS', '0')) or None
+# Batches with fewer ballots than this are encrypted in-process, one ballot after another.
+PARALLEL_ENCRYPT_MIN_BALLOTS = int(os.environ.get('EG_PARALLEL_ENCRYPT_MIN_BALLOTS', '4'))
+
+# Device used when a request names none; its chain is not kept between requests
+DEFAULT_DEVICE = EncryptionDevice(device_id=1, session_id=1, launch_code=1, location="polling-place")
+
+_pool = SharedProcessPool('encrypt', ENCRYPT_MAX_WORKERS)
+
+
+def shutdown_encrypt_pool() -> None:
+    """Shut down the shared ballot encryption process pool if one was started."""
+    _pool.shutdown()
 
 
 
@@ -253,7 +275,10 @@ def create_encrypted_ballot_service(
     create_plaintext_ballot_func,
     create_election_manifest_func,
     generate_ballot_hash_func,
-    max_choices: int = 1
+    max_choices: int = 1,
+    compact: bool = False,
+    device: Optional[Dict] = None,
+    contest_proofs: Optional[str] = None
 ) -> Dict[str, Any]:
     """
     Service function to create and encrypt a ballot.
@@ -271,17 +296,27 @@ def create_encrypted_ballot_service(
         create_election_manifest_func: Function to create election manifest
         generate_ballot_hash_func: Function to generate ballot hash
         max_choices: Maximum number of candidates voter can select (default 1)
+        compact: Also return the ballot as a sealed compact ballot for storage
+        device: Encryption device (device_id, session_id, launch_code, location) whose
+            ballot code chain the ballot extends; the chain is kept across requests
+        contest_proofs: 'placeholder' or 'range' proofs of the contest selection limits
+            (default: EG_CONTEST_PROOFS)
         
     Returns:
-        Dictionary containing the encrypted ballot and hash
+        Dictionary containing the encrypted ballot and hash (and the compact ballot)
         
     Raises:
-        ValueError: If ballot encryption fails
+        ValueError: If ballot encryption fails, contest_proofs is unknown, or compact is set
+            without a compact ballot key
     """
+    if compact:
+        compact_ballot_key()
     # Convert string inputs to integers for internal processing
     joint_public_key_int = int(joint_public_key)
     commitment_hash_int = int(commitment_hash)
     
+    encryption_device = device_from_dict(device)
+    
     # Create plaintext ballot
     ballot = create_plaintext_ballot_func(party_names, candidate_names, candidate_names_to_vote, ballot_id, max_choices)
     
@@ -295,7 +330,9 @@ def create_encrypted_ballot_service(
         number_of_guardians,
         quorum,
         create_election_manifest_func,
-        max_choices
+        max_choices,
+        device=encryption_device,
+        contest_proofs=contest_proofs
     )
     
     if not encrypted_ballot:
@@ -307,10 +344,14 @@ def create_encrypted_ballot_service(
     # Serialize the ballot for response using binary serialization (FAST)
     serialized_ballot = to_binary_transport(encrypted_ballot)
     
-    return {
+    result = {
         'encrypted_ballot': serialized_ballot,
         'ballot_hash': ballot_hash
     }
+    if compact:
+        # A few hundred bytes that re-encrypt to exactly this ballot when expanded
+        result['compact_ballot'] = make_sealed_compact_ballot(encrypted_ballot, ballot)
+    return result
 
 
 def encrypt_ballot(
@@ -322,7 +363,10 @@ def encrypt_ballot(
     number_of_guardians: int,
     quorum: int,
     create_election_manifest_func,
-    max_choices: int = 1
+    max_choices: int = 1,
+    max_workers: Optional[int] = None,
+    device: Optional[EncryptionDevice] = None,
+    contest_proofs: Optional[str] = None
 ) -> Optional[CiphertextBallot]:
     """
     Encrypt a single ballot.
@@ -337,6 +381,11 @@ def encrypt_ballot(
         quorum: Quorum for the election
         create_election_manifest_func: Function to create election manifest
         max_choices: Maximum number of candidates voter can select (default 1)
+        max_workers: 1 encrypts in-process, more splits the contests and selections across
+            the shared encryption pool (default: the pool once the ballot has
+            PARALLEL_ENCRYPT_MIN_SELECTIONS)
+        device: Device session to chain the ballot code to (default: a fresh default device)
+        contest_proofs: 'placeholder' or 'range' (default: EG_CONTEST_PROOFS)
         
     Returns:
         Encrypted ballot or None if encryption fails
@@ -348,15 +397,186 @@ def encrypt_ballot(
         joint_public_key_json, commitment_hash_json,
         number_of_guardians, quorum,
         create_election_manifest_func,
-        max_choices
+        max_choices,
+        contest_proofs
     )
+    return encrypt_ballot_in_context(plaintext_ballot, internal_manifest, context, max_workers, device)
+
+
+def encrypt_ballot_in_context(
+    plaintext_ballot: PlaintextBallot,
+    internal_manifest: InternalManifest,
+    context: CiphertextElectionContext,
+    max_workers: Optional[int] = None,
+    device: Optional[EncryptionDevice] = None
+) -> Optional[CiphertextBallot]:
+    """
+    Encrypt a single ballot for an election context that is already built.
     
-    # Create encryption device and mediator
-    device = EncryptionDevice(device_id=1, session_id=1, launch_code=1, location="polling-place")
-    encrypter = EncryptionMediator(internal_manifest, context, device)
+    Args:
+        plaintext_ballot: The plaintext ballot to encrypt
+        internal_manifest: Internal manifest of the election
+        context: Election context
+        max_workers: 1 encrypts in-process, more splits the contests and selections across
+            the shared encryption pool (default: the pool once the ballot has
+            PARALLEL_ENCRYPT_MIN_SELECTIONS)
+        device: Device session to chain the ballot code to (default: a fresh default device)
+        
+    Returns:
+        Encrypted ballot or None if encryption fails
+    """
+    # Large ballots are split into contests and selection chunks across a process pool;
+    # every nonce derives from the ballot nonce, so the result is the same as in-process
+    if max_workers is None:
+        max_workers = ENCRYPT_MAX_WORKERS
+    if max_workers is None:
+        selection_total = sum(
+            len(contest.ballot_selections) + len(contest.placeholder_selections)
+            for contest in internal_manifest.get_contests_for(plaintext_ballot.style_id)
+        )
+        max_workers = Scheduler.cpu_count() if selection_total >= PARALLEL_ENCRYPT_MIN_SELECTIONS else 1
+    executor = _pool.get() if max_workers > 1 else None
     
-    # Encrypt the ballot
-    encrypted_ballot = encrypter.encrypt(plaintext_ballot)
+    if device is None:
+        # Create encryption device and mediator
+        encrypter = EncryptionMediator(internal_manifest, context, DEFAULT_DEVICE)
+        encrypted_ballot = encrypter.encrypt(plaintext_ballot, executor=executor)
+    else:
+        # Encrypt the body, then link its code to the head of the device's chain
+        encrypted_ballot = encrypt_ballot_body(
+            plaintext_ballot, internal_manifest, context, internal_manifest.manifest_hash, executor=executor
+        )
+        if encrypted_ballot:
+            encrypted_ballot = get_device_session(device, context).link([encrypted_ballot])[0]
     if encrypted_ballot:
         return get_optional(encrypted_ballot)
     return None
+
+
+def device_from_dict(device: Optional[Dict]) -> Optional[EncryptionDevice]:
+    """
+    Build the encryption device named by a request.
+    
+    Raises:
+        ValueError: If the device is not a dictionary with integer device_id, session_id
+            and launch_code and a string location
+    """
+    if device is None:
+        return None
+    if not isinstance(device, dict):
+        raise ValueError('device must be an object with device_id, session_id, launch_code and location')
+    try:
+        return EncryptionDevice(
+            device_id=int(device['device_id']),
+            session_id=int(device['session_id']),
+            launch_code=int(device['launch_code']),
+            location=str(device['location'])
+        )
+    except (KeyError, TypeError, ValueError) as e:
+        raise ValueError(f'Invalid device: {e}')
+
+
+def create_encrypted_ballots_service(
+    party_names: List[str],
+    candidate_names: List[str],
+    ballots: List[Dict],
+    joint_public_key: str,
+    commitment_hash: str,
+    number_of_guardians: int,
+    quorum: int,
+    create_plaintext_ballot_func,
+    create_election_manifest_func,
+    generate_ballot_hash_func,
+    max_choices: int = 1,
+    compact: bool = False,
+    device: Optional[Dict] = None,
+    max_workers: Optional[int] = None,
+    contest_proofs: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Service function to encrypt a batch of ballots from one device.
+    
+    The ballot bodies are encrypted in parallel, one ballot per pool task; their codes
+    are then chained in request order, so the result is the chain that encrypting them
+    one after another would give.
+    
+    Args:
+        party_names: List of party names
+        candidate_names: List of all candidate names in the election
+        ballots: List of {'ballot_id', 'candidate_names_to_vote'} dictionaries
+        joint_public_key: Joint public key as string
+        commitment_hash: Commitment hash as string
+        number_of_guardians: Number of guardians
+        quorum: Quorum for the election
+        create_plaintext_ballot_func: Function to create plaintext ballot
+        create_election_manifest_func: Function to create election manifest
+        generate_ballot_hash_func: Function to generate ballot hash
+        max_choices: Maximum number of candidates voter can select (default 1)
+        compact: Also return each ballot as a sealed compact ballot for storage
+        device: Encryption device whose chain the ballots extend across requests
+            (default: a fresh default device chaining this batch only)
+        max_workers: 1 encrypts in-process, more encrypts the ballot bodies on the shared
+            encryption pool (default: the pool from PARALLEL_ENCRYPT_MIN_BALLOTS ballots)
+        contest_proofs: 'placeholder' or 'range' proofs of the contest selection limits
+            (default: EG_CONTEST_PROOFS)
+        
+    Returns:
+        Dictionary with one {'ballot_id', 'encrypted_ballot', 'ballot_hash'} per ballot, in order
+        
+    Raises:
+        ValueError: If no ballots are given, a ballot is malformed or fails to encrypt, or
+            compact is set without a compact ballot key
+    """
+    if not ballots:
+        raise ValueError('No ballots to encrypt.')
+    if compact:
+        compact_ballot_key()
+    encryption_device = device_from_dict(device)
+    
+    plaintext_ballots = []
+    for index, ballot in enumerate(ballots):
+        if not isinstance(ballot, dict) or 'ballot_id' not in ballot or 'candidate_names_to_vote' not in ballot:
+            raise ValueError(f'Ballot {index} needs ballot_id and candidate_names_to_vote')
+        plaintext_ballots.append(create_plaintext_ballot_func(
+            party_names, candidate_names, ballot['candidate_names_to_vote'], ballot['ballot_id'], max_choices
+        ))
+    
+    cache = get_manifest_cache()
+    internal_manifest, context = cache.get_or_create_context(
+        party_names, candidate_names,
+        int(joint_public_key), int(commitment_hash),
+        number_of_guardians, quorum,
+        create_election_manifest_func,
+        max_choices,
+        contest_proofs
+    )
+    
+    if max_workers is None:
+        max_workers = ENCRYPT_MAX_WORKERS
+    if max_workers is None:
+        max_workers = Scheduler.cpu_count() if len(plaintext_ballots) >= PARALLEL_ENCRYPT_MIN_BALLOTS else 1
+    # One pool task per ballot, so the batch size bounds the tasks; the pool keeps its size
+    executor = _pool.get() if max_workers > 1 and len(plaintext_ballots) > 1 else None
+    
+    bodies = encrypt_ballot_bodies(plaintext_ballots, internal_manifest, context, executor)
+    for plaintext_ballot, body in zip(plaintext_ballots, bodies):
+        if body is None:
+            raise ValueError(f'Failed to encrypt ballot {plaintext_ballot.object_id}')
+    
+    # The only sequential step: one hash per ballot to link the codes
+    if encryption_device is None:
+        encrypted_ballots = EncryptionMediator(internal_manifest, context, DEFAULT_DEVICE).link(bodies)
+    else:
+        encrypted_ballots = get_device_session(encryption_device, context).link(bodies)
+    
+    results = []
+    for plaintext_ballot, encrypted_ballot in zip(plaintext_ballots, encrypted_ballots):
+        result = {
+            'ballot_id': encrypted_ballot.object_id,
+            'encrypted_ballot': to_binary_transport(encrypted_ballot),
+            'ballot_hash': generate_ballot_hash_func(encrypted_ballot)
+        }
+        if compact:
+            result['compact_ballot'] = make_sealed_compact_ballot(encrypted_ballot, plaintext_ballot)
+        results.append(result)
+    return {'ballots': results}
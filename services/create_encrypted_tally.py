@@ -5,7 +5,7 @@ Service for creating encrypted tally from ballots.
 #!/usr/bin/env python
 
 from flask import Flask, request, jsonify
-from typing import Dict, List, Optional, Tuple, Any
+from typing import Dict, List, Optional, Set, Tuple, Any, Union
 import random
 from datetime import datetime
 import uuid
@@ -36,6 +36,7 @@ from electionguard.guardian import Guardian
 from electionguard.key_ceremony_mediator import KeyCeremonyMediator
 from electionguard.key_ceremony import ElectionKeyPair, ElectionPublicKey
 from electionguard.ballot_box import BallotBox, get_ballots, submit_ballot
+from electionguard.ballot_validator import ballot_is_valid_for_style
 from electionguard.elgamal import ElGamalPublicKey, ElGamalSecretKey, ElGamalCiphertext
 from electionguard.group import ElementModQ, ElementModP, g_pow_p, int_to_p, int_to_q
 from electionguard.manifest import (
@@ -53,7 +54,6 @@ from electionguard.manifest import (
     ContactInformation,
     ReportingUnitType
 )
-from electionguard_tools.helpers.election_builder import ElectionBuilder
 from electionguard.tally import (
     tally_ballots,
     CiphertextTally,
@@ -77,6 +77,10 @@ from electionguard.decryption import (
     compute_lagrange_coefficients_for_guardians as compute_lagrange_coeffs
 )
 from manifest_cache import get_manifest_cache
+from ballot_index import BallotIdIndex, get_ballot_index
+from checkpoints import CHECKPOINT_INTERVAL, checkpoint_key, get_checkpoint_store
+from services.compact_ballot import expand_compact_ballots, open_compact_ballots
+from msgpack_stream import StreamedArray
 
 
 
@@ -123,7 +127,14 @@ def create_encrypted_tally_service(
     quorum: int,
     create_election_manifest_func,
     ciphertext_tally_to_raw_func,
-    max_choices: int = 1
+    max_choices: int = 1,
+    stream: bool = False,
+    compact_ballots: Optional[List[str]] = None,
+    manifest_id: Optional[str] = None,
+    checkpoint_id: Optional[str] = None,
+    tally_id: Optional[str] = None,
+    reset_ballot_index: bool = False,
+    contest_proofs: Optional[str] = None
 ) -> Dict[str, Any]:
     """
     Service function to tally encrypted ballots.
@@ -138,21 +149,35 @@ def create_encrypted_tally_service(
         quorum: Quorum for the election
         create_election_manifest_func: Function to create election manifest
         ciphertext_tally_to_raw_func: Function to serialize ciphertext tally
+        stream: Return submitted ballots as a StreamedArray serialized on demand
+        compact_ballots: Sealed compact ballots, expanded server-side and tallied
+            together with encrypted_ballots
+        manifest_id: Registered manifest of the election, used instead of the
+            party and candidate names
+        checkpoint_id: Name of this tally run; its progress is checkpointed and a
+            retry with the same id and ballots resumes from the last checkpoint
+        tally_id: Name of the tally the ballots are added to; ballots already admitted
+            to it by an earlier request (chunk) are rejected
+        reset_ballot_index: Forget the ballots admitted to tally_id before, to tally
+            them again
+        contest_proofs: Contest proofs the ballots must carry, 'placeholder' or 'range'
+            (default: EG_CONTEST_PROOFS)
         
     Returns:
-        Dictionary containing the tally results
+        Dictionary containing the tally results and the ids of ballots rejected
+        as duplicates of ballots already tallied for this tally
         
     Raises:
-        ValueError: If no ballots provided or tally fails
+        ValueError: If no ballots provided, every ballot was already tallied or tally fails
     """
-    if not encrypted_ballots:
+    if not encrypted_ballots and not compact_ballots:
         raise ValueError('No ballots to tally. Provide encrypted ballots.')
     
     # Convert string inputs to integers for internal processing
     joint_public_key_int = int(joint_public_key)
     commitment_hash_int = int(commitment_hash)
     
-    ciphertext_tally_json, submitted_ballots_json = tally_encrypted_ballots(
+    ciphertext_tally_json, submitted_ballots_json, rejected_ballot_ids = tally_encrypted_ballots(
         party_names,
         candidate_names,
         joint_public_key_int,
@@ -162,12 +187,20 @@ def create_encrypted_tally_service(
         quorum,
         create_election_manifest_func,
         ciphertext_tally_to_raw_func,
-        max_choices=max_choices
+        max_choices=max_choices,
+        stream=stream,
+        compact_ballots_json=compact_ballots,
+        manifest_id=manifest_id,
+        checkpoint_id=checkpoint_id,
+        tally_id=tally_id,
+        reset_ballot_index=reset_ballot_index,
+        contest_proofs=contest_proofs
     )
     
     return {
         'ciphertext_tally': ciphertext_tally_json,
-        'submitted_ballots': submitted_ballots_json
+        'submitted_ballots': submitted_ballots_json,
+        'rejected_ballot_ids': rejected_ballot_ids
     }
 
 
@@ -181,10 +214,26 @@ def tally_encrypted_ballots(
     quorum: int,
     create_election_manifest_func,
     ciphertext_tally_to_raw_func,
-    max_choices: int = 1
-) -> Tuple[Dict, List[Dict]]:
+    max_choices: int = 1,
+    stream: bool = False,
+    compact_ballots_json: Optional[List[str]] = None,
+    manifest_id: Optional[str] = None,
+    checkpoint_id: Optional[str] = None,
+    tally_id: Optional[str] = None,
+    reset_ballot_index: bool = False,
+    contest_proofs: Optional[str] = None
+) -> Tuple[Dict, Union[List[Dict], StreamedArray], List[str]]:
     """
     Tally encrypted ballots.
+
+    Ballot ids are checked for duplicates first; a ballot whose id appears earlier in the
+    request, or with a tally_id was admitted to that tally by an earlier chunk, is left
+    out of the tally and reported as rejected. A request whose ballots are all rejected
+    fails instead of returning an empty tally.
+
+    With a checkpoint_id the ids admitted to the index belong to the run: they are kept
+    when the request fails, and a retry of the run admits them again and only
+    accumulates the ballots its last checkpoint does not contain.
     
     Args:
         party_names: List of party names
@@ -196,9 +245,21 @@ def tally_encrypted_ballots(
         quorum: Quorum for the election
         create_election_manifest_func: Function to create election manifest
         ciphertext_tally_to_raw_func: Function to serialize ciphertext tally
+        stream: Serialize submitted ballots lazily while the response is being sent
+        compact_ballots_json: Sealed compact ballots; only the ones admitted by the
+            ballot id index are expanded
+        manifest_id: Registered manifest of the election; its ballots are checked
+            against their ballot style before they are tallied
+        checkpoint_id: Name of this tally run, used to checkpoint and resume it
+        tally_id: Name of the tally whose ballot id index the ballots are checked against
+        reset_ballot_index: Empty the index of tally_id before checking the ballots
+        contest_proofs: Contest proofs the ballots must carry (default: EG_CONTEST_PROOFS)
         
     Returns:
-        Tuple of (tally_json, submitted_ballots_json)
+        Tuple of (tally_json, submitted_ballots_json, rejected_ballot_ids)
+        
+    Raises:
+        ValueError: If every ballot of the request was already admitted to the tally
     """
     print(f"  \ud83d\udd0d SERVICE: create_encrypted_tally_service started")
     
@@ -223,22 +284,179 @@ def tally_encrypted_ballots(
                 encrypted_ballots.append(from_binary_transport(CiphertextBallot, encrypted_ballot_json))
         else:
             raise ValueError(f"Unexpected encrypted ballot format: {type(encrypted_ballot_json)}")
+    # Compact ballots are only opened here; the expensive re-encryption waits for the duplicate check
+    compact_ballots = open_compact_ballots(compact_ballots_json or [])
     deserialize_elapsed = time.time() - deserialize_start
     print(f"    \u23f1\ufe0f  Ballot deserialization: {deserialize_elapsed*1000:.2f}ms")
     
     # Build context (use cache to avoid expensive recreation)
     context_start = time.time()
     cache = get_manifest_cache()
-    internal_manifest, context = cache.get_or_create_context(
-        party_names, candidate_names,
-        joint_public_key_json, commitment_hash_json,
-        number_of_guardians, quorum,
-        create_election_manifest_func,
-        max_choices=max_choices
-    )
+    if manifest_id is not None:
+        if compact_ballots:
+            raise ValueError('Compact ballots are not supported for registered manifests')
+        internal_manifest, context = cache.get_or_create_registered_context(
+            manifest_id, joint_public_key_json, commitment_hash_json, number_of_guardians, quorum,
+            contest_proofs=contest_proofs
+        )
+        # Ballots of a full manifest may come from other systems: check them against their style
+        for ballot in encrypted_ballots:
+            try:
+                valid = ballot_is_valid_for_style(ballot, internal_manifest)
+            except IndexError:  # unknown ballot style
+                valid = False
+            if not valid:
+                raise ValueError(f'Ballot {ballot.object_id} does not match ballot style {ballot.style_id}')
+    else:
+        internal_manifest, context = cache.get_or_create_context(
+            party_names, candidate_names,
+            joint_public_key_json, commitment_hash_json,
+            number_of_guardians, quorum,
+            create_election_manifest_func,
+            max_choices=max_choices,
+            contest_proofs=contest_proofs
+        )
     context_elapsed = time.time() - context_start
     print(f"    \u23f1\ufe0f  Context building: {context_elapsed*1000:.2f}ms")
     
+    # Reject ballots already tallied, within the request or across the chunks of a tally
+    dedup_start = time.time()
+    if tally_id is None:
+        ballot_index = BallotIdIndex('request', directory=None)
+    else:
+        ballot_index = get_ballot_index(context.crypto_extended_base_hash.to_hex(), str(tally_id))
+        if reset_ballot_index:
+            ballot_index.reset()
+    ballot_ids = [ballot.object_id for ballot in encrypted_ballots]
+    ballot_ids += [compact.compact_plaintext_ballot.object_id for compact in compact_ballots]
+    checkpoint = None
+    if checkpoint_id is not None:
+        checkpoint = _load_tally_checkpoint(context, str(checkpoint_id), ballot_ids)
+        admitted = _admit_for_run(ballot_index, ballot_ids, set(checkpoint['state']['admitted']))
+    else:
+        admitted = ballot_index.admit(ballot_ids)
+    rejected_ballot_ids = [ballot_id for ballot_id, ok in zip(ballot_ids, admitted) if not ok]
+    if ballot_ids and not any(admitted):
+        raise ValueError(
+            f"All {len(ballot_ids)} ballots were already tallied for tally '{tally_id}'; "
+            f"send reset_ballot_index to tally them again"
+        )
+    admitted_ids = [ballot_id for ballot_id, ok in zip(ballot_ids, admitted) if ok]
+    compact_admitted = admitted[len(encrypted_ballots):]
+    encrypted_ballots = [ballot for ballot, ok in zip(encrypted_ballots, admitted) if ok]
+    compact_ballots = [compact for compact, ok in zip(compact_ballots, compact_admitted) if ok]
+    if checkpoint is not None:
+        checkpoint['state']['admitted'] = sorted(set(checkpoint['state']['admitted']).union(admitted_ids))
+        get_checkpoint_store().save(checkpoint['key'], checkpoint['state'])
+    dedup_elapsed = time.time() - dedup_start
+    print(f"    \u23f1\ufe0f  Duplicate check: {dedup_elapsed*1000:.2f}ms ({len(rejected_ballot_ids)} rejected)")
+    expand_elapsed = 0.0
+    try:
+        if compact_ballots:
+            # Deterministic re-encryption reproduces the ballots exactly as they were cast
+            expand_start = time.time()
+            encrypted_ballots += expand_compact_ballots(
+                compact_ballots,
+                party_names, candidate_names,
+                joint_public_key_json, commitment_hash_json,
+                number_of_guardians, quorum,
+                create_election_manifest_func,
+                max_choices=max_choices,
+                contest_proofs=contest_proofs
+            )
+            expand_elapsed = time.time() - expand_start
+            print(f"    \u23f1\ufe0f  Compact ballot expansion: {expand_elapsed*1000:.2f}ms ({len(compact_ballots)} ballots)")
+        return _tally_admitted_ballots(
+            encrypted_ballots, rejected_ballot_ids, internal_manifest, context,
+            ciphertext_tally_to_raw_func, stream,
+            deserialize_elapsed + context_elapsed + dedup_elapsed + expand_elapsed,
+            checkpoint,
+        )
+    except BaseException:
+        # Nothing was tallied, so a retry of this request must not be rejected;
+        # a checkpointed run keeps its ballots for the retry that resumes it
+        if checkpoint is None:
+            ballot_index.release(admitted_ids)
+        raise
+
+
+def _load_tally_checkpoint(
+    context: CiphertextElectionContext,
+    checkpoint_id: str,
+    ballot_ids: List[str],
+) -> Dict[str, Any]:
+    """
+    Load the last checkpoint of a tally run, or start a new one.
+
+    Raises:
+        ValueError: If the checkpoint contains ballots that are not in this request
+    """
+    key = checkpoint_key('tally', context.crypto_extended_base_hash.to_hex(), checkpoint_id)
+    state = get_checkpoint_store().load(key)
+    if state is None:
+        state = {'admitted': [], 'cast_ballot_ids': [], 'spoiled_ballot_ids': [], 'contests': None}
+    missing = set(state['cast_ballot_ids']).union(state['spoiled_ballot_ids']).difference(ballot_ids)
+    if missing:
+        raise ValueError(
+            f"Checkpoint '{checkpoint_id}' was made for other ballots ({len(missing)} tallied ballots are missing)"
+        )
+    return {'key': key, 'state': state}
+
+
+def _admit_for_run(ballot_index, ballot_ids: List[str], run_ids: Set[str]) -> List[bool]:
+    """Admit ballot ids, accepting once each id the run admitted before."""
+    new_admitted = iter(ballot_index.admit([ballot_id for ballot_id in ballot_ids if ballot_id not in run_ids]))
+    seen: Set[str] = set()
+    admitted = []
+    for ballot_id in ballot_ids:
+        if ballot_id in run_ids:
+            admitted.append(ballot_id not in seen)
+            seen.add(ballot_id)
+        else:
+            admitted.append(next(new_admitted))
+    return admitted
+
+
+def _tally_with_checkpoints(
+    tally: CiphertextTally,
+    submitted_ballots: List[SubmittedBallot],
+    checkpoint: Dict[str, Any],
+) -> None:
+    """Accumulate the ballots the checkpoint does not contain, saving a checkpoint every interval."""
+    state = checkpoint['state']
+    if state['contests'] is not None:
+        tally.contests = {
+            contest_id: from_raw(CiphertextTallyContest, json.dumps(contest_raw))
+            for contest_id, contest_raw in state['contests'].items()
+        }
+        tally.cast_ballot_ids = set(state['cast_ballot_ids'])
+        tally.spoiled_ballot_ids = set(state['spoiled_ballot_ids'])
+    remaining = [ballot for ballot in submitted_ballots if ballot not in tally]
+    print(f"    \u267b\ufe0f  Checkpoint: {len(tally)} ballots resumed, {len(remaining)} to tally")
+
+    store = get_checkpoint_store()
+    for start in range(0, len(remaining), CHECKPOINT_INTERVAL):
+        chunk = remaining[start:start + CHECKPOINT_INTERVAL]
+        tally.batch_append([(ballot.object_id, ballot) for ballot in chunk], should_validate=False)
+        state['cast_ballot_ids'] = sorted(tally.cast_ballot_ids)
+        state['spoiled_ballot_ids'] = sorted(tally.spoiled_ballot_ids)
+        state['contests'] = {
+            contest_id: json.loads(to_raw(contest)) for contest_id, contest in tally.contests.items()
+        }
+        store.save(checkpoint['key'], state)
+
+
+def _tally_admitted_ballots(
+    encrypted_ballots: List[Union[CiphertextBallot, SubmittedBallot]],
+    rejected_ballot_ids: List[str],
+    internal_manifest: InternalManifest,
+    context: CiphertextElectionContext,
+    ciphertext_tally_to_raw_func,
+    stream: bool,
+    elapsed_so_far: float,
+    checkpoint: Optional[Dict[str, Any]] = None,
+) -> Tuple[Dict, Union[List[Dict], StreamedArray], List[str]]:
+    """Cast and tally the ballots that passed the duplicate check."""
     # Submit ballots - cast all ballots (skip proof re-validation: ballots were just created by this API)
     cast_start = time.time()
     ballot_store = DataStore()
@@ -247,7 +465,11 @@ def tally_encrypted_ballots(
     for ballot in encrypted_ballots:
         # Use submit_ballot directly to bypass expensive proof re-verification
         # (ballots just came from create_encrypted_ballot, already proved valid)
-        submitted = submit_ballot(ballot, BallotBoxState.CAST)
+        if isinstance(ballot, SubmittedBallot):
+            # Expanded compact ballots already carry their ballot box state
+            submitted = ballot
+        else:
+            submitted = submit_ballot(ballot, BallotBoxState.CAST)
         ballot_store.set(submitted.object_id, submitted)
         submitted_ballots.append(submitted)
     cast_elapsed = time.time() - cast_start
@@ -256,7 +478,10 @@ def tally_encrypted_ballots(
     # Tally the ballots — use should_validate=False to skip proof re-verification
     tally_start = time.time()
     tally = CiphertextTally("election-results", internal_manifest, context)
-    tally.batch_append(ballot_store, should_validate=False)
+    if checkpoint is None:
+        tally.batch_append(ballot_store, should_validate=False)
+    else:
+        _tally_with_checkpoints(tally, submitted_ballots, checkpoint)
     ciphertext_tally = tally
     tally_elapsed = time.time() - tally_start
     print(f"    \u23f1\ufe0f  Tally computation: {tally_elapsed*1000:.2f}ms")
@@ -265,11 +490,16 @@ def tally_encrypted_ballots(
     serialize_start = time.time()
     ciphertext_tally_json = ciphertext_tally_to_raw_func(ciphertext_tally)
     # Return plain dicts, not JSON strings (msgpack handles dicts natively)
-    submitted_ballots_json = [json.loads(to_raw(submitted_ballot)) for submitted_ballot in submitted_ballots]
+    serialized_ballots = (json.loads(to_raw(submitted_ballot)) for submitted_ballot in submitted_ballots)
+    if stream:
+        # Each ballot is converted only when the response writer reaches it
+        submitted_ballots_json = StreamedArray(len(submitted_ballots), serialized_ballots)
+    else:
+        submitted_ballots_json = list(serialized_ballots)
     serialize_elapsed = time.time() - serialize_start
     print(f"    ⏱️  Result conversion: {serialize_elapsed*1000:.2f}ms")
     
-    total_service_time = deserialize_elapsed + context_elapsed + cast_elapsed + tally_elapsed + serialize_elapsed
+    total_service_time = elapsed_so_far + cast_elapsed + tally_elapsed + serialize_elapsed
     print(f"  \u2705 SERVICE COMPLETE: {total_service_time*1000:.2f}ms total")
     
-    return ciphertext_tally_json, submitted_ballots_json
+    return ciphertext_tally_json, submitted_ballots_json, rejected_ballot_ids
@@ -5,7 +5,7 @@ Service for creating partial decryption shares for a guardian.
 #!/usr/bin/env python
 
 from flask import Flask, request, jsonify
-from typing import Dict, List, Optional, Tuple, Any
+from typing import Callable, Dict, List, Optional, Tuple, Any
 import random
 from datetime import datetime
 import uuid
@@ -33,7 +33,7 @@ from electionguard.election_polynomial import (
 from electionguard.encrypt import EncryptionDevice, EncryptionMediator
 from electionguard.guardian import Guardian
 from electionguard.key_ceremony_mediator import KeyCeremonyMediator
-from electionguard.key_ceremony import ElectionKeyPair, ElectionPublicKey
+from electionguard.key_ceremony import ElectionDecryptionKey, ElectionKeyPair, ElectionPublicKey
 from electionguard.ballot_box import BallotBox, get_ballots
 from electionguard.elgamal import ElGamalPublicKey, ElGamalSecretKey, ElGamalCiphertext
 from electionguard.group import ElementModQ, ElementModP, g_pow_p, int_to_p, int_to_q
@@ -52,7 +52,6 @@ from electionguard.manifest import (
     ContactInformation,
     ReportingUnitType
 )
-from electionguard_tools.helpers.election_builder import ElectionBuilder
 from electionguard.tally import (
     tally_ballots,
     CiphertextTally,
@@ -62,7 +61,7 @@ from electionguard.tally import (
 )
 from electionguard.type import BallotId, GuardianId
 from electionguard.utils import get_optional
-from electionguard.election_polynomial import ElectionPolynomial, Coefficient, SecretCoefficient, PublicCommitment, generate_polynomial
+from electionguard.election_polynomial import ElectionPolynomial, Coefficient, SecretCoefficient, PublicCommitment
 from electionguard.schnorr import SchnorrProof
 from electionguard.elgamal import ElGamalKeyPair, ElGamalPublicKey, ElGamalSecretKey
 from electionguard.hash import hash_elems
@@ -76,8 +75,103 @@ from electionguard.decryption import (
     compute_lagrange_coefficients_for_guardians as compute_lagrange_coeffs
 )
 from manifest_cache import get_manifest_cache
+from checkpoints import CHECKPOINT_INTERVAL, checkpoint_key, get_checkpoint_store
+from services.spoiled_ballots import select_ballot_range, submitted_ballot_views
 
 
+def election_public_key_for_decryption(
+    election_key: ElectionDecryptionKey,
+    election_public_key_data: Optional[Any] = None
+) -> ElectionPublicKey:
+    """
+    The election public key a guardian announces with its decryption shares.
+    
+    Uses the guardian's stored election public key (from setup_guardians) when given,
+    otherwise the bare key with no commitments or proofs.
+    
+    Raises:
+        ValueError: If the stored election public key belongs to another guardian or key
+    """
+    if election_public_key_data is None:
+        return ElectionPublicKey(
+            election_key.owner_id,
+            election_key.sequence_order,
+            election_key.key_pair.public_key,
+            [],
+            []
+        )
+    if isinstance(election_public_key_data, dict):
+        election_public_key = from_raw(ElectionPublicKey, json.dumps(election_public_key_data))
+    else:
+        election_public_key = from_binary_transport(ElectionPublicKey, election_public_key_data)
+    if (election_public_key.owner_id != election_key.owner_id
+            or election_public_key.key != election_key.key_pair.public_key):
+        raise ValueError(f"Election public key does not match the key of guardian {election_key.owner_id}")
+    return election_public_key
+
+
+def tally_digest(ciphertext_tally: CiphertextTally) -> str:
+    """Digest of a ciphertext tally's contests, naming the tally in decryption checkpoints."""
+    return hashlib.blake2b(to_raw(ciphertext_tally.publish()).encode('utf-8'), digest_size=16).hexdigest()
+
+
+def ballot_range_parts(ballot_id_from: Optional[str], ballot_id_to: Optional[str]) -> List[str]:
+    """Checkpoint run parts naming a ballot id range, so ranges run apart keep apart checkpoints."""
+    if ballot_id_from is None and ballot_id_to is None:
+        return []
+    return [f"{ballot_id_from or ''}..{ballot_id_to or ''}"]
+
+
+def compute_shares_with_checkpoint(
+    checkpoint_id: Optional[str],
+    run_parts: List[str],
+    compute_tally_share: Callable[[], Any],
+    compute_ballot_shares: Callable[[List[SubmittedBallot]], Dict[str, Any]],
+    ballots: List[SubmittedBallot]
+) -> Tuple[Optional[str], Dict[str, Optional[str]]]:
+    """
+    Compute and serialize a guardian's tally share and ballot shares.
+    
+    With a checkpoint_id the tally share and every EG_CHECKPOINT_INTERVAL spoiled ballots'
+    shares are checkpointed under the run (checkpoint_id and run_parts), and a retry of the
+    run only computes the shares its last checkpoint does not contain.
+    
+    Args:
+        checkpoint_id: Name of the decryption run, or None to compute everything at once
+        run_parts: Election, tally and guardian(s) of the run
+        compute_tally_share: Computes the tally share
+        compute_ballot_shares: Computes the shares of a list of ballots, by ballot id
+        ballots: Submitted ballots; only spoiled ballots have shares
+        
+    Returns:
+        Tuple of (serialized tally share, serialized ballot shares by ballot id)
+    """
+    def serialize(share: Any) -> Optional[str]:
+        return to_binary_transport(share) if share else None
+
+    if checkpoint_id is None:
+        ballot_shares = compute_ballot_shares(ballots)
+        return serialize(compute_tally_share()), {
+            ballot_id: serialize(share) for ballot_id, share in ballot_shares.items()
+        }
+
+    store = get_checkpoint_store()
+    key = checkpoint_key('decryption', *run_parts, str(checkpoint_id))
+    state = store.load(key) or {'ballot_shares': {}}
+    if 'tally_share' not in state:
+        state['tally_share'] = serialize(compute_tally_share())
+        store.save(key, state)
+    remaining = [
+        ballot for ballot in ballots
+        if ballot.state == BallotBoxState.SPOILED and ballot.object_id not in state['ballot_shares']
+    ]
+    print(f"  ♻️ Checkpoint: {len(state['ballot_shares'])} ballot shares resumed, {len(remaining)} to compute")
+    for start in range(0, len(remaining), CHECKPOINT_INTERVAL):
+        shares = compute_ballot_shares(remaining[start:start + CHECKPOINT_INTERVAL])
+        state['ballot_shares'].update((ballot_id, serialize(share)) for ballot_id, share in shares.items())
+        store.save(key, state)
+    return state['tally_share'], state['ballot_shares']
+
 
 def create_partial_decryption_service(
     party_names: List[str],
@@ -96,7 +190,10 @@ def create_partial_decryption_service(
     create_election_manifest_func,
     raw_to_ciphertext_tally_func,
     compute_ballot_shares_func,
-    max_choices: int = 1
+    max_choices: int = 1,
+    checkpoint_id: Optional[str] = None,
+    ballot_id_from: Optional[str] = None,
+    ballot_id_to: Optional[str] = None
 ) -> Dict[str, Any]:
     """
     Service function to compute decryption shares for a single guardian.
@@ -108,7 +205,7 @@ def create_partial_decryption_service(
         guardian_data: Single guardian data dictionary
         private_key: Single private key data dictionary for the guardian
         public_key: Single public key data dictionary for the guardian
-        polynomial: Optional polynomial data dictionary for the guardian (can be None)
+        polynomial: Ignored; kept for callers that still send it (decryption needs no polynomial)
         ciphertext_tally_json: Serialized ciphertext tally
         submitted_ballots_json: List of serialized submitted ballots
         joint_public_key: Joint public key as string
@@ -118,6 +215,10 @@ def create_partial_decryption_service(
         create_election_manifest_func: Function to create election manifest
         raw_to_ciphertext_tally_func: Function to deserialize ciphertext tally
         compute_ballot_shares_func: Function to compute ballot shares
+        checkpoint_id: Name of this decryption run; its progress is checkpointed and a
+            retry with the same id resumes from the last checkpoint
+        ballot_id_from: Only compute ballot shares for ballot ids >= this one
+        ballot_id_to: Only compute ballot shares for ballot ids < this one
         
     Returns:
         Dictionary containing the decryption shares
@@ -146,7 +247,10 @@ def create_partial_decryption_service(
         create_election_manifest_func,
         raw_to_ciphertext_tally_func,
         compute_ballot_shares_func,
-        max_choices=max_choices
+        max_choices=max_choices,
+        checkpoint_id=checkpoint_id,
+        ballot_id_from=ballot_id_from,
+        ballot_id_to=ballot_id_to
     )
     
     return {
@@ -173,7 +277,10 @@ def compute_guardian_decryption_shares(
     create_election_manifest_func,
     raw_to_ciphertext_tally_func,
     compute_ballot_shares_func,
-    max_choices: int = 1
+    max_choices: int = 1,
+    checkpoint_id: Optional[str] = None,
+    ballot_id_from: Optional[str] = None,
+    ballot_id_to: Optional[str] = None
 ) -> Dict[str, Any]:
     """
     Compute decryption shares for a single guardian.
@@ -185,7 +292,7 @@ def compute_guardian_decryption_shares(
         guardian_data: Single guardian data dictionary
         private_key: Single private key data dictionary for the guardian
         public_key: Single public key data dictionary for the guardian
-        polynomial: Optional polynomial data dictionary for the guardian (can be None - will generate minimal polynomial)
+        polynomial: Ignored; kept for callers that still send it (decryption needs no polynomial)
         ciphertext_tally_json: Serialized ciphertext tally
         submitted_ballots_json: List of serialized submitted ballots
         joint_public_key_json: Joint public key as integer
@@ -195,6 +302,9 @@ def compute_guardian_decryption_shares(
         create_election_manifest_func: Function to create election manifest
         raw_to_ciphertext_tally_func: Function to deserialize ciphertext tally
         compute_ballot_shares_func: Function to compute ballot shares
+        checkpoint_id: Name of this decryption run, used to checkpoint and resume it
+        ballot_id_from: Only compute ballot shares for ballot ids >= this one
+        ballot_id_to: Only compute ballot shares for ballot ids < this one
         
     Returns:
         Dictionary containing the decryption shares
@@ -203,8 +313,9 @@ def compute_guardian_decryption_shares(
         ValueError: If guardian data is invalid
         
     Note:
-        When polynomial is None, a minimal polynomial will be generated using the private key.
-        This is sufficient for partial decryption when all guardians are present.
+        The returned guardian public key is the guardian's stored election public key when
+        guardian_data carries one, otherwise the bare public key without commitments; the
+        combining step only reads the owner, sequence order and key of present guardians.
     """
     # Validate that guardian_id matches the guardian_data
     if guardian_data['id'] != guardian_id:
@@ -214,33 +325,14 @@ def compute_guardian_decryption_shares(
     public_key_value = int_to_p(int(public_key['public_key']))
     private_key_value = int_to_q(int(private_key['private_key']))
     
-    # Handle polynomial data - create minimal polynomial if not provided
-    if polynomial is None:
-        # Create a minimal polynomial with the private key as the first coefficient
-        # This is sufficient for partial decryption when all guardians are present
-        polynomial_obj = generate_polynomial(quorum)
-        # Replace the first coefficient with the actual private key
-        polynomial_obj.coefficients[0] = Coefficient(
-            private_key_value,
-            public_key_value,
-            polynomial_obj.coefficients[0].proof  # Keep the existing proof structure
-        )
-    else:
-        # Handle polynomial data - binary deserialization
-        polynomial_data = polynomial['polynomial']
-        if isinstance(polynomial_data, dict):
-            # Already deserialized, convert back to JSON string for from_raw
-            polynomial_obj = from_raw(ElectionPolynomial, json.dumps(polynomial_data))
-        else:
-            # It's a binary string (base64), deserialize from binary
-            polynomial_obj = from_binary_transport(ElectionPolynomial, polynomial_data)
-    
-    # Create election key pair for this guardian
-    election_key = ElectionKeyPair(
+    # Partial decryption only needs the key pair; the polynomial is neither parsed nor generated
+    election_key = ElectionDecryptionKey(
         owner_id=guardian_id,
         sequence_order=guardian_data['sequence_order'],
-        key_pair=ElGamalKeyPair(private_key_value, public_key_value),
-        polynomial=polynomial_obj
+        key_pair=ElGamalKeyPair(private_key_value, public_key_value)
+    )
+    guardian_public_key = election_public_key_for_decryption(
+        election_key, guardian_data.get('election_public_key')
     )
     
     # Use cache to avoid expensive manifest/context recreation
@@ -257,26 +349,23 @@ def compute_guardian_decryption_shares(
     manifest = cache.get_or_create_manifest(party_names, candidate_names, create_election_manifest_func, max_choices=max_choices)
     
     ciphertext_tally = raw_to_ciphertext_tally_func(ciphertext_tally_json, manifest=manifest)
-    submitted_ballots = []
-    for ballot_json in submitted_ballots_json:
-        if isinstance(ballot_json, dict):
-            submitted_ballots.append(from_raw(SubmittedBallot, json.dumps(ballot_json)))
-        else:
-            # Binary deserialization (base64)
-            submitted_ballots.append(from_binary_transport(SubmittedBallot, ballot_json))
+    # Only the spoiled ballots are deserialized in full, when their shares are computed;
+    # a ballot id range lets the shares of one guardian be split across machines
+    submitted_ballots = select_ballot_range(submitted_ballot_views(submitted_ballots_json), ballot_id_from, ballot_id_to)
 
-    # Compute shares
-    guardian_public_key = election_key.share()
-    tally_share = compute_decryption_share(election_key, ciphertext_tally, context)
-    ballot_shares = compute_ballot_shares_func(election_key, submitted_ballots, context)
-    
-    # Serialize each component using binary serialization (FAST)
+    # Compute shares, serialized using binary serialization (FAST)
+    run_parts = []
+    if checkpoint_id is not None:
+        run_parts = [context.crypto_extended_base_hash.to_hex(), tally_digest(ciphertext_tally), guardian_id]
+        run_parts += ballot_range_parts(ballot_id_from, ballot_id_to)
+    serialized_tally_share, serialized_ballot_shares = compute_shares_with_checkpoint(
+        checkpoint_id,
+        run_parts,
+        lambda: compute_decryption_share(election_key, ciphertext_tally, context),
+        lambda ballots: compute_ballot_shares_func(election_key, ballots, context),
+        submitted_ballots
+    )
     serialized_public_key = to_binary_transport(guardian_public_key) if guardian_public_key else None
-    serialized_tally_share = to_binary_transport(tally_share) if tally_share else None
-
-    serialized_ballot_shares = {}
-    for ballot_id, ballot_share in ballot_shares.items():
-        serialized_ballot_shares[ballot_id] = to_binary_transport(ballot_share) if ballot_share else None
     
     return {
         'guardian_public_key': serialized_public_key,
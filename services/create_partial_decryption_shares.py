@@ -31,7 +31,7 @@ from electionguard.election_polynomial import (
 from electionguard.encrypt import EncryptionDevice, EncryptionMediator
 from electionguard.guardian import Guardian
 from electionguard.key_ceremony_mediator import KeyCeremonyMediator
-from electionguard.key_ceremony import ElectionKeyPair, ElectionPublicKey
+from electionguard.key_ceremony import ElectionDecryptionKey, ElectionKeyPair, ElectionPublicKey
 from electionguard.ballot_box import BallotBox, get_ballots
 from electionguard.elgamal import ElGamalPublicKey, ElGamalSecretKey, ElGamalCiphertext
 from electionguard.group import ElementModQ, ElementModP, g_pow_p, int_to_p, int_to_q
@@ -50,7 +50,6 @@ from electionguard.manifest import (
     ContactInformation,
     ReportingUnitType
 )
-from electionguard_tools.helpers.election_builder import ElectionBuilder
 from electionguard.tally import (
     tally_ballots,
     CiphertextTally,
@@ -71,32 +70,42 @@ from electionguard.decryption import (
     compute_compensated_decryption_share,
     compute_compensated_decryption_share_for_ballot,
     decrypt_backup,
-    compute_lagrange_coefficients_for_guardians as compute_lagrange_coeffs
+    compute_lagrange_coefficients_for_guardians as compute_lagrange_coeffs,
+    GuardianDecryptionKey
 )
 from manifest_cache import get_manifest_cache
+from services.create_partial_decryption import election_public_key_for_decryption
+from services.spoiled_ballots import map_ballot_chunks, spoiled_ballots_of, submitted_ballot_views
+
+
+def _ballot_shares_chunk(
+    _election_keys: GuardianDecryptionKey,
+    context: CiphertextElectionContext,
+    ballots: List[SubmittedBallot]
+) -> Dict[BallotId, Optional[DecryptionShare]]:
+    return {
+        ballot.object_id: compute_decryption_share_for_ballot(_election_keys, ballot, context)
+        for ballot in ballots
+    }
 
 
 def compute_ballot_shares(
-    _election_keys: ElectionKeyPair,
+    _election_keys: GuardianDecryptionKey,
     ballots: List[SubmittedBallot],
-    context: CiphertextElectionContext
+    context: CiphertextElectionContext,
+    max_workers: Optional[int] = None
 ) -> Dict[BallotId, Optional[DecryptionShare]]:
     """Compute the decryption shares of ballots.
     
     Only computes shares for SPOILED ballots — CAST ballot shares are never
     used in the tally decryption (only spoiled ballots are individually decrypted).
+    Many spoiled ballots are split into chunks across the spoiled ballot process pool.
     """
-    from electionguard.ballot import BallotBoxState
     shares = {}
-    for ballot in ballots:
-        if ballot.state == BallotBoxState.SPOILED:
-            share = compute_decryption_share_for_ballot(
-                _election_keys,
-                ballot,
-                context,
-            )
-            shares[ballot.object_id] = share
-        # CAST ballots: skip — their individual decryption is never needed
+    for chunk_shares in map_ballot_chunks(
+        _ballot_shares_chunk, (_election_keys, context), spoiled_ballots_of(ballots), max_workers
+    ):
+        shares.update(chunk_shares)
     return shares
 
 
@@ -129,21 +138,14 @@ def compute_guardian_decryption_shares(
     public_key = int_to_p(int(guardian_info['public_key']))
     private_key = int_to_q(int(guardian_info['private_key']))
     
-    # Handle polynomial data - binary deserialization
-    polynomial_data = guardian_info['polynomial']
-    if isinstance(polynomial_data, dict):
-        # Already deserialized, convert back to JSON string for from_raw
-        polynomial = from_raw(ElectionPolynomial, json.dumps(polynomial_data))
-    else:
-        # It's a binary string (base64), deserialize from binary
-        polynomial = from_binary_transport(ElectionPolynomial, polynomial_data)
-    
-    # Create election key pair for this guardian
-    election_key = ElectionKeyPair(
+    # Partial decryption only needs the key pair; the polynomial is not parsed
+    election_key = ElectionDecryptionKey(
         owner_id=guardian_id,
         sequence_order=guardian_info['sequence_order'],
-        key_pair=ElGamalKeyPair(private_key, public_key),
-        polynomial=polynomial
+        key_pair=ElGamalKeyPair(private_key, public_key)
+    )
+    guardian_public_key = election_public_key_for_decryption(
+        election_key, guardian_info.get('election_public_key')
     )
     
     # Use stored election data for accurate setup
@@ -165,16 +167,10 @@ def compute_guardian_decryption_shares(
     # InternalManifest stores manifest only in __post_init__ (InitVar), not as attribute.
     manifest = cache.get_or_create_manifest(party_names, candidate_names, create_election_manifest_func, max_choices=max_choices)
     ciphertext_tally = raw_to_ciphertext_tally_func(ciphertext_tally_json, manifest=manifest)
-    submitted_ballots = []
-    for ballot_json in submitted_ballots_json:
-        if isinstance(ballot_json, dict):
-            submitted_ballots.append(from_raw(SubmittedBallot, json.dumps(ballot_json)))
-        else:
-            # Binary deserialization (base64)
-            submitted_ballots.append(from_binary_transport(SubmittedBallot, ballot_json))
+    # Only the spoiled ballots are deserialized in full, when their shares are computed
+    submitted_ballots = submitted_ballot_views(submitted_ballots_json)
 
     # Compute shares
-    guardian_public_key = election_key.share()
     tally_share = compute_decryption_share(election_key, ciphertext_tally, context)
     ballot_shares = compute_ballot_shares(election_key, submitted_ballots, context)
     
@@ -0,0 +1,155 @@
+"""
+Service for elections described by a full manifest.
+
+`create_election_manifest` builds a one-contest, one-style manifest from name lists.
+County elections have hundreds of contests and thousands of ballot styles, so a full
+`Manifest` can be registered instead: it is validated once, stored under its manifest
+hash (`manifest_id`) and its `InternalManifest` indexes contests, styles and selections
+by id, so encrypting, validating and tallying a ballot never scans the manifest.
+"""
+
+import json
+from typing import Any, Dict, List, Optional, Union
+
+from binary_serialize import to_binary_transport
+from electionguard.ballot import PlaintextBallot, PlaintextBallotContest, PlaintextBallotSelection
+from electionguard.manifest import InternalManifest, Manifest
+from electionguard.serialize import from_raw
+from manifest_cache import get_manifest_cache
+from services.create_encrypted_ballot import device_from_dict, encrypt_ballot_in_context
+
+
+def register_election_manifest_service(manifest_data: Union[Dict, str]) -> Dict[str, Any]:
+    """
+    Validate and register a full election manifest.
+
+    Args:
+        manifest_data: ElectionGuard manifest as a dictionary or JSON string
+
+    Returns:
+        Dictionary with the manifest_id and the size of the manifest
+
+    Raises:
+        ValueError: If the manifest cannot be parsed or is not valid
+    """
+    try:
+        raw = manifest_data if isinstance(manifest_data, str) else json.dumps(manifest_data)
+        manifest = from_raw(Manifest, raw)
+    except Exception as e:
+        raise ValueError(f'Invalid manifest: {e}')
+    if not manifest.is_valid():
+        raise ValueError('Invalid manifest: contests, ballot styles or geopolitical units are inconsistent')
+
+    manifest_id = get_manifest_cache().register_manifest(manifest)
+    return {
+        'manifest_id': manifest_id,
+        'contests': len(manifest.contests),
+        'ballot_styles': len(manifest.ballot_styles),
+        'geopolitical_units': len(manifest.geopolitical_units),
+        'selections': sum(len(contest.ballot_selections) for contest in manifest.contests),
+    }
+
+
+def plaintext_ballot_from_votes(
+    internal_manifest: InternalManifest,
+    ballot_id: str,
+    ballot_style_id: str,
+    votes: Dict[str, List[str]]
+) -> PlaintextBallot:
+    """
+    Create a plaintext ballot of a registered manifest.
+
+    Args:
+        internal_manifest: Internal manifest of the election
+        ballot_id: Unique identifier for the ballot
+        ballot_style_id: Ballot style of the voter
+        votes: Selection ids voted for, by contest id; contests left out are encrypted as blank
+
+    Raises:
+        ValueError: If the style is unknown, a contest is not on the style, a selection is
+            not in its contest or a contest has more selections than votes allowed
+    """
+    try:
+        style_contests = internal_manifest.get_contests_for(ballot_style_id)
+    except IndexError:
+        raise ValueError(f"Ballot style '{ballot_style_id}' not found in manifest")
+    if not isinstance(votes, dict):
+        raise ValueError('votes must map contest ids to lists of selection ids')
+    style_contest_ids = {contest.object_id for contest in style_contests}
+
+    ballot_contests = []
+    for contest_id, selection_ids in votes.items():
+        contest = internal_manifest.contest_for(contest_id)
+        if contest is None or contest_id not in style_contest_ids:
+            raise ValueError(f"Contest '{contest_id}' is not on ballot style '{ballot_style_id}'")
+        if isinstance(selection_ids, str):
+            selection_ids = [selection_ids]
+        if len(selection_ids) != len(set(selection_ids)):
+            raise ValueError(f"Duplicate selections in contest '{contest_id}'")
+        votes_allowed = contest.votes_allowed or contest.number_elected
+        if len(selection_ids) > votes_allowed:
+            raise ValueError(
+                f"Too many selections in contest '{contest_id}' ({len(selection_ids)}). Maximum allowed is {votes_allowed}"
+            )
+        selections = []
+        for selection_id in selection_ids:
+            selection = contest.selection_for(selection_id)
+            if selection is None or contest.is_placeholder(selection):
+                raise ValueError(f"Selection '{selection_id}' not found in contest '{contest_id}'")
+            selections.append(PlaintextBallotSelection(object_id=selection_id, vote=1, is_placeholder_selection=False))
+        ballot_contests.append(PlaintextBallotContest(object_id=contest_id, ballot_selections=selections))
+
+    return PlaintextBallot(object_id=ballot_id, style_id=ballot_style_id, contests=ballot_contests)
+
+
+def create_encrypted_manifest_ballot_service(
+    manifest_id: str,
+    ballot_id: str,
+    ballot_style_id: str,
+    votes: Dict[str, List[str]],
+    joint_public_key: str,
+    commitment_hash: str,
+    number_of_guardians: int,
+    quorum: int,
+    generate_ballot_hash_func,
+    device: Optional[Dict] = None,
+    contest_proofs: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Service function to create and encrypt a ballot of a registered manifest.
+
+    Args:
+        manifest_id: Id returned when the manifest was registered
+        ballot_id: Unique identifier for the ballot
+        ballot_style_id: Ballot style of the voter
+        votes: Selection ids voted for, by contest id
+        joint_public_key: Joint public key as string
+        commitment_hash: Commitment hash as string
+        number_of_guardians: Number of guardians
+        quorum: Quorum for the election
+        generate_ballot_hash_func: Function to generate ballot hash
+        device: Encryption device whose ballot code chain the ballot extends
+        contest_proofs: 'placeholder' or 'range' proofs of the contest selection limits
+            (default: EG_CONTEST_PROOFS)
+
+    Returns:
+        Dictionary containing the encrypted ballot and hash
+
+    Raises:
+        ValueError: If the manifest is unknown, the votes are invalid or encryption fails
+    """
+    encryption_device = device_from_dict(device)
+    internal_manifest, context = get_manifest_cache().get_or_create_registered_context(
+        manifest_id, int(joint_public_key), int(commitment_hash), number_of_guardians, quorum,
+        contest_proofs=contest_proofs
+    )
+    ballot = plaintext_ballot_from_votes(internal_manifest, ballot_id, ballot_style_id, votes)
+
+    encrypted_ballot = encrypt_ballot_in_context(ballot, internal_manifest, context, device=encryption_device)
+    if not encrypted_ballot:
+        raise ValueError('Failed to encrypt ballot')
+
+    return {
+        'encrypted_ballot': to_binary_transport(encrypted_ballot),
+        'ballot_hash': generate_ballot_hash_func(encrypted_ballot)
+    }
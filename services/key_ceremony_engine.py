@@ -0,0 +1,277 @@
+"""
+Parallel key ceremony engine for setting up guardians.
+
+Runs the three key ceremony rounds (key generation, partial key backups, backup
+verification) as independent per-guardian tasks, optionally fanned out across a
+process pool in at most max_workers chunks. Each task only receives the data that
+guardian needs for the round, so the payload sent to a worker grows linearly with
+the number of guardians.
+"""
+
+#!/usr/bin/env python
+
+import os
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from electionguard.elgamal import ElGamalSecretKey
+from electionguard.election_polynomial import (
+    ElectionPolynomial,
+    verify_polynomial_coordinate,
+    verify_polynomial_coordinates,
+)
+from electionguard.guardian import Guardian
+from electionguard.key_ceremony import (
+    CeremonyDetails,
+    CoordinateData,
+    ElectionJointKey,
+    ElectionKeyPair,
+    ElectionPartialKeyBackup,
+    ElectionPartialKeyVerification,
+    ElectionPublicKey,
+    combine_election_public_keys,
+    generate_election_key_pair,
+    generate_election_partial_key_backups,
+    get_backup_seed,
+)
+from electionguard.scheduler import Scheduler
+from electionguard.type import GuardianId
+from electionguard.utils import get_optional
+from process_pools import SharedProcessPool
+
+# Below this many guardians the process pool start-up costs more than it saves.
+PARALLEL_CEREMONY_MIN_GUARDIANS = int(os.environ.get('EG_PARALLEL_CEREMONY_MIN_GUARDIANS', '6'))
+CEREMONY_MAX_WORKERS = int(os.environ.get('EG_CEREMONY_MAX_WORKERS', '0')) or None
+
+_pool = SharedProcessPool('ceremony', CEREMONY_MAX_WORKERS)
+
+
+def shutdown_ceremony_pool() -> None:
+    """Shut down the shared ceremony process pool if one was started."""
+    _pool.shutdown()
+
+
+def _run_chunk(task, arguments: List[Tuple]) -> List:
+    """Worker task: run one ceremony task for each guardian of a chunk."""
+    return [task(*args) for args in arguments]
+
+
+def _map(task, arguments: List[Tuple], max_workers: int) -> List:
+    """
+    Run a ceremony task for every argument tuple, in order: inline for one worker,
+    otherwise split into at most max_workers chunks on the shared ceremony pool.
+    """
+    # Clients choose at most the pool size: the pool is shared and never grows per request
+    max_workers = max(1, min(max_workers, _pool.workers, len(arguments)))
+    if max_workers == 1:
+        return _run_chunk(task, arguments)
+    chunk_size = -(-len(arguments) // max_workers)
+    executor = _pool.get()
+    futures = [
+        executor.submit(_run_chunk, task, arguments[start:start + chunk_size])
+        for start in range(0, len(arguments), chunk_size)
+    ]
+    return [result for future in futures for result in future.result()]
+
+
+def _generate_key_pair_task(guardian_id: str, sequence_order: int, quorum: int) -> ElectionKeyPair:
+    """ROUND 1 task: generate a guardian's polynomial, commitments and Schnorr proofs."""
+    return generate_election_key_pair(guardian_id, sequence_order, quorum)
+
+
+def generate_guardian_key_pairs(
+    guardian_ids: List[str], quorum: int, max_workers: Optional[int] = None
+) -> List[ElectionKeyPair]:
+    """
+    Generate the election key pairs of several guardians, with sequence orders following
+    the list, fanned out across the ceremony process pool for large panels.
+    """
+    if max_workers is None:
+        max_workers = CEREMONY_MAX_WORKERS
+    if max_workers is None:
+        max_workers = Scheduler.cpu_count() if len(guardian_ids) >= PARALLEL_CEREMONY_MIN_GUARDIANS else 1
+    arguments = [(guardian_id, index + 1, quorum) for index, guardian_id in enumerate(guardian_ids)]
+    return _map(_generate_key_pair_task, arguments, max_workers)
+
+
+def _generate_backups_task(
+    sender_id: GuardianId,
+    polynomial: ElectionPolynomial,
+    recipients: List[ElectionPublicKey],
+) -> List[ElectionPartialKeyBackup]:
+    """ROUND 2 task: generate one sender's encrypted backups for every other guardian."""
+    return generate_election_partial_key_backups(sender_id, polynomial, recipients)
+
+
+def _verify_backups_task(
+    receiver_id: GuardianId,
+    receiver_sequence_order: int,
+    receiver_secret_key: ElGamalSecretKey,
+    backups: List[ElectionPartialKeyBackup],
+    sender_commitments: Dict[GuardianId, List],
+) -> List[ElectionPartialKeyVerification]:
+    """
+    ROUND 3 task: decrypt and verify every backup addressed to one guardian.
+
+    All coordinates are checked with one batched verification; individual checks
+    only run when the batch fails, to find out which senders were at fault.
+    """
+    encryption_seed = get_backup_seed(receiver_id, receiver_sequence_order)
+    coordinates = []
+    for backup in backups:
+        coordinate_bytes = backup.encrypted_coordinate.decrypt(receiver_secret_key, encryption_seed)
+        if coordinate_bytes is None:
+            coordinates.append(None)
+        else:
+            coordinates.append(CoordinateData.from_bytes(coordinate_bytes).coordinate)
+
+    decrypted = [(backup, coordinate) for backup, coordinate in zip(backups, coordinates) if coordinate is not None]
+    batch_verified = len(decrypted) == len(backups) and verify_polynomial_coordinates(
+        [coordinate for _, coordinate in decrypted],
+        receiver_sequence_order,
+        [sender_commitments[backup.owner_id] for backup, _ in decrypted],
+    )
+
+    verifications = []
+    for backup, coordinate in zip(backups, coordinates):
+        if batch_verified:
+            verified = True
+        elif coordinate is None:
+            verified = False
+        else:
+            verified = verify_polynomial_coordinate(
+                coordinate, receiver_sequence_order, sender_commitments[backup.owner_id]
+            )
+        verifications.append(
+            ElectionPartialKeyVerification(backup.owner_id, backup.designated_id, receiver_id, verified)
+        )
+    return verifications
+
+
+@dataclass
+class KeyCeremonyResult:
+    """Outcome of a completed key ceremony."""
+
+    guardians: List[Guardian]
+    joint_key: ElectionJointKey
+    round_timings: Dict[str, float] = field(default_factory=dict)
+    """Wall-clock milliseconds spent in each ceremony round."""
+
+
+class KeyCeremonyEngine:
+    """
+    Runs a complete key ceremony for guardians hosted by this service.
+
+    With more than one worker each round's per-guardian tasks are split into at most
+    max_workers chunks on the ceremony process pool; otherwise the same tasks run
+    inline, which still benefits from batched verification.
+    """
+
+    def __init__(self, number_of_guardians: int, quorum: int, max_workers: Optional[int] = None):
+        self.ceremony_details = CeremonyDetails(number_of_guardians, quorum)
+        if max_workers is None:
+            max_workers = CEREMONY_MAX_WORKERS
+        if max_workers is None:
+            max_workers = Scheduler.cpu_count() if number_of_guardians >= PARALLEL_CEREMONY_MIN_GUARDIANS else 1
+        self.max_workers = max(1, min(max_workers, _pool.workers))
+
+    def run(self) -> KeyCeremonyResult:
+        """Run all ceremony rounds and publish the joint key."""
+        number_of_guardians = self.ceremony_details.number_of_guardians
+        quorum = self.ceremony_details.quorum
+        timings: Dict[str, float] = {}
+
+        # ROUND 1: Key generation
+        round_start = time.time()
+        key_pairs: List[ElectionKeyPair] = _map(
+            _generate_key_pair_task,
+            [(str(i + 1), i + 1, quorum) for i in range(number_of_guardians)],
+            self.max_workers,
+        )
+        public_keys = {key_pair.owner_id: key_pair.share() for key_pair in key_pairs}
+        timings['round_1_key_generation'] = (time.time() - round_start) * 1000
+
+        # ROUND 2: Partial key backups. Backups only need the recipient's key, so
+        # commitments and proofs are stripped from what is sent to each task.
+        round_start = time.time()
+        recipients = {
+            owner_id: ElectionPublicKey(key.owner_id, key.sequence_order, key.key, [], [])
+            for owner_id, key in public_keys.items()
+        }
+        backups_by_sender: List[List[ElectionPartialKeyBackup]] = _map(
+            _generate_backups_task,
+            [
+                (
+                    key_pair.owner_id,
+                    key_pair.polynomial,
+                    [recipient for owner_id, recipient in recipients.items() if owner_id != key_pair.owner_id],
+                )
+                for key_pair in key_pairs
+            ],
+            self.max_workers,
+        )
+        backups_to_share: Dict[GuardianId, Dict[GuardianId, ElectionPartialKeyBackup]] = {}
+        backups_received: Dict[GuardianId, Dict[GuardianId, ElectionPartialKeyBackup]] = {
+            key_pair.owner_id: {} for key_pair in key_pairs
+        }
+        for key_pair, backups in zip(key_pairs, backups_by_sender):
+            backups_to_share[key_pair.owner_id] = {backup.designated_id: backup for backup in backups}
+            for backup in backups:
+                backups_received[backup.designated_id][backup.owner_id] = backup
+        timings['round_2_backups'] = (time.time() - round_start) * 1000
+
+        # ROUND 3: Backup verification, batched per receiving guardian
+        round_start = time.time()
+        commitments = {owner_id: key.coefficient_commitments for owner_id, key in public_keys.items()}
+        verifications_by_receiver: List[List[ElectionPartialKeyVerification]] = _map(
+            _verify_backups_task,
+            [
+                (
+                    key_pair.owner_id,
+                    key_pair.sequence_order,
+                    key_pair.key_pair.secret_key,
+                    list(backups_received[key_pair.owner_id].values()),
+                    {
+                        owner_id: commitments[owner_id]
+                        for owner_id in backups_received[key_pair.owner_id]
+                    },
+                )
+                for key_pair in key_pairs
+            ],
+            self.max_workers,
+        )
+        failed = [
+            f"{verification.owner_id}->{verification.designated_id}"
+            for verifications in verifications_by_receiver
+            for verification in verifications
+            if not verification.verified
+        ]
+        if failed:
+            raise ValueError(f"Partial key backup verification failed for: {', '.join(failed)}")
+        timings['round_3_verification'] = (time.time() - round_start) * 1000
+
+        # FINAL: Assemble guardians and publish joint key
+        round_start = time.time()
+        verifications_received: Dict[GuardianId, Dict[GuardianId, ElectionPartialKeyVerification]] = {
+            key_pair.owner_id: {} for key_pair in key_pairs
+        }
+        for verifications in verifications_by_receiver:
+            for verification in verifications:
+                verifications_received[verification.owner_id][verification.designated_id] = verification
+
+        guardians = [
+            Guardian(
+                key_pair,
+                self.ceremony_details,
+                election_public_keys=dict(public_keys),
+                partial_key_backups=backups_received[key_pair.owner_id],
+                backups_to_share=backups_to_share[key_pair.owner_id],
+                guardian_election_partial_key_verifications=verifications_received[key_pair.owner_id],
+            )
+            for key_pair in key_pairs
+        ]
+        joint_key = get_optional(combine_election_public_keys(list(public_keys.values())))
+        timings['joint_key'] = (time.time() - round_start) * 1000
+
+        return KeyCeremonyResult(guardians, joint_key, timings)
@@ -52,7 +52,6 @@ from electionguard.manifest import (
     ContactInformation,
     ReportingUnitType
 )
-from electionguard_tools.helpers.election_builder import ElectionBuilder
 from electionguard.tally import (
     tally_ballots,
     CiphertextTally,
@@ -75,13 +74,15 @@ from electionguard.decryption import (
     decrypt_backup,
     compute_lagrange_coefficients_for_guardians as compute_lagrange_coeffs
 )
+from services.key_ceremony_engine import KeyCeremonyEngine
 
 
 def setup_guardians_service(
     number_of_guardians: int,
     quorum: int,
     party_names: List[str],
-    candidate_names: List[str]
+    candidate_names: List[str],
+    max_workers: Optional[int] = None
 ) -> Dict[str, Any]:
     """
     Service function to setup guardians and create joint key.
@@ -91,6 +92,9 @@ def setup_guardians_service(
         quorum: Minimum number of guardians needed for decryption
         party_names: List of party names
         candidate_names: List of candidate names
+        max_workers: Most ceremony pool processes each round uses, capped at the pool
+            size (None picks a default based on CPU count and number of guardians,
+            1 runs inline)
         
     Returns:
         Dictionary containing the setup results
@@ -105,70 +109,13 @@ def setup_guardians_service(
     if quorum < 1:
         raise ValueError('Quorum must be at least 1')
     
-    # Setup Guardians
-    guardians: List[Guardian] = []
-    for i in range(number_of_guardians):
-        guardian = Guardian.from_nonce(
-            str(i + 1),  # guardian id
-            i + 1,  # sequence order
-            number_of_guardians,
-            quorum,
-        )
-        guardians.append(guardian)
-    
-    # Setup Key Ceremony Mediator
-    mediator = KeyCeremonyMediator(
-        "key-ceremony-mediator", 
-        guardians[0].ceremony_details
-    )
-    
-    # ROUND 1: Public Key Sharing
-    for guardian in guardians:
-        mediator.announce(guardian.share_key())
-        
-    # Share Keys
-    for guardian in guardians:
-        announced_keys = get_optional(mediator.share_announced())
-        for key in announced_keys:
-            if guardian.id != key.owner_id:
-                guardian.save_guardian_key(key)
-    
-    # ROUND 2: Election Partial Key Backup Sharing
-    for sending_guardian in guardians:
-        sending_guardian.generate_election_partial_key_backups()
-        
-        backups = []
-        for designated_guardian in guardians:
-            if designated_guardian.id != sending_guardian.id:
-                backup = get_optional(
-                    sending_guardian.share_election_partial_key_backup(
-                        designated_guardian.id
-                    )
-                )
-                backups.append(backup)
-        
-        mediator.receive_backups(backups)
-    
-    # Receive Backups
-    for designated_guardian in guardians:
-        backups = get_optional(mediator.share_backups(designated_guardian.id))
-        for backup in backups:
-            designated_guardian.save_election_partial_key_backup(backup)
-    
-    # ROUND 3: Verification of Backups
-    for designated_guardian in guardians:
-        verifications = []
-        for backup_owner in guardians:
-            if designated_guardian.id != backup_owner.id:
-                verification = designated_guardian.verify_election_partial_key_backup(
-                    backup_owner.id
-                )
-                verifications.append(get_optional(verification))
-        
-        mediator.receive_backup_verifications(verifications)
-    
-    # FINAL: Publish Joint Key
-    joint_key = get_optional(mediator.publish_joint_key())
+    # Run the key ceremony (rounds fan out across a process pool for larger panels)
+    engine = KeyCeremonyEngine(number_of_guardians, quorum, max_workers=max_workers)
+    ceremony = engine.run()
+    guardians = ceremony.guardians
+    joint_key = ceremony.joint_key
+    for round_name, elapsed in ceremony.round_timings.items():
+        print(f"    ⏱️  {round_name}: {elapsed:.2f}ms")
     
     # Prepare guardian data including backups for quorum decryption
     guardian_data = []
@@ -216,5 +163,6 @@ def setup_guardians_service(
         'public_keys': public_keys,
         'polynomials': polynomials,
         'number_of_guardians': number_of_guardians,
-        'quorum': quorum
+        'quorum': quorum,
+        'ceremony_timings': ceremony.round_timings
     }
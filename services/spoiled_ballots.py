@@ -0,0 +1,211 @@
+"""
+Parallel, streaming decryption of spoiled ballots.
+
+Spoiled (audited) ballots are decrypted one by one, and elections with heavy Benaloh
+auditing end with tens of thousands of them. Each stage is split into chunks of ballots
+that run on a shared process pool once there are enough of them:
+
+- a guardian's ballot shares and compensated ballot shares,
+- the reconstruction of missing guardians' shares and the decryption of each ballot,
+  which only needs that ballot's shares, so a chunk carries nothing else.
+
+Chunk results are yielded in ballot order as they complete, with a bounded number of
+chunks in flight, so responses can stream them, and `select_ballot_range` restricts a run
+to a range of ballot ids so that several machines can each take one range.
+
+Requests carry every submitted ballot, but nearly all of them are cast and never decrypted,
+so ballots are read into `SubmittedBallotView`s that only peek at their id, state and hash;
+a full `SubmittedBallot` is built only for the ballots that are decrypted.
+"""
+
+#!/usr/bin/env python
+
+import json
+import os
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, TypeVar, Union
+
+from binary_serialize import from_binary_transport_to_dict
+from electionguard.ballot import BallotBoxState, SubmittedBallot
+from electionguard.decrypt_with_shares import decrypt_ballot
+from electionguard.decryption import reconstruct_decryption_share_for_ballot
+from electionguard.decryption_share import CompensatedDecryptionShare, DecryptionShare
+from electionguard.group import ElementModQ
+from electionguard.key_ceremony import ElectionPublicKey
+from electionguard.manifest import Manifest
+from electionguard.scheduler import Scheduler
+from electionguard.serialize import from_raw
+from electionguard.tally import PlaintextTally
+from electionguard.type import BallotId, GuardianId
+from process_pools import SharedProcessPool
+
+# Below this many spoiled ballots the process pool start-up costs more than it saves.
+PARALLEL_SPOILED_MIN_BALLOTS = int(os.environ.get('EG_PARALLEL_SPOILED_MIN_BALLOTS', '16'))
+SPOILED_MAX_WORKERS = int(os.environ.get('EG_SPOILED_MAX_WORKERS', '0')) or None
+# Ballots per task; smaller chunks stream sooner, larger ones pickle less per ballot.
+SPOILED_CHUNK_SIZE = int(os.environ.get('EG_SPOILED_CHUNK_SIZE', '8'))
+
+_T = TypeVar('_T')
+
+_pool = SharedProcessPool('spoiled', SPOILED_MAX_WORKERS)
+
+
+def shutdown_spoiled_ballot_pool() -> None:
+    """Shut down the shared spoiled ballot process pool if one was started."""
+    _pool.shutdown()
+
+
+def _workers_for(count: int, max_workers: Optional[int]) -> int:
+    if max_workers is None:
+        max_workers = SPOILED_MAX_WORKERS
+    if max_workers is None:
+        max_workers = Scheduler.cpu_count() if count >= PARALLEL_SPOILED_MIN_BALLOTS else 1
+    return max(1, max_workers)
+
+
+def map_ballot_chunks(
+    task: Callable[..., _T],
+    arguments: Tuple,
+    items: Sequence[Any],
+    max_workers: Optional[int] = None,
+    chunk_size: int = SPOILED_CHUNK_SIZE,
+) -> Iterator[_T]:
+    """
+    Run task(*arguments, chunk) over consecutive chunks of items, yielding the results in
+    order. With more than one worker the chunks run on the process pool, at most two per
+    worker at a time; otherwise they run inline, one chunk per iteration.
+    """
+    chunk_size = max(1, chunk_size)
+    chunks = (items[start:start + chunk_size] for start in range(0, len(items), chunk_size))
+    max_workers = _workers_for(len(items), max_workers)
+    if max_workers == 1:
+        for chunk in chunks:
+            yield task(*arguments, chunk)
+        return
+    executor = _pool.get()
+    pending: deque = deque()
+    for chunk in chunks:
+        pending.append(executor.submit(task, *arguments, chunk))
+        if len(pending) >= 2 * max_workers:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+class SubmittedBallotView:
+    """
+    A submitted ballot as sent in a request. The id, state and hash are read from the raw
+    dict; contests are only deserialized by `materialize`, once, on first use.
+    """
+
+    __slots__ = ('object_id', 'state', '_data', '_ballot')
+
+    def __init__(self, data: Dict[str, Any]):
+        self.object_id: str = data['object_id']
+        self.state = BallotBoxState(data['state'])
+        self._data: Optional[Dict[str, Any]] = data
+        self._ballot: Optional[SubmittedBallot] = None
+
+    @property
+    def crypto_hash(self) -> ElementModQ:
+        if self._ballot is not None:
+            return self._ballot.crypto_hash
+        return ElementModQ(self._data['crypto_hash'])
+
+    def materialize(self) -> SubmittedBallot:
+        """Deserialize the full ballot, dropping the raw dict once it is built."""
+        if self._ballot is None:
+            self._ballot = from_raw(SubmittedBallot, json.dumps(self._data))
+            self._data = None
+        return self._ballot
+
+
+def submitted_ballot_views(submitted_ballots_json: Iterable[Union[Dict, str]]) -> List[SubmittedBallotView]:
+    """Read submitted ballots sent as dicts or as binary transport (base64) into views."""
+    return [
+        SubmittedBallotView(ballot_json if isinstance(ballot_json, dict) else from_binary_transport_to_dict(ballot_json))
+        for ballot_json in submitted_ballots_json
+    ]
+
+
+def materialize_ballot(ballot: Union[SubmittedBallot, SubmittedBallotView]) -> SubmittedBallot:
+    """The full ballot behind a view; ballots that are not views are returned as they are."""
+    return ballot.materialize() if isinstance(ballot, SubmittedBallotView) else ballot
+
+
+def spoiled_ballots_of(ballots: Iterable[SubmittedBallot]) -> List[SubmittedBallot]:
+    """
+    The ballots whose shares are needed, materialized: CAST ballots are never decrypted
+    individually.
+    """
+    return [materialize_ballot(ballot) for ballot in ballots if ballot.state == BallotBoxState.SPOILED]
+
+
+def select_ballot_range(
+    ballots: Iterable[SubmittedBallot],
+    ballot_id_from: Optional[str] = None,
+    ballot_id_to: Optional[str] = None,
+) -> List[SubmittedBallot]:
+    """The ballots whose ids fall in [ballot_id_from, ballot_id_to), either bound optional."""
+    return [
+        ballot for ballot in ballots
+        if (ballot_id_from is None or ballot.object_id >= ballot_id_from)
+        and (ballot_id_to is None or ballot.object_id < ballot_id_to)
+    ]
+
+
+@dataclass
+class SpoiledBallotShares:
+    """A spoiled ballot with the shares needed to decrypt it."""
+
+    ballot: SubmittedBallot
+    shares: Dict[GuardianId, DecryptionShare] = field(default_factory=dict)
+    """Decryption shares of the available guardians."""
+    compensated_shares: Dict[GuardianId, Dict[GuardianId, CompensatedDecryptionShare]] = field(default_factory=dict)
+    """Compensated shares by missing guardian, then by the available guardian that computed them."""
+
+
+def _decrypt_chunk(
+    missing_guardian_keys: List[ElectionPublicKey],
+    lagrange_coefficients: Dict[GuardianId, ElementModQ],
+    crypto_extended_base_hash: ElementModQ,
+    number_of_guardians: int,
+    manifest: Manifest,
+    items: List[SpoiledBallotShares],
+) -> List[Tuple[BallotId, Optional[PlaintextTally]]]:
+    """Reconstruct the missing guardians' shares of each ballot, then decrypt it."""
+    results = []
+    for item in items:
+        shares = dict(item.shares)
+        for missing_guardian_key in missing_guardian_keys:
+            missing_guardian_id = missing_guardian_key.owner_id
+            compensated_shares = item.compensated_shares.get(missing_guardian_id)
+            if missing_guardian_id in shares or not compensated_shares:
+                continue
+            shares[missing_guardian_id] = reconstruct_decryption_share_for_ballot(
+                missing_guardian_key, item.ballot, compensated_shares, lagrange_coefficients
+            )
+        plaintext = None
+        if len(shares) == number_of_guardians:
+            plaintext = decrypt_ballot(item.ballot, shares, crypto_extended_base_hash, manifest)
+        results.append((item.ballot.object_id, plaintext))
+    return results
+
+
+def decrypt_spoiled_ballots(
+    items: Sequence[SpoiledBallotShares],
+    missing_guardian_keys: List[ElectionPublicKey],
+    lagrange_coefficients: Dict[GuardianId, ElementModQ],
+    crypto_extended_base_hash: ElementModQ,
+    number_of_guardians: int,
+    manifest: Manifest,
+    max_workers: Optional[int] = None,
+) -> Iterator[Tuple[BallotId, Optional[PlaintextTally]]]:
+    """
+    Decrypt spoiled ballots, yielding (ballot id, plaintext) in the order of items as
+    chunks complete. The plaintext is None when a ballot lacks some guardian's share.
+    """
+    arguments = (missing_guardian_keys, lagrange_coefficients, crypto_extended_base_hash, number_of_guardians, manifest)
+    for results in map_ballot_chunks(_decrypt_chunk, arguments, items, max_workers):
+        yield from results
@@ -0,0 +1,119 @@
+#!/usr/bin/env python
+
+import sys, os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import json
+import subprocess
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_asgi_lanes_and_backpressure():
+    """Lookups answer while crypto runs in the pool, a full lane answers 429 and published ballots are visible."""
+    # asgi imports api, which replaces sys.stdout, so it is exercised in a separate interpreter
+    script = r'''
+import asyncio, json, time, msgpack, asgi
+
+async def call(method, path, payload=None):
+    body = b'' if payload is None else msgpack.packb(payload, use_bin_type=True)
+    scope = {'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1', 'method': method, 'scheme': 'http',
+             'path': path, 'raw_path': path.encode(), 'query_string': b'', 'root_path': '',
+             'headers': [(b'content-type', b'application/msgpack'), (b'content-length', str(len(body)).encode())],
+             'client': ('127.0.0.1', 1), 'server': ('127.0.0.1', 5000)}
+    messages = []
+    requests = [{'type': 'http.request', 'body': body, 'more_body': False}]
+    async def receive():
+        # Like a server: the body once, then nothing until the client disconnects
+        if requests:
+            return requests.pop()
+        await asyncio.Event().wait()
+    async def send(message):
+        messages.append(message)
+    started = time.time()
+    await asgi.app(scope, receive, send)
+    headers = {key.decode(): value.decode() for key, value in messages[0]['headers']}
+    data = b''.join(message.get('body', b'') for message in messages[1:])
+    return messages[0]['status'], headers, data, time.time() - started, len(messages) - 1
+
+async def main():
+    base = dict(party_names=['Party A', 'Party B', 'Party C'], candidate_names=['Alice', 'Bob', 'Carol'], number_of_guardians=1, quorum=1)
+    status, _, data, _, _ = await call('POST', '/setup_guardians', base)
+    assert status == 200
+    setup = msgpack.unpackb(data, raw=False)
+    base.update(joint_public_key=setup['joint_public_key'], commitment_hash=setup['commitment_hash'])
+
+    # One heavy worker and no queue: a second crypto call is refused while the first runs
+    busy = asyncio.ensure_future(call('POST', '/setup_guardians', dict(base, number_of_guardians=4, quorum=3)))
+    await asyncio.sleep(0)
+    refused = await call('POST', '/create_encrypted_ballot', dict(base, ballot_id='b0', candidate_names_to_vote=['Alice']))
+    health = await call('GET', '/health')
+    stats = json.loads((await call('GET', '/asgi/health'))[2])
+    busy = await busy
+
+    ballot = await call('POST', '/create_encrypted_ballot', dict(base, ballot_id='b0', candidate_names_to_vote=['Alice']))
+    lookup = await call('GET', '/ballots/b0')
+    # A streamed response leaves the worker chunk by chunk instead of as one buffered body
+    second = await call('POST', '/create_encrypted_ballot', dict(base, ballot_id='b1', candidate_names_to_vote=['Bob']))
+    encrypted = [msgpack.unpackb(response[2], raw=False)['encrypted_ballot'] for response in (ballot, second)]
+    tally = await call('POST', '/create_encrypted_tally', dict(base, encrypted_ballots=encrypted))
+
+    # A slow route served in this process (a large profile report, say) leaves the event loop free
+    listing = asgi.api.app.view_functions['api_list_published_ballots']
+    asgi.api.app.view_functions['api_list_published_ballots'] = lambda: (time.sleep(0.5), listing())[1]
+    started = time.time()
+    slow = asyncio.ensure_future(call('GET', '/ballots'))
+    await asyncio.sleep(0.05)
+    beside = await call('GET', '/asgi/health')
+    answered = time.time() - started
+    slow = await slow
+    # A task the lane cannot run (its body does not pickle) counts as failed, not completed
+    try:
+        await asgi.heavy_lane.run('POST', '/create_encrypted_ballot', b'', [], lambda: None)
+        failure = None
+    except Exception as e:
+        failure = type(e).__name__
+    counters = asgi.heavy_lane.get_stats()
+    print(json.dumps({
+        'refused': [refused[0], refused[1].get('retry-after'), msgpack.unpackb(refused[2], raw=False)],
+        'health': [health[0], health[3], busy[3]],
+        'pending': stats['lanes']['heavy']['pending'],
+        'busy': busy[0],
+        'ballot': [ballot[0], ballot[1]['content-type']],
+        'lookup': [lookup[0], json.loads(lookup[2]).get('ballot_id')],
+        'tally': [tally[0], tally[4] > 2, len(msgpack.unpackb(tally[2], raw=False)['submitted_ballots'])],
+        'failure': failure,
+        'beside': [slow[0], beside[0], answered < 0.3, slow[3] >= 0.5],
+        'counters': [counters['completed'], counters['failed'], counters['rejected'], counters['pending']],
+    }))
+
+if __name__ == '__main__':
+    asyncio.run(main())
+    asgi.heavy_lane.shutdown()
+'''
+    env = dict(os.environ, EG_ASGI_HEAVY_WORKERS='1', EG_ASGI_QUEUE_DEPTH='0',
+               EG_STREAM_RESPONSE_MIN_ITEMS='2')
+    completed = subprocess.run(
+        [sys.executable, "-c", script], cwd=REPO_ROOT, env=env,
+        capture_output=True, text=True, encoding="utf-8", errors="replace",
+    )
+    assert completed.returncode == 0, completed.stderr[-2000:]
+    result = json.loads(completed.stdout.strip().splitlines()[-1])
+
+    assert result['refused'] == [429, '1', {'error': 'Rate limit exceeded'}]
+    assert result['pending'] == 1 and result['busy'] == 200
+    # The lookup did not wait for the crypto call running next to it
+    assert result['health'][0] == 200 and result['health'][1] < result['health'][2]
+    assert result['ballot'] == [200, 'application/msgpack']
+    assert result['lookup'] == [200, 'b0']
+    assert result['tally'] == [200, True, 2]
+    assert result['failure'] is not None
+    assert result['beside'] == [200, 200, True, True]
+    # Five crypto calls answered, one failed and the refused one only counted as rejected
+    assert result['counters'] == [5, 1, 1, 0]
+    print(f"🚦 ASGI lanes: {result}")
+
+
+if __name__ == "__main__":
+    test_asgi_lanes_and_backpressure()
+    print("✅ ASGI front end tests passed")
@@ -0,0 +1,147 @@
+#!/usr/bin/env python
+
+import sys, os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import json
+import multiprocessing
+import shutil
+import subprocess
+import tempfile
+import time
+
+from ballot_index import BallotIdIndex
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _admit_in_worker(directory, ballot_ids, results):
+    results.put(BallotIdIndex("election", directory).admit(ballot_ids))
+
+
+def test_duplicates_within_and_across_requests():
+    """Repeats in one request and replays of earlier requests are rejected, failed requests released."""
+    index = BallotIdIndex("election", directory=None)
+    assert index.admit(["b1", "b2", "b1", "b3"]) == [True, True, False, True]
+    assert index.admit(["b4", "b2"]) == [True, False]
+    assert "b2" in index and "b5" not in index and len(index) == 4
+
+    index.release(["b4"])
+    assert index.admit(["b4"]) == [True]
+
+
+def test_reset_and_expiry():
+    """A reset or an expired index forgets its ids, in every worker sharing the log."""
+    directory = tempfile.mkdtemp()
+    try:
+        first = BallotIdIndex("tally", directory)
+        second = BallotIdIndex("tally", directory)
+        assert first.admit(["b1", "b2"]) == [True, True]
+        second.reset()
+        assert "b1" not in first and len(second) == 0
+        assert first.admit(["b1"]) == [True] and second.admit(["b1"]) == [False]
+
+        expiring = BallotIdIndex("tally", directory, ttl=60)
+        past = time.time() - 120
+        os.utime(expiring.path, (past, past))
+        assert expiring.admit(["b1", "b3"]) == [True, True]
+        assert first.admit(["b2"]) == [True]
+
+        # The log of an expired index is removed; workers that read it start over
+        os.remove(first.path)
+        assert second.admit(["b3"]) == [True] and first.admit(["b3"]) == [False]
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+    in_memory = BallotIdIndex("tally", directory=None, ttl=60)
+    in_memory.admit(["b1"])
+    in_memory._updated -= 120
+    assert in_memory.admit(["b1"]) == [True]
+
+
+def test_index_is_shared_between_workers():
+    """Workers with their own index over the same directory agree on every id exactly once."""
+    directory = tempfile.mkdtemp()
+    try:
+        first = BallotIdIndex("election", directory)
+        second = BallotIdIndex("election", directory)
+        assert first.admit(["b1", "b2"]) == [True, True]
+        assert second.admit(["b2", "b3"]) == [False, True]
+        assert first.admit(["b3"]) == [False]
+        second.release(["b3"])
+        assert first.admit(["b3"]) == [True]
+        assert BallotIdIndex("other-election", directory).admit(["b1"]) == [True]
+
+        # Overlapping chunks admitted concurrently by separate processes
+        results = multiprocessing.Queue()
+        chunks = [[f"c{i}" for i in range(start, start + 300)] for start in (0, 100, 200, 0)]
+        workers = [multiprocessing.Process(target=_admit_in_worker, args=(directory, chunk, results)) for chunk in chunks]
+        for worker in workers:
+            worker.start()
+        admitted = [results.get(timeout=60) for _ in workers]
+        for worker in workers:
+            worker.join()
+        assert sum(sum(flags) for flags in admitted) == 500
+        assert len(BallotIdIndex("election", directory)) == 503
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+def test_api_reports_rejected_ballots():
+    """The tally endpoint leaves out and reports ballots already tallied for the same tally id."""
+    # api replaces sys.stdout on import, so it is exercised in a separate interpreter
+    script = r'''
+import json, msgpack, api
+client = api.app.test_client()
+def send(path, payload):
+    response = client.post(path, data=msgpack.packb(payload, use_bin_type=True), content_type='application/msgpack')
+    return response.status_code, msgpack.unpackb(response.data, raw=False)
+def post(path, payload):
+    status, body = send(path, payload)
+    assert status == 200, body
+    return body
+base = dict(party_names=['Party A', 'Party B'], candidate_names=['Alice', 'Bob'], number_of_guardians=1, quorum=1)
+setup = post('/setup_guardians', base)
+base.update(joint_public_key=setup['joint_public_key'], commitment_hash=setup['commitment_hash'])
+ballots = [post('/create_encrypted_ballot', dict(base, ballot_id=f'b{i}', candidate_names_to_vote=['Alice']))['encrypted_ballot'] for i in range(3)]
+first = post('/create_encrypted_tally', dict(base, tally_id='final', encrypted_ballots=[ballots[0], ballots[1], ballots[1]]))
+second = post('/create_encrypted_tally', dict(base, tally_id='final', encrypted_ballots=[ballots[2], ballots[0]]))
+replayed, _ = send('/create_encrypted_tally', dict(base, tally_id='final', encrypted_ballots=[ballots[0], ballots[2]]))
+reset = post('/create_encrypted_tally', dict(base, tally_id='final', reset_ballot_index=True, encrypted_ballots=ballots))
+untracked = [post('/create_encrypted_tally', dict(base, encrypted_ballots=ballots[:2])) for _ in range(2)]
+print(json.dumps({
+    'first': [first['rejected_ballot_ids'], first['ciphertext_tally']['cast_ballot_ids']],
+    'second': [second['rejected_ballot_ids'], second['ciphertext_tally']['cast_ballot_ids']],
+    'replayed': replayed,
+    'reset': sorted(reset['ciphertext_tally']['cast_ballot_ids']),
+    'untracked': [sorted(tally['ciphertext_tally']['cast_ballot_ids']) for tally in untracked],
+}))
+'''
+    directory = tempfile.mkdtemp()
+    try:
+        env = dict(os.environ, EG_BALLOT_INDEX_DIR=directory)
+        completed = subprocess.run(
+            [sys.executable, "-c", script], cwd=REPO_ROOT, env=env,
+            capture_output=True, text=True, encoding="utf-8", errors="replace",
+        )
+        assert completed.returncode == 0, completed.stderr[-2000:]
+        result = json.loads(completed.stdout.strip().splitlines()[-1])
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+    assert result['first'][0] == ['b1'] and sorted(result['first'][1]) == ['b0', 'b1']
+    assert result['second'] == [['b0'], ['b2']]
+    # A tally whose ballots were all tallied already fails instead of coming back empty
+    assert result['replayed'] == 400
+    assert result['reset'] == ['b0', 'b1', 'b2']
+    # Without a tally id only repeats within the request are rejected
+    assert result['untracked'] == [['b0', 'b1'], ['b0', 'b1']]
+    print(f"🔁 Rejected duplicates: {result}")
+
+
+if __name__ == "__main__":
+    test_duplicates_within_and_across_requests()
+    test_reset_and_expiry()
+    test_index_is_shared_between_workers()
+    test_api_reports_rejected_ballots()
+    print("✅ Ballot index tests passed")
@@ -0,0 +1,81 @@
+#!/usr/bin/env python
+
+import sys, os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import json
+import subprocess
+
+from electionguard.elgamal import elgamal_encrypt, elgamal_keypair_random
+from electionguard.group import FixedBasePowP, pow_p, rand_q
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_fixed_base_pow_and_small_plaintext_decryption():
+    """Precomputed powers match pow_p and selections decode to 0/1 without a discrete log."""
+    keypair = elgamal_keypair_random()
+    powers = FixedBasePowP(keypair.public_key)
+    for _ in range(20):
+        exponent = rand_q()
+        assert powers.pow(exponent) == pow_p(keypair.public_key, exponent)
+    assert powers.pow(0) == pow_p(keypair.public_key, 0)
+
+    for vote in (0, 1, 2):
+        nonce = rand_q()
+        ciphertext = elgamal_encrypt(vote, nonce, keypair.public_key)
+        decoded = ciphertext.decrypt_known_product_among(powers.pow(nonce))
+        assert decoded == (vote if vote in (0, 1) else None)
+
+
+def test_batch_endpoint_matches_single_challenges():
+    """The batch endpoint agrees with /benaloh_challenge, in order, inline and on a process pool."""
+    # api replaces sys.stdout on import, so it is exercised in a separate interpreter
+    script = r'''
+import json, msgpack, api
+client = api.app.test_client()
+def post(path, payload):
+    response = client.post(path, data=msgpack.packb(payload, use_bin_type=True), content_type='application/msgpack')
+    return response.status_code, msgpack.unpackb(response.data, raw=False)
+base = dict(party_names=['Party A', 'Party B'], candidate_names=['Alice', 'Bob'], number_of_guardians=1, quorum=1)
+_, setup = post('/setup_guardians', base)
+base.update(joint_public_key=setup['joint_public_key'], commitment_hash=setup['commitment_hash'])
+challenges = []
+for i, (vote, expected) in enumerate([('Alice', 'Alice'), ('Bob', 'Alice'), ('Bob', ['Bob'])]):
+    _, ballot = post('/create_encrypted_ballot', dict(base, ballot_id=f'b{i}', candidate_names_to_vote=[vote]))
+    challenges.append({'encrypted_ballot_with_nonce': ballot['encrypted_ballot_with_nonce'], 'candidate_names_to_verify': expected})
+challenges.append({'encrypted_ballot_with_nonce': 'not a ballot', 'candidate_names_to_verify': 'Alice'})
+singles = [post('/benaloh_challenge', dict(base, **challenge))[1] for challenge in challenges[:3]]
+status, inline = post('/benaloh_challenge_batch', dict(joint_public_key=base['joint_public_key'], challenges=challenges, max_workers=1))
+_, pooled = post('/benaloh_challenge_batch', dict(joint_public_key=base['joint_public_key'], challenges=challenges, max_workers=2))
+_, greedy = post('/benaloh_challenge_batch', dict(joint_public_key=base['joint_public_key'], challenges=challenges, max_workers=10000))
+missing_status, _ = post('/benaloh_challenge_batch', dict(joint_public_key=base['joint_public_key'], challenges=[{}]))
+print(json.dumps({'status': status, 'singles': singles, 'inline': inline, 'pooled': pooled, 'greedy': greedy, 'missing_status': missing_status}))
+'''
+    env = dict(os.environ, EG_BENALOH_MAX_WORKERS='2')
+    completed = subprocess.run(
+        [sys.executable, "-c", script], cwd=REPO_ROOT, env=env,
+        capture_output=True, text=True, encoding="utf-8", errors="replace",
+    )
+    assert completed.returncode == 0, completed.stderr[-2000:]
+    result = json.loads(completed.stdout.strip().splitlines()[-1])
+
+    assert result['status'] == 200
+    assert result['missing_status'] == 400
+    # A client cannot ask for more processes than EG_BENALOH_MAX_WORKERS
+    assert [result[batch]['workers'] for batch in ('inline', 'pooled', 'greedy')] == [1, 2, 2]
+    for batch in (result['inline'], result['pooled'], result['greedy']):
+        assert (batch['total'], batch['matched'], batch['mismatched'], batch['failed']) == (4, 2, 1, 1)
+        # The single endpoint leaves verified_candidates empty on a mismatch; compare the rest
+        for item, single in zip(batch['results'], result['singles']):
+            fields = ('status', 'match', 'message', 'ballot_id', 'verified_candidate', 'expected_candidate')
+            assert {f: item[f] for f in fields} == {f: single[f] for f in fields}
+        assert batch['results'][1]['verified_candidates'] == ['Bob']
+        assert batch['results'][3]['status'] == 'error'
+    print(f"🔍 Batch challenge summary: {result['inline']['matched']} matched, {result['inline']['mismatched']} mismatched")
+
+
+if __name__ == "__main__":
+    test_fixed_base_pow_and_small_plaintext_decryption()
+    test_batch_endpoint_matches_single_challenges()
+    print("✅ Batch Benaloh challenge tests passed")
@@ -0,0 +1,174 @@
+#!/usr/bin/env python
+
+import sys, os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import json
+import shutil
+import subprocess
+import tempfile
+from types import SimpleNamespace
+
+import checkpoints
+from binary_serialize import from_binary_transport_to_dict
+from checkpoints import CheckpointStore
+from electionguard.ballot import BallotBoxState
+from services.create_partial_decryption import compute_shares_with_checkpoint
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_checkpoint_store():
+    """Checkpoints are replaced atomically, shared through the directory and kept in memory without one."""
+    directory = tempfile.mkdtemp()
+    try:
+        first, second = CheckpointStore(directory), CheckpointStore(directory)
+        assert first.load("run") is None
+        first.save("run", {"tallied": ["b0"]})
+        first.save("run", {"tallied": ["b0", "b1"]})
+        assert second.load("run") == {"tallied": ["b0", "b1"]}
+        assert [name for name in os.listdir(directory) if name.endswith(".tmp")] == []
+        second.discard("run")
+        assert first.load("run") is None
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+    memory = CheckpointStore("")
+    memory.save("run", {"tallied": []})
+    assert memory.load("run") == {"tallied": []}
+    print("💾 Checkpoint store: atomic replace, shared directory, in-memory mode")
+
+
+def test_decryption_shares_resume():
+    """A decryption run that fails part way only computes the missing shares when it is retried."""
+    ballots = [
+        SimpleNamespace(object_id=f"b{i}", state=BallotBoxState.SPOILED if i % 2 else BallotBoxState.CAST)
+        for i in range(10)
+    ]
+    computed = []
+
+    def compute_ballot_shares(chunk):
+        if fail_after is not None and len(computed) >= fail_after:
+            raise RuntimeError("worker preempted")
+        computed.extend(ballot.object_id for ballot in chunk)
+        return {ballot.object_id: {"share": ballot.object_id} for ballot in chunk if ballot.state == BallotBoxState.SPOILED}
+
+    tally_shares = []
+    compute_tally_share = lambda: tally_shares.append(1) or {"share": "tally"}
+
+    directory = tempfile.mkdtemp()
+    previous = checkpoints._store, checkpoints.CHECKPOINT_INTERVAL
+    try:
+        checkpoints._store = CheckpointStore(directory)
+        import services.create_partial_decryption as partial_decryption
+        partial_decryption.CHECKPOINT_INTERVAL = 2
+
+        fail_after = 2
+        try:
+            compute_shares_with_checkpoint("run", ["election", "tally", "guardian-1"], compute_tally_share,
+                                           compute_ballot_shares, ballots)
+            raise AssertionError("run was not interrupted")
+        except RuntimeError:
+            pass
+        assert computed == ["b1", "b3"]
+
+        fail_after = None
+        tally_share, ballot_shares = compute_shares_with_checkpoint(
+            "run", ["election", "tally", "guardian-1"], compute_tally_share, compute_ballot_shares, ballots)
+        assert computed == ["b1", "b3", "b5", "b7", "b9"]
+        assert tally_shares == [1]
+        resumed = len(computed)
+        assert from_binary_transport_to_dict(tally_share) == {"share": "tally"}
+        assert sorted(ballot_shares) == ["b1", "b3", "b5", "b7", "b9"]
+        assert from_binary_transport_to_dict(ballot_shares["b7"]) == {"share": "b7"}
+
+        # Another guardian's run does not see this one's shares
+        compute_shares_with_checkpoint("run", ["election", "tally", "guardian-2"], compute_tally_share,
+                                       compute_ballot_shares, ballots)
+        assert tally_shares == [1, 1]
+    finally:
+        checkpoints._store = previous[0]
+        partial_decryption.CHECKPOINT_INTERVAL = previous[1]
+        shutil.rmtree(directory, ignore_errors=True)
+    print(f"🔑 Decryption resume: {len(ballot_shares)} ballot shares, {resumed} computed across the interruption")
+
+
+def test_api_tally_resume():
+    """A tally interrupted after its first checkpoint resumes with the remaining ballots only."""
+    # api replaces sys.stdout on import, so it is exercised in a separate interpreter
+    script = r'''
+import json, msgpack, api
+from electionguard.ballot import SubmittedBallot
+from electionguard.elgamal import elgamal_add
+from electionguard.serialize import from_raw
+from electionguard.tally import CiphertextTally, CiphertextTallyContest
+client = api.app.test_client()
+def post(path, payload):
+    response = client.post(path, data=msgpack.packb(payload, use_bin_type=True), content_type='application/msgpack')
+    return response.status_code, msgpack.unpackb(response.data, raw=False)
+base = dict(party_names=['Party A', 'Party B'], candidate_names=['Alice', 'Bob'], number_of_guardians=1, quorum=1)
+_, setup = post('/setup_guardians', base)
+base.update(joint_public_key=setup['joint_public_key'], commitment_hash=setup['commitment_hash'])
+ballots = [post('/create_encrypted_ballot', dict(base, ballot_id=f'b{i}', candidate_names_to_vote=[name]))[1]['encrypted_ballot_with_nonce']
+           for i, name in enumerate(['Alice', 'Bob', 'Alice', 'Alice', 'Bob'])]
+
+chunks = []
+original = CiphertextTally.batch_append
+def preempted(self, ballots, should_validate, scheduler=None):
+    chunks.append(len(list(ballots)))
+    if len(chunks) == 2:
+        raise RuntimeError('worker preempted')
+    return original(self, ballots, should_validate, scheduler)
+CiphertextTally.batch_append = preempted
+request = dict(base, encrypted_ballots=ballots, checkpoint_id='tally-1', tally_id='final')
+interrupted, _ = post('/create_encrypted_tally', request)
+CiphertextTally.batch_append = lambda self, ballots, should_validate, scheduler=None: chunks.append(len(list(ballots))) or original(self, ballots, should_validate, scheduler)
+status, tally = post('/create_encrypted_tally', request)
+resume_chunks = list(chunks)
+other_ballots, _ = post('/create_encrypted_tally', dict(request, encrypted_ballots=ballots[2:]))
+duplicate, _ = post('/create_encrypted_tally', dict(base, tally_id='final', encrypted_ballots=ballots[:1]))
+
+submitted = [from_raw(SubmittedBallot, json.dumps(ballot)) for ballot in tally['submitted_ballots']]
+matches = True
+for contest_id, contest_raw in tally['ciphertext_tally']['contests'].items():
+    contest = from_raw(CiphertextTallyContest, json.dumps(contest_raw))
+    for selection_id, selection in contest.selections.items():
+        expected = elgamal_add(*[s.ciphertext for b in submitted for c in b.contests for s in c.ballot_selections
+                                 if c.object_id == contest_id and s.object_id == selection_id])
+        matches = matches and selection.ciphertext == expected
+print(json.dumps({
+    'status': [interrupted, status, other_ballots, duplicate],
+    'chunks': resume_chunks,
+    'cast': sorted(tally['ciphertext_tally']['cast_ballot_ids']),
+    'rejected': tally['rejected_ballot_ids'],
+    'matches': matches,
+}))
+'''
+    directory = tempfile.mkdtemp()
+    try:
+        env = dict(os.environ, EG_CHECKPOINT_DIR=os.path.join(directory, "checkpoints"),
+                   EG_BALLOT_INDEX_DIR=os.path.join(directory, "index"), EG_CHECKPOINT_INTERVAL="2")
+        completed = subprocess.run(
+            [sys.executable, "-c", script], cwd=REPO_ROOT, env=env,
+            capture_output=True, text=True, encoding="utf-8", errors="replace",
+        )
+        assert completed.returncode == 0, completed.stderr[-2000:]
+        result = json.loads(completed.stdout.strip().splitlines()[-1])
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+    # A ballot already in the tally is rejected, and a request of only such ballots fails
+    assert result['status'] == [500, 200, 400, 400]
+    # Two ballots were checkpointed before the interruption; the retry tallies the other three
+    assert result['chunks'] == [2, 2, 2, 1]
+    assert result['cast'] == ['b0', 'b1', 'b2', 'b3', 'b4']
+    assert result['rejected'] == []
+    assert result['matches']
+    print(f"♻️ Tally resume: {result}")
+
+
+if __name__ == "__main__":
+    test_checkpoint_store()
+    test_decryption_shares_resume()
+    test_api_tally_resume()
+    print("✅ Checkpoint tests passed")
@@ -0,0 +1,129 @@
+#!/usr/bin/env python
+
+import sys, os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import base64
+import json
+import shutil
+import subprocess
+import tempfile
+
+from electionguard.ballot_box import BallotBoxState
+from electionguard.ballot_compact import CompactPlaintextBallot, CompactSubmittedBallot
+from electionguard.group import rand_q
+from services import compact_ballot
+from services.compact_ballot import open_compact_ballot, seal_compact_ballot
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TEST_KEY = base64.b64encode(bytes(range(32))).decode()
+
+
+def test_sealed_ballot_round_trip():
+    """A sealed compact ballot opens to the same values and rejects any tampering."""
+    compact = CompactSubmittedBallot(
+        CompactPlaintextBallot("ballot-1", "ballot-style-1", [False, True, False], {}),
+        1767225600, rand_q(), rand_q(), rand_q(), BallotBoxState.CAST,
+    )
+    configured_key = compact_ballot.COMPACT_BALLOT_KEY
+    compact_ballot.COMPACT_BALLOT_KEY = base64.b64decode(TEST_KEY)
+    try:
+        sealed = seal_compact_ballot(compact)
+        assert open_compact_ballot(sealed) == compact
+        assert len(sealed) < 300
+
+        tampered = bytearray(base64.b64decode(sealed))
+        tampered[-1] ^= 1
+        for bad in (base64.b64encode(bytes(tampered)).decode(), "not a ballot"):
+            try:
+                open_compact_ballot(bad)
+                raise AssertionError("tampered compact ballot was accepted")
+            except ValueError:
+                pass
+
+        # Without a configured key compact ballots are refused, never sealed under a throwaway key
+        compact_ballot.COMPACT_BALLOT_KEY = None
+        for operation, argument in ((seal_compact_ballot, compact), (open_compact_ballot, sealed)):
+            try:
+                operation(argument)
+                raise AssertionError("compact ballot used without a configured key")
+            except ValueError as e:
+                assert "EG_COMPACT_BALLOT_KEY" in str(e)
+    finally:
+        compact_ballot.COMPACT_BALLOT_KEY = configured_key
+
+
+_UNKEYED_SCRIPT = r'''
+import json, sys, msgpack, api
+client = api.app.test_client()
+def status(path, payload):
+    return client.post(path, data=msgpack.packb(payload, use_bin_type=True), content_type='application/msgpack').status_code
+base = dict(party_names=['Party A', 'Party B'], candidate_names=['Alice', 'Bob'], number_of_guardians=1, quorum=1)
+setup = msgpack.unpackb(client.post('/setup_guardians', data=msgpack.packb(base), content_type='application/msgpack').data, raw=False)
+base.update(joint_public_key=setup['joint_public_key'], commitment_hash=setup['commitment_hash'])
+stored = [json.loads(sys.argv[1])]
+print(json.dumps([
+    status('/create_encrypted_ballot', dict(base, ballot_id='b0', candidate_names_to_vote=['Alice'], compact=True)),
+    status('/expand_compact_ballots', dict(base, compact_ballots=stored)),
+    status('/create_encrypted_tally', dict(base, compact_ballots=stored)),
+    status('/create_encrypted_ballot', dict(base, ballot_id='b0', candidate_names_to_vote=['Alice'])),
+]))
+'''
+
+
+def test_api_expands_compact_ballots():
+    """Compact ballots expand to the exact ballots that were encrypted and can be tallied directly."""
+    # api replaces sys.stdout on import, so it is exercised in a separate interpreter
+    script = r'''
+import json, msgpack, api
+client = api.app.test_client()
+def post(path, payload):
+    response = client.post(path, data=msgpack.packb(payload, use_bin_type=True), content_type='application/msgpack')
+    assert response.status_code == 200, msgpack.unpackb(response.data, raw=False)
+    return msgpack.unpackb(response.data, raw=False)
+base = dict(party_names=['Party A', 'Party B'], candidate_names=['Alice', 'Bob'], number_of_guardians=1, quorum=1)
+setup = post('/setup_guardians', base)
+base.update(joint_public_key=setup['joint_public_key'], commitment_hash=setup['commitment_hash'])
+created = [post('/create_encrypted_ballot', dict(base, ballot_id=f'b{i}', candidate_names_to_vote=['Bob' if i % 2 else 'Alice'], compact=True)) for i in range(4)]
+full = post('/create_encrypted_tally', dict(base, tally_id='final', encrypted_ballots=[c['encrypted_ballot'] for c in created[:3]]))
+expanded = post('/expand_compact_ballots', dict(base, compact_ballots=[c['compact_ballot'] for c in created[:3]]))
+compact = post('/create_encrypted_tally', dict(base, tally_id='final', compact_ballots=[created[3]['compact_ballot'], created[0]['compact_ballot']]))
+print(json.dumps({
+    'identical': full['submitted_ballots'] == expanded['submitted_ballots'],
+    'sizes': [len(created[0]['encrypted_ballot']), len(created[0]['compact_ballot'])],
+    'compact_tally': [compact['rejected_ballot_ids'], compact['ciphertext_tally']['cast_ballot_ids']],
+    'compact_ballot': created[0]['compact_ballot'],
+}))
+'''
+    directory = tempfile.mkdtemp()
+    try:
+        env = dict(os.environ, EG_BALLOT_INDEX_DIR=directory, EG_EXPAND_MAX_WORKERS='2', EG_COMPACT_BALLOT_KEY=TEST_KEY)
+        completed = subprocess.run(
+            [sys.executable, "-c", script], cwd=REPO_ROOT, env=env,
+            capture_output=True, text=True, encoding="utf-8", errors="replace",
+        )
+        assert completed.returncode == 0, completed.stderr[-2000:]
+        result = json.loads(completed.stdout.strip().splitlines()[-1])
+
+        # A worker without the key refuses compact ballots instead of sealing them unreadably
+        env.pop('EG_COMPACT_BALLOT_KEY')
+        unkeyed = subprocess.run(
+            [sys.executable, "-c", _UNKEYED_SCRIPT, json.dumps(result['compact_ballot'])], cwd=REPO_ROOT, env=env,
+            capture_output=True, text=True, encoding="utf-8", errors="replace",
+        )
+        assert unkeyed.returncode == 0, unkeyed.stderr[-2000:]
+        result['unkeyed'] = json.loads(unkeyed.stdout.strip().splitlines()[-1])
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+    assert result['identical']
+    assert result['sizes'][1] * 50 < result['sizes'][0]
+    assert result['compact_tally'] == [['b0'], ['b3']]
+    assert result['unkeyed'] == [400, 400, 400, 200]
+    print(f"🗜️  Compact ballots: {result}")
+
+
+if __name__ == "__main__":
+    test_sealed_ballot_round_trip()
+    test_api_expands_compact_ballots()
+    print("✅ Compact ballot tests passed")
@@ -0,0 +1,113 @@
+#!/usr/bin/env python
+
+import sys, os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import json
+import subprocess
+import threading
+import time
+
+from credential_pool import KemPool, map_concurrently
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class _CountingKem:
+    """Stand-in KEM numbering its keypairs, to check that each one is handed out once."""
+
+    def __init__(self):
+        self.generated = 0
+        self._lock = threading.Lock()
+
+    def generate_keypair(self):
+        with self._lock:
+            self.generated += 1
+            number = self.generated
+        return f"pk{number}".encode(), f"sk{number}".encode()
+
+    def encrypt(self, public_key):
+        return b"ct-" + public_key, b"ss-" + public_key
+
+
+def test_kem_pool():
+    """Pooled material is handed out once, refilled in the background and generated inline when empty."""
+    kem = _CountingKem()
+    pool = KemPool(kem, size=4)
+    first = pool.take()
+    assert first[2:] == (b"ct-" + first[0], b"ss-" + first[0])
+    deadline = time.time() + 5
+    while pool.available() < 4 and time.time() < deadline:
+        time.sleep(0.01)
+    assert pool.available() == 4
+
+    taken = [pool.take() for _ in range(20)]
+    public_keys = [entry[0] for entry in taken] + [first[0]]
+    assert len(set(public_keys)) == len(public_keys)
+    assert pool.hits >= 4 and pool.hits + pool.misses == 21
+
+    inline = KemPool(_CountingKem(), size=0)
+    inline.take()
+    assert inline.available() == 0 and inline.misses == 1
+
+    assert map_concurrently(lambda x: x * x, range(10)) == [x * x for x in range(10)]
+    print(f"🔐 KEM pool: {pool.hits} pooled, {pool.misses} generated inline")
+
+
+def test_api_bulk_credentials():
+    """Bulk credentials match the single-guardian format and their sealed keys decrypt."""
+    # api replaces sys.stdout on import, so it is exercised in a separate interpreter
+    script = r'''
+import base64, json, msgpack, api
+client = api.app.test_client()
+def post(path, payload):
+    response = client.post(path, data=msgpack.packb(payload, use_bin_type=True), content_type='application/msgpack')
+    return response.status_code, msgpack.unpackb(response.data, raw=False)
+password = 'p' * 40
+# Sealing uses the generate_keypair/encrypt/decrypt interface of pqcrypto before 1.0
+sealing = hasattr(api.get_pq_kem(), 'generate_keypair')
+status, bulk = post('/generate_guardian_credentials_bulk', dict(
+    number_of_guardians=3, quorum=2, guardian_ids=['alice', 'bob', 'carol'],
+    seal_private_keys=sealing, passwords=[None, password, None]))
+_, single = post('/generate_guardian_credentials', dict(guardian_id='dave', sequence_order=4, number_of_guardians=4, quorum=2))
+duplicate, _ = post('/generate_guardian_credentials_bulk', dict(number_of_guardians=2, quorum=1, guardian_ids=['a', 'a']))
+short, _ = post('/generate_guardian_credentials_bulk', dict(number_of_guardians=1, quorum=1, seal_private_keys=True, passwords=['short']))
+oversized, _ = post('/generate_guardian_credentials_bulk', dict(number_of_guardians=5, quorum=1))
+result = {
+    'status': [status, duplicate, short, oversized],
+    'ids': [g['guardian_data']['id'] for g in bulk['guardians']],
+    'orders': [g['guardian_data']['sequence_order'] for g in bulk['guardians']],
+    'keys': sorted(set(bulk['guardians'][0]) - {'encrypted_data', 'credentials'}) == sorted(set(single) - {'status'}),
+    'sealed': sealing,
+}
+if sealing:
+    decrypted = [post('/api/decrypt', dict(encrypted_data=g['encrypted_data'], credentials=g['credentials']))[1]['private_key']
+                 for g in bulk['guardians']]
+    result['decrypted'] = [json.loads(text) == g['private_key'] for text, g in zip(decrypted, bulk['guardians'])]
+    result['distinct_kem'] = len({json.loads(base64.b64decode(g['credentials']))['pq_private_key'] for g in bulk['guardians']})
+print(json.dumps(result))
+'''
+    env = dict(os.environ, EG_PARALLEL_CEREMONY_MIN_GUARDIANS="100", EG_KDF_WORKERS="2", EG_KEM_POOL_SIZE="2",
+               EG_MAX_BULK_GUARDIANS="4")
+    completed = subprocess.run(
+        [sys.executable, "-c", script], cwd=REPO_ROOT, env=env,
+        capture_output=True, text=True, encoding="utf-8", errors="replace",
+    )
+    assert completed.returncode == 0, completed.stderr[-2000:]
+    result = json.loads(completed.stdout.strip().splitlines()[-1])
+
+    # A panel beyond EG_MAX_BULK_GUARDIANS is refused before any key is generated
+    assert result['status'] == [200, 400, 400, 400]
+    assert result['ids'] == ['alice', 'bob', 'carol']
+    assert result['orders'] == [1, 2, 3]
+    assert result['keys']
+    if result['sealed']:
+        assert result['decrypted'] == [True, True, True]
+        assert result['distinct_kem'] == 3
+    print(f"👥 Bulk credentials: {result}")
+
+
+if __name__ == "__main__":
+    test_kem_pool()
+    test_api_bulk_credentials()
+    print("✅ Credential pool tests passed")
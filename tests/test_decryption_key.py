@@ -0,0 +1,73 @@
+#!/usr/bin/env python
+
+import sys, os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from electionguard.ballot_box import BallotBoxState, submit_ballot
+from electionguard.decryption import compute_decryption_share_for_ballot
+from electionguard.elgamal import ElGamalKeyPair
+from electionguard.encrypt import encrypt_ballot
+from electionguard.group import ONE_MOD_Q, int_to_p
+from electionguard.key_ceremony import ElectionDecryptionKey, generate_election_key_pair
+from electionguard_tools.factories.election_factory import ElectionFactory
+from binary_serialize import to_binary_transport
+from services.create_partial_decryption import election_public_key_for_decryption
+
+
+def test_decryption_key_matches_key_pair():
+    """A key without polynomial produces the same partial decryptions as the full key pair."""
+    election_key = generate_election_key_pair("guardian-1", 1, 2)
+    decryption_key = election_key.decryption_key()
+
+    manifest = ElectionFactory.get_fake_manifest()
+    internal_manifest, context = ElectionFactory.get_fake_ciphertext_election(
+        manifest, election_key.key_pair.public_key
+    )
+    ballot = ElectionFactory().get_fake_ballot(manifest)
+    encrypted = encrypt_ballot(ballot, internal_manifest, context, ONE_MOD_Q)
+    submitted = submit_ballot(encrypted, BallotBoxState.SPOILED)
+
+    full_share = compute_decryption_share_for_ballot(election_key, submitted, context)
+    light_share = compute_decryption_share_for_ballot(decryption_key, submitted, context)
+    assert light_share.guardian_id == full_share.guardian_id == "guardian-1"
+    assert light_share.public_key == full_share.public_key == election_key.key_pair.public_key
+
+    checked = 0
+    for contest in submitted.contests:
+        for selection in contest.ballot_selections:
+            full = full_share.contests[contest.object_id].selections[selection.object_id]
+            light = light_share.contests[contest.object_id].selections[selection.object_id]
+            assert light.share == full.share
+            assert light.proof.is_valid(
+                selection.ciphertext, election_key.key_pair.public_key, light.share,
+                context.crypto_extended_base_hash,
+            )
+            checked += 1
+    print(f"🔑 Decryption key: {checked} selections match the full key pair")
+
+
+def test_announced_public_key():
+    """The stored election public key is announced when present and must belong to the guardian."""
+    election_key = generate_election_key_pair("guardian-1", 1, 2)
+    decryption_key = election_key.decryption_key()
+
+    stored = election_public_key_for_decryption(decryption_key, to_binary_transport(election_key.share()))
+    assert stored == election_key.share()
+
+    bare = election_public_key_for_decryption(decryption_key)
+    assert bare.key == election_key.key_pair.public_key and bare.coefficient_commitments == []
+
+    other = ElectionDecryptionKey(
+        "guardian-1", 1, ElGamalKeyPair(election_key.key_pair.secret_key, int_to_p(4))
+    )
+    try:
+        election_public_key_for_decryption(other, to_binary_transport(election_key.share()))
+        raise AssertionError("mismatched election public key was accepted")
+    except ValueError:
+        pass
+
+
+if __name__ == "__main__":
+    test_decryption_key_matches_key_pair()
+    test_announced_public_key()
+    print("✅ Decryption key tests passed")
@@ -0,0 +1,141 @@
+#!/usr/bin/env python
+
+import sys, os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import json
+import shutil
+import subprocess
+import tempfile
+from datetime import datetime
+
+from electionguard.manifest import (
+    BallotStyle,
+    Candidate,
+    CandidateContestDescription,
+    ElectionType,
+    GeopoliticalUnit,
+    InternalManifest,
+    Manifest,
+    ReportingUnitType,
+    SelectionDescription,
+    SpecVersion,
+    VoteVariationType,
+)
+from electionguard.serialize import to_raw
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def county_manifest(units: int = 6, contests_per_unit: int = 3, candidates: int = 3) -> Manifest:
+    """County-like manifest: contests per district, one style per pair of districts plus a county-wide unit."""
+    gp_units = [GeopoliticalUnit("county", "County", ReportingUnitType.county)]
+    gp_units += [GeopoliticalUnit(f"district-{u}", f"District {u}", ReportingUnitType.precinct) for u in range(units)]
+    candidate_ids = [f"candidate-{c}" for c in range(candidates)]
+    contests = []
+    for unit in gp_units:
+        for c in range(contests_per_unit):
+            contest_id = f"{unit.object_id}-contest-{c}"
+            contests.append(CandidateContestDescription(
+                contest_id, len(contests), unit.object_id, VoteVariationType.n_of_m, 2, 2, contest_id,
+                [SelectionDescription(f"{contest_id}-{candidate}", s, candidate) for s, candidate in enumerate(candidate_ids)],
+            ))
+    styles = [
+        BallotStyle(f"style-{u}", ["county", f"district-{u}", f"district-{(u + 1) % units}"])
+        for u in range(units)
+    ]
+    return Manifest(
+        spec_version=SpecVersion.EG0_95,
+        election_scope_id="county-general",
+        type=ElectionType.general,
+        start_date=datetime(2026, 11, 3),
+        end_date=datetime(2026, 11, 3),
+        geopolitical_units=gp_units,
+        parties=[],
+        candidates=[Candidate(candidate) for candidate in candidate_ids],
+        contests=contests,
+        ballot_styles=styles,
+    )
+
+
+def test_internal_manifest_indexes():
+    """Indexed lookups return what the linear scans over the manifest returned."""
+    manifest = county_manifest()
+    internal_manifest = InternalManifest(manifest)
+
+    for style in manifest.ballot_styles:
+        scanned = [c for c in internal_manifest.contests if c.electoral_district_id in style.geopolitical_unit_ids]
+        assert internal_manifest.get_contests_for(style.object_id) == scanned
+        assert internal_manifest.get_ballot_style(style.object_id) is style
+    for contest in internal_manifest.contests:
+        assert internal_manifest.contest_for(contest.object_id) is contest
+        for selection in contest.ballot_selections + contest.placeholder_selections:
+            assert contest.selection_for(selection.object_id) is selection
+        assert contest.selection_for("missing") is None
+    assert internal_manifest.contest_for("missing") is None
+    try:
+        internal_manifest.get_ballot_style("missing")
+        raise AssertionError("unknown ballot style was found")
+    except IndexError:
+        pass
+    # The indexes are not part of the serialized manifest
+    assert "_contests_by_id" not in to_raw(internal_manifest)
+    print(f"🗂️ Manifest indexes: {len(internal_manifest.contests)} contests, {len(manifest.ballot_styles)} styles")
+
+
+def test_api_registered_manifest():
+    """A registered manifest is used to encrypt, validate and tally ballots of several styles."""
+    # api replaces sys.stdout on import, so it is exercised in a separate interpreter
+    script = r'''
+import json, sys, msgpack, api
+client = api.app.test_client()
+def post(path, payload):
+    response = client.post(path, data=msgpack.packb(payload, use_bin_type=True), content_type='application/msgpack')
+    return response.status_code, msgpack.unpackb(response.data, raw=False)
+manifest = json.loads(sys.stdin.read())
+_, setup = post('/setup_guardians', dict(party_names=['Party A', 'Party B'], candidate_names=['Alice', 'Bob'], number_of_guardians=1, quorum=1))
+election = dict(joint_public_key=setup['joint_public_key'], commitment_hash=setup['commitment_hash'], number_of_guardians=1, quorum=1)
+status, registered = post('/election_manifest', dict(manifest=manifest))
+election['manifest_id'] = registered['manifest_id']
+ballots, statuses = [], []
+for i, (style, votes) in enumerate([
+    ('style-0', {'county-contest-0': ['county-contest-0-candidate-1'], 'district-1-contest-2': ['district-1-contest-2-candidate-0', 'district-1-contest-2-candidate-2']}),
+    ('style-3', {'district-3-contest-0': ['district-3-contest-0-candidate-2']}),
+]):
+    code, result = post('/create_encrypted_manifest_ballot', dict(election, ballot_id=f'b{i}', ballot_style_id=style, votes=votes))
+    statuses.append(code)
+    ballots.append(result['encrypted_ballot_with_nonce'])
+wrong_style = post('/create_encrypted_manifest_ballot', dict(election, ballot_id='bx', ballot_style_id='style-3', votes={'district-1-contest-0': ['district-1-contest-0-candidate-0']}))[0]
+unknown = post('/create_encrypted_manifest_ballot', dict(election, manifest_id='00', ballot_id='by', ballot_style_id='style-0', votes={}))[0]
+tally_status, tally = post('/create_encrypted_tally', dict(election, encrypted_ballots=ballots))
+print(json.dumps({
+    'registered': [status, registered['contests'], registered['ballot_styles']],
+    'ballots': statuses,
+    'rejected': [wrong_style, unknown],
+    'tally': [tally_status, len(tally['ciphertext_tally']['contests']), len(tally['submitted_ballots'])],
+}))
+'''
+    directory = tempfile.mkdtemp()
+    try:
+        env = dict(os.environ, EG_MANIFEST_DIR=directory)
+        completed = subprocess.run(
+            [sys.executable, "-c", script], cwd=REPO_ROOT, env=env, input=to_raw(county_manifest()),
+            capture_output=True, text=True, encoding="utf-8", errors="replace",
+        )
+        assert completed.returncode == 0, completed.stderr[-2000:]
+        result = json.loads(completed.stdout.strip().splitlines()[-1])
+        assert len(os.listdir(directory)) == 1
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+    assert result['registered'] == [200, 21, 6]
+    assert result['ballots'] == [200, 200]
+    assert result['rejected'] == [400, 400]
+    assert result['tally'] == [200, 21, 2]
+    print(f"🗳️ Registered manifest: {result}")
+
+
+if __name__ == "__main__":
+    test_internal_manifest_indexes()
+    test_api_registered_manifest()
+    print("✅ Election manifest tests passed")
@@ -0,0 +1,134 @@
+#!/usr/bin/env python
+
+import sys, os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import json
+import shutil
+import subprocess
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+from electionguard.elgamal import elgamal_keypair_from_secret
+from electionguard.encrypt import EncryptionDevice, EncryptionMediator, encrypt_ballot
+from electionguard.group import int_to_q
+from electionguard_tools.factories.ballot_factory import BallotFactory
+from electionguard_tools.factories.election_factory import ElectionFactory
+from encryption_sessions import DeviceSession
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _election():
+    keypair = elgamal_keypair_from_secret(int_to_q(12345))
+    manifest = ElectionFactory.get_fake_manifest()
+    internal_manifest, context = ElectionFactory.get_fake_ciphertext_election(manifest, keypair.public_key)
+    return keypair, internal_manifest, context
+
+
+def test_pipelined_chain():
+    """Ballot bodies encrypted in a pool and linked afterwards form the same chain as one-by-one encryption."""
+    keypair, internal_manifest, context = _election()
+    device = EncryptionDevice(7, 1, 1234, "precinct-7")
+    ballots = [BallotFactory().get_fake_ballot(internal_manifest, f"ballot-{i}") for i in range(4)]
+
+    mediator = EncryptionMediator(internal_manifest, context, device)
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        encrypted = mediator.encrypt_ballots(ballots[:3], executor=executor)
+    encrypted.append(mediator.encrypt(ballots[3]))
+
+    assert [ballot.object_id for ballot in encrypted] == [f"ballot-{i}" for i in range(4)]
+    assert encrypted[0].code_seed == device.get_hash()
+    for previous, ballot in zip(encrypted, encrypted[1:]):
+        assert ballot.code_seed == previous.code
+    for ballot in encrypted:
+        assert ballot.is_valid_encryption(internal_manifest.manifest_hash, keypair.public_key, context.crypto_extended_base_hash)
+    print(f"⛓️ Pipelined chain: {len(encrypted)} ballots linked in order")
+
+
+def test_device_session_shared_between_workers():
+    """Two sessions on one directory (two API workers) extend a single chain."""
+    _, internal_manifest, context = _election()
+    device = EncryptionDevice(7, 1, 1234, "precinct-7")
+    bodies = [
+        encrypt_ballot(BallotFactory().get_fake_ballot(internal_manifest, f"ballot-{i}"), internal_manifest, context,
+                       internal_manifest.manifest_hash)
+        for i in range(3)
+    ]
+    directory = tempfile.mkdtemp()
+    try:
+        first = DeviceSession("session", device.get_hash(), directory)
+        second = DeviceSession("session", device.get_hash(), directory)
+        linked = first.link(bodies[:2]) + second.link(bodies[2:])
+        assert linked[0].code_seed == device.get_hash()
+        assert linked[2].code_seed == linked[1].code
+        assert first.head == second.head == linked[2].code
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+def test_shared_pool_outlives_other_requests():
+    """Requests asking for different parallelism share one pool, so none is shut down under another."""
+    from services.create_encrypted_ballot import _pool, encrypt_ballot_in_context
+
+    keypair, internal_manifest, context = _election()
+    pool = _pool.get()
+    pending = pool.submit(pow, 3, 4)
+    for max_workers in (3, 2):
+        ballot = BallotFactory().get_fake_ballot(internal_manifest, f"ballot-{max_workers}")
+        assert encrypt_ballot_in_context(ballot, internal_manifest, context, max_workers=max_workers) is not None
+    assert _pool.get() is pool
+    assert pending.result() == 81 and pool.submit(pow, 2, 5).result() == 32
+    print("🏊 Shared encryption pool kept across requests")
+
+
+def test_api_device_chain_across_requests():
+    """A device named in successive requests, single and batch, keeps one chain."""
+    # api replaces sys.stdout on import, so it is exercised in a separate interpreter
+    script = r'''
+import json, msgpack, api
+from binary_serialize import from_binary_transport_to_dict
+client = api.app.test_client()
+def post(path, payload):
+    response = client.post(path, data=msgpack.packb(payload, use_bin_type=True), content_type='application/msgpack')
+    return response.status_code, msgpack.unpackb(response.data, raw=False)
+base = dict(party_names=['Party A', 'Party B'], candidate_names=['Alice', 'Bob'], number_of_guardians=1, quorum=1)
+_, setup = post('/setup_guardians', base)
+base.update(joint_public_key=setup['joint_public_key'], commitment_hash=setup['commitment_hash'],
+            device=dict(device_id=3, session_id=1, launch_code=42, location='precinct-3'))
+status, single = post('/create_encrypted_ballot', dict(base, ballot_id='b0', candidate_names_to_vote=['Alice']))
+batch_status, batch = post('/create_encrypted_ballots', dict(base, ballots=[
+    dict(ballot_id=f'b{i}', candidate_names_to_vote=['Bob']) for i in range(1, 4)]))
+bad_status, _ = post('/create_encrypted_ballots', dict(base, ballots=[dict(ballot_id='b9')]))
+chain = [from_binary_transport_to_dict(single['encrypted_ballot_with_nonce'])]
+chain += [from_binary_transport_to_dict(entry['encrypted_ballot_with_nonce']) for entry in batch['ballots']]
+print(json.dumps({
+    'status': [status, batch_status, bad_status],
+    'ids': [ballot['object_id'] for ballot in chain],
+    'linked': all(ballot['code_seed'] == previous['code'] for previous, ballot in zip(chain, chain[1:])),
+}))
+'''
+    directory = tempfile.mkdtemp()
+    try:
+        env = dict(os.environ, EG_ENCRYPTION_SESSION_DIR=directory, EG_PARALLEL_ENCRYPT_MIN_BALLOTS="2")
+        completed = subprocess.run(
+            [sys.executable, "-c", script], cwd=REPO_ROOT, env=env,
+            capture_output=True, text=True, encoding="utf-8", errors="replace",
+        )
+        assert completed.returncode == 0, completed.stderr[-2000:]
+        result = json.loads(completed.stdout.strip().splitlines()[-1])
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+    assert result['status'] == [200, 200, 400]
+    assert result['ids'] == ['b0', 'b1', 'b2', 'b3']
+    assert result['linked']
+    print(f"🔗 Device chain across requests: {result}")
+
+
+if __name__ == "__main__":
+    test_pipelined_chain()
+    test_device_session_shared_between_workers()
+    test_shared_pool_outlives_other_requests()
+    test_api_device_chain_across_requests()
+    print("✅ Encryption session tests passed")
@@ -0,0 +1,202 @@
+#!/usr/bin/env python
+
+import sys, os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import json
+import subprocess
+import tempfile
+
+import http_compression
+from http_compression import (
+    Codec,
+    Compressor,
+    Decompressor,
+    available_codings,
+    compress_body,
+    compress_stream,
+    decode_body,
+    negotiate,
+    register_codec,
+)
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class _Reversed(Compressor, Decompressor):
+    """Toy coding that reverses the body, to check that codecs are pluggable."""
+
+    def __init__(self, *_):
+        self._parts = []
+
+    def compress(self, data):
+        self._parts.append(data)
+        return b''
+
+    def flush(self):
+        return b''.join(self._parts)[::-1]
+
+    def decompress(self, data, max_length=0):
+        return data[::-1]
+
+
+class _Repeat(Decompressor):
+    """Toy coding whose few body bytes name a length of zeros, like a decompression bomb."""
+
+    limits = []
+
+    def decompress(self, data, max_length=0):
+        self.limits.append(max_length)
+        length = int(data)
+        return b'0' * (min(length, max_length) if max_length else length)
+
+
+def test_codecs_and_negotiation():
+    """Codings round-trip whole and streamed bodies, are negotiated by weight and can be added."""
+    body = json.dumps([format(i * 7919 ** 40, 'X') for i in range(200)]).encode()
+    for coding in available_codings():
+        compressed = compress_body(body, coding)
+        assert len(compressed) < len(body) * 0.7
+        assert decode_body(compressed, coding) == body
+        streamed = b''.join(compress_stream([body[:1000], b'', body[1000:]], coding))
+        assert decode_body(streamed, coding) == body
+    assert decode_body(compress_body(compress_body(body, 'gzip'), 'deflate'), 'gzip, deflate') == body
+
+    assert negotiate(None) is None
+    assert negotiate('br') is None
+    assert negotiate('deflate, gzip;q=0.5') == 'deflate'
+    assert negotiate('gzip;q=0') is None
+    assert negotiate('*') == available_codings()[0]
+    assert negotiate('*, gzip;q=0') != 'gzip'
+
+    for bad, coding in ((b'not gzip', 'gzip'), (body, 'br')):
+        try:
+            decode_body(bad, coding)
+            raise AssertionError(f"{coding} body was accepted")
+        except ValueError:
+            pass
+    # Every gzip member is decoded, within the limit; trailing or missing data is refused
+    members = compress_body(b'{"a":', 'gzip') + compress_body(b'1}', 'gzip')
+    assert decode_body(members, 'gzip') == b'{"a":1}'
+    try:
+        decode_body(compress_body(b'0' * 600, 'gzip') * 2, 'gzip', max_size=1000)
+        raise AssertionError("oversized gzip members were accepted")
+    except ValueError as e:
+        assert 'exceeds' in str(e)
+    # zstd reads through the library's stream reader, which does not report where the data ended
+    for coding in [coding for coding in available_codings() if coding != 'zstd']:
+        whole = compress_body(body, coding)
+        for bad in (whole + b'trailing', whole[:len(whole) // 2]):
+            try:
+                decode_body(bad, coding)
+                raise AssertionError(f"{coding} body with trailing or missing data was accepted")
+            except ValueError:
+                pass
+
+    # Every coding, the optional ones included, stops inflating just past the limit
+    for coding in available_codings():
+        try:
+            decode_body(compress_body(b'0' * 100000, coding), coding, max_size=1000)
+            raise AssertionError(f"oversized {coding} body was accepted")
+        except ValueError as e:
+            assert 'exceeds' in str(e)
+
+    # A codec must implement every stream method
+    class _Unfinished(Compressor):
+        def compress(self, data):
+            return data
+    for incomplete in (_Unfinished, Decompressor):
+        try:
+            incomplete()
+            raise AssertionError(f"{incomplete.__name__} was instantiated without its abstract methods")
+        except TypeError:
+            pass
+
+    previous = list(http_compression._preference)
+    try:
+        register_codec(Codec('x-reversed', _Reversed, _Reversed), preferred=True)
+        assert negotiate('gzip, x-reversed') == 'x-reversed'
+        assert decode_body(compress_body(body, 'x-reversed'), 'x-reversed') == body
+
+        register_codec(Codec('x-repeat', _Reversed, _Repeat))
+        assert decode_body(b'500', 'x-repeat', max_size=1000) == b'0' * 500
+        try:
+            decode_body(b'1000000000000', 'x-repeat', max_size=1000)
+            raise AssertionError("decompression bomb was accepted")
+        except ValueError as e:
+            assert 'exceeds' in str(e)
+        # The codec is asked for one byte past the limit, never for the whole body
+        assert _Repeat.limits == [1001, 1001]
+    finally:
+        http_compression._codecs.pop('x-reversed', None)
+        http_compression._codecs.pop('x-repeat', None)
+        http_compression._preference[:] = previous
+    print(f"🗜️ Codecs: {available_codings()}")
+
+
+def test_api_compression():
+    """Compressed requests are read and responses compressed when the client accepts it."""
+    # api replaces sys.stdout on import, so it is exercised in a separate interpreter
+    script = r'''
+import json, zlib, msgpack, api
+from http_compression import compress_body, decode_body
+client = api.app.test_client()
+def post(path, payload, encoding=None, accept=None):
+    body = msgpack.packb(payload, use_bin_type=True)
+    headers = {}
+    if encoding:
+        body = compress_body(body, encoding)
+        headers['Content-Encoding'] = encoding
+    if accept:
+        headers['Accept-Encoding'] = accept
+    response = client.post(path, data=body, content_type='application/msgpack', headers=headers)
+    coding = response.headers.get('Content-Encoding')
+    data = decode_body(response.data, coding) if coding else response.data
+    return response, msgpack.unpackb(data, raw=False)
+base = dict(party_names=['Party A', 'Party B'], candidate_names=['Alice', 'Bob'], number_of_guardians=1, quorum=1)
+setup_response, setup = post('/setup_guardians', base, encoding='gzip', accept='gzip')
+base.update(joint_public_key=setup['joint_public_key'], commitment_hash=setup['commitment_hash'])
+ballots = [post('/create_encrypted_ballot', dict(base, ballot_id=f'b{i}', candidate_names_to_vote=['Alice']), encoding='deflate')[1]['encrypted_ballot']
+           for i in range(3)]
+plain_response, plain = post('/create_encrypted_tally', dict(base, encrypted_ballots=ballots[:1], tally_id='final'))
+tally_response, tally = post('/create_encrypted_tally', dict(base, encrypted_ballots=ballots[1:], tally_id='final'), accept='gzip;q=0.5, deflate;q=0.9')
+error_response, error = post('/create_encrypted_tally', dict(base, encrypted_ballots=ballots, tally_id='final'), encoding='gzip', accept='gzip')
+unsupported = client.post('/create_encrypted_tally', data=b'x', content_type='application/msgpack', headers={'Content-Encoding': 'br'})
+health = client.get('/health', headers={'Accept-Encoding': 'gzip'})
+print(json.dumps({
+    'setup': [setup_response.status_code, setup_response.headers.get('Content-Encoding'), 'joint_public_key' in setup],
+    'ballots': len(ballots),
+    'plain': [plain_response.status_code, plain_response.headers.get('Content-Encoding'), len(plain['submitted_ballots'])],
+    'tally': [tally_response.status_code, tally_response.headers.get('Content-Encoding'), tally_response.headers.get('Vary'),
+              len(tally['submitted_ballots']), 'Content-Length' not in tally_response.headers],
+    'rejected': [error_response.status_code, error_response.headers.get('Content-Encoding'), 'already tallied' in error['message']],
+    'unsupported': unsupported.status_code,
+    'health': health.headers.get('Content-Encoding'),
+}))
+'''
+    with tempfile.TemporaryDirectory() as directory:
+        env = dict(os.environ, EG_STREAM_RESPONSE_MIN_ITEMS="2", EG_COMPRESSION_MIN_BYTES="2048",
+                   EG_BALLOT_INDEX_DIR=directory)
+        completed = subprocess.run(
+            [sys.executable, "-c", script], cwd=REPO_ROOT, env=env,
+            capture_output=True, text=True, encoding="utf-8", errors="replace",
+        )
+    assert completed.returncode == 0, completed.stderr[-2000:]
+    result = json.loads(completed.stdout.strip().splitlines()[-1])
+
+    assert result['setup'] == [200, 'gzip', True]
+    assert result['ballots'] == 3
+    assert result['plain'] == [200, None, 1]
+    # Two submitted ballots are streamed, and compressed as they are packed
+    assert result['tally'] == [200, 'deflate', 'Accept-Encoding', 2, True]
+    # Every ballot of the last tally was tallied before under the same tally id
+    assert result['rejected'] == [400, None, True]
+    assert result['unsupported'] == 400
+    assert result['health'] is None
+    print(f"📦 API compression: {result}")
+
+
+if __name__ == "__main__":
+    test_codecs_and_negotiation()
+    test_api_compression()
+    print("✅ HTTP compression tests passed")
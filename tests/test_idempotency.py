@@ -0,0 +1,158 @@
+#!/usr/bin/env python
+
+import sys, os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import json
+import shutil
+import subprocess
+import tempfile
+import threading
+import time
+
+from idempotency import IdempotencyCache, request_digest
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_idempotency_cache():
+    """Results are stored per key, refused for another request and bounded in size."""
+    directory = tempfile.mkdtemp()
+    try:
+        cache = IdempotencyCache(directory, max_bytes=2500)
+        digest = request_digest({'guardian_id': 'g1', 'ballots': [1, 2]})
+        assert digest == request_digest({'ballots': [1, 2], 'guardian_id': 'g1'})
+        assert digest != request_digest({'guardian_id': 'g2', 'ballots': [1, 2]})
+
+        assert cache.run('/decrypt', 'k1', digest, lambda: (500, b'failed')) == (500, b'failed', False)
+        assert cache.run('/decrypt', 'k1', digest, lambda: (200, b'a' * 1000)) == (200, b'a' * 1000, False)
+        assert cache.run('/decrypt', 'k1', digest, lambda: (200, b'other')) == (200, b'a' * 1000, True)
+        assert cache.run('/other', 'k1', digest, lambda: (200, b'other')) == (200, b'other', False)
+        try:
+            cache.run('/decrypt', 'k1', request_digest({'guardian_id': 'g2'}), lambda: (200, b''))
+            raise AssertionError("key reused for a different request")
+        except ValueError:
+            pass
+
+        # A third result does not fit: the oldest one is evicted
+        time.sleep(0.01)
+        cache.run('/decrypt', 'k2', digest, lambda: (200, b'b' * 1000))
+        time.sleep(0.01)
+        cache.run('/decrypt', 'k3', digest, lambda: (200, b'c' * 1000))
+        assert cache.run('/decrypt', 'k1', digest, lambda: (200, b'again')) == (200, b'again', False)
+        assert cache.run('/decrypt', 'k3', digest, lambda: (200, b'')) == (200, b'c' * 1000, True)
+
+        # Locks exist only while requests hold them; a lock file left by a worker that
+        # exited mid-request is removed once it expires
+        assert not [name for name in os.listdir(directory) if name.endswith('.lock')] and not cache._locks
+        abandoned = os.path.join(directory, 'abandoned.lock')
+        open(abandoned, 'wb').close()
+        os.utime(abandoned, (0, 0))
+        cache.run('/decrypt', 'k4', digest, lambda: (200, b'd'))
+        assert not os.path.exists(abandoned)
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+    # In memory, the oldest results are evicted past the bound, and replaced ones count once
+    memory = IdempotencyCache('', max_bytes=2500)
+    for key, fill in (('k1', b'a'), ('k2', b'b'), ('k2', b'B'), ('k3', b'c')):
+        memory._store(key, digest, fill * 1000)
+    assert list(memory._memory) == ['k2', 'k3'] and memory._memory_bytes == 2000
+
+    expired = IdempotencyCache('', ttl=-1)
+    expired.run('/decrypt', 'k1', digest, lambda: (200, b'a'))
+    assert expired.run('/decrypt', 'k1', digest, lambda: (200, b'b')) == (200, b'b', False)
+    print("🗃️ Idempotency cache: replay, conflicts, eviction and expiry")
+
+
+def test_concurrent_duplicates_wait():
+    """Identical requests in flight on two workers are computed once."""
+    directory = tempfile.mkdtemp()
+    try:
+        workers = [IdempotencyCache(directory), IdempotencyCache(directory)]
+        calls = []
+
+        def compute():
+            calls.append(1)
+            time.sleep(0.3)
+            return 200, b'shares'
+
+        results = []
+        threads = [
+            threading.Thread(target=lambda cache=cache: results.append(cache.run('/decrypt', 'k', 'd', compute)))
+            for cache in workers + workers
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        leftovers = [name for name in os.listdir(directory) if name.endswith('.lock')]
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+    assert len(calls) == 1
+    assert sorted(replayed for _, _, replayed in results) == [False, True, True, True]
+    assert all(body == b'shares' for _, body, _ in results)
+    assert leftovers == [] and not any(cache._locks for cache in workers)
+    print(f"⏳ Concurrent duplicates: {len(results)} requests, {len(calls)} computation")
+
+
+def test_api_partial_decryption_replay():
+    """A retried partial decryption with the same idempotency key is answered without recomputing."""
+    # api replaces sys.stdout on import, so it is exercised in a separate interpreter
+    script = r'''
+import json, msgpack, api
+client = api.app.test_client()
+def post(path, payload, headers=None):
+    response = client.post(path, data=msgpack.packb(payload, use_bin_type=True), content_type='application/msgpack', headers=headers or {})
+    return response, msgpack.unpackb(response.data, raw=False)
+base = dict(party_names=['Party A', 'Party B'], candidate_names=['Alice', 'Bob'], number_of_guardians=1, quorum=1)
+_, setup = post('/setup_guardians', base)
+base.update(joint_public_key=setup['joint_public_key'], commitment_hash=setup['commitment_hash'])
+ballots = [post('/create_encrypted_ballot', dict(base, ballot_id=f'b{i}', candidate_names_to_vote=['Alice']))[1]['encrypted_ballot'] for i in range(2)]
+_, tally = post('/create_encrypted_tally', dict(base, encrypted_ballots=ballots))
+guardian_id = json.loads(setup['guardian_data'][0])['id'] if isinstance(setup['guardian_data'][0], str) else setup['guardian_data'][0]['id']
+request = dict(base, ciphertext_tally=tally['ciphertext_tally'], submitted_ballots=tally['submitted_ballots'], guardian_id=guardian_id,
+               guardian_data=setup['guardian_data'][0], private_key=setup['private_keys'][0], public_key=setup['public_keys'][0])
+
+calls = []
+service = api.create_partial_decryption_service
+api.create_partial_decryption_service = lambda *args, **kwargs: calls.append(1) or service(*args, **kwargs)
+first, first_body = post('/create_partial_decryption', request, {'Idempotency-Key': 'decrypt-g1'})
+retry, retry_body = post('/create_partial_decryption', request, {'Idempotency-Key': 'decrypt-g1'})
+conflict, _ = post('/create_partial_decryption', dict(request, guardian_id='other'), {'Idempotency-Key': 'decrypt-g1'})
+field, _ = post('/create_partial_decryption', dict(request, idempotency_key='decrypt-g1'))
+unkeyed, _ = post('/create_partial_decryption', request)
+print(json.dumps({
+    'status': [first.status_code, retry.status_code, conflict.status_code, field.status_code, unkeyed.status_code],
+    'replayed': [r.headers.get('X-EG-Idempotent-Replay') for r in (first, retry, field)],
+    'same': first_body == retry_body and first.data == retry.data,
+    'calls': len(calls),
+}))
+'''
+    directory = tempfile.mkdtemp()
+    try:
+        env = dict(os.environ, EG_IDEMPOTENCY_DIR=directory)
+        env.pop('EG_IDEMPOTENCY_AUTO', None)
+        completed = subprocess.run(
+            [sys.executable, "-c", script], cwd=REPO_ROOT, env=env,
+            capture_output=True, text=True, encoding="utf-8", errors="replace",
+        )
+        assert completed.returncode == 0, completed.stderr[-2000:]
+        result = json.loads(completed.stdout.strip().splitlines()[-1])
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+    assert result['status'] == [200, 200, 400, 200, 200]
+    assert result['replayed'] == [None, 'true', 'true']
+    assert result['same']
+    # The first request and the unkeyed one are computed; the retries are replayed
+    assert result['calls'] == 2
+    print(f"🔁 Partial decryption replay: {result}")
+
+
+if __name__ == "__main__":
+    test_idempotency_cache()
+    test_concurrent_duplicates_wait()
+    test_api_partial_decryption_replay()
+    print("✅ Idempotency tests passed")
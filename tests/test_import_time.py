@@ -0,0 +1,29 @@
+#!/usr/bin/env python
+
+import sys, os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scripts.import_time_report import measure_import_times, total_import_ms
+
+# Generous enough for slow CI machines; lazy loading keeps `import api` well under it.
+API_IMPORT_BUDGET_MS = float(os.environ.get('EG_API_IMPORT_BUDGET_MS', '1000'))
+
+# Only needed by tests and sample data generation, never by a serving worker.
+LAZY_MODULES = ['hypothesis', 'electionguard_tools.factories', 'electionguard_tools.strategies', 'pqcrypto']
+
+
+def test_api_import_time_within_budget():
+    """Importing the API (worker boot) stays within the import time budget."""
+    records = measure_import_times("api")
+    total_ms = total_import_ms(records, "api")
+    print(f"⏱️  import api: {total_ms:.1f}ms (budget {API_IMPORT_BUDGET_MS:.0f}ms)")
+
+    assert total_ms <= API_IMPORT_BUDGET_MS
+    loaded = {record.module for record in records}
+    for module in LAZY_MODULES:
+        assert module not in loaded, f"{module} should not be imported at worker boot"
+
+
+if __name__ == "__main__":
+    test_api_import_time_within_budget()
+    print("✅ Import time tests passed")
@@ -0,0 +1,85 @@
+#!/usr/bin/env python
+
+import sys, os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from electionguard.election_polynomial import (
+    compute_polynomial_coordinate,
+    generate_polynomial,
+    verify_polynomial_coordinates,
+)
+from concurrent.futures import ThreadPoolExecutor
+
+from electionguard.group import add_q
+import services.key_ceremony_engine as key_ceremony_engine
+from services.setup_guardians import setup_guardians_service
+
+
+def test_batched_coordinate_verification():
+    """Batched verification accepts valid coordinates and rejects a tampered one."""
+    polynomials = [generate_polynomial(3) for _ in range(4)]
+    coordinates = [compute_polynomial_coordinate(5, polynomial) for polynomial in polynomials]
+    commitments = [polynomial.get_commitments() for polynomial in polynomials]
+
+    assert verify_polynomial_coordinates(coordinates, 5, commitments)
+
+    coordinates[2] = add_q(coordinates[2], 1)
+    assert not verify_polynomial_coordinates(coordinates, 5, commitments)
+
+
+def test_setup_guardians_ceremony():
+    """The ceremony engine produces fully verified guardians and a consistent joint key."""
+    result = setup_guardians_service(5, 3, ["Party A"], ["Alice"], max_workers=1)
+    guardians = result['guardians']
+
+    assert len(guardians) == 5
+    for guardian in guardians:
+        assert guardian.all_guardian_keys_received()
+        assert guardian.all_election_partial_key_backups_received()
+        assert guardian.all_election_partial_key_backups_verified()
+        assert int(guardian.publish_joint_key()) == int(result['joint_public_key'])
+
+    print(f"⏱️  Ceremony timings: {result['ceremony_timings']}")
+
+
+class _CountingPool:
+    """Stands in for the ceremony pool, counting the tasks submitted to it."""
+
+    def __init__(self, workers: int):
+        self.workers = workers
+        self.submitted = 0
+        self._executor = ThreadPoolExecutor(max_workers=workers)
+
+    def get(self):
+        return self
+
+    def submit(self, *args):
+        self.submitted += 1
+        return self._executor.submit(*args)
+
+
+def test_ceremony_fan_out_capped():
+    """max_workers caps the chunks each round submits, and the pool size caps max_workers."""
+    shared_pool = key_ceremony_engine._pool
+    try:
+        for max_workers, chunks in ((2, 2), (10000, 4)):
+            key_ceremony_engine._pool = _CountingPool(workers=4)
+            result = setup_guardians_service(8, 3, ["Party A"], ["Alice"], max_workers=max_workers)
+            assert all(guardian.all_election_partial_key_backups_verified() for guardian in result['guardians'])
+            # Three rounds, each split into at most `chunks` pool tasks
+            assert key_ceremony_engine._pool.submitted == 3 * chunks, (max_workers, key_ceremony_engine._pool.submitted)
+
+        key_ceremony_engine._pool = _CountingPool(workers=4)
+        key_pairs = key_ceremony_engine.generate_guardian_key_pairs(['a', 'b', 'c'], 2, max_workers=2)
+        assert [key_pair.sequence_order for key_pair in key_pairs] == [1, 2, 3]
+        assert key_ceremony_engine._pool.submitted == 2
+    finally:
+        key_ceremony_engine._pool = shared_pool
+    print("🧮 Ceremony fan-out capped at max_workers and the pool size")
+
+
+if __name__ == "__main__":
+    test_batched_coordinate_verification()
+    test_setup_guardians_ceremony()
+    test_ceremony_fan_out_capped()
+    print("✅ Key ceremony engine tests passed")
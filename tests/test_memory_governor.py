@@ -0,0 +1,73 @@
+#!/usr/bin/env python
+
+import sys, os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import json
+import subprocess
+
+import memory_governor
+from memory_governor import MemoryGovernor
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_deferred_collection_and_retirement():
+    """Collections run after the response and workers retire once over the soft RSS limit."""
+    governor = MemoryGovernor(soft_rss_mb=1, gc_trigger_delta_mb=1024)
+
+    governor.begin_request()
+    governor.defer_collection()
+    usage = governor.end_request('/create_encrypted_tally')
+    assert usage['collect']
+
+    # Without a managing server the worker only warns
+    governor.after_response(usage['collect'], can_retire=False)
+    assert not governor.retiring
+
+    signals = []
+    original_kill = memory_governor.os.kill
+    memory_governor.os.kill = lambda pid, sig: signals.append((pid, sig))
+    try:
+        governor.begin_request()
+        usage = governor.end_request('/create_encrypted_tally')
+        assert not usage['collect']
+        governor.after_response(usage['collect'], can_retire=True)
+        governor.after_response(usage['collect'], can_retire=True)
+    finally:
+        memory_governor.os.kill = original_kill
+
+    assert governor.retiring
+    assert signals == [(os.getpid(), memory_governor.signal.SIGTERM)]
+
+    stats = governor.get_stats()
+    assert stats['deferred_collections'] == 1
+    assert stats['endpoints']['/create_encrypted_tally']['requests'] == 2
+
+
+def test_api_reports_memory_usage():
+    """Every response carries the worker's RSS delta and /health exposes governor stats."""
+    # api replaces sys.stdout on import, so it is exercised in a separate interpreter
+    script = (
+        "import json, api\n"
+        "response = api.app.test_client().get('/health')\n"
+        "print(json.dumps({'status': response.status_code, "
+        "'delta': response.headers.get('X-Worker-RSS-Delta-MB'), "
+        "'memory': response.get_json()['memory']}))\n"
+    )
+    completed = subprocess.run(
+        [sys.executable, "-c", script], cwd=REPO_ROOT, capture_output=True, text=True, encoding="utf-8"
+    )
+    assert completed.returncode == 0, completed.stderr[-2000:]
+    result = json.loads(completed.stdout.strip().splitlines()[-1])
+
+    assert result['status'] == 200
+    assert result['delta'] is not None
+    assert result['memory']['frozen_objects'] > 0
+    print(f"🧠 Memory stats: {result['memory']}")
+
+
+if __name__ == "__main__":
+    test_deferred_collection_and_retirement()
+    test_api_reports_memory_usage()
+    print("✅ Memory governor tests passed")
@@ -0,0 +1,103 @@
+#!/usr/bin/env python
+
+import sys, os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import json
+import subprocess
+
+import msgpack
+
+from msgpack_stream import StreamedArray, count_streamed_items, iter_packed_chunks
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _sanitize(obj):
+    if isinstance(obj, dict):
+        return {_sanitize(k): _sanitize(v) for k, v in obj.items()}
+    if isinstance(obj, list):
+        return [_sanitize(v) for v in obj]
+    if isinstance(obj, str):
+        return obj.encode('utf-8', errors='replace').decode('utf-8')
+    return obj
+
+
+def test_streamed_packing_matches_packb():
+    """Incremental packing produces exactly the bytes of msgpack.packb on the materialized data."""
+    ballots = [{'object_id': f"ballot-{i}", 'crypto_hash': str(i * 7919), 'code': b'\x01' * i} for i in range(300)]
+    ballots[5]['note'] = "lone \udc80 surrogate"
+
+    def build(stream):
+        items = StreamedArray(len(ballots), iter(ballots)) if stream else list(ballots)
+        return {'status': 'success', 'results': {'total': 300, 'ballots': items, 'guardians': ['g1', 'g2']}}
+
+    streamed = build(stream=True)
+    assert count_streamed_items(streamed) == 300
+    chunks = list(iter_packed_chunks(streamed, _sanitize, chunk_bytes=1024))
+    assert len(chunks) > 1
+
+    expected = msgpack.packb(_sanitize(build(stream=False)), use_bin_type=True, default=str)
+    assert b''.join(chunks) == expected
+
+
+def test_streamed_array_length_is_enforced():
+    """A producer that yields a different number of items than announced is an error."""
+    for produced in (2, 4):
+        try:
+            list(iter_packed_chunks({'items': StreamedArray(3, iter(range(produced)))}, _sanitize))
+        except ValueError:
+            continue
+        raise AssertionError(f"{produced} items for a length-3 array should fail")
+
+
+def test_api_streams_tally_and_combine():
+    """Tally and combine responses are chunked and decode to the same payload as before."""
+    # api replaces sys.stdout on import, so it is exercised in a separate interpreter
+    script = r'''
+import json, msgpack, api
+client = api.app.test_client()
+def post(path, payload):
+    response = client.post(path, data=msgpack.packb(payload, use_bin_type=True), content_type='application/msgpack')
+    assert response.status_code == 200, msgpack.unpackb(response.data, raw=False)
+    return response, msgpack.unpackb(response.data, raw=False)
+base = dict(party_names=['Party A', 'Party B'], candidate_names=['Alice', 'Bob'], number_of_guardians=3, quorum=2)
+_, setup = post('/setup_guardians', base)
+base.update(joint_public_key=setup['joint_public_key'], commitment_hash=setup['commitment_hash'])
+ballots = [post('/create_encrypted_ballot', dict(base, ballot_id=f'b{i}', candidate_names_to_vote=['Alice']))[1]['encrypted_ballot'] for i in range(3)]
+tally_response, tally = post('/create_encrypted_tally', dict(base, encrypted_ballots=ballots))
+common = dict(base, ciphertext_tally=tally['ciphertext_tally'], submitted_ballots=tally['submitted_ballots'])
+ids = [json.loads(g)['id'] if isinstance(g, str) else g['id'] for g in setup['guardian_data']]
+shares = [post('/create_partial_decryption', dict(common, guardian_id=ids[k], guardian_data=setup['guardian_data'][k],
+          private_key=setup['private_keys'][k], public_key=setup['public_keys'][k], polynomial=setup['polynomials'][k]))[1] for k in range(3)]
+combine_response, combined = post('/combine_decryption_shares', dict(common, guardian_data=setup['guardian_data'],
+    available_guardian_ids=ids, available_guardian_public_keys=[s['guardian_public_key'] for s in shares],
+    available_tally_shares=[s['tally_share'] for s in shares], available_ballot_shares=[s['ballot_shares'] for s in shares],
+    missing_guardian_ids=[], compensating_guardian_ids=[], compensated_tally_shares=[], compensated_ballot_shares=[]))
+print(json.dumps({
+    'tally_streamed': 'Content-Length' not in tally_response.headers, 'submitted': len(tally['submitted_ballots']),
+    'combine_streamed': 'Content-Length' not in combine_response.headers,
+    'verified': [b['verification'] for b in combined['results']['verification']['ballots']],
+    'alice': combined['results']['results']['candidates']['Alice']['votes'],
+}))
+'''
+    env = dict(os.environ, EG_STREAM_RESPONSE_MIN_ITEMS='1')
+    completed = subprocess.run(
+        [sys.executable, "-c", script], cwd=REPO_ROOT, env=env,
+        capture_output=True, text=True, encoding="utf-8", errors="replace",
+    )
+    assert completed.returncode == 0, completed.stderr[-2000:]
+    result = json.loads(completed.stdout.strip().splitlines()[-1])
+
+    assert result['tally_streamed'] and result['combine_streamed']
+    assert result['submitted'] == 3
+    assert result['verified'] == ['success'] * 3
+    assert result['alice'] == '3'
+    print(f"🌊 Streamed responses: {result}")
+
+
+if __name__ == "__main__":
+    test_streamed_packing_matches_packb()
+    test_streamed_array_length_is_enforced()
+    test_api_streams_tally_and_combine()
+    print("✅ Streaming response tests passed")
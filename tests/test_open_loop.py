@@ -0,0 +1,57 @@
+#!/usr/bin/env python
+
+import sys, os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import json
+import subprocess
+import tempfile
+
+from loadtesting.open_loop import LatencyHistogram
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_latency_histogram_percentiles():
+    """Percentiles stay within the histogram's relative precision and merge exactly."""
+    histogram = LatencyHistogram()
+    for value in range(1, 100001):
+        histogram.record(value)
+
+    for percentile in (50.0, 90.0, 99.0, 99.9):
+        expected = percentile * 1000
+        assert abs(histogram.percentile(percentile) - expected) <= expected / 128
+    assert histogram.percentile(100.0) == histogram.max == 100000
+    assert histogram.min == 1
+
+    other = LatencyHistogram()
+    other.record(5000000)
+    histogram.merge(other)
+    assert histogram.total == 100001
+    assert histogram.percentile(100.0) == 5000000
+
+
+def test_open_loop_lifecycle():
+    """A small in-process run completes every phase and counts every ballot."""
+    with tempfile.TemporaryDirectory() as tmp:
+        report_path = os.path.join(tmp, "report.json")
+        completed = subprocess.run(
+            [sys.executable, "loadtesting/open_loop.py", "--ballots", "4", "--rate", "50",
+             "--chunk-size", "2", "--seed", "1", "--json", report_path],
+            cwd=REPO_ROOT, capture_output=True, text=True, encoding="utf-8", errors="replace",
+        )
+        assert completed.returncode == 0, completed.stdout[-2000:] + completed.stderr[-2000:]
+        with open(report_path) as f:
+            report = json.load(f)
+
+    assert report['ballots_stored'] == 4
+    assert report['votes_counted'] == 4
+    assert report['endpoints']['/create_encrypted_tally']['requests'] == 2
+    assert report['endpoints']['/combine_decryption_shares']['errors'] == 0
+    print(f"📈 Phases: {report['phase_seconds']}")
+
+
+if __name__ == "__main__":
+    test_latency_histogram_percentiles()
+    test_open_loop_lifecycle()
+    print("✅ Open-loop load generator tests passed")
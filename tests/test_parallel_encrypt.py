@@ -0,0 +1,42 @@
+#!/usr/bin/env python
+
+import sys, os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from concurrent.futures import ProcessPoolExecutor
+
+from electionguard.ballot import CiphertextBallot
+from electionguard.elgamal import elgamal_keypair_from_secret
+from electionguard.encrypt import encrypt_ballot, encrypt_ballot_contests
+from electionguard.group import ONE_MOD_Q, int_to_q
+from electionguard.serialize import to_raw
+from electionguard_tools.factories.ballot_factory import BallotFactory
+from electionguard_tools.factories.election_factory import ElectionFactory
+
+
+def test_parallel_encryption_is_identical():
+    """Contests and selection chunks encrypted in a process pool match the sequential ballot."""
+    keypair = elgamal_keypair_from_secret(int_to_q(12345))
+    manifest = ElectionFactory.get_fake_manifest()
+    internal_manifest, context = ElectionFactory.get_fake_ciphertext_election(manifest, keypair.public_key)
+    ballot = BallotFactory().get_fake_ballot(internal_manifest, "ballot-1")
+    nonce = int_to_q(99)
+
+    sequential = encrypt_ballot(ballot, internal_manifest, context, ONE_MOD_Q, nonce)
+    nonce_seed = CiphertextBallot.nonce_seed(internal_manifest.manifest_hash, ballot.object_id, nonce)
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        parallel = encrypt_ballot(ballot, internal_manifest, context, ONE_MOD_Q, nonce, executor=executor)
+        # One selection per task: every contest goes through the split path
+        split = encrypt_ballot_contests(ballot, internal_manifest, context, nonce_seed, executor=executor, selections_per_task=1)
+
+    assert sequential is not None and parallel is not None
+    assert to_raw(parallel.contests) == to_raw(sequential.contests)
+    assert to_raw(split) == to_raw(sequential.contests)
+    assert parallel.crypto_hash == sequential.crypto_hash
+    assert parallel.is_valid_encryption(internal_manifest.manifest_hash, keypair.public_key, context.crypto_extended_base_hash)
+    print(f"🧮 Parallel encryption: {len(split)} contests identical to the sequential ballot")
+
+
+if __name__ == "__main__":
+    test_parallel_encryption_is_identical()
+    print("✅ Parallel encryption tests passed")
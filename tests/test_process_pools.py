@@ -0,0 +1,45 @@
+#!/usr/bin/env python
+
+import sys, os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from process_pools import POOL_WORKER_SETTINGS, SharedProcessPool, run_services_inline
+
+
+def test_pool_is_fixed_and_shared():
+    """Every caller gets the same pool of the configured size until it is shut down."""
+    pool = SharedProcessPool('test', 2)
+    assert pool.workers == 2
+    with ThreadPoolExecutor(max_workers=4) as threads:
+        executors = list(threads.map(lambda _: pool.get(), range(8)))
+    assert all(executor is executors[0] for executor in executors)
+
+    pending = executors[0].submit(pow, 3, 4)
+    # Requests for any amount of parallelism keep submitting to the running pool
+    assert pool.get() is executors[0] and pool.get().submit(pow, 2, 5).result() == 32
+    assert pending.result() == 81
+
+    pool.shutdown()
+    restarted = pool.get()
+    assert restarted is not executors[0] and restarted.submit(pow, 2, 3).result() == 8
+    pool.shutdown()
+    assert SharedProcessPool('default').workers >= 1
+    print(f"🏊 Shared pool: {pool.workers} processes, one pool for {len(executors)} callers")
+
+
+def test_pool_workers_run_services_inline():
+    """Workers started with run_services_inline see every service pool sized to one process."""
+    with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context('spawn'),
+                             initializer=run_services_inline) as lane:
+        settings = list(lane.map(os.getenv, POOL_WORKER_SETTINGS))
+    assert settings == ['1'] * len(POOL_WORKER_SETTINGS)
+    print(f"🪆 Lane worker pool sizes: {dict(zip(POOL_WORKER_SETTINGS, settings))}")
+
+
+if __name__ == "__main__":
+    test_pool_is_fixed_and_shared()
+    test_pool_workers_run_services_inline()
+    print("✅ Process pool tests passed")
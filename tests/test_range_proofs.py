@@ -0,0 +1,213 @@
+#!/usr/bin/env python
+
+import sys, os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import json
+import subprocess
+
+from electionguard.ballot import BallotBoxState, CiphertextBallot
+from electionguard.ballot_box import BallotBox, get_ballots
+from electionguard.ballot_validator import ballot_is_valid_for_election
+from electionguard.batch_verification import BatchVerifier
+from electionguard.chaum_pedersen import ConstantChaumPedersenProof, RangeChaumPedersenProof, make_range_chaum_pedersen
+from electionguard.data_store import DataStore
+from electionguard.election import Configuration
+from electionguard.elgamal import elgamal_encrypt, elgamal_keypair_from_secret
+from electionguard.encrypt import encrypt_ballot
+from electionguard.group import int_to_q
+from electionguard.serialize import from_raw, to_raw
+from electionguard.tally import tally_ballots
+from electionguard.utils import get_optional
+from electionguard_tools.factories.ballot_factory import BallotFactory
+from electionguard_tools.factories.election_factory import ElectionFactory
+from electionguard_tools.helpers.election_builder import ElectionBuilder
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _election(range_proofs: bool):
+    keypair = elgamal_keypair_from_secret(int_to_q(12345))
+    builder = ElectionBuilder(1, 1, ElectionFactory.get_fake_manifest(),
+                              configuration=Configuration(range_proofs=range_proofs))
+    builder.set_public_key(keypair.public_key)
+    builder.set_commitment_hash(int_to_q(2))
+    internal_manifest, context = get_optional(builder.build())
+    return keypair, internal_manifest, context
+
+
+def test_range_proof():
+    """A range proof holds for every value up to the limit and only for the statement it was made for."""
+    keypair = elgamal_keypair_from_secret(int_to_q(12345))
+    q, other_q = int_to_q(99), int_to_q(98)
+    for value in range(4):
+        message = get_optional(elgamal_encrypt(value, int_to_q(7 + value), keypair.public_key))
+        proof = make_range_chaum_pedersen(message, value, 3, int_to_q(7 + value), keypair.public_key, int_to_q(5), q)
+        assert proof.is_valid(message, keypair.public_key, q)
+        assert not proof.is_valid(message, keypair.public_key, other_q)
+        batch = BatchVerifier()
+        assert batch.add_range_proof(proof, message, keypair.public_key, q)
+        assert batch.verify()
+
+    message = get_optional(elgamal_encrypt(2, int_to_q(7), keypair.public_key))
+    lying = make_range_chaum_pedersen(message, 1, 3, int_to_q(7), keypair.public_key, int_to_q(5), q)
+    assert not lying.is_valid(message, keypair.public_key, q)
+    assert not BatchVerifier().add_range_proof(lying, message, keypair.public_key, q)
+    try:
+        make_range_chaum_pedersen(message, 4, 3, int_to_q(7), keypair.public_key, int_to_q(5), q)
+        raise AssertionError("value above the limit was proven")
+    except ValueError:
+        pass
+    print("📏 Range proofs: valid for 0..3, rejected for other statements")
+
+
+def test_ballots_without_placeholders():
+    """Range-proof ballots carry no placeholders, validate, round-trip and tally like placeholder ballots."""
+    keypair, internal_manifest, context = _election(True)
+    _, _, placeholder_context = _election(False)
+    plaintext_ballots = [BallotFactory().get_fake_ballot(internal_manifest, f"ballot-{i}") for i in range(3)]
+
+    encrypted = [encrypt_ballot(ballot, internal_manifest, context, internal_manifest.manifest_hash)
+                 for ballot in plaintext_ballots]
+    placeholder_ballot = encrypt_ballot(plaintext_ballots[0], internal_manifest, placeholder_context,
+                                        internal_manifest.manifest_hash)
+    for ballot in encrypted:
+        for contest in ballot.contests:
+            assert isinstance(contest.proof, RangeChaumPedersenProof)
+            assert not any(selection.is_placeholder_selection for selection in contest.ballot_selections)
+        assert ballot_is_valid_for_election(ballot, internal_manifest, context, True)
+        assert not ballot_is_valid_for_election(ballot, internal_manifest, placeholder_context, True)
+        assert from_raw(CiphertextBallot, to_raw(ballot)) == ballot
+    assert all(isinstance(contest.proof, ConstantChaumPedersenProof) for contest in placeholder_ballot.contests)
+    assert ballot_is_valid_for_election(placeholder_ballot, internal_manifest, placeholder_context, True)
+    assert not ballot_is_valid_for_election(placeholder_ballot, internal_manifest, context, True)
+    assert len(to_raw(encrypted[0])) < len(to_raw(placeholder_ballot))
+
+    store = DataStore()
+    box = BallotBox(internal_manifest, context, store)
+    for ballot in encrypted:
+        assert box.cast(ballot) is not None
+    tally = get_optional(tally_ballots(store, internal_manifest, context))
+    assert len(get_ballots(store, BallotBoxState.CAST)) == 3
+    decrypted = {
+        selection_id: selection.ciphertext.decrypt(keypair.secret_key)
+        for contest in tally.contests.values()
+        for selection_id, selection in contest.selections.items()
+    }
+    expected = {selection_id: 0 for selection_id in decrypted}
+    for ballot in plaintext_ballots:
+        for contest in ballot.contests:
+            for selection in contest.ballot_selections:
+                expected[selection.object_id] += selection.vote
+    assert decrypted == expected
+    print(f"🗳️ Range-proof ballots: {len(to_raw(encrypted[0]))} bytes vs {len(to_raw(placeholder_ballot))} with placeholders")
+
+
+def test_api_range_proofs():
+    """EG_CONTEST_PROOFS=range is used by the ballot and tally endpoints."""
+    # api replaces sys.stdout on import, so it is exercised in a separate interpreter
+    script = r'''
+import json, msgpack, api
+from binary_serialize import from_binary_transport_to_dict
+client = api.app.test_client()
+def post(path, payload):
+    response = client.post(path, data=msgpack.packb(payload, use_bin_type=True), content_type='application/msgpack')
+    return response.status_code, msgpack.unpackb(response.data, raw=False)
+base = dict(party_names=['Party A', 'Party B'], candidate_names=['Alice', 'Bob'], number_of_guardians=1, quorum=1)
+_, setup = post('/setup_guardians', base)
+base.update(joint_public_key=setup['joint_public_key'], commitment_hash=setup['commitment_hash'])
+ballots = []
+for i, name in enumerate(['Alice', 'Bob', 'Alice']):
+    status, result = post('/create_encrypted_ballot', dict(base, ballot_id=f'b{i}', candidate_names_to_vote=[name]))
+    ballots.append(result['encrypted_ballot_with_nonce'])
+contest = from_binary_transport_to_dict(ballots[0])['contests'][0]
+tally_status, tally = post('/create_encrypted_tally', dict(base, encrypted_ballots=ballots))
+print(json.dumps({
+    'selections': len(contest['ballot_selections']),
+    'proof': sorted(contest['proof']),
+    'tally': [tally_status, len(tally['submitted_ballots'])],
+}))
+'''
+    env = dict(os.environ, EG_CONTEST_PROOFS="range")
+    completed = subprocess.run(
+        [sys.executable, "-c", script], cwd=REPO_ROOT, env=env,
+        capture_output=True, text=True, encoding="utf-8", errors="replace",
+    )
+    assert completed.returncode == 0, completed.stderr[-2000:]
+    result = json.loads(completed.stdout.strip().splitlines()[-1])
+
+    assert result['selections'] == 2
+    assert 'challenges' in result['proof'] and 'limit' in result['proof']
+    assert result['tally'] == [200, 3]
+    print(f"🌐 API with range proofs: {result}")
+
+
+def test_contest_proofs_per_election():
+    """contest_proofs chooses the proofs per request; EG_CONTEST_PROOFS is only the default."""
+    from manifest_cache import ManifestCache, CONTEST_PROOFS
+    from services.create_encrypted_ballot import create_election_manifest
+
+    cache = ManifestCache(manifest_dir=None)
+    election = (['Party A', 'Party B'], ['Alice', 'Bob'], 7, 11, 1, 1, create_election_manifest)
+    _, placeholder_context = cache.get_or_create_context(*election, contest_proofs='placeholder')
+    _, range_context = cache.get_or_create_context(*election, contest_proofs='RANGE')
+    _, default_context = cache.get_or_create_context(*election)
+    assert not placeholder_context.configuration.range_proofs
+    assert range_context.configuration.range_proofs
+    assert default_context is (range_context if CONTEST_PROOFS == 'range' else placeholder_context)
+    try:
+        cache.get_or_create_context(*election, contest_proofs='none')
+        assert False, 'unknown contest proofs accepted'
+    except ValueError:
+        pass
+
+    script = r'''
+import json, msgpack, api
+from binary_serialize import from_binary_transport_to_dict
+client = api.app.test_client()
+def post(path, payload):
+    response = client.post(path, data=msgpack.packb(payload, use_bin_type=True), content_type='application/msgpack')
+    return response.status_code, msgpack.unpackb(response.data, raw=False)
+base = dict(party_names=['Party A', 'Party B'], candidate_names=['Alice', 'Bob'], number_of_guardians=1, quorum=1)
+_, setup = post('/setup_guardians', base)
+base.update(joint_public_key=setup['joint_public_key'], commitment_hash=setup['commitment_hash'])
+selections = {}
+ballots = []
+for i, mode in enumerate(['range', None, 'range']):
+    request = dict(base, ballot_id=f'b{i}', candidate_names_to_vote=['Alice'])
+    if mode:
+        request['contest_proofs'] = mode
+    status, result = post('/create_encrypted_ballot', request)
+    contest = from_binary_transport_to_dict(result['encrypted_ballot_with_nonce'])['contests'][0]
+    selections[mode or 'default'] = len(contest['ballot_selections'])
+    if mode:
+        ballots.append(result['encrypted_ballot_with_nonce'])
+tally_status, tally = post('/create_encrypted_tally', dict(base, encrypted_ballots=ballots, contest_proofs='range'))
+unknown_status, _ = post('/create_encrypted_ballot', dict(base, ballot_id='b9', candidate_names_to_vote=['Bob'], contest_proofs='none'))
+print(json.dumps({
+    'selections': selections,
+    'tally': [tally_status, len(tally['submitted_ballots'])],
+    'unknown': unknown_status,
+}))
+'''
+    env = {key: value for key, value in os.environ.items() if key != 'EG_CONTEST_PROOFS'}
+    completed = subprocess.run(
+        [sys.executable, "-c", script], cwd=REPO_ROOT, env=env,
+        capture_output=True, text=True, encoding="utf-8", errors="replace",
+    )
+    assert completed.returncode == 0, completed.stderr[-2000:]
+    result = json.loads(completed.stdout.strip().splitlines()[-1])
+
+    # One process serves both modes: the range contexts have no placeholder selection
+    assert result['selections'] == {'range': 2, 'default': 3}
+    assert result['tally'] == [200, 2]
+    assert result['unknown'] == 400
+    print(f"🌐 API with per-election contest proofs: {result}")
+
+
+if __name__ == "__main__":
+    test_range_proof()
+    test_ballots_without_placeholders()
+    test_api_range_proofs()
+    test_contest_proofs_per_election()
+    print("✅ Range proof tests passed")
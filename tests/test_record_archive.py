@@ -0,0 +1,147 @@
+#!/usr/bin/env python
+
+import sys, os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import random
+import shutil
+import tempfile
+
+from electionguard.ballot import SubmittedBallot
+from electionguard.constants import ElectionConstants
+from electionguard.election import CiphertextElectionContext
+from electionguard.election_polynomial import LagrangeCoefficientsRecord
+from electionguard.encrypt import EncryptionDevice
+from electionguard.guardian import GuardianRecord
+from electionguard.manifest import Manifest
+from electionguard.serialize import from_file
+from electionguard.tally import PlaintextTally, PublishedCiphertextTally
+from electionguard_tools.factories.election_factory import ElectionFactory
+from electionguard_tools.helpers.export import (
+    DEVICES_DIR,
+    GUARDIANS_DIR,
+    SPOILED_BALLOTS_DIR,
+    SUBMITTED_BALLOTS_DIR,
+)
+from electionguard_tools.helpers.record_archive import (
+    ARCHIVE_COMPRESSION,
+    RecordArchive,
+    RecordArchiveWriter,
+    export_record_archive,
+    pack_record_directory,
+    unpack_record_archive,
+)
+from electionguard_tools.helpers.record_verifier import verify_election_record
+from electionguard_tools.scripts.sample_generator import ElectionSampleDataGenerator
+
+
+def _read_tree(directory):
+    files = {}
+    for root, _dirs, names in os.walk(directory):
+        for name in names:
+            path = os.path.join(root, name)
+            with open(path, "rb") as record_file:
+                files[os.path.relpath(path, directory)] = record_file.read()
+    return files
+
+
+def test_segments_and_random_access():
+    """Records spread over many compressed segments come back by id in any order."""
+    workspace = tempfile.mkdtemp()
+    try:
+        path = os.path.join(workspace, "record.egra")
+        payloads = {f"ballot-{i}": (f'{{"object_id": "ballot-{i}", "pad": "{i:0>600}"}}').encode() for i in range(200)}
+        with RecordArchiveWriter(path, ARCHIVE_COMPRESSION, segment_bytes=4096) as writer:
+            for object_id, payload in payloads.items():
+                writer.add_raw(SUBMITTED_BALLOTS_DIR, object_id, payload)
+            try:
+                writer.add_raw(SUBMITTED_BALLOTS_DIR, "ballot-0", b"{}")
+                raise AssertionError("duplicate ids must be rejected")
+            except ValueError:
+                pass
+
+        with RecordArchive(path) as archive:
+            assert len(archive) == 200
+            assert archive.object_ids(SUBMITTED_BALLOTS_DIR) == list(payloads)
+            for object_id in random.sample(list(payloads), 50):
+                assert archive.get_raw(SUBMITTED_BALLOTS_DIR, object_id) == payloads[object_id]
+            assert not archive.contains(SUBMITTED_BALLOTS_DIR, "ballot-200")
+
+        # A failed export leaves the previous archive in place
+        try:
+            with RecordArchiveWriter(path) as writer:
+                writer.add_raw("not_a_section", "x", b"{}")
+        except ValueError:
+            pass
+        with RecordArchive(path) as archive:
+            assert len(archive) == 200
+        assert os.listdir(workspace) == ["record.egra"]
+    finally:
+        shutil.rmtree(workspace, ignore_errors=True)
+
+
+def test_record_round_trip_and_verification():
+    """A record packs, exports and unpacks byte for byte and verifies from the archive."""
+    workspace = tempfile.mkdtemp()
+    try:
+        record = os.path.join(workspace, "record")
+        random.seed(0)
+        ElectionSampleDataGenerator().generate(
+            number_of_ballots=6,
+            manifest=ElectionFactory.get_fake_manifest(),
+            election_record_directory=record,
+        )
+        original = _read_tree(record)
+
+        for compression in (None, ARCHIVE_COMPRESSION):
+            packed = os.path.join(workspace, f"packed-{compression}.egra")
+            assert pack_record_directory(record, packed, compression) == len(original)
+            unpacked = os.path.join(workspace, f"unpacked-{compression}")
+            unpack_record_archive(packed, unpacked)
+            assert _read_tree(unpacked) == original
+
+        ballot_ids = sorted(
+            name[len("submitted_ballot_"):-len(".json")]
+            for name in os.listdir(os.path.join(record, SUBMITTED_BALLOTS_DIR))
+        )
+        ballots = [
+            from_file(SubmittedBallot, os.path.join(record, SUBMITTED_BALLOTS_DIR, f"submitted_ballot_{i}.json"))
+            for i in ballot_ids
+        ]
+        load = lambda type_, *parts: from_file(type_, os.path.join(record, *parts))
+        load_all = lambda type_, section: [
+            load(type_, section, name) for name in sorted(os.listdir(os.path.join(record, section)))
+        ]
+        exported = os.path.join(workspace, "exported.egra")
+        export_record_archive(
+            load(Manifest, "manifest.json"),
+            load(CiphertextElectionContext, "context.json"),
+            load(ElectionConstants, "constants.json"),
+            load_all(EncryptionDevice, DEVICES_DIR),
+            iter(ballots),
+            load_all(PlaintextTally, SPOILED_BALLOTS_DIR),
+            load(PublishedCiphertextTally, "encrypted_tally.json"),
+            load(PlaintextTally, "tally.json"),
+            load_all(GuardianRecord, GUARDIANS_DIR),
+            load(LagrangeCoefficientsRecord, "coefficients.json"),
+            exported,
+        )
+        with RecordArchive(exported) as archive:
+            for ballot_id in ballot_ids:
+                key = f"{SUBMITTED_BALLOTS_DIR}/submitted_ballot_{ballot_id}.json"
+                assert archive.get_raw(SUBMITTED_BALLOTS_DIR, ballot_id) == original[key]
+            assert archive.get(SubmittedBallot, SUBMITTED_BALLOTS_DIR, ballot_ids[0]) == ballots[0]
+
+        for archive_path in (exported, os.path.join(workspace, f"packed-{ARCHIVE_COMPRESSION}.egra")):
+            report = verify_election_record(archive_path, max_workers=2, chunk_size=2)
+            assert report.is_valid, report.failures
+            assert report.ballots == 6 and report.spoiled
+        print(f"📦 Archive round trip: {len(original)} records, {os.path.getsize(exported)} bytes")
+    finally:
+        shutil.rmtree(workspace, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    test_segments_and_random_access()
+    test_record_round_trip_and_verification()
+    print("✅ Election record archive tests passed")
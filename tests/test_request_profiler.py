@@ -0,0 +1,99 @@
+#!/usr/bin/env python
+
+import sys, os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import json
+import shutil
+import subprocess
+import tempfile
+import time
+
+from request_profiler import RequestProfiler
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _busy(seconds):
+    deadline = time.time() + seconds
+    while time.time() < deadline:
+        sum(range(1000))
+
+
+def test_sampling_and_retention():
+    """One request in N is stack-sampled, the token enables cProfile and only the newest profiles are kept."""
+    directory = tempfile.mkdtemp()
+    try:
+        profiler = RequestProfiler(directory, max_files=3, sample_every=2, token="secret")
+        ids = []
+        for _ in range(6):
+            profiler.begin_request("/sampled")
+            _busy(0.03)
+            ids.append(profiler.end_request(200))
+        assert ids[0::2] == [None] * 3 and all(ids[1::2])
+
+        profiler.begin_request("/requested", "wrong")
+        assert profiler.end_request(200) is None
+        profiler.begin_request("/requested", "secret")
+        _busy(0.01)
+        requested = profiler.end_request(200)
+
+        profiles = profiler.list_profiles()
+        assert [p["id"] for p in profiles] == [requested, ids[5], ids[3]]
+        assert [p["mode"] for p in profiles] == ["cprofile", "stack", "stack"]
+        assert "_busy" in profiler.summarize(ids[5])
+        assert "cumulative" in profiler.summarize(requested)
+        assert profiler.get_profile("../" + requested) is None
+
+        # The sampling rate set by one worker applies to every profiler sharing the directory
+        RequestProfiler(directory).set_sample_every(0)
+        assert profiler.sample_every == 0
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+def test_api_profiles_on_demand():
+    """A request with the profiling token is profiled and its profile is listed and served."""
+    # api replaces sys.stdout on import, so it is exercised in a separate interpreter
+    script = r'''
+import json, msgpack, api
+client = api.app.test_client()
+payload = msgpack.packb(dict(party_names=['Party A', 'Party B'], candidate_names=['Alice', 'Bob'], number_of_guardians=2, quorum=2), use_bin_type=True)
+plain = client.post('/setup_guardians', data=payload, content_type='application/msgpack')
+profiled = client.post('/setup_guardians', data=payload, content_type='application/msgpack', headers={'X-EG-Profile': 'secret'})
+profile_id = profiled.headers.get('X-EG-Profile-Id')
+index = client.get('/profiles', headers={'X-EG-Profile': 'secret'})
+report = client.get(f'/profiles/{profile_id}?format=text', headers={'X-EG-Profile': 'secret'})
+raw = client.get(f'/profiles/{profile_id}', headers={'X-EG-Profile': 'secret'})
+print(json.dumps({
+    'plain': [plain.status_code, plain.headers.get('X-EG-Profile-Id')],
+    'profiled': profiled.status_code,
+    'index': [p['endpoint'] for p in index.get_json()['profiles']],
+    'report': 'setup_guardians_service' in report.get_data(as_text=True),
+    'raw': len(raw.data) > 0,
+    'denied': client.get('/profiles', headers={'X-EG-Profile': 'nope'}).status_code,
+}))
+'''
+    directory = tempfile.mkdtemp()
+    try:
+        env = dict(os.environ, EG_PROFILE_DIR=directory, EG_PROFILE_TOKEN="secret", EG_PROFILE_SAMPLE_EVERY="0")
+        completed = subprocess.run(
+            [sys.executable, "-c", script], cwd=REPO_ROOT, env=env,
+            capture_output=True, text=True, encoding="utf-8", errors="replace",
+        )
+        assert completed.returncode == 0, completed.stderr[-2000:]
+        result = json.loads(completed.stdout.strip().splitlines()[-1])
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+    assert result['plain'] == [200, None] and result['profiled'] == 200
+    assert result['index'] == ['/setup_guardians']
+    assert result['report'] and result['raw']
+    assert result['denied'] == 403
+    print(f"🔬 Request profiling: {result}")
+
+
+if __name__ == "__main__":
+    test_sampling_and_retention()
+    test_api_profiles_on_demand()
+    print("✅ Request profiler tests passed")
@@ -0,0 +1,198 @@
+#!/usr/bin/env python
+
+import sys, os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import json
+import subprocess
+from types import SimpleNamespace
+
+from binary_serialize import to_binary_transport
+from electionguard.ballot import BallotBoxState
+from services.spoiled_ballots import (
+    map_ballot_chunks,
+    select_ballot_range,
+    spoiled_ballots_of,
+    submitted_ballot_views,
+)
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _square_all(offset, chunk):
+    return [offset + value * value for value in chunk]
+
+
+def test_chunks_and_ranges():
+    """Chunks come back in order on the pool or inline, and ranges split ballots without overlap."""
+    values = list(range(23))
+    expected = [1 + value * value for value in values]
+    for workers in (1, 2):
+        results = list(map_ballot_chunks(_square_all, (1,), values, max_workers=workers, chunk_size=4))
+        assert [len(chunk) for chunk in results] == [4, 4, 4, 4, 4, 3]
+        assert [value for chunk in results for value in chunk] == expected
+
+    ballots = [
+        SimpleNamespace(object_id=f"b{i:02}", state=BallotBoxState.SPOILED if i % 3 else BallotBoxState.CAST)
+        for i in range(12)
+    ]
+    spoiled = spoiled_ballots_of(ballots)
+    assert len(spoiled) == 8
+    parts = [select_ballot_range(spoiled, None, "b04"), select_ballot_range(spoiled, "b04", "b10"),
+             select_ballot_range(spoiled, "b10")]
+    assert [ballot.object_id for part in parts for ballot in part] == [ballot.object_id for ballot in spoiled]
+    print(f"🧩 Chunks and ranges: {[len(part) for part in parts]} ballots per range")
+
+
+def test_submitted_ballot_views():
+    """Views read id, state and hash without deserializing; only spoiled ballots are built."""
+    crypto_hash = "9F" * 32
+    # Cast ballots carry no contests here, so deserializing one would fail
+    cast = [{"object_id": f"c{i}", "state": BallotBoxState.CAST.value, "crypto_hash": crypto_hash} for i in range(3)]
+    views = submitted_ballot_views([cast[0], to_binary_transport(cast[1]), cast[2]])
+    assert [view.object_id for view in views] == ["c0", "c1", "c2"]
+    assert all(view.state == BallotBoxState.CAST for view in views)
+    assert views[1].crypto_hash.to_hex() == crypto_hash
+    assert spoiled_ballots_of(views) == []
+    assert [view.object_id for view in select_ballot_range(views, "c1")] == ["c1", "c2"]
+    print(f"👀 Ballot views: {len(views)} cast ballots read without deserializing")
+
+
+def test_api_spoiled_ballot_decryption():
+    """Spoiled ballots decrypt with a missing guardian, streamed and split by ballot id range, from shares split the same way;
+    combining pages the ballot verification list."""
+    # api replaces sys.stdout on import, so it is exercised in a separate interpreter
+    script = r'''
+import json, msgpack, api
+from binary_serialize import from_binary_transport
+from electionguard.ballot import BallotBoxState, CiphertextBallot
+from electionguard.ballot_box import submit_ballot
+from electionguard.serialize import to_raw
+client = api.app.test_client()
+def post(path, payload):
+    response = client.post(path, data=msgpack.packb(payload, use_bin_type=True), content_type='application/msgpack')
+    return response, msgpack.unpackb(response.data, raw=False)
+base = dict(party_names=['Party A', 'Party B'], candidate_names=['Alice', 'Bob'], number_of_guardians=3, quorum=2)
+_, setup = post('/setup_guardians', base)
+base.update(joint_public_key=setup['joint_public_key'], commitment_hash=setup['commitment_hash'])
+encrypt = lambda ballot_id, name: post('/create_encrypted_ballot', dict(base, ballot_id=ballot_id, candidate_names_to_vote=[name]))[1]['encrypted_ballot_with_nonce']
+votes = ['Alice', 'Bob', 'Alice', 'Bob', 'Alice']
+spoiled = [json.loads(to_raw(submit_ballot(from_binary_transport(CiphertextBallot, encrypt(f's{i}', name)), BallotBoxState.SPOILED)))
+           for i, name in enumerate(votes)]
+_, tally = post('/create_encrypted_tally', dict(base, encrypted_ballots=[encrypt('c0', 'Bob')]))
+submitted = tally['submitted_ballots'] + spoiled
+ids = [json.loads(g)['id'] if isinstance(g, str) else g['id'] for g in setup['guardian_data']]
+common = dict(base, ciphertext_tally=tally['ciphertext_tally'], submitted_ballots=submitted)
+shares = [post('/create_partial_decryption', dict(common, guardian_id=ids[k], guardian_data=setup['guardian_data'][k],
+          private_key=setup['private_keys'][k], public_key=setup['public_keys'][k], polynomial=setup['polynomials'][k]))[1] for k in range(2)]
+# setup_guardians keeps each backup with its recipient; without backups on the missing guardian's data the
+# compensation lookup falls back to the one the available guardian received
+missing_guardian_data = dict(json.loads(setup['guardian_data'][2]) if isinstance(setup['guardian_data'][2], str) else setup['guardian_data'][2], backups={})
+compensate = lambda k, **ballot_range: post('/create_compensated_decryption', dict(common, available_guardian_id=ids[k], missing_guardian_id=ids[2],
+               available_guardian_data=setup['guardian_data'][k], missing_guardian_data=missing_guardian_data,
+               available_private_key=setup['private_keys'][k], available_public_key=setup['public_keys'][k],
+               available_polynomial=setup['polynomials'][k], **ballot_range))[1]
+compensated = [compensate(k) for k in range(2)]
+# The first guardian's ballot shares are computed in two ballot id ranges, as two machines would, and merged
+share_ranges = [post('/create_partial_decryption', dict(common, guardian_id=ids[0], guardian_data=setup['guardian_data'][0],
+                private_key=setup['private_keys'][0], public_key=setup['public_keys'][0], **ballot_range))[1]
+                for ballot_range in (dict(ballot_id_to='s2'), dict(ballot_id_from='s2'))]
+compensated_ranges = [compensate(0, ballot_id_to='s2'), compensate(0, ballot_id_from='s2')]
+shares[0]['ballot_shares'] = {**share_ranges[0]['ballot_shares'], **share_ranges[1]['ballot_shares']}
+compensated[0]['compensated_ballot_shares'] = {**compensated_ranges[0]['compensated_ballot_shares'],
+                                               **compensated_ranges[1]['compensated_ballot_shares']}
+request = dict(base, submitted_ballots=submitted, guardian_data=setup['guardian_data'],
+               available_guardian_ids=ids[:2], available_guardian_public_keys=[s['guardian_public_key'] for s in shares],
+               available_ballot_shares=[s['ballot_shares'] for s in shares],
+               missing_guardian_ids=[ids[2]] * 2, compensating_guardian_ids=ids[:2],
+               compensated_ballot_shares=[c['compensated_ballot_shares'] for c in compensated])
+full_response, full = post('/decrypt_spoiled_ballots', request)
+_, first = post('/decrypt_spoiled_ballots', dict(request, ballot_id_to='s2'))
+_, rest = post('/decrypt_spoiled_ballots', dict(request, ballot_id_from='s2'))
+uncompensated, _ = post('/decrypt_spoiled_ballots', dict(request, missing_guardian_ids=[], compensating_guardian_ids=[], compensated_ballot_shares=[]))
+
+tally['ciphertext_tally']['spoiled_ballot_ids'] = [f's{i}' for i in range(len(votes))]
+combine = lambda **options: post('/combine_decryption_shares', dict(request, ciphertext_tally=tally['ciphertext_tally'],
+    available_tally_shares=[s['tally_share'] for s in shares],
+    compensated_tally_shares=[c['compensated_tally_share'] for c in compensated], **options))[1]['results']
+combined = {'results': combine()}
+page = combine(verification_offset=2, verification_limit=3)
+past_end = combine(verification_offset=10, verification_limit=3)
+unverified = combine(include_ballot_verification=False)
+verification = combined['results']['verification']
+print(json.dumps({
+    'shared': sorted(shares[1]['ballot_shares']),
+    'share_ranges': [sorted(part['ballot_shares']) for part in share_ranges],
+    'compensated_ranges': [sorted(part['compensated_ballot_shares']) for part in compensated_ranges],
+    'streamed': 'Content-Length' not in full_response.headers,
+    'total': full['ballots_total'],
+    'ballots': [[b['ballot_id'], b['verification'], [s['selection_id'] for s in b['selections']]] for b in full['spoiled_ballots']],
+    'ranges': [[b['ballot_id'] for b in part['spoiled_ballots']] for part in (first, rest)],
+    'same': first['spoiled_ballots'] + rest['spoiled_ballots'] == full['spoiled_ballots'],
+    'uncompensated': uncompensated.status_code,
+    'combined': {b['ballot_id']: [b['status'], b['verification'], b['decrypted_hash']] for b in combined['results']['verification']['ballots']},
+    'hashes': {b['ballot_id']: b['decrypted_hash'] for b in full['spoiled_ballots']},
+    'alice': combined['results']['results']['candidates']['Alice']['votes'],
+    'page': [page['verification']['ballots_total'], page['verification']['ballots_offset'],
+             [b['ballot_id'] for b in page['verification']['ballots']]],
+    'page_same': page['verification']['ballots'] == verification['ballots'][2:5],
+    'past_end': [past_end['verification']['ballots_total'], past_end['verification']['ballots_offset'],
+                 past_end['verification']['ballots']],
+    'unverified': [unverified['verification']['ballots'], unverified['verification']['ballots_total']],
+    'results_same': all(part['results'] == combined['results']['results'] and part['verification']['guardians'] == verification['guardians']
+                        for part in (page, past_end, unverified)),
+    'cast': [[b['status'], b['initial_hash'] == b['decrypted_hash']] for b in verification['ballots'] if b['ballot_id'] == 'c0'],
+    'initial_hashes': all(b['initial_hash'] == {v['ballot_id']: v['initial_hash'] for v in verification['ballots']}[b['ballot_id']]
+                          for b in combined['results']['results']['spoiled_ballots']),
+    'guardians': [[g['id'], g['sequence_order'], g['status']] for g in verification['guardians']],
+    'guardian_keys': len({g['public_key'] for g in verification['guardians']}),
+    'ids': ids,
+}))
+'''
+    env = dict(os.environ, EG_PARALLEL_SPOILED_MIN_BALLOTS="2", EG_SPOILED_MAX_WORKERS="2", EG_SPOILED_CHUNK_SIZE="2",
+               EG_STREAM_RESPONSE_MIN_ITEMS="2")
+    completed = subprocess.run(
+        [sys.executable, "-c", script], cwd=REPO_ROOT, env=env,
+        capture_output=True, text=True, encoding="utf-8", errors="replace",
+    )
+    assert completed.returncode == 0, completed.stderr[-2000:]
+    result = json.loads(completed.stdout.strip().splitlines()[-1])
+
+    # Only the spoiled ballots get shares; the cast one is only in the tally
+    assert result['shared'] == ['s0', 's1', 's2', 's3', 's4']
+    # Shares computed per ballot id range merge into the full set; the decryptions below use them
+    assert result['share_ranges'] == result['compensated_ranges'] == [['s0', 's1'], ['s2', 's3', 's4']]
+    assert result['streamed'] and result['total'] == 5
+    assert [ballot_id for ballot_id, _, _ in result['ballots']] == ['s0', 's1', 's2', 's3', 's4']
+    assert all(verification == 'success' and len(selections) == 1 for _, verification, selections in result['ballots'])
+    alice, bob = result['ballots'][0][2], result['ballots'][1][2]
+    assert alice != bob
+    assert [selections for _, _, selections in result['ballots']] == [alice, bob, alice, bob, alice]
+    assert result['ranges'] == [['s0', 's1'], ['s2', 's3', 's4']]
+    assert result['same']
+    assert result['uncompensated'] == 400
+    # Combining uses the same pipeline and reaches the same plaintexts
+    for ballot_id, decrypted_hash in result['hashes'].items():
+        assert result['combined'][ballot_id] == ['spoiled', 'success', decrypted_hash]
+    assert result['alice'] == '0'
+    # The verification list pages over all submitted ballots without changing the results
+    assert result['page'] == [6, 2, ['s1', 's2', 's3']]
+    assert result['page_same']
+    assert result['past_end'] == [6, 10, []]
+    assert result['unverified'] == [[], 6]
+    assert result['results_same']
+    # Ballots and guardians are found through their id indexes
+    assert result['cast'] == [['cast', True]]
+    assert result['initial_hashes']
+    ids = result['ids']
+    assert result['guardians'] == [[ids[0], '1', 'available'], [ids[1], '2', 'available'],
+                                   [ids[2], '3', 'missing (compensated)']]
+    assert result['guardian_keys'] == 3
+    print(f"🗳️ Spoiled ballots: {result['ballots']}")
+
+
+if __name__ == "__main__":
+    test_chunks_and_ranges()
+    test_submitted_ballot_views()
+    test_api_spoiled_ballot_decryption()
+    print("✅ Spoiled ballot tests passed")